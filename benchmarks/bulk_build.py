@@ -0,0 +1,52 @@
+"""
+Benchmark of building a FootprintTable from PACT JSON records with build_table.
+
+Reports the throughput of decoding the records in one process with FootprintTable.from_footprints
+and with build_table for an increasing number of worker processes.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bulk_build.py --count 100000 --workers 1 2 4 8
+"""
+
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker
+
+from pickle_footprints import make_footprints
+
+from pact_methodology.aggregation.bulk import build_table
+from pact_methodology.aggregation.footprint_table import FootprintTable
+from pact_methodology.exchange.json_codec import decode_product_footprint, encode
+
+
+def report(name: str, count: int, seconds: float) -> None:
+    print(f"{name:<16} {seconds:>8.2f} s {count / seconds:>12,.0f} footprints/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=100_000, help="number of records")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="pool sizes to measure")
+    args = parser.parse_args()
+
+    template = [encode(footprint) for footprint in make_footprints(min(args.count, 1000))]
+    records = [template[index % len(template)] for index in range(args.count)]
+
+    start = time.perf_counter()
+    FootprintTable.from_footprints(decode_product_footprint(record) for record in records)
+    report("single process", args.count, time.perf_counter() - start)
+
+    resource_tracker.ensure_running()
+    for workers in args.workers:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Start the workers before timing.
+            list(executor.map(abs, range(workers)))
+            start = time.perf_counter()
+            with build_table(records, executor=executor, max_workers=workers):
+                elapsed = time.perf_counter() - start
+        report(f"{workers} workers", args.count, elapsed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark of a shared footprint catalog read by several worker processes.
+
+Publishes footprints as a catalog generation, then starts worker processes that each map the
+current generation and serve id lookups with their documents, and a filtered column sum. Reports
+the publishing time, the time a worker takes to map a generation, the query throughput of every
+worker, and the anonymous memory each worker allocated, which excludes the shared mapped file.
+
+Usage:
+    PYTHONPATH=. python benchmarks/catalog.py --count 100000 --workers 4
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from pickle_footprints import make_footprints
+
+from pact_methodology.repository.catalog import SharedCatalog, publish
+
+
+def anonymous_memory() -> int:
+    """Returns the resident anonymous memory of this process in bytes, or 0 where it is unknown."""
+    try:
+        with open("/proc/self/status") as file:
+            for line in file:
+                if line.startswith("RssAnon:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+
+def worker(directory: str, ids: list[str]) -> tuple[float, float, float, int]:
+    before = anonymous_memory()
+    start = time.perf_counter()
+    generation = SharedCatalog(directory).current()
+    opened = time.perf_counter() - start
+    start = time.perf_counter()
+    size = 0
+    for id in ids:
+        size += len(generation.document(id))
+    lookups = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(100):
+        generation.table.column("p_cf_excluding_biogenic")[generation.where("status", "Active")].sum()
+    sums = (time.perf_counter() - start) / 100
+    return opened, lookups, sums, anonymous_memory() - before
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=100_000, help="number of footprints")
+    parser.add_argument("--workers", type=int, default=4, help="number of worker processes")
+    parser.add_argument("--queries", type=int, default=100_000, help="id lookups per worker")
+    args = parser.parse_args()
+
+    footprints = make_footprints(args.count)
+    ids = [str(footprint.id) for footprint in random.Random(0).choices(footprints, k=args.queries)]
+    with tempfile.TemporaryDirectory(dir="/dev/shm" if os.path.isdir("/dev/shm") else None) as directory:
+        start = time.perf_counter()
+        publish(directory, footprints)
+        seconds = time.perf_counter() - start
+        print(f"publish {args.count:,} footprints  {seconds:8.3f} s")
+        [name] = [name for name in os.listdir(directory) if name.endswith(".catalog")]
+        size = os.path.getsize(os.path.join(directory, name))
+        print(f"generation file          {size / 2**20:8,.0f} MiB")
+
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            results = list(executor.map(worker, [directory] * args.workers, [ids] * args.workers))
+        for index, (opened, lookups, sums, memory) in enumerate(results):
+            print(
+                f"worker {index}: open {opened * 1000:6.2f} ms, {args.queries / lookups:10,.0f} lookups/s, "
+                f"filtered sum {sums * 1000:6.2f} ms, {memory / 2**20:6,.1f} MiB anonymous memory"
+            )
+
+
+if __name__ == "__main__":
+    main()
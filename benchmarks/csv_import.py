@@ -0,0 +1,84 @@
+"""
+Benchmark of importing footprints from a CSV file with CsvImporter.
+
+Writes a CSV file with one row per footprint and every supported member in its own column, then
+reports the throughput of reading it into FootprintTables, and of decoding a sample of its rows
+into ProductFootprint objects.
+
+Usage:
+    PYTHONPATH=. python benchmarks/csv_import.py --rows 1000000 --sample 10000
+"""
+
+import argparse
+import csv
+import os
+import tempfile
+import time
+import uuid
+
+from pickle_footprints import make_footprints
+
+from pact_methodology.exchange.csv_import import MEMBERS, ColumnMapping, CsvImporter
+from pact_methodology.exchange.json_codec import encode
+
+
+def flatten(data: dict, prefix: str = "") -> dict[str, str]:
+    """Returns the cell text of every supported member of an encoded footprint, by member path."""
+    cells = {}
+    for name, value in data.items():
+        path = f"{prefix}{name}"
+        if isinstance(value, dict):
+            cells.update(flatten(value, f"{path}/"))
+        elif path in MEMBERS and isinstance(value, list):
+            cells[path] = "|".join(value)
+        elif path in MEMBERS and value is not None:
+            cells[path] = str(value).lower() if isinstance(value, bool) else str(value)
+    return cells
+
+
+def write_file(path: str, rows: int) -> list[str]:
+    """Writes rows footprints, repeating a template with new ids, and returns the header."""
+    header = sorted(MEMBERS)
+    template = [flatten(encode(footprint)) for footprint in make_footprints(min(rows, 1000))]
+    template = [[cells.get(column, "") for column in header] for cells in template]
+    id = header.index("id")
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(header)
+        for index in range(rows):
+            row = template[index % len(template)]
+            row[id] = str(uuid.UUID(int=index))
+            writer.writerow(row)
+    return header
+
+
+def report(name: str, rows: int, seconds: float) -> None:
+    print(f"{name:<12} {rows:>10,} rows {seconds:>8.2f} s {rows / seconds:>12,.0f} rows/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="number of rows in the file")
+    parser.add_argument("--sample", type=int, default=10_000, help="number of rows decoded into footprints")
+    parser.add_argument("--chunk-size", type=int, default=50_000, help="rows read at a time")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "footprints.csv")
+        header = write_file(path, args.rows)
+        print(f"{os.path.getsize(path) / 2**20:,.0f} MiB, {len(header)} columns")
+        importer = CsvImporter(ColumnMapping({column: column for column in header}), chunk_size=args.chunk_size)
+
+        start = time.perf_counter()
+        rows = sum(len(table) for table in importer.tables(path))
+        report("tables", rows, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        footprints = importer.footprints(path)
+        rows = sum(1 for _, _ in zip(range(args.sample), footprints))
+        footprints.close()
+        report("footprints", rows, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Benchmark of pickling ProductFootprint objects, as when sending them to process pool workers.
+
+Compares the pickle size and round-trip time per footprint of:
+
+- compact: the __reduce__ of the data model classes, which pickles each object as its class and
+  a tuple of its values in a fixed order per class, without attribute names;
+- dict: the default pickling of every model and value object as its __dict__;
+- json: the PACT JSON codec, for reference.
+
+Usage:
+    PYTHONPATH=. python benchmarks/pickle_footprints.py --count 1000 --repeat 5
+"""
+
+import argparse
+import copyreg
+import io
+import pickle
+import time
+
+from pact_methodology.assurance.assurance import Assurance, Boundary, Coverage, Level
+from pact_methodology.canonical import ContentDigestMixin
+from pact_methodology.carbon_footprint.biogenic_accounting_methodology import BiogenicAccountingMethodology
+from pact_methodology.carbon_footprint.carbon_footprint import CarbonFootprint
+from pact_methodology.carbon_footprint.characterization_factors import CharacterizationFactors
+from pact_methodology.carbon_footprint.cross_sectoral_standard import CrossSectoralStandard
+from pact_methodology.carbon_footprint.cross_sectoral_standard_set import CrossSectoralStandardSet
+from pact_methodology.carbon_footprint.declared_unit import DeclaredUnit
+from pact_methodology.carbon_footprint.emission_factor_ds import EmissionFactorDS
+from pact_methodology.carbon_footprint.emission_factor_ds_set import EmissionFactorDSSet
+from pact_methodology.carbon_footprint.geographical_scope import CarbonFootprintGeographicalScope
+from pact_methodology.carbon_footprint.reference_period import ReferencePeriod
+from pact_methodology.data_quality_indicators.data_quality_indicators import DataQualityIndicators
+from pact_methodology.data_quality_indicators.data_quality_rating import DataQualityRating
+from pact_methodology.datetime import DateTime
+from pact_methodology.exchange.json_codec import dumps, loads
+from pact_methodology.product_footprint.company_id_list import CompanyIdList
+from pact_methodology.product_footprint.cpc import CPC, CPCCodeLookup
+from pact_methodology.product_footprint.product_footprint import ProductFootprint
+from pact_methodology.product_footprint.product_id_list import ProductIdList
+from pact_methodology.product_footprint.status import ProductFootprintStatus, Status
+from pact_methodology.product_footprint.version import Version
+from pact_methodology.urn import URN, CompanyId, ProductId
+
+
+def make_footprints(count: int) -> list[ProductFootprint]:
+    """Builds count footprints with every optional attribute defined."""
+    cpc = CPCCodeLookup().lookup("0111")
+    footprints = []
+    for index in range(count):
+        reference_period = ReferencePeriod(
+            start=DateTime("2023-01-01T00:00:00Z"), end=DateTime("2023-12-31T23:59:59Z")
+        )
+        standards = CrossSectoralStandardSet()
+        standards.add(CrossSectoralStandard.GHG_PROTOCOL)
+        pcf = CarbonFootprint(
+            declared_unit=DeclaredUnit.KILOGRAM,
+            unitary_product_amount=1.0,
+            p_cf_excluding_biogenic=0.5 + index / count,
+            p_cf_including_biogenic=2.0,
+            fossil_ghg_emissions=0.3,
+            fossil_carbon_content=0.2,
+            biogenic_carbon_content=0.1,
+            characterization_factors=CharacterizationFactors.AR6,
+            ipcc_characterization_factors_sources=["AR6"],
+            cross_sectoral_standards_used=standards,
+            boundary_processes_description="Cradle to gate",
+            exempted_emissions_percent=1.0,
+            exempted_emissions_description="None",
+            reference_period=reference_period,
+            packaging_emissions_included=True,
+            packaging_ghg_emissions=0.02,
+            geographical_scope=CarbonFootprintGeographicalScope(geography_country="DE"),
+            primary_data_share=50.0,
+            dqi=DataQualityIndicators(
+                reference_period=reference_period,
+                coverage_percent=80.0,
+                technological_dqr=DataQualityRating(2),
+                temporal_dqr=DataQualityRating(2),
+                geographical_dqr=DataQualityRating(1),
+                completeness_dqr=DataQualityRating(3),
+                reliability_dqr=DataQualityRating(2),
+            ),
+            secondary_emission_factor_sources=EmissionFactorDSSet([EmissionFactorDS("ecoinvent", "3.9.1")]),
+            d_luc_ghg_emissions=0.4,
+            land_management_ghg_emissions=0.2,
+            other_biogenic_ghg_emissions=0.1,
+            biogenic_carbon_withdrawal=-1.0,
+            biogenic_accounting_methodology=BiogenicAccountingMethodology.GHGP,
+            assurance=Assurance(
+                assurance=True,
+                provider_name="Assurance Corp",
+                coverage=Coverage.PRODUCT_LEVEL,
+                level=Level.REASONABLE,
+                boundary=Boundary.CRADLE_TO_GATE,
+                completed_at=DateTime("2024-02-01T00:00:00Z"),
+            ),
+        )
+        footprints.append(
+            ProductFootprint(
+                version=Version(1),
+                created=DateTime("2024-01-01T00:00:00Z"),
+                status_info=ProductFootprintStatus(Status.ACTIVE),
+                company_name="Acme Corp",
+                company_ids=CompanyIdList([CompanyId("urn:pathfinder:company:customcode:buyer-assigned:acme")]),
+                product_description="Widget",
+                product_ids=ProductIdList([ProductId(f"urn:pathfinder:product:customcode:buyer-assigned:w{index}")]),
+                product_category_cpc=cpc,
+                product_name_company="Widget",
+                comment="Benchmark footprint",
+                pcf=pcf,
+            )
+        )
+    return footprints
+
+
+class DictPickler(pickle.Pickler):
+    """Pickles model and value objects as their __dict__, as pickle does without __reduce__."""
+
+    def reducer_override(self, obj):
+        if isinstance(obj, (ContentDigestMixin, DateTime, Version, CPC, URN)):
+            return copyreg.__newobj__, (type(obj),), dict(vars(obj))
+        return NotImplemented
+
+
+def dumps_dict(obj) -> bytes:
+    buffer = io.BytesIO()
+    DictPickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(obj)
+    return buffer.getvalue()
+
+
+def measure(name: str, footprints: list, dump, load, repeat: int) -> None:
+    """Prints the size and the best round-trip time per footprint of one way of serializing."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        payloads = [dump(footprint) for footprint in footprints]
+        for payload in payloads:
+            load(payload)
+        best = min(best, time.perf_counter() - start)
+    size = sum(len(payload) for payload in payloads) / len(footprints)
+    print(f"{name:<8} {size:>10.0f} B {best / len(footprints) * 1e6:>10.1f} us")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=1000, help="number of footprints")
+    parser.add_argument("--repeat", type=int, default=5, help="runs to take the best time of")
+    args = parser.parse_args()
+
+    footprints = make_footprints(args.count)
+    print(f"{'format':<8} {'size':>12} {'round trip':>13}  (per footprint)")
+    measure("compact", footprints, lambda fp: pickle.dumps(fp, pickle.HIGHEST_PROTOCOL), pickle.loads, args.repeat)
+    measure("dict", footprints, dumps_dict, pickle.loads, args.repeat)
+    measure("json", footprints, lambda fp: dumps(fp).encode(), loads, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
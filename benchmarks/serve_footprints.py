@@ -0,0 +1,63 @@
+"""
+Benchmark of the requests per second PactServer answers on one core.
+
+Starts a server over a repository of footprints in this process and sends GetFootprint and
+ListFootprints requests from keep-alive connections in the same event loop, so the figure includes
+the client's share of the work and understates what the server alone sustains.
+
+Usage:
+    PYTHONPATH=. python benchmarks/serve_footprints.py --footprints 1000 --connections 16 --seconds 5
+"""
+
+import argparse
+import asyncio
+import base64
+import random
+
+from pickle_footprints import make_footprints
+
+from pact_methodology.exchange.http import ConnectionPool
+from pact_methodology.exchange.server import PactServer
+from pact_methodology.repository.repository import FootprintRepository
+
+
+async def main(args) -> None:
+    repository = FootprintRepository(make_footprints(args.footprints))
+    ids = [str(footprint.id) for footprint in repository]
+    server = PactServer(repository, {"client": "secret"})
+    listener = await server.start()
+    origin = f"http://127.0.0.1:{listener.sockets[0].getsockname()[1]}"
+    pool = ConnectionPool(origin, max_connections=args.connections)
+    basic = "Basic " + base64.b64encode(b"client:secret").decode()
+    response = await pool.request("POST", "/auth/token", {"Authorization": basic}, b"grant_type=client_credentials")
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    for name, target in (
+        ("GetFootprint", lambda: f"/2/footprints/{random.choice(ids)}"),
+        (f"ListFootprints limit={args.limit}", lambda: f"/2/footprints?limit={args.limit}"),
+    ):
+        count = 0
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + args.seconds
+
+        async def worker():
+            nonlocal count
+            while loop.time() < deadline:
+                response = await pool.request("GET", target(), headers)
+                assert response.status == 200
+                count += 1
+
+        await asyncio.gather(*(worker() for _ in range(args.connections)))
+        print(f"{name:<28} {count / args.seconds:>10,.0f} requests/s")
+
+    await pool.close()
+    listener.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--footprints", type=int, default=1000, help="number of footprints served")
+    parser.add_argument("--connections", type=int, default=16, help="number of keep-alive connections")
+    parser.add_argument("--limit", type=int, default=10, help="page size of the list requests")
+    parser.add_argument("--seconds", type=float, default=5.0, help="duration of each measurement")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,56 @@
+"""
+Benchmark of a warm start from a repository snapshot file, against decoding every footprint from JSON.
+
+Reports the time to write a snapshot file of a repository, to restore the repository from it with
+lazy footprints, and to read every footprint of the restored repository. For comparison, it reports
+the time to build the same repository by decoding the footprints from PACT JSON.
+
+Usage:
+    PYTHONPATH=. python benchmarks/snapshot_file.py --count 100000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from pickle_footprints import make_footprints
+
+from pact_methodology.exchange.json_codec import dumps, loads
+from pact_methodology.repository.repository import FootprintRepository
+from pact_methodology.repository.snapshot_file import dump, load
+
+
+def report(name: str, count: int, seconds: float) -> None:
+    print(f"{name:<24} {seconds:>8.3f} s {count / seconds:>12,.0f} footprints/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=100_000, help="number of footprints")
+    args = parser.parse_args()
+
+    footprints = make_footprints(args.count)
+    documents = [dumps(footprint) for footprint in footprints]
+    start = time.perf_counter()
+    repository = FootprintRepository(loads(document) for document in documents)
+    report("decode JSON", args.count, time.perf_counter() - start)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "footprints.snapshot")
+        start = time.perf_counter()
+        dump(repository, path)
+        report("dump", args.count, time.perf_counter() - start)
+        print(f"{os.path.getsize(path) / 2**20:,.0f} MiB, {os.path.getsize(path) / args.count:,.0f} bytes per footprint")
+
+        start = time.perf_counter()
+        restored = load(path)
+        report("load", args.count, time.perf_counter() - start)
+        start = time.perf_counter()
+        for footprint in restored:
+            footprint.pcf
+        report("read every footprint", args.count, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark of storing and querying footprints with SqliteFootprintStore.
+
+Reports the throughput of bulk upserts into a new database file, and the latency of lookups and
+queries against it. Queries return lazy footprints, so their cost is reported both without and
+with decoding the returned footprints.
+
+Usage:
+    PYTHONPATH=. python benchmarks/sqlite_store.py --count 100000 --batch-size 1000
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from pickle_footprints import make_footprints
+
+from pact_methodology.repository.sqlite_store import SqliteFootprintStore
+
+
+def report(name: str, count: int, seconds: float, unit: str) -> None:
+    print(f"{name:<24} {seconds:>8.3f} s {count / seconds:>12,.0f} {unit}/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=100_000, help="number of footprints")
+    parser.add_argument("--batch-size", type=int, default=1000, help="footprints per transaction")
+    parser.add_argument("--queries", type=int, default=1000, help="number of lookups and queries")
+    args = parser.parse_args()
+
+    footprints = make_footprints(args.count)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "footprints.db")
+        with SqliteFootprintStore(path) as store:
+            start = time.perf_counter()
+            store.add_all(footprints, batch_size=args.batch_size)
+            report("add_all", args.count, time.perf_counter() - start, "footprints")
+            start = time.perf_counter()
+            store.add_all(footprints[: args.count // 10], batch_size=args.batch_size)
+            report("add_all (replacing)", args.count // 10, time.perf_counter() - start, "footprints")
+            print(f"{os.path.getsize(path) / 2**20:,.0f} MiB, {os.path.getsize(path) / args.count:,.0f} bytes per footprint")
+
+            sample = random.Random(0).sample(footprints, min(args.queries, args.count))
+            start = time.perf_counter()
+            for footprint in sample:
+                store[footprint.id]
+            report("get", len(sample), time.perf_counter() - start, "queries")
+            start = time.perf_counter()
+            for footprint in sample:
+                store.find(product_id=str(footprint.product_ids[0]))
+            report("find by product id", len(sample), time.perf_counter() - start, "queries")
+            start = time.perf_counter()
+            for footprint in sample:
+                store.find(created_from=footprint.created, limit=100)
+            report("find 100 by created", len(sample), time.perf_counter() - start, "queries")
+
+            start = time.perf_counter()
+            page = store.find(limit=10_000)
+            report("find 10,000", len(page), time.perf_counter() - start, "footprints")
+            start = time.perf_counter()
+            for footprint in page:
+                footprint.pcf
+            report("decode 10,000", len(page), time.perf_counter() - start, "footprints")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark of logging footprint changes with FootprintLog, and of replaying the log.
+
+Reports the throughput of concurrent writers calling add, whose records share syncs through group
+commit, against a single writer whose every record needs its own sync. Then reports how long
+reopening takes, replaying the whole log and then starting from a snapshot.
+
+Usage:
+    PYTHONPATH=. python benchmarks/wal.py --count 20000 --threads 16
+"""
+
+import argparse
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pickle_footprints import make_footprints
+
+from pact_methodology.frozen import freeze
+from pact_methodology.repository.wal import FootprintLog
+
+
+def report(name: str, count: int, seconds: float, unit: str) -> None:
+    print(f"{name:<28} {seconds:>8.3f} s {count / seconds:>12,.0f} {unit}/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=20_000, help="number of footprints")
+    parser.add_argument("--threads", type=int, default=16, help="number of concurrent writers")
+    parser.add_argument("--commit-delay", type=float, default=0.0, help="seconds a writer waits for others")
+    args = parser.parse_args()
+
+    footprints = [freeze(footprint) for footprint in make_footprints(args.count)]
+    sample = footprints[: max(args.count // 10, 1)]
+    with tempfile.TemporaryDirectory() as directory:
+        with FootprintLog(directory, snapshot_interval=args.count * 10) as log:
+            start = time.perf_counter()
+            for footprint in sample:
+                log.add(footprint)
+            report("add, 1 writer", len(sample), time.perf_counter() - start, "records")
+            print(f"{log.syncs:,} syncs")
+
+        with FootprintLog(directory, snapshot_interval=args.count * 10, commit_delay=args.commit_delay) as log:
+            start = time.perf_counter()
+            with ThreadPoolExecutor(args.threads) as executor:
+                list(executor.map(log.add, footprints))
+            report(f"add, {args.threads} writers", args.count, time.perf_counter() - start, "records")
+            print(f"{log.syncs:,} syncs")
+            start = time.perf_counter()
+            log.add_all(footprints)
+            report("add_all", args.count, time.perf_counter() - start, "records")
+
+        start = time.perf_counter()
+        with FootprintLog(directory) as log:
+            report("replay log", log.replayed, time.perf_counter() - start, "records")
+            log.snapshot()
+        start = time.perf_counter()
+        with FootprintLog(directory) as log:
+            report("load snapshot", len(log.repository), time.perf_counter() - start, "footprints")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Helpers shared by the modules that read and write footprints in bulk.
+"""
+
+import gc
+import os
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+
+@contextmanager
+def collection_paused() -> Iterator[None]:
+    """
+    Pauses the cyclic garbage collector while many objects are created at once.
+
+    The collector would otherwise scan the new objects again and again as their number grows. It is
+    enabled again afterwards only if it was enabled before.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def sync_directory(directory: str | os.PathLike) -> None:
+    """
+    Syncs a directory, so that files created or renamed in it survive a crash.
+
+    Args:
+        directory (str | os.PathLike): The path of the directory.
+    """
+    if os.name == "nt":
+        # Windows cannot open directories, and makes renames durable without this.
+        return
+    descriptor = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
@@ -0,0 +1,317 @@
+"""
+Cradle-to-gate roll-up of product footprints over a bill of materials.
+
+A bill of materials (BOM) is a directed acyclic graph. Each assembly is a ProductId with a list of
+components, and each component is a ProductId with the quantity of its declared units that goes
+into one declared unit of the assembly. A component is either another assembly or a product with a
+known ProductFootprint. The footprint of an assembly is the sum of the footprints of its
+components, each scaled by its quantity, and this is computed separately for every emission
+component in `ROLLUP_COLUMNS`.
+
+The primary data share of an assembly is the share of its p_cf_excluding_biogenic that comes from
+primary data, so each component contributes its own primary data share weighted by its emissions.
+Components that do not report a primary data share contribute no primary data.
+"""
+
+from collections.abc import Iterable
+
+import numpy as np
+
+from pact_methodology.carbon_footprint.carbon_footprint import CarbonFootprint
+from pact_methodology.exceptions import BomCycleError
+from pact_methodology.product_footprint.product_footprint import ProductFootprint
+from pact_methodology.urn import ProductId
+
+ROLLUP_COLUMNS = (
+    "p_cf_excluding_biogenic",
+    "p_cf_including_biogenic",
+    "fossil_ghg_emissions",
+    "fossil_carbon_content",
+    "biogenic_carbon_content",
+    "d_luc_ghg_emissions",
+    "land_management_ghg_emissions",
+    "other_biogenic_ghg_emissions",
+    "iluc_ghg_emissions",
+    "biogenic_carbon_withdrawal",
+    "aircraft_ghg_emissions",
+    "packaging_ghg_emissions",
+)
+"""The CarbonFootprint attributes summed over the components of an assembly."""
+
+_PRIMARY = len(ROLLUP_COLUMNS)
+"""The index of the primary data emissions, stored after the ROLLUP_COLUMNS in every vector."""
+
+
+def _footprint_vector(pcf: CarbonFootprint) -> np.ndarray:
+    """Returns the per declared unit values of a carbon footprint, NaN where a value is undefined."""
+    vector = np.empty(_PRIMARY + 1)
+    for index, name in enumerate(ROLLUP_COLUMNS):
+        value = getattr(pcf, name)
+        vector[index] = np.nan if value is None else value
+    share = pcf.primary_data_share or 0.0
+    vector[_PRIMARY] = pcf.p_cf_excluding_biogenic * share / 100
+    return vector
+
+
+class BomEngine:
+    """
+    Computes cradle-to-gate footprints of assemblies from the footprints of their components.
+
+    Rolled-up values are memoized per product, so sub-assemblies shared by several assemblies are
+    computed once. Replacing a component's footprint or an assembly's components only invalidates
+    the assemblies that contain it, and they are recomputed the next time they are requested.
+    Assemblies are evaluated in topological order with an explicit stack, so the depth of the BOM
+    is not limited by the recursion limit.
+
+    A product with a footprint is always treated as a purchased component, even if it also has a
+    bill of materials, because the supplier's footprint already covers its own sub-components.
+
+    Examples:
+        >>> engine = BomEngine()
+        >>> engine.set_footprint(steel_footprint)
+        >>> engine.set_footprint(paint_footprint)
+        >>> engine.set_components(frame_id, [(steel_id, 2.5), (paint_id, 0.1)])
+        >>> engine.rollup(frame_id)["p_cf_excluding_biogenic"]
+        4.85
+        >>> pcf = engine.carbon_footprint(frame_id, **frame_attributes)
+    """
+
+    def __init__(self):
+        """Initializes an empty BomEngine."""
+        self._components: dict[ProductId, tuple[tuple[ProductId, float], ...]] = {}
+        self._footprints: dict[ProductId, ProductFootprint] = {}
+        self._parents: dict[ProductId, set[ProductId]] = {}
+        self._cache: dict[ProductId, np.ndarray] = {}
+
+    def set_components(self, product_id: ProductId, components: Iterable[tuple[ProductId, float]]) -> None:
+        """
+        Sets the bill of materials of an assembly, replacing any previous one.
+
+        Args:
+            product_id (ProductId): The assembly.
+            components (Iterable[tuple[ProductId, float]]): Each component with the quantity of its
+                declared units used per declared unit of the assembly. Repeated components are added up.
+
+        Raises:
+            ValueError: If an id is not a ProductId, a quantity is not a non-negative number, or the
+                assembly lists itself as a component.
+        """
+        self._check_product_id(product_id)
+        quantities: dict[ProductId, float] = {}
+        for component_id, quantity in components:
+            self._check_product_id(component_id)
+            if component_id == product_id:
+                raise BomCycleError(f"{product_id} cannot be a component of itself")
+            if not isinstance(quantity, (int, float)) or isinstance(quantity, bool) or quantity < 0:
+                raise ValueError("quantity must be a non-negative number")
+            quantities[component_id] = quantities.get(component_id, 0.0) + quantity
+
+        for component_id, _ in self._components.get(product_id, ()):
+            self._parents[component_id].discard(product_id)
+        for component_id in quantities:
+            self._parents.setdefault(component_id, set()).add(product_id)
+        self._components[product_id] = tuple(quantities.items())
+        self._invalidate(product_id)
+
+    def set_footprint(self, footprint: ProductFootprint) -> None:
+        """
+        Sets the footprint of every product it covers, for example when a new version is received.
+
+        Args:
+            footprint (ProductFootprint): The footprint. It applies to all of its product_ids.
+
+        Raises:
+            ValueError: If footprint is not an instance of ProductFootprint.
+        """
+        if not isinstance(footprint, ProductFootprint):
+            raise ValueError("footprint must be an instance of ProductFootprint")
+        for product_id in footprint.product_ids:
+            self._footprints[product_id] = footprint
+            self._invalidate(product_id)
+
+    def remove_footprint(self, product_id: ProductId) -> None:
+        """
+        Removes the footprint of a product.
+
+        Args:
+            product_id (ProductId): The product.
+
+        Raises:
+            KeyError: If the product has no footprint.
+        """
+        del self._footprints[product_id]
+        self._invalidate(product_id)
+
+    def components(self, product_id: ProductId) -> list[tuple[ProductId, float]]:
+        """
+        Returns the bill of materials of an assembly.
+
+        Args:
+            product_id (ProductId): The assembly.
+
+        Returns:
+            list[tuple[ProductId, float]]: The components and their quantities, empty if the product
+                has no bill of materials.
+        """
+        return list(self._components.get(product_id, ()))
+
+    def rollup(self, product_id: ProductId) -> dict[str, float | None]:
+        """
+        Returns the rolled-up values of a product per declared unit.
+
+        Args:
+            product_id (ProductId): The product.
+
+        Returns:
+            dict[str, float | None]: A value for every name in ROLLUP_COLUMNS, and the primary data
+                share under "primary_data_share". A value is None when a component leaves it undefined.
+
+        Raises:
+            ValueError: If a product in the BOM has neither a footprint nor components.
+            BomCycleError: If the BOM contains a cycle.
+        """
+        vector = self._vector(product_id)
+        values = {name: None if np.isnan(value) else float(value) for name, value in zip(ROLLUP_COLUMNS, vector)}
+        total = vector[0]
+        values["primary_data_share"] = float(100 * vector[_PRIMARY] / total) if total > 0 else None
+        return values
+
+    def carbon_footprint(self, product_id: ProductId, **attributes) -> CarbonFootprint:
+        """
+        Builds the CarbonFootprint of an assembly from its rolled-up values.
+
+        The values in ROLLUP_COLUMNS, the primary data share, and a unitary product amount of 1.0 are
+        computed. Every other CarbonFootprint argument, such as declared_unit and reference_period,
+        must be given. The packaging emissions are left undefined if packaging_emissions_included is false.
+
+        Args:
+            product_id (ProductId): The assembly.
+            **attributes: The remaining CarbonFootprint arguments.
+
+        Returns:
+            CarbonFootprint: The footprint of one declared unit of the assembly.
+
+        Raises:
+            ValueError: If an argument overrides a computed value, or the footprint is invalid.
+            BomCycleError: If the BOM contains a cycle.
+        """
+        values = self.rollup(product_id)
+        overridden = sorted(set(values) & set(attributes))
+        if overridden:
+            raise ValueError(f"Computed attributes cannot be given: {', '.join(overridden)}")
+        if not attributes.get("packaging_emissions_included"):
+            values["packaging_ghg_emissions"] = None
+        attributes.setdefault("unitary_product_amount", 1.0)
+        return CarbonFootprint(**values, **attributes)
+
+    def __contains__(self, product_id: ProductId) -> bool:
+        """
+        Checks whether a product has a footprint or components.
+
+        Args:
+            product_id (ProductId): The product.
+
+        Returns:
+            bool: True if the product has a footprint or components.
+        """
+        return product_id in self._footprints or product_id in self._components
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the BomEngine.
+
+        Returns:
+            str: A string representation of the BomEngine.
+        """
+        return f"BomEngine(assemblies={len(self._components)}, footprints={len(self._footprints)})"
+
+    def leaf_quantities(self, product_id: ProductId) -> dict[ProductId, float]:
+        """
+        Returns the declared units of each purchased component in one declared unit of a product.
+
+        The roll-up is linear, so every rolled-up value of the product equals the sum of these
+        quantities multiplied by the values of the components' footprints.
+
+        Args:
+            product_id (ProductId): The product.
+
+        Returns:
+            dict[ProductId, float]: The quantity of every product with a footprint in the BOM.
+
+        Raises:
+            ValueError: If a product in the BOM has neither a footprint nor components.
+            BomCycleError: If the BOM contains a cycle.
+        """
+        amounts = {product_id: 1.0}
+        leaves = {}
+        for node in reversed(list(self._post_order(product_id, ()))):
+            amount = amounts.pop(node)
+            if node in self._footprints:
+                leaves[node] = amount
+                continue
+            for component_id, quantity in self._components[node]:
+                amounts[component_id] = amounts.get(component_id, 0.0) + amount * quantity
+        return leaves
+
+    def _vector(self, product_id: ProductId) -> np.ndarray:
+        """Returns the memoized vector of a product, computing missing ones in topological order."""
+        for node in self._post_order(product_id, self._cache):
+            footprint = self._footprints.get(node)
+            if footprint is not None:
+                self._cache[node] = _footprint_vector(footprint.pcf)
+                continue
+            components = self._components[node]
+            if components:
+                quantities = np.fromiter((quantity for _, quantity in components), dtype=np.float64)
+                vectors = np.stack([self._cache[component_id] for component_id, _ in components])
+                self._cache[node] = quantities @ vectors
+            else:
+                self._cache[node] = np.zeros(_PRIMARY + 1)
+        return self._cache[product_id]
+
+    def _post_order(self, product_id: ProductId, done):
+        """
+        Yields the products of a BOM after all of their components, skipping the products in done.
+
+        The traversal uses an explicit stack, and products with a footprint are not expanded.
+        """
+        visited: set[ProductId] = set()
+        on_path: set[ProductId] = set()
+        stack = [(product_id, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if expanded:
+                on_path.discard(node)
+                visited.add(node)
+                yield node
+                continue
+            if node in visited or node in done:
+                continue
+            if node in self._footprints:
+                visited.add(node)
+                yield node
+                continue
+            if node not in self._components:
+                raise ValueError(f"{node} has neither a footprint nor components")
+            if node in on_path:
+                raise BomCycleError(f"{node} is a component of itself")
+            on_path.add(node)
+            stack.append((node, True))
+            stack.extend((component_id, False) for component_id, _ in self._components[node])
+
+    def _invalidate(self, product_id: ProductId) -> None:
+        """Drops the memoized vectors of a product and every assembly that contains it."""
+        # A product is only memoized after all of its components are, so the walk can stop at
+        # products that are not memoized.
+        self._cache.pop(product_id, None)
+        stack = list(self._parents.get(product_id, ()))
+        while stack:
+            node = stack.pop()
+            if self._cache.pop(node, None) is not None:
+                stack.extend(self._parents.get(node, ()))
+
+    @staticmethod
+    def _check_product_id(product_id) -> None:
+        """Raises ValueError if product_id is not a ProductId."""
+        if not isinstance(product_id, ProductId):
+            raise ValueError("product ids must be instances of ProductId")
@@ -0,0 +1,291 @@
+"""
+Parallel construction of a FootprintTable from raw PACT JSON records.
+
+Decoding and validating footprints is CPU-bound, so `build_table` splits the records into chunks
+and decodes them in a process pool. Each worker writes the columns of its chunk straight into one
+shared memory segment, at the rows the chunk occupies in the final table, and sends back only the
+row count, the category labels it found and the errors of invalid records. No footprint object or
+column array is pickled back to the parent, which builds the table as views of the segment.
+
+Examples:
+    >>> with build_table(json.loads(body)["data"], max_workers=8) as table:
+    ...     table.column("p_cf_excluding_biogenic").sum()
+    1234.5
+"""
+
+import math
+import os
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import suppress
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from pact_methodology.aggregation.footprint_table import (
+    CATEGORICAL_COLUMNS,
+    DQR_COLUMNS,
+    NUMERIC_COLUMNS,
+    FootprintTable,
+)
+from pact_methodology.exceptions import BulkBuildError
+from pact_methodology.exchange.json_codec import decode_product_footprint
+from pact_methodology.product_footprint.product_footprint import ProductFootprint
+
+MAX_CHUNK_SIZE = 10_000
+"""The largest number of records sent to a worker at once."""
+
+
+class SharedFootprintTable(FootprintTable):
+    """
+    A FootprintTable whose columns are views of a shared memory segment.
+
+    The segment is released by `close`, at the end of a with block, or when the table is garbage
+    collected. Columns must not be used after the table is closed; copy the ones that must outlive it.
+    Tables returned by `select` are copies and do not depend on the segment.
+    """
+
+    def __init__(self, *, segment: SharedMemory, **columns):
+        """
+        Initializes a SharedFootprintTable.
+
+        Args:
+            segment (SharedMemory): The segment the column arrays are views of.
+            **columns: The FootprintTable columns.
+        """
+        super().__init__(**columns)
+        self._segment = segment
+
+    def close(self) -> None:
+        """
+        Releases the shared memory segment.
+
+        Raises:
+            BufferError: If views of the columns are still referenced outside the table. The table
+                is closed nonetheless, and the segment is released by calling close again once the
+                views are gone.
+        """
+        segment = getattr(self, "_segment", None)
+        if segment is None:
+            return
+        self.ids = self.created = self.version = self.dqr = None
+        self.numeric = self.codes = None
+        segment.close()
+        self._segment = None
+
+    def __enter__(self) -> "SharedFootprintTable":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __del__(self):
+        with suppress(BufferError):
+            self.close()
+
+
+def build_table(
+    records: Iterable[dict],
+    *,
+    decode: Callable[[dict], ProductFootprint] = decode_product_footprint,
+    executor: Executor | None = None,
+    max_workers: int | None = None,
+    chunk_size: int | None = None,
+    on_error: Callable[[int, str], None] | None = None,
+) -> FootprintTable:
+    """
+    Decodes and validates footprint records in parallel and returns them as a FootprintTable.
+
+    Args:
+        records (Iterable[dict]): The PACT JSON objects of the footprints.
+        decode (Callable[[dict], ProductFootprint]): The function building a footprint from a record.
+            It must be picklable, for example a module-level function.
+        executor (Executor | None): The process pool to use. By default a ProcessPoolExecutor is
+            started for the call and shut down afterwards. Workers started before the multiprocessing
+            resource tracker of this process report the segment as leaked when they exit, so call
+            multiprocessing.resource_tracker.ensure_running() before starting a long-lived pool.
+        max_workers (int | None): The number of processes of the default pool. Defaults to the
+            number of CPUs.
+        chunk_size (int | None): The number of records per task. By default the records are split
+            into about four tasks per worker, with at most MAX_CHUNK_SIZE records each.
+        on_error (Callable[[int, str], None] | None): Called with the index and error message of
+            every invalid record, which is then left out of the table. By default invalid records
+            raise BulkBuildError.
+
+    Returns:
+        FootprintTable: The table, with one row per valid record in input order. Unless it is
+            empty, it is a SharedFootprintTable.
+
+    Raises:
+        BulkBuildError: If a record is invalid and on_error is not given.
+        ValueError: If chunk_size or max_workers is not positive.
+    """
+    if not isinstance(records, Sequence):
+        records = list(records)
+    if chunk_size is not None and chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    if max_workers is not None and max_workers < 1:
+        raise ValueError("max_workers must be positive")
+    rows = len(records)
+    if rows == 0:
+        return FootprintTable.from_footprints([])
+
+    workers = max_workers or os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, min(MAX_CHUNK_SIZE, math.ceil(rows / (workers * 4))))
+
+    # Workers started from here on share the tracker, which forgets the segment when it is unlinked.
+    resource_tracker.ensure_running()
+    segment = SharedMemory(create=True, size=_layout(rows)[1])
+    try:
+        pool = executor or ProcessPoolExecutor(max_workers=max_workers)
+        try:
+            futures = [
+                pool.submit(_build_chunk, decode, records[start : start + chunk_size], segment.name, rows, start)
+                for start in range(0, rows, chunk_size)
+            ]
+            results = [future.result() for future in futures]
+        finally:
+            if executor is None:
+                pool.shutdown(cancel_futures=True)
+    finally:
+        # Every worker has closed its mapping, so the name is not needed any longer. The memory
+        # itself stays allocated while this process maps it.
+        segment.unlink()
+
+    try:
+        errors = [error for _, _, chunk_errors, _ in results for error in chunk_errors]
+        if errors and on_error is None:
+            index, message = errors[0]
+            more = f" ({len(errors) - 1} more invalid records)" if len(errors) > 1 else ""
+            raise BulkBuildError(f"Record {index} is invalid: {message}{more}")
+        for index, message in errors:
+            on_error(index, message)
+    except BaseException:
+        segment.close()
+        raise
+    columns, categories = _assemble(segment.buf, rows, results)
+    return SharedFootprintTable(segment=segment, categories=categories, **columns)
+
+
+def _build_chunk(
+    decode: Callable[[dict], ProductFootprint], records: Sequence[dict], segment_name: str, rows: int, start: int
+) -> tuple[int, int, list[tuple[int, str]], dict[str, list[str]]]:
+    """
+    Decodes one chunk of records in a worker and writes its columns to the shared segment.
+
+    The valid footprints are written to consecutive rows from start on.
+
+    Returns:
+        tuple: The start row, the number of valid footprints, the index and message of every invalid
+            record, and the category labels the chunk's codes index into.
+    """
+    footprints = []
+    errors = []
+    for offset, record in enumerate(records):
+        try:
+            footprints.append(decode(record))
+        except (ValueError, TypeError) as error:
+            errors.append((start + offset, str(error)))
+
+    table = FootprintTable.from_footprints(footprints)
+    count = len(table)
+    segment = SharedMemory(name=segment_name)
+    columns = _columns(segment.buf, rows)
+    try:
+        stop = start + count
+        columns["ids"][start:stop] = table.ids
+        columns["created"][start:stop] = table.created
+        columns["version"][start:stop] = table.version
+        columns["dqr"][start:stop] = table.dqr
+        for name in NUMERIC_COLUMNS:
+            columns["numeric"][name][start:stop] = table.numeric[name]
+        for name in CATEGORICAL_COLUMNS:
+            columns["codes"][name][start:stop] = table.codes[name]
+    finally:
+        # The segment can only be closed once no array refers to it.
+        columns = None
+        segment.close()
+    return start, count, errors, table.categories
+
+
+def _assemble(buffer: memoryview, rows: int, results: list) -> tuple[dict, dict[str, list[str]]]:
+    """
+    Merges the chunks written by the workers into the columns of one table, in place.
+
+    The category codes of every chunk are translated to one shared list of labels per column. If
+    invalid records were left out, the valid rows are moved up so that the table has no gaps.
+
+    Returns:
+        tuple: The FootprintTable column arrays without categories, and the categories.
+    """
+    columns = _columns(buffer, rows)
+    arrays = [columns["ids"], columns["created"], columns["version"], columns["dqr"]]
+    arrays += list(columns["numeric"].values())
+    lookups = {name: {} for name in CATEGORICAL_COLUMNS}
+    valid = 0
+    for start, count, _, categories in results:
+        for name in CATEGORICAL_COLUMNS:
+            lookup = lookups[name]
+            mapping = np.array([lookup.setdefault(label, len(lookup)) for label in categories[name]], dtype=np.int32)
+            codes = columns["codes"][name]
+            if count and not np.array_equal(mapping, np.arange(len(mapping))):
+                codes[start : start + count] = mapping[codes[start : start + count]]
+            if valid != start:
+                codes[valid : valid + count] = codes[start : start + count]
+        if valid != start:
+            for array in arrays:
+                array[valid : valid + count] = array[start : start + count]
+        valid += count
+
+    rows_used = slice(0, valid)
+    return (
+        {
+            "ids": columns["ids"][rows_used],
+            "created": columns["created"][rows_used],
+            "version": columns["version"][rows_used],
+            "numeric": {name: array[rows_used] for name, array in columns["numeric"].items()},
+            "dqr": columns["dqr"][rows_used],
+            "codes": {name: array[rows_used] for name, array in columns["codes"].items()},
+        },
+        {name: list(lookup) for name, lookup in lookups.items()},
+    )
+
+
+def _layout(rows: int) -> tuple[list[tuple[str, str | None, np.dtype, tuple[int, ...], int]], int]:
+    """
+    Returns where the columns of a table with the given number of rows lie in a segment.
+
+    Returns:
+        tuple: A (group, name, dtype, shape, offset) entry per column, where group is "numeric" or
+            "codes" for the columns in those dicts, and the size of the segment in bytes.
+    """
+    columns = [
+        ("ids", None, np.dtype("S16"), (rows,)),
+        ("created", None, np.dtype("datetime64[us]"), (rows,)),
+        ("version", None, np.dtype(np.int32), (rows,)),
+        ("dqr", None, np.dtype(np.int8), (rows, len(DQR_COLUMNS))),
+    ]
+    columns += [("numeric", name, np.dtype(np.float64), (rows,)) for name in NUMERIC_COLUMNS]
+    columns += [("codes", name, np.dtype(np.int32), (rows,)) for name in CATEGORICAL_COLUMNS]
+
+    layout = []
+    offset = 0
+    for group, name, dtype, shape in columns:
+        layout.append((group, name, dtype, shape, offset))
+        # Each column starts on an 8 byte boundary so that every array is aligned.
+        offset += -(-dtype.itemsize * math.prod(shape) // 8) * 8
+    return layout, offset
+
+
+def _columns(buffer: memoryview, rows: int) -> dict:
+    """Returns the column arrays of a table with the given number of rows as views of a buffer."""
+    columns = {"numeric": {}, "codes": {}}
+    for group, name, dtype, shape, offset in _layout(rows)[0]:
+        array = np.frombuffer(buffer, dtype=dtype, count=math.prod(shape), offset=offset).reshape(shape)
+        if name is None:
+            columns[group] = array
+        else:
+            columns[group][name] = array
+    return columns
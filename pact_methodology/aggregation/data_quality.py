@@ -0,0 +1,180 @@
+"""
+Vectorized roll-up of data quality indicators across many footprints.
+
+The five data quality ratings of each footprint are stored as one row of an int8 matrix, in the
+order of `DQR_COLUMNS`, with 0 marking an undefined rating. Summaries weight each footprint by its
+contribution to the total emissions, so a supplier that accounts for most of the emissions also
+accounts for most of the reported data quality.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from pact_methodology.aggregation.footprint_table import DQR_COLUMNS, FootprintTable, dqr_row
+from pact_methodology.data_quality_indicators.data_quality_indicators import DataQualityIndicators
+
+RATINGS = (1, 2, 3)
+"""The valid data quality ratings. Histogram bin 0 counts undefined ratings."""
+
+
+@dataclass(frozen=True)
+class DataQualitySummary:
+    """
+    The data quality of a set of footprints, weighted by their emissions.
+
+    Attributes:
+        weighted_dqr (dict[str, float]): The emission-weighted average of each rating, over the
+            footprints that define it. NaN if no footprint defines it.
+        histograms (dict[str, numpy.ndarray]): For each rating, the number of footprints per rating
+            value. Index 0 counts undefined ratings, indices 1 to 3 count the rating values.
+        weighted_histograms (dict[str, numpy.ndarray]): The same bins as histograms, summing the
+            emission weights instead of counting footprints.
+        primary_data_share (float): The emission-weighted primary data share in percent, over the
+            footprints that define it. NaN if no footprint defines it.
+        coverage_percent (float): The emission-weighted coverage percent, over the footprints that
+            define it. NaN if no footprint defines it.
+        total_weight (float): The sum of the emission weights.
+    """
+
+    weighted_dqr: dict[str, float]
+    histograms: dict[str, np.ndarray]
+    weighted_histograms: dict[str, np.ndarray]
+    primary_data_share: float
+    coverage_percent: float
+    total_weight: float
+
+
+def dqr_matrix(dqis) -> np.ndarray:
+    """
+    Packs data quality indicators into an int8 rating matrix.
+
+    Args:
+        dqis (Iterable[DataQualityIndicators | None]): The indicators of each footprint.
+
+    Returns:
+        numpy.ndarray: An int8 matrix with one row per footprint and one column per name in DQR_COLUMNS,
+            0 where a rating is undefined.
+
+    Raises:
+        ValueError: If an item is neither a DataQualityIndicators instance nor None.
+    """
+    rows = []
+    for dqi in dqis:
+        if dqi is not None and not isinstance(dqi, DataQualityIndicators):
+            raise ValueError("dqis must contain DataQualityIndicators or None")
+        rows.append(dqr_row(dqi))
+    return np.array(rows, dtype=np.int8).reshape(-1, len(DQR_COLUMNS))
+
+
+def summarize_data_quality(
+    dqr: np.ndarray,
+    weights: np.ndarray,
+    *,
+    primary_data_share: np.ndarray | None = None,
+    coverage_percent: np.ndarray | None = None,
+) -> DataQualitySummary:
+    """
+    Rolls up data quality ratings weighted by emissions.
+
+    Args:
+        dqr (numpy.ndarray): An int8 matrix with one row per footprint and one column per name in
+            DQR_COLUMNS, 0 where a rating is undefined.
+        weights (numpy.ndarray): The non-negative emission contribution of each footprint.
+        primary_data_share (numpy.ndarray | None): The primary data share of each footprint, NaN where undefined.
+        coverage_percent (numpy.ndarray | None): The coverage percent of each footprint, NaN where undefined.
+
+    Returns:
+        DataQualitySummary: The weighted averages and histograms.
+
+    Raises:
+        ValueError: If the arrays do not have one row per footprint, if a rating is outside 0 to 3, or
+            if a weight is negative.
+
+    Examples:
+        >>> dqr = np.array([[1, 2, 3, 2, 1], [3, 3, 3, 0, 3]], dtype=np.int8)
+        >>> summary = summarize_data_quality(dqr, np.array([3.0, 1.0]))
+        >>> summary.weighted_dqr["technological_dqr"]
+        1.5
+        >>> summary.histograms["completeness_dqr"]
+        array([1, 0, 1, 0])
+    """
+    dqr = np.asarray(dqr)
+    weights = np.asarray(weights, dtype=np.float64)
+    if dqr.ndim != 2 or dqr.shape[1] != len(DQR_COLUMNS):
+        raise ValueError(f"dqr must have {len(DQR_COLUMNS)} columns")
+    if weights.shape != (dqr.shape[0],):
+        raise ValueError("weights must have one value per row of dqr")
+    if dqr.size and (dqr.min() < 0 or dqr.max() > RATINGS[-1]):
+        raise ValueError("dqr ratings must be between 0 and 3")
+    if np.any(weights < 0):
+        raise ValueError("weights must not be negative")
+
+    defined = dqr > 0
+    weighted_sums = weights @ dqr.astype(np.float64)
+    defined_weights = weights @ defined
+    bins = len(RATINGS) + 1
+    # Offset each column into its own block of bins so that one bincount covers the whole matrix.
+    binned = (dqr.astype(np.intp) + bins * np.arange(len(DQR_COLUMNS))).ravel()
+    counts = np.bincount(binned, minlength=bins * len(DQR_COLUMNS)).reshape(len(DQR_COLUMNS), bins)
+    weighted_counts = np.bincount(
+        binned, weights=np.repeat(weights, len(DQR_COLUMNS)), minlength=bins * len(DQR_COLUMNS)
+    ).reshape(len(DQR_COLUMNS), bins)
+
+    return DataQualitySummary(
+        weighted_dqr={
+            name: _ratio(weighted_sums[index], defined_weights[index]) for index, name in enumerate(DQR_COLUMNS)
+        },
+        histograms={name: counts[index] for index, name in enumerate(DQR_COLUMNS)},
+        weighted_histograms={name: weighted_counts[index] for index, name in enumerate(DQR_COLUMNS)},
+        primary_data_share=_weighted_mean(primary_data_share, weights),
+        coverage_percent=_weighted_mean(coverage_percent, weights),
+        total_weight=float(weights.sum()),
+    )
+
+
+def summarize_table(table: FootprintTable, *, quantities: np.ndarray | None = None) -> DataQualitySummary:
+    """
+    Rolls up the data quality of a FootprintTable, weighting each footprint by its emissions.
+
+    The weight of a footprint is its p_cf_excluding_biogenic multiplied by the declared units
+    purchased, i.e. the quantity times its unitary_product_amount.
+
+    Args:
+        table (FootprintTable): The footprints to summarize.
+        quantities (numpy.ndarray | None): The quantity of each product purchased. Defaults to one of each.
+
+    Returns:
+        DataQualitySummary: The weighted averages and histograms.
+
+    Raises:
+        ValueError: If quantities does not have one value per row, or a weight is negative.
+    """
+    weights = table.column("unitary_product_amount") * table.column("p_cf_excluding_biogenic")
+    if quantities is not None:
+        quantities = np.asarray(quantities, dtype=np.float64)
+        if quantities.shape != (len(table),):
+            raise ValueError("quantities must have one value per row")
+        weights = weights * quantities
+    return summarize_data_quality(
+        table.dqr,
+        weights,
+        primary_data_share=table.column("primary_data_share"),
+        coverage_percent=table.column("coverage_percent"),
+    )
+
+
+def _weighted_mean(values: np.ndarray | None, weights: np.ndarray) -> float:
+    """Returns the weighted mean of the defined values, or NaN if there are none."""
+    if values is None:
+        return float("nan")
+    values = np.asarray(values, dtype=np.float64)
+    if values.shape != weights.shape:
+        raise ValueError("values must have one value per row of dqr")
+    defined = ~np.isnan(values)
+    return _ratio(weights @ np.where(defined, values, 0.0), weights @ defined)
+
+
+def _ratio(numerator: float, denominator: float) -> float:
+    """Divides, returning NaN when the denominator is zero."""
+    return float(numerator / denominator) if denominator else float("nan")
@@ -0,0 +1,281 @@
+"""
+A columnar view of ProductFootprint collections.
+
+Analytical work over large portfolios (sums, means, filters) is expensive when it walks
+ProductFootprint objects one attribute at a time. This module provides the `FootprintTable`
+class, which stores the numeric PCF values as NumPy arrays and the grouping keys as integer
+codes into a list of category labels, so that aggregations run as vectorized array operations.
+"""
+
+from collections.abc import Iterable
+
+import numpy as np
+
+from pact_methodology.carbon_footprint.carbon_footprint import CarbonFootprint
+from pact_methodology.data_quality_indicators.data_quality_indicators import DataQualityIndicators
+from pact_methodology.product_footprint.product_footprint import ProductFootprint
+
+NUMERIC_COLUMNS = (
+    "unitary_product_amount",
+    "p_cf_excluding_biogenic",
+    "p_cf_including_biogenic",
+    "fossil_ghg_emissions",
+    "fossil_carbon_content",
+    "biogenic_carbon_content",
+    "d_luc_ghg_emissions",
+    "land_management_ghg_emissions",
+    "other_biogenic_ghg_emissions",
+    "iluc_ghg_emissions",
+    "biogenic_carbon_withdrawal",
+    "aircraft_ghg_emissions",
+    "packaging_ghg_emissions",
+    "exempted_emissions_percent",
+    "primary_data_share",
+    "coverage_percent",
+)
+"""The CarbonFootprint and DataQualityIndicators attributes stored as float64 columns. Undefined values are stored as NaN."""
+
+DQR_COLUMNS = (
+    "technological_dqr",
+    "temporal_dqr",
+    "geographical_dqr",
+    "completeness_dqr",
+    "reliability_dqr",
+)
+"""The DataQualityIndicators ratings stored, in this order, as the columns of the int8 DQR matrix."""
+
+CATEGORICAL_COLUMNS = (
+    "product_category_cpc",
+    "declared_unit",
+    "geography",
+    "company_name",
+    "status",
+)
+"""The grouping keys stored as int32 codes into a list of string labels."""
+
+
+def _numeric_value(pcf: CarbonFootprint, name: str) -> float:
+    """Returns the value of a numeric column for one carbon footprint."""
+    if name == "coverage_percent":
+        value = pcf.dqi.coverage_percent if pcf.dqi is not None else None
+    else:
+        value = getattr(pcf, name)
+    return np.nan if value is None else value
+
+
+def dqr_row(dqi: DataQualityIndicators | None) -> list[int]:
+    """
+    Returns the ratings of one set of data quality indicators, as a row of the DQR matrix.
+
+    Args:
+        dqi (DataQualityIndicators | None): The indicators, or None if a footprint has none.
+
+    Returns:
+        list[int]: The ratings in the order of DQR_COLUMNS, 0 where a rating is undefined.
+
+    Examples:
+        >>> dqr_row(pcf.dqi)
+        [2, 2, 1, 3, 2]
+    """
+    if dqi is None:
+        return [0] * len(DQR_COLUMNS)
+    ratings = (getattr(dqi, name) for name in DQR_COLUMNS)
+    return [rating.rating if rating is not None else 0 for rating in ratings]
+
+
+def _categorical_value(footprint: ProductFootprint, name: str) -> str:
+    """Returns the string label of a categorical column for one footprint."""
+    if name == "product_category_cpc":
+        return footprint.product_category_cpc.code
+    if name == "declared_unit":
+        return footprint.pcf.declared_unit.value
+    if name == "geography":
+        return str(footprint.pcf.geographical_scope.scope)
+    if name == "company_name":
+        return footprint.company_name
+    if name == "status":
+        return footprint.status.value
+    raise KeyError(name)
+
+
+class FootprintTable:
+    """
+    A column-oriented table of ProductFootprint values backed by NumPy arrays.
+
+    Attributes:
+        ids (numpy.ndarray): The 16 byte UUID of each footprint, with dtype "S16".
+        created (numpy.ndarray): The creation timestamp of each footprint, with dtype "datetime64[us]" in UTC.
+        version (numpy.ndarray): The version number of each footprint, with dtype int32.
+        numeric (dict[str, numpy.ndarray]): The float64 columns named in NUMERIC_COLUMNS.
+        dqr (numpy.ndarray): The data quality ratings as an int8 matrix with one column per name in
+            DQR_COLUMNS, 0 where a rating is undefined.
+        codes (dict[str, numpy.ndarray]): The int32 category codes of the columns named in CATEGORICAL_COLUMNS.
+        categories (dict[str, list[str]]): The labels the category codes index into.
+
+    Examples:
+        >>> table = FootprintTable.from_footprints(footprints)
+        >>> len(table)
+        3
+        >>> table.column("p_cf_excluding_biogenic")
+        array([0.5, 1.2, 0.8])
+        >>> table.labels("declared_unit")
+        array(['kilogram', 'kilogram', 'liter'], dtype=object)
+    """
+
+    def __init__(
+        self,
+        *,
+        ids: np.ndarray,
+        created: np.ndarray,
+        version: np.ndarray,
+        numeric: dict[str, np.ndarray],
+        dqr: np.ndarray,
+        codes: dict[str, np.ndarray],
+        categories: dict[str, list[str]],
+    ):
+        """
+        Initializes a FootprintTable from existing column arrays.
+
+        The arrays are used as given, without copying, so tables can be built over buffers such as
+        shared memory.
+
+        Args:
+            ids (numpy.ndarray): The 16 byte UUID of each footprint.
+            created (numpy.ndarray): The creation timestamp of each footprint.
+            version (numpy.ndarray): The version number of each footprint.
+            numeric (dict[str, numpy.ndarray]): A float64 array for every name in NUMERIC_COLUMNS.
+            dqr (numpy.ndarray): An int8 matrix with a row per footprint and a column per name in DQR_COLUMNS.
+            codes (dict[str, numpy.ndarray]): An int32 code array for every name in CATEGORICAL_COLUMNS.
+            categories (dict[str, list[str]]): The labels for every name in CATEGORICAL_COLUMNS.
+
+        Raises:
+            ValueError: If a column is missing or the columns do not all have the same length.
+        """
+        length = len(ids)
+        missing = [name for name in NUMERIC_COLUMNS if name not in numeric]
+        missing += [name for name in CATEGORICAL_COLUMNS if name not in codes or name not in categories]
+        if missing:
+            raise ValueError(f"Missing columns: {', '.join(missing)}")
+        columns = [created, version, dqr, *numeric.values(), *codes.values()]
+        if any(len(column) != length for column in columns):
+            raise ValueError("All columns must have the same length")
+        if dqr.ndim != 2 or dqr.shape[1] != len(DQR_COLUMNS):
+            raise ValueError(f"dqr must have {len(DQR_COLUMNS)} columns")
+
+        self.ids = ids
+        self.created = created
+        self.version = version
+        self.numeric = numeric
+        self.dqr = dqr
+        self.codes = codes
+        self.categories = categories
+
+    @classmethod
+    def from_footprints(cls, footprints: Iterable[ProductFootprint]) -> "FootprintTable":
+        """
+        Builds a FootprintTable from ProductFootprint objects.
+
+        Args:
+            footprints (Iterable[ProductFootprint]): The footprints to convert.
+
+        Returns:
+            FootprintTable: A table with one row per footprint, in iteration order.
+        """
+        ids = []
+        created = []
+        version = []
+        numeric = {name: [] for name in NUMERIC_COLUMNS}
+        dqr = []
+        codes = {name: [] for name in CATEGORICAL_COLUMNS}
+        lookups = {name: {} for name in CATEGORICAL_COLUMNS}
+
+        for footprint in footprints:
+            ids.append(footprint.id.bytes)
+            created.append(footprint.created.iso_datetime.replace(tzinfo=None))
+            version.append(footprint.version.version)
+            pcf = footprint.pcf
+            for name in NUMERIC_COLUMNS:
+                numeric[name].append(_numeric_value(pcf, name))
+            dqr.append(dqr_row(pcf.dqi))
+            for name in CATEGORICAL_COLUMNS:
+                lookup = lookups[name]
+                label = _categorical_value(footprint, name)
+                codes[name].append(lookup.setdefault(label, len(lookup)))
+
+        return cls(
+            ids=np.array(ids, dtype="S16"),
+            created=np.array(created, dtype="datetime64[us]"),
+            version=np.array(version, dtype=np.int32),
+            numeric={name: np.array(values, dtype=np.float64) for name, values in numeric.items()},
+            dqr=np.array(dqr, dtype=np.int8).reshape(-1, len(DQR_COLUMNS)),
+            codes={name: np.array(values, dtype=np.int32) for name, values in codes.items()},
+            categories={name: list(lookup) for name, lookup in lookups.items()},
+        )
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Returns a numeric column.
+
+        Args:
+            name (str): One of NUMERIC_COLUMNS.
+
+        Returns:
+            numpy.ndarray: The float64 values of the column, NaN where the value is undefined.
+
+        Raises:
+            KeyError: If name is not a numeric column.
+        """
+        return self.numeric[name]
+
+    def labels(self, name: str) -> np.ndarray:
+        """
+        Returns the string labels of a categorical column, one per row.
+
+        Args:
+            name (str): One of CATEGORICAL_COLUMNS.
+
+        Returns:
+            numpy.ndarray: An object array with the label of every row.
+
+        Raises:
+            KeyError: If name is not a categorical column.
+        """
+        return np.array(self.categories[name], dtype=object)[self.codes[name]]
+
+    def select(self, rows: np.ndarray) -> "FootprintTable":
+        """
+        Returns a new table with a subset of the rows.
+
+        Args:
+            rows (numpy.ndarray): A boolean mask or an array of row indices.
+
+        Returns:
+            FootprintTable: The selected rows. Category labels are shared with this table.
+        """
+        return FootprintTable(
+            ids=self.ids[rows],
+            created=self.created[rows],
+            version=self.version[rows],
+            numeric={name: values[rows] for name, values in self.numeric.items()},
+            dqr=self.dqr[rows],
+            codes={name: values[rows] for name, values in self.codes.items()},
+            categories=self.categories,
+        )
+
+    def __len__(self) -> int:
+        """
+        Returns the number of rows in the table.
+
+        Returns:
+            int: The number of rows.
+        """
+        return len(self.ids)
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the FootprintTable.
+
+        Returns:
+            str: A string representation of the FootprintTable.
+        """
+        return f"FootprintTable(rows={len(self)})"
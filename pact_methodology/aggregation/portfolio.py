@@ -0,0 +1,219 @@
+"""
+Vectorized aggregation of PCF values over a portfolio of purchased products.
+
+PCF values are expressed per declared unit. The emissions attributable to a purchase are the PCF
+value multiplied by the number of declared units bought, which is the purchased quantity of the
+product times its `unitary_product_amount`. This module groups a `FootprintTable` by CPC level,
+declared unit, geography or company and computes, for each emission component separately:
+
+- totals: the emissions of the purchased declared units, in kgCO2e.
+- means: the unweighted mean of the per declared unit values.
+- weighted means: the per declared unit values weighted by the declared units purchased.
+
+Undefined values (NaN in the table) are left out of the totals, means and weights of their column.
+Means over groups that mix declared units are not meaningful, so group by `declared_unit` or
+filter the table to one declared unit first.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from pact_methodology.aggregation.footprint_table import FootprintTable
+
+EMISSION_COLUMNS = (
+    "p_cf_excluding_biogenic",
+    "p_cf_including_biogenic",
+    "fossil_ghg_emissions",
+    "d_luc_ghg_emissions",
+    "land_management_ghg_emissions",
+    "other_biogenic_ghg_emissions",
+    "iluc_ghg_emissions",
+    "biogenic_carbon_withdrawal",
+    "aircraft_ghg_emissions",
+    "packaging_ghg_emissions",
+)
+"""The emission components aggregated by default, each reported as its own column."""
+
+GROUP_KEYS = {
+    "cpc": "product_category_cpc",
+    "declared_unit": "declared_unit",
+    "geography": "geography",
+    "company": "company_name",
+}
+"""The supported grouping keys, mapped to the FootprintTable column they group on."""
+
+CPC_LEVELS = {
+    "section": 1,
+    "division": 2,
+    "group": 3,
+    "class": 4,
+    "subclass": 5,
+}
+"""The CPC hierarchy levels, mapped to the length of the code prefix that identifies them."""
+
+
+@dataclass(frozen=True)
+class PortfolioAggregate:
+    """
+    The result of aggregating a portfolio by one grouping key.
+
+    Every array is indexed by group, in the order of `keys`.
+
+    Attributes:
+        keys (list[str]): The label of each group.
+        counts (numpy.ndarray): The number of footprints in each group.
+        declared_units (numpy.ndarray): The number of declared units purchased in each group.
+        totals (dict[str, numpy.ndarray]): The emissions of the purchased declared units, per column.
+        means (dict[str, numpy.ndarray]): The unweighted mean per declared unit value, per column.
+        weighted_means (dict[str, numpy.ndarray]): The per declared unit value weighted by the declared
+            units purchased, per column.
+    """
+
+    keys: list[str]
+    counts: np.ndarray
+    declared_units: np.ndarray
+    totals: dict[str, np.ndarray]
+    means: dict[str, np.ndarray]
+    weighted_means: dict[str, np.ndarray]
+
+    def row(self, key: str) -> dict:
+        """
+        Returns the aggregates of one group.
+
+        Args:
+            key (str): The group label.
+
+        Returns:
+            dict: The count, declared units, and the total, mean and weighted mean of every column.
+
+        Raises:
+            KeyError: If there is no group with this label.
+        """
+        try:
+            index = self.keys.index(key)
+        except ValueError:
+            raise KeyError(key)
+        return {
+            "count": int(self.counts[index]),
+            "declared_units": float(self.declared_units[index]),
+            "totals": {name: float(values[index]) for name, values in self.totals.items()},
+            "means": {name: float(values[index]) for name, values in self.means.items()},
+            "weighted_means": {name: float(values[index]) for name, values in self.weighted_means.items()},
+        }
+
+
+def group_codes(table: FootprintTable, by: str, cpc_level: str | None = None) -> tuple[list[str], np.ndarray]:
+    """
+    Returns the group labels and the group index of every row of a table.
+
+    Args:
+        table (FootprintTable): The table to group.
+        by (str): One of the keys of GROUP_KEYS.
+        cpc_level (str | None): When grouping by "cpc", one of the keys of CPC_LEVELS. Defaults to
+            grouping by the full CPC code.
+
+    Returns:
+        tuple[list[str], numpy.ndarray]: The group labels and an int array mapping each row to a label.
+
+    Raises:
+        ValueError: If by or cpc_level is not supported.
+    """
+    if by not in GROUP_KEYS:
+        raise ValueError(f"by must be one of: {', '.join(GROUP_KEYS)}")
+    column = GROUP_KEYS[by]
+    labels = table.categories[column]
+    codes = table.codes[column]
+    if cpc_level is None:
+        return list(labels), codes
+    if by != "cpc":
+        raise ValueError("cpc_level can only be used when grouping by cpc")
+    if cpc_level not in CPC_LEVELS:
+        raise ValueError(f"cpc_level must be one of: {', '.join(CPC_LEVELS)}")
+
+    length = CPC_LEVELS[cpc_level]
+    prefixes = {}
+    remap = np.array(
+        [prefixes.setdefault(label[:length], len(prefixes)) for label in labels], dtype=np.int32
+    )
+    return list(prefixes), remap[codes]
+
+
+def aggregate_portfolio(
+    table: FootprintTable,
+    by: str,
+    *,
+    cpc_level: str | None = None,
+    quantities: np.ndarray | None = None,
+    columns: tuple[str, ...] = EMISSION_COLUMNS,
+) -> PortfolioAggregate:
+    """
+    Aggregates the emission columns of a table by a grouping key.
+
+    Args:
+        table (FootprintTable): The portfolio, one row per purchased product.
+        by (str): One of the keys of GROUP_KEYS.
+        cpc_level (str | None): When grouping by "cpc", one of the keys of CPC_LEVELS.
+        quantities (numpy.ndarray | None): The quantity of each product purchased. Defaults to one of each.
+        columns (tuple[str, ...]): The numeric columns to aggregate. Defaults to EMISSION_COLUMNS.
+
+    Returns:
+        PortfolioAggregate: The totals, means and weighted means of every column per group.
+
+    Raises:
+        ValueError: If the grouping is not supported, or quantities does not have one non-negative
+            value per row.
+
+    Examples:
+        >>> table = FootprintTable.from_footprints(footprints)
+        >>> result = aggregate_portfolio(table, "cpc", cpc_level="division", quantities=np.array([10, 5, 2]))
+        >>> result.keys
+        ['01', '23']
+        >>> result.totals["p_cf_excluding_biogenic"]
+        array([11. ,  1.6])
+    """
+    keys, codes = group_codes(table, by, cpc_level)
+    groups = len(keys)
+
+    if quantities is None:
+        amounts = table.column("unitary_product_amount")
+    else:
+        quantities = np.asarray(quantities, dtype=np.float64)
+        if quantities.shape != (len(table),):
+            raise ValueError("quantities must have one value per row")
+        if np.any(quantities < 0):
+            raise ValueError("quantities must not be negative")
+        amounts = quantities * table.column("unitary_product_amount")
+
+    counts = np.bincount(codes, minlength=groups)
+    declared_units = np.bincount(codes, weights=amounts, minlength=groups)
+    totals = {}
+    means = {}
+    weighted_means = {}
+    for name in columns:
+        values = table.column(name)
+        present = ~np.isnan(values)
+        filled = np.where(present, values, 0.0)
+        present_count = np.bincount(codes, weights=present, minlength=groups)
+        present_amounts = np.bincount(codes, weights=amounts * present, minlength=groups)
+        total = np.bincount(codes, weights=amounts * filled, minlength=groups)
+        value_sum = np.bincount(codes, weights=filled, minlength=groups)
+        totals[name] = total
+        means[name] = _divide(value_sum, present_count)
+        weighted_means[name] = _divide(total, present_amounts)
+
+    return PortfolioAggregate(
+        keys=keys,
+        counts=counts,
+        declared_units=declared_units,
+        totals=totals,
+        means=means,
+        weighted_means=weighted_means,
+    )
+
+
+def _divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Divides element-wise, returning NaN where the denominator is zero."""
+    result = np.full(numerator.shape, np.nan)
+    np.divide(numerator, denominator, out=result, where=denominator != 0)
+    return result
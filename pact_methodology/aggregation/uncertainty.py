@@ -0,0 +1,334 @@
+"""
+Monte Carlo propagation of uncertainty through PCF aggregation.
+
+A PCF aggregated from components is a weighted sum: each input is the emission value of a
+component per declared unit, and each coefficient is the number of declared units of that
+component in the aggregate. `MonteCarlo` draws every input from a probability distribution in
+batched NumPy arrays, sums them with their coefficients, and reports percentiles of the result
+together with the share of the variance contributed by each input.
+
+Samples are drawn in batches of a fixed size, and each batch has its own seed spawned from the
+run's seed. The results therefore only depend on the seed and batch size, and not on whether the
+batches run in one process or across a process pool.
+"""
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from pact_methodology.aggregation.bom import BomEngine
+from pact_methodology.carbon_footprint.carbon_footprint import CarbonFootprint
+from pact_methodology.urn import ProductId
+
+
+@dataclass(frozen=True)
+class Fixed:
+    """
+    A value without uncertainty.
+
+    Attributes:
+        value (float): The value.
+    """
+
+    value: float
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        """Returns size copies of the value."""
+        return np.full(size, float(self.value))
+
+
+@dataclass(frozen=True)
+class Normal:
+    """
+    A normal distribution.
+
+    Attributes:
+        mean (float): The mean.
+        std (float): The standard deviation, equal to or greater than 0.
+    """
+
+    mean: float
+    std: float
+
+    def __post_init__(self):
+        if self.std < 0:
+            raise ValueError("std must be equal to or greater than 0")
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        """Draws size samples."""
+        return rng.normal(self.mean, self.std, size)
+
+
+@dataclass(frozen=True)
+class LogNormal:
+    """
+    A lognormal distribution, as commonly used for emission factors in life cycle inventories.
+
+    Attributes:
+        geometric_mean (float): The geometric mean (the median), greater than 0.
+        geometric_std (float): The geometric standard deviation, equal to or greater than 1.
+    """
+
+    geometric_mean: float
+    geometric_std: float
+
+    def __post_init__(self):
+        if self.geometric_mean <= 0:
+            raise ValueError("geometric_mean must be greater than 0")
+        if self.geometric_std < 1:
+            raise ValueError("geometric_std must be equal to or greater than 1")
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        """Draws size samples."""
+        return rng.lognormal(math.log(self.geometric_mean), math.log(self.geometric_std), size)
+
+
+@dataclass(frozen=True)
+class Uniform:
+    """
+    A uniform distribution.
+
+    Attributes:
+        low (float): The lower bound.
+        high (float): The upper bound, equal to or greater than low.
+    """
+
+    low: float
+    high: float
+
+    def __post_init__(self):
+        if self.high < self.low:
+            raise ValueError("high must be equal to or greater than low")
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        """Draws size samples."""
+        return rng.uniform(self.low, self.high, size)
+
+
+@dataclass(frozen=True)
+class Triangular:
+    """
+    A triangular distribution.
+
+    Attributes:
+        low (float): The lower bound.
+        mode (float): The most likely value, between low and high.
+        high (float): The upper bound, greater than low.
+    """
+
+    low: float
+    mode: float
+    high: float
+
+    def __post_init__(self):
+        if not self.low <= self.mode <= self.high or self.low == self.high:
+            raise ValueError("low <= mode <= high must hold and low must be less than high")
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        """Draws size samples."""
+        return rng.triangular(self.low, self.mode, self.high, size)
+
+
+DISTRIBUTIONS = (Fixed, Normal, LogNormal, Uniform, Triangular)
+"""The supported input distributions."""
+
+
+@dataclass(frozen=True)
+class UncertaintyResult:
+    """
+    The outcome of a Monte Carlo run.
+
+    Attributes:
+        samples (int): The number of samples drawn.
+        mean (float): The mean of the aggregated value.
+        std (float): The standard deviation of the aggregated value.
+        percentiles (dict[float, float]): The aggregated value at each requested percentile.
+        drivers (list[tuple[str, float]]): Each input with its share of the variance of the
+            aggregated value, largest first. The shares add up to 1 for independent inputs.
+    """
+
+    samples: int
+    mean: float
+    std: float
+    percentiles: dict[float, float]
+    drivers: list[tuple[str, float]]
+
+    def description(self, unit: str = "kgCO2e per declared unit", drivers: int = 3) -> str:
+        """
+        Describes the result in the form used for CarbonFootprint.uncertainty_assessment_description.
+
+        Args:
+            unit (str): The unit of the aggregated value.
+            drivers (int): The number of key drivers to name.
+
+        Returns:
+            str: A one paragraph summary of the percentiles and key drivers.
+
+        Examples:
+            >>> result.description()
+            'Monte Carlo simulation with 100000 samples: mean 6.02, standard deviation 0.41, P2.5 5.25,
+            P50 6.01, P97.5 6.85 kgCO2e per declared unit. Key drivers: steel (81.3%), paint (18.7%).'
+        """
+        percentiles = ", ".join(f"P{percentile:g} {value:.4g}" for percentile, value in self.percentiles.items())
+        text = (
+            f"Monte Carlo simulation with {self.samples} samples: mean {self.mean:.4g}, "
+            f"standard deviation {self.std:.4g}, {percentiles} {unit}."
+        )
+        key_drivers = [f"{name} ({share:.1%})" for name, share in self.drivers[:drivers] if share > 0]
+        if key_drivers:
+            text += f" Key drivers: {', '.join(key_drivers)}."
+        return text
+
+    def apply_to(self, pcf: CarbonFootprint, **kwargs) -> None:
+        """
+        Sets the uncertainty_assessment_description of a carbon footprint to the description of this result.
+
+        Args:
+            pcf (CarbonFootprint): The carbon footprint to update.
+            **kwargs: Passed on to description().
+        """
+        pcf.uncertainty_assessment_description = self.description(**kwargs)
+
+
+def _simulate_batch(
+    coefficients: np.ndarray, distributions: tuple, seed: np.random.SeedSequence, size: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Draws one batch, returning the totals and the sums needed for the variance contributions."""
+    rng = np.random.default_rng(seed)
+    contributions = np.empty((size, len(distributions)))
+    for index, distribution in enumerate(distributions):
+        contributions[:, index] = distribution.sample(rng, size) * coefficients[index]
+    totals = contributions.sum(axis=1)
+    return totals, contributions.sum(axis=0), totals @ contributions
+
+
+class MonteCarlo:
+    """
+    Propagates input distributions through a weighted sum by Monte Carlo simulation.
+
+    Examples:
+        >>> simulation = MonteCarlo({"steel": (2.5, LogNormal(2.0, 1.2)), "paint": (0.1, Normal(10.0, 2.0))})
+        >>> result = simulation.run(100_000, seed=42)
+        >>> result.percentiles[97.5]
+        6.85
+        >>> result.apply_to(pcf)
+    """
+
+    def __init__(self, inputs: dict[str, tuple[float, object]]):
+        """
+        Initializes a MonteCarlo simulation.
+
+        Args:
+            inputs (dict[str, tuple[float, Distribution]]): For every input, its coefficient in the sum
+                and the distribution of its value. Distributions are instances of DISTRIBUTIONS.
+
+        Raises:
+            ValueError: If there are no inputs, a coefficient is not a number, or a distribution is
+                not supported.
+        """
+        if not inputs:
+            raise ValueError("inputs must not be empty")
+        for coefficient, distribution in inputs.values():
+            if not isinstance(coefficient, (int, float)) or isinstance(coefficient, bool):
+                raise ValueError("coefficients must be numbers")
+            if not isinstance(distribution, DISTRIBUTIONS):
+                raise ValueError("distributions must be instances of Fixed, Normal, LogNormal, Uniform or Triangular")
+        self._names = list(inputs)
+        self._coefficients = np.array([coefficient for coefficient, _ in inputs.values()], dtype=np.float64)
+        self._distributions = tuple(distribution for _, distribution in inputs.values())
+
+    @classmethod
+    def from_bom(
+        cls,
+        engine: BomEngine,
+        product_id: ProductId,
+        distributions: dict[ProductId, object],
+        column: str = "p_cf_excluding_biogenic",
+    ) -> "MonteCarlo":
+        """
+        Builds a simulation of one rolled-up value of an assembly.
+
+        Every purchased component of the assembly becomes an input, named after its ProductId and
+        weighted by its quantity in the assembly. Components without a distribution keep the value
+        of their footprint.
+
+        Args:
+            engine (BomEngine): The bill of materials.
+            product_id (ProductId): The assembly.
+            distributions (dict[ProductId, Distribution]): The distributions of uncertain components.
+            column (str): One of the ROLLUP_COLUMNS of the BOM engine.
+
+        Returns:
+            MonteCarlo: The simulation.
+
+        Raises:
+            ValueError: If a component value in column is undefined and has no distribution.
+        """
+        inputs = {}
+        for component_id, quantity in engine.leaf_quantities(product_id).items():
+            distribution = distributions.get(component_id)
+            if distribution is None:
+                value = engine.rollup(component_id)[column]
+                if value is None:
+                    raise ValueError(f"{column} of {component_id} is undefined")
+                distribution = Fixed(value)
+            inputs[str(component_id)] = (quantity, distribution)
+        return cls(inputs)
+
+    def run(
+        self,
+        samples: int,
+        *,
+        seed: int | None = None,
+        batch_size: int = 100_000,
+        workers: int = 1,
+        percentiles: tuple[float, ...] = (2.5, 50.0, 97.5),
+    ) -> UncertaintyResult:
+        """
+        Runs the simulation.
+
+        Args:
+            samples (int): The number of samples to draw.
+            seed (int | None): The seed of the run. Defaults to fresh entropy from the operating system.
+            batch_size (int): The number of samples drawn at a time, which bounds the memory used per batch.
+            workers (int): The number of worker processes. Batches run in the current process if 1.
+            percentiles (tuple[float, ...]): The percentiles to report, between 0 and 100.
+
+        Returns:
+            UncertaintyResult: The percentiles, mean, standard deviation and key drivers.
+
+        Raises:
+            ValueError: If samples, batch_size or workers is less than 1.
+        """
+        if samples < 1 or batch_size < 1 or workers < 1:
+            raise ValueError("samples, batch_size and workers must be at least 1")
+        sizes = [batch_size] * (samples // batch_size)
+        if samples % batch_size:
+            sizes.append(samples % batch_size)
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        arguments = [(self._coefficients, self._distributions, batch_seed, size) for batch_seed, size in zip(seeds, sizes)]
+
+        if workers == 1 or len(sizes) == 1:
+            batches = [_simulate_batch(*batch) for batch in arguments]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                batches = list(executor.map(_simulate_batch, *zip(*arguments)))
+
+        totals = np.concatenate([batch[0] for batch in batches])
+        contribution_sums = sum(batch[1] for batch in batches)
+        cross_sums = sum(batch[2] for batch in batches)
+        mean = totals.mean()
+        variance = totals.var()
+        covariances = cross_sums / samples - contribution_sums / samples * mean
+        shares = covariances / variance if variance > 0 else np.zeros(len(self._names))
+        drivers = sorted(zip(self._names, shares.tolist()), key=lambda driver: abs(driver[1]), reverse=True)
+
+        return UncertaintyResult(
+            samples=samples,
+            mean=float(mean),
+            std=float(math.sqrt(variance)),
+            percentiles=dict(zip(percentiles, np.percentile(totals, percentiles).tolist())),
+            drivers=drivers,
+        )
@@ -1,6 +1,7 @@
 from enum import Enum
 
 from pact_methodology.datetime import DateTime
+from pact_methodology.canonical import ContentDigestMixin
 
 
 class Coverage(str, Enum):
@@ -38,7 +39,7 @@ class Boundary(str, Enum):
         return f"Boundary.{self.name}"
 
 
-class Assurance:
+class Assurance(ContentDigestMixin):
     """Represents an assurance in conformance with PACT Methodology chapter 5 and appendix B.
 
     This class represents the assurance information for a product carbon footprint calculation,
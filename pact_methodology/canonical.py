@@ -0,0 +1,414 @@
+"""
+Canonical encoding and content digests of data model objects.
+
+Two objects with the same content have the same canonical encoding: compact JSON with sorted keys,
+where value types such as DateTime, Version, CPC and URNs are written as their string or integer
+form, and floats with an integral value are written as integers so that 1 and 1.0 are the same.
+The content digest is the BLAKE2b hash of that encoding.
+
+Data model classes that mix in `ContentDigestMixin` cache their digest until one of their
+properties is set. The encoding of an object embeds the digests of the model objects it contains,
+so a digest is a Merkle hash over the object tree. Every contained object remembers which objects
+have embedded its digest, and invalidates them when it changes. Lists, dicts and sets assigned to an
+attribute are stored as `OwnedList`, `OwnedDict` and `OwnedSet`, which behave like their base types
+but invalidate the digests covering them when they are changed in place.
+"""
+
+import functools
+import hashlib
+import json
+import uuid
+import weakref
+from collections.abc import Iterable
+from enum import Enum
+
+DIGEST_SIZE = 32
+"""The size of a content digest in bytes."""
+
+
+class ContentDigestMixin:
+    """
+    Adds a cached content_digest to a data model class.
+
+    The cache is kept in slots so that it does not show up in the instance __dict__. The property
+    setters of a subclass are wrapped to invalidate it, so attributes that are part of the content
+    must be properties. If the subclass has a `_changed_fields` slot, the wrapped setters also add
+    the property name to it while it holds a set. A subclass can set `_canonical_type` to encode
+    under the name of the class it stands in for.
+    """
+
+    _canonical_type = None
+
+    __slots__ = ("_content_digest", "_digest_owners")
+
+    def __new__(cls, *args, **kwargs):
+        obj = object.__new__(cls)
+        object.__setattr__(obj, "_content_digest", None)
+        object.__setattr__(obj, "_digest_owners", None)
+        return obj
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # The attributes of model objects are properties, so wrapping their setters once per class
+        # tracks every change without a __setattr__ running for the private attributes they write.
+        track_changes = hasattr(cls, "_changed_fields")
+        for name, attribute in list(vars(cls).items()):
+            if isinstance(attribute, property) and attribute.fset is not None:
+                setter = _tracking_setter(attribute.fset, name) if track_changes else _digest_setter(attribute.fset)
+                setattr(cls, name, attribute.setter(setter))
+
+    @property
+    def content_digest(self) -> bytes:
+        """
+        Gets the BLAKE2b digest of the canonical encoding of this object.
+
+        Returns:
+            bytes: The digest, DIGEST_SIZE bytes long.
+
+        Examples:
+            >>> footprint.content_digest.hex()
+            '5c1b6f...'
+        """
+        digest = self._content_digest
+        if digest is None:
+            digest = hashlib.blake2b(canonical_bytes(self), digest_size=DIGEST_SIZE).digest()
+            object.__setattr__(self, "_content_digest", digest)
+        return digest
+
+    def _invalidate_content_digest(self) -> None:
+        """Drops the cached digest of this object and of every object that embeds it."""
+        # An object's digest is only cached while the digests it embeds are cached, so there is
+        # nothing to invalidate above an object without a cached digest.
+        if self._content_digest is None:
+            return
+        object.__setattr__(self, "_content_digest", None)
+        _invalidate_owners(self._digest_owners)
+
+    def _register_digest_owner(self, owner: "ContentDigestMixin") -> None:
+        """Records that owner has embedded the digest of this object."""
+        owners = self._digest_owners
+        if owners is None:
+            owners = []
+            object.__setattr__(self, "_digest_owners", owners)
+        _add_owner(owners, owner)
+
+    def __reduce__(self):
+        """
+        Pickles the object as its class and its attribute values in a fixed order.
+
+        The order is that of the attributes behind the properties of the class, so no attribute names
+        are pickled, except for objects with attributes that are not behind a property. Unpickling
+        sets the attributes directly, without running the property setters, so the object is not
+        validated again.
+        """
+        names, values = self._pickle_state()
+        if isinstance(names, tuple):
+            return _unpickle, (type(self), names, values)
+        return _unpickle_fields, (type(self), values, names) if names else (type(self), values)
+
+    def _pickle_state(self) -> tuple[tuple[str, ...] | int, tuple]:
+        """
+        Returns the attribute values in the order of the fields of the class.
+
+        The values come with a bit mask of the fields the object does not have, or with the attribute
+        names if it has attributes that are not fields. Owned containers are given as their base type,
+        which pickles without a reference to its class.
+        """
+        attributes = vars(self)
+        fields = _field_order(type(self))
+        if not attributes.keys() <= fields.keys():
+            return _attribute_names(type(self), tuple(attributes)), tuple(attributes.values())
+        missing = 0
+        values = []
+        for name, index in fields.items():
+            if name not in attributes:
+                missing |= 1 << index
+                continue
+            value = attributes[name]
+            values.append(value._base(value) if isinstance(value, _Owned) else value)
+        return missing, tuple(values)
+
+    @classmethod
+    def _state_names(cls, names: tuple[str, ...] | int) -> Iterable[str]:
+        """Returns the attribute names of the values returned by _pickle_state."""
+        if isinstance(names, tuple):
+            return names
+        fields = _field_order(cls)
+        return [name for name, index in fields.items() if not names >> index & 1] if names else fields
+
+
+def _digest_setter(fset):
+    """Returns a property setter that owns the containers it is given and invalidates the digest."""
+
+    @functools.wraps(fset)
+    def setter(self, value):
+        if type(value) in _OWNED_TYPES:
+            value = own(value)
+        fset(self, value)
+        if self._content_digest is not None:
+            self._invalidate_content_digest()
+
+    return setter
+
+
+def _tracking_setter(fset, name: str):
+    """Returns a _digest_setter that also records name in the _changed_fields set of the object, if any."""
+
+    @functools.wraps(fset)
+    def setter(self, value):
+        if type(value) in _OWNED_TYPES:
+            value = own(value)
+        fset(self, value)
+        if self._changed_fields is not None:
+            self._changed_fields.add(name)
+        if self._content_digest is not None:
+            self._invalidate_content_digest()
+
+    return setter
+
+
+def _add_owner(owners: list, owner: ContentDigestMixin) -> None:
+    """Adds a weak reference to owner to a list of digest owners, dropping dead references."""
+    owners[:] = [owner_ref for owner_ref in owners if owner_ref() is not None]
+    if not any(owner_ref() is owner for owner_ref in owners):
+        owners.append(weakref.ref(owner))
+
+
+def _invalidate_owners(owners: list | None) -> None:
+    """Drops the cached digests of the objects in a list of digest owners."""
+    for owner_ref in owners or ():
+        owner = owner_ref()
+        if owner is not None:
+            owner._invalidate_content_digest()
+
+
+class _Owned:
+    """Base of the containers that invalidate the digests covering them when changed in place."""
+
+    __slots__ = ()
+
+    def _register_digest_owner(self, owner: ContentDigestMixin) -> None:
+        """Records that the digest of owner covers this container."""
+        if self._digest_owners is None:
+            self._digest_owners = []
+        _add_owner(self._digest_owners, owner)
+
+    def __reduce__(self):
+        # Pickled and copied as the base type. Assigning the copy to an attribute owns it again.
+        return self._base, (self._base(self),)
+
+
+def _owned_method(base: type, name: str):
+    """Returns a method that calls a method of base with owned arguments and invalidates the owners."""
+    method = getattr(base, name)
+
+    @functools.wraps(method)
+    def changed(self, *args, **kwargs):
+        result = method(self, *map(own, args), **{key: own(value) for key, value in kwargs.items()})
+        _invalidate_owners(self._digest_owners)
+        return result
+
+    return changed
+
+
+def _owned_class(base: type, mutators: tuple[str, ...]) -> type:
+    """Returns the owned variant of a container type."""
+    namespace = {
+        "__doc__": f"A {base.__name__} that invalidates the digests covering it when changed in place.",
+        "__module__": __name__,
+        "__slots__": ("_digest_owners",),
+        "_base": base,
+    }
+    namespace.update((name, _owned_method(base, name)) for name in mutators)
+    return type(f"Owned{base.__name__.capitalize()}", (_Owned, base), namespace)
+
+
+OwnedList = _owned_class(
+    list,
+    (
+        "__setitem__",
+        "__delitem__",
+        "__iadd__",
+        "__imul__",
+        "append",
+        "extend",
+        "insert",
+        "pop",
+        "remove",
+        "clear",
+        "sort",
+        "reverse",
+    ),
+)
+OwnedDict = _owned_class(
+    dict, ("__setitem__", "__delitem__", "__ior__", "clear", "pop", "popitem", "setdefault", "update")
+)
+OwnedSet = _owned_class(
+    set,
+    (
+        "__ior__",
+        "__iand__",
+        "__isub__",
+        "__ixor__",
+        "add",
+        "discard",
+        "remove",
+        "pop",
+        "clear",
+        "update",
+        "intersection_update",
+        "difference_update",
+        "symmetric_difference_update",
+    ),
+)
+_OWNED_TYPES = {list: OwnedList, dict: OwnedDict, set: OwnedSet}
+
+
+def own(value):
+    """
+    Returns a value with its lists, dicts and sets, including nested ones, replaced by owned copies.
+
+    The property setters of model objects call this, so a container changed in place afterwards
+    invalidates the digests that cover it.
+
+    Args:
+        value: The value.
+
+    Returns:
+        The value itself if it is not a plain list, dict or set, otherwise an OwnedList, OwnedDict
+        or OwnedSet with the same content.
+    """
+    owned_type = _OWNED_TYPES.get(type(value))
+    if owned_type is None:
+        return value
+    if owned_type is OwnedDict:
+        owned = OwnedDict((key, own(item)) for key, item in value.items())
+    else:
+        owned = owned_type(map(own, value))
+    owned._digest_owners = None
+    return owned
+
+
+def _unpickle(cls: type, names: tuple[str, ...], values: tuple) -> ContentDigestMixin:
+    """Rebuilds an object pickled by ContentDigestMixin.__reduce__ with its attribute names."""
+    obj = cls.__new__(cls)
+    vars(obj).update(zip(names, map(own, values)))
+    return obj
+
+
+def _unpickle_fields(cls: type, values: tuple, missing: int = 0) -> ContentDigestMixin:
+    """Rebuilds an object pickled by ContentDigestMixin.__reduce__ in the order of its fields."""
+    obj = cls.__new__(cls)
+    vars(obj).update(zip(cls._state_names(missing), map(own, values)))
+    return obj
+
+
+@functools.cache
+def _field_order(cls: type) -> dict[str, int]:
+    """Returns the attributes behind the settable properties of a class, by their position in sorted order."""
+    names = {
+        f"_{name}"
+        for base in cls.__mro__
+        for name, value in vars(base).items()
+        if isinstance(value, property) and value.fset is not None
+    }
+    return {name: index for index, name in enumerate(sorted(names))}
+
+
+_ATTRIBUTE_NAMES: dict[tuple[type, tuple[str, ...]], tuple[str, ...]] = {}
+
+
+def _attribute_names(cls: type, names: tuple[str, ...]) -> tuple[str, ...]:
+    """Returns one shared tuple for each class and sequence of attribute names."""
+    return _ATTRIBUTE_NAMES.setdefault((cls, names), names)
+
+
+def to_primitive(value, owner: ContentDigestMixin | None = None):
+    """
+    Converts a value to the JSON-compatible form used by the canonical encoding.
+
+    Args:
+        value: The value to convert.
+        owner (ContentDigestMixin | None): The object being encoded. Model objects nested in it are
+            replaced by their digest, and owner is registered with them for invalidation.
+
+    Returns:
+        The value as None, bool, int, float, str, list or dict.
+
+    Raises:
+        ValueError: If the value, or a value nested in it, cannot be encoded.
+    """
+    if isinstance(value, Enum):
+        return value.value
+    if value is None or isinstance(value, (bool, int, str)):
+        return value
+    if isinstance(value, float):
+        if value != value or value in (float("inf"), float("-inf")):
+            raise ValueError("NaN and infinite values cannot be encoded")
+        return int(value) if value.is_integer() and abs(value) < 2**53 else value
+    if owner is not None and isinstance(value, _Owned):
+        value._register_digest_owner(owner)
+    if isinstance(value, (list, tuple)):
+        return [to_primitive(item, owner) for item in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted((to_primitive(item, owner) for item in value), key=_sort_key)
+    if isinstance(value, dict):
+        return {str(key): to_primitive(item, owner) for key, item in value.items()}
+    for value_type, encode in _value_types():
+        if isinstance(value, value_type):
+            return encode(value)
+    if isinstance(value, ContentDigestMixin):
+        if owner is None:
+            return _fields(value)
+        digest = value.content_digest
+        value._register_digest_owner(owner)
+        return {"$digest": digest.hex()}
+    raise ValueError(f"Cannot encode values of type {type(value).__name__}")
+
+
+def canonical_bytes(obj: ContentDigestMixin) -> bytes:
+    """
+    Returns the canonical encoding of a data model object.
+
+    Args:
+        obj (ContentDigestMixin): The object to encode.
+
+    Returns:
+        bytes: UTF-8 JSON with sorted keys and no insignificant whitespace.
+
+    Raises:
+        ValueError: If an attribute of the object cannot be encoded.
+    """
+    return json.dumps(_fields(obj, owner=obj), sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+@functools.cache
+def _value_types() -> tuple:
+    """Returns the value types of the data model with the function that encodes each of them."""
+    # Imported on first use because the data model modules import this module.
+    from pact_methodology.data_quality_indicators.data_quality_rating import DataQualityRating
+    from pact_methodology.datetime import DateTime
+    from pact_methodology.product_footprint.cpc import CPC
+    from pact_methodology.product_footprint.version import Version
+    from pact_methodology.urn import URN
+
+    return (
+        (uuid.UUID, str),
+        (URN, lambda urn: urn.value),
+        (DateTime, lambda datetime: datetime.iso_string),
+        (Version, lambda version: version.version),
+        (CPC, lambda cpc: cpc.code),
+        (DataQualityRating, lambda rating: rating.rating),
+    )
+
+
+def _fields(obj: ContentDigestMixin, owner: ContentDigestMixin | None = None) -> dict:
+    """Returns the type and attributes of a model object, without leading underscores."""
+    fields = {name.lstrip("_"): to_primitive(value, owner) for name, value in vars(obj).items()}
+    fields["$type"] = getattr(type(obj), "_canonical_type", None) or type(obj).__name__
+    return fields
+
+
+def _sort_key(primitive) -> str:
+    """Orders primitives by their JSON encoding."""
+    return json.dumps(primitive, sort_keys=True, separators=(",", ":"))
@@ -1,3 +1,5 @@
+import math
+
 from pact_methodology.assurance.assurance import Assurance
 from pact_methodology.carbon_footprint.characterization_factors import (
     CharacterizationFactors,
@@ -14,8 +16,17 @@ from pact_methodology.data_quality_indicators.data_quality_indicators import (
 from pact_methodology.carbon_footprint.biogenic_accounting_methodology import BiogenicAccountingMethodology
 from pact_methodology.carbon_footprint.product_or_sector_specific_rule_set import ProductOrSectorSpecificRuleSet
 from pact_methodology.carbon_footprint.emission_factor_ds_set import EmissionFactorDSSet
+from pact_methodology.canonical import ContentDigestMixin
+from pact_methodology.rules import DEFAULT_SPEC_VERSION, REGISTRY, Regime
+
+
+def _check_finite(name: str, value) -> None:
+    """Raises ValueError if value is a NaN or infinite float, which no PACT decimal can express."""
+    if isinstance(value, float) and not math.isfinite(value):
+        raise ValueError(f"{name} must be a finite number")
 
-class CarbonFootprint:
+
+class CarbonFootprint(ContentDigestMixin):
     """
     A CarbonFootprint represents the carbon footprint of a product and related data in accordance with the Pathfinder Framework.
 
@@ -54,6 +65,25 @@ class CarbonFootprint:
         product_or_sector_specific_rules (ProductOrSectorSpecificRuleSet | None): If present, refers to a set of product or sector specific rules published by a specific operator and applied during product carbon footprint calculation.
     """
 
+    # The names of the attributes set since the last validation are kept in a slot, so that they do
+    # not show up in the instance __dict__ used by the canonical encoding. ContentDigestMixin wraps
+    # the property setters to record them.
+    __slots__ = ("__dict__", "__weakref__", "_changed_fields")
+
+    CROSS_FIELD_RULES = {
+        "validate_packaging_emissions": frozenset({"packaging_emissions_included", "packaging_ghg_emissions"}),
+    }
+    """The methods checking rules across attributes, mapped to the attributes each rule depends on.
+
+    The required attributes rules are not listed; their dependencies come from pact_methodology.rules.REGISTRY.
+    """
+
+    def __new__(cls, *args, **kwargs):
+        obj = super().__new__(cls)
+        # Carbon footprints made without the constructor, for example by replace, track from the start.
+        object.__setattr__(obj, "_changed_fields", set())
+        return obj
+
     def __init__(
         self,
         declared_unit,
@@ -88,6 +118,8 @@ class CarbonFootprint:
         biogenic_accounting_methodology=None,
         product_or_sector_specific_rules=None
     ):
+        # The constructor validates all attributes at the end, so the attributes it sets are not tracked.
+        object.__setattr__(self, "_changed_fields", None)
         self.declared_unit = declared_unit
         self.unitary_product_amount = unitary_product_amount
         self.p_cf_excluding_biogenic = p_cf_excluding_biogenic
@@ -120,32 +152,75 @@ class CarbonFootprint:
         self.biogenic_accounting_methodology = biogenic_accounting_methodology
         self.product_or_sector_specific_rules = product_or_sector_specific_rules
 
-        required_attributes_before_2025 = ["primary_data_share", "dqi"]
-        required_attributes_after_2025 = [
-            "primary_data_share",
-            "dqi",
-            "p_cf_including_biogenic",
-            "d_luc_ghg_emissions",
-            "land_management_ghg_emissions",
-            "other_biogenic_ghg_emissions",
-            "biogenic_carbon_withdrawal",
-            "biogenic_accounting_methodology",
-        ]
-
-        if reference_period.includes_2025_or_later():
-            for attr in required_attributes_after_2025:
-                if not hasattr(self, attr) or getattr(self, attr) is None:
-                    raise ValueError(
-                        f"Attribute '{attr}' must be defined and not None for reference periods including 2025 or later"
-                    )
-        else:
-            if not any(
-                hasattr(self, attr) and getattr(self, attr) is not None
-                for attr in required_attributes_before_2025
-            ):
-                raise ValueError(
-                    "At least one of 'primary_data_share' or 'dqi' must be defined for reference periods before 2025"
-                )
+        self.validate_required_attributes()
+        object.__setattr__(self, "_changed_fields", set())
+
+    @property
+    def changed_fields(self) -> frozenset[str]:
+        """Gets the names of the attributes set since the carbon footprint was last validated.
+
+        Returns:
+            frozenset[str]: The attribute names, for example {"dqi", "primary_data_share"}.
+        """
+        return frozenset(self._changed_fields)
+
+    def revalidate(self) -> None:
+        """Checks the rules across attributes that depend on an attribute set since the last validation.
+
+        Each setter only checks its own value, so setting attributes one at a time can leave the carbon
+        footprint in a state the constructor would reject, for example by setting
+        packaging_emissions_included to False while packaging_ghg_emissions is defined. Rules that do
+        not depend on a changed attribute are skipped. The changed attributes are forgotten once all
+        rules pass.
+
+        Raises:
+            ValueError: If a rule fails. The changed attributes are kept, so the rule runs again on
+                the next call.
+
+        Examples:
+            >>> pcf.packaging_emissions_included = False
+            >>> pcf.packaging_ghg_emissions = None
+            >>> pcf.revalidate()
+        """
+        changed_fields = self._changed_fields
+        if not changed_fields:
+            return
+        if not changed_fields.isdisjoint(REGISTRY.dependencies("CarbonFootprint")):
+            self.validate_required_attributes()
+        for rule, dependencies in self.CROSS_FIELD_RULES.items():
+            if not changed_fields.isdisjoint(dependencies):
+                getattr(self, rule)()
+        changed_fields.clear()
+
+    def validate_packaging_emissions(self) -> None:
+        """Checks packaging_ghg_emissions against packaging_emissions_included.
+
+        Raises:
+            ValueError: If packaging emissions are included and packaging_ghg_emissions is None, or if
+                they are not included and packaging_ghg_emissions is defined.
+        """
+        if self.packaging_emissions_included and self.packaging_ghg_emissions is None:
+            raise ValueError(
+                "packaging_ghg_emissions must be a non-negative number if packaging_emissions_included is true"
+            )
+        if not self.packaging_emissions_included and self.packaging_ghg_emissions is not None:
+            raise ValueError("packaging_ghg_emissions must not be defined if packaging_emissions_included is false")
+
+    def validate_required_attributes(self, spec_version: str = DEFAULT_SPEC_VERSION) -> None:
+        """Checks the attributes required for the reference period of the carbon footprint.
+
+        For reference periods including 2025 or later, primary_data_share, dqi, p_cf_including_biogenic,
+        the biogenic and land use emissions, and biogenic_accounting_methodology must be defined. For
+        earlier reference periods, at least one of primary_data_share or dqi must be defined. The rules
+        are registered in pact_methodology.rules.REGISTRY.
+
+        Args:
+            spec_version (str): The spec version whose rules to check. Defaults to DEFAULT_SPEC_VERSION.
+
+        Raises:
+            ValueError: If a required attribute is None, or no rules are registered for spec_version.
+        """
+        REGISTRY.compiled("CarbonFootprint", spec_version, Regime.of(self.reference_period))(self)
 
     @property
     def declared_unit(self):
@@ -189,8 +264,10 @@ class CarbonFootprint:
             value (float): The unitary product amount to set.
 
         Raises:
+            ValueError: If value is NaN or infinite.
             ValueError: If value is not greater than 0.
         """
+        _check_finite("unitary_product_amount", value)
         if value <= 0:
             raise ValueError("unitary_product_amount must be strictly greater than 0")
         self._unitary_product_amount = value
@@ -212,8 +289,10 @@ class CarbonFootprint:
             value (float): The carbon footprint to set.
 
         Raises:
+            ValueError: If value is NaN or infinite.
             ValueError: If value is negative.
         """
+        _check_finite("p_cf_excluding_biogenic", value)
         if value < 0:
             raise ValueError("p_cf_excluding_biogenic must be equal to or greater than 0")
         self._p_cf_excluding_biogenic = value
@@ -235,8 +314,10 @@ class CarbonFootprint:
             value (float): The emissions to set.
 
         Raises:
+            ValueError: If value is NaN or infinite.
             ValueError: If value is negative.
         """
+        _check_finite("fossil_ghg_emissions", value)
         if value < 0:
             raise ValueError("fossil_ghg_emissions must be equal to or greater than 0")
         self._fossil_ghg_emissions = value
@@ -258,8 +339,10 @@ class CarbonFootprint:
             value (float): The carbon content to set.
 
         Raises:
+            ValueError: If value is NaN or infinite.
             ValueError: If value is negative.
         """
+        _check_finite("fossil_carbon_content", value)
         if value < 0:
             raise ValueError("fossil_carbon_content must be equal to or greater than 0")
         self._fossil_carbon_content = value
@@ -281,8 +364,10 @@ class CarbonFootprint:
             value (float): The carbon content to set.
 
         Raises:
+            ValueError: If value is NaN or infinite.
             ValueError: If value is negative.
         """
+        _check_finite("biogenic_carbon_content", value)
         if value < 0:
             raise ValueError("biogenic_carbon_content must be equal to or greater than 0")
         self._biogenic_carbon_content = value
@@ -419,8 +504,10 @@ class CarbonFootprint:
             value (float): The percent to set.
 
         Raises:
+            ValueError: If value is NaN or infinite.
             ValueError: If value is not between 0.0 and 5.0 inclusive.
         """
+        _check_finite("exempted_emissions_percent", value)
         if not 0.0 <= value <= 5.0:
             raise ValueError("exempted_emissions_percent must be between 0.0 and 5.0")
         self._exempted_emissions_percent = value
@@ -534,8 +621,10 @@ class CarbonFootprint:
             value (float | None): The carbon footprint to set.
 
         Raises:
+            ValueError: If value is NaN or infinite.
             ValueError: If value is not a number or None.
         """
+        _check_finite("p_cf_including_biogenic", value)
         if value is not None and not isinstance(value, (int, float)):
             raise ValueError("p_cf_including_biogenic must be a number")
         self._p_cf_including_biogenic = value
@@ -557,8 +646,10 @@ class CarbonFootprint:
             value (float | None): The share to set.
 
         Raises:
+            ValueError: If value is NaN or infinite.
             ValueError: If value is not a number or None.
         """
+        _check_finite("primary_data_share", value)
         if not isinstance(value, (int, float)) and value is not None:
             raise ValueError("primary_data_share must be a number")
         self._primary_data_share = value
@@ -603,8 +694,10 @@ class CarbonFootprint:
             value (float | None): The emissions to set.
 
         Raises:
+            ValueError: If value is NaN or infinite.
             ValueError: If value is not a non-negative number or None.
         """
+        _check_finite("d_luc_ghg_emissions", value)
         if value is not None and (not isinstance(value, (int, float)) or value < 0):
             raise ValueError("d_luc_ghg_emissions must be a non-negative number")
         self._d_luc_ghg_emissions = value
@@ -626,8 +719,10 @@ class CarbonFootprint:
             value (float | None): The emissions to set.
 
         Raises:
+            ValueError: If value is NaN or infinite.
             ValueError: If value is not a number or None.
         """
+        _check_finite("land_management_ghg_emissions", value)
         if value is not None and not isinstance(value, (int, float)):
             raise ValueError("land_management_ghg_emissions must be a number")
         self._land_management_ghg_emissions = value
@@ -649,8 +744,10 @@ class CarbonFootprint:
             value (float | None): The emissions to set.
 
         Raises:
+            ValueError: If value is NaN or infinite.
             ValueError: If value is not a non-negative number or None.
         """
+        _check_finite("other_biogenic_ghg_emissions", value)
         if value is not None and (not isinstance(value, (int, float)) or value < 0):
             raise ValueError("other_biogenic_ghg_emissions must be a non-negative number")
         self._other_biogenic_ghg_emissions = value
@@ -672,8 +769,10 @@ class CarbonFootprint:
             value (float | None): The withdrawal to set.
 
         Raises:
+            ValueError: If value is NaN or infinite.
             ValueError: If value is not a non-positive number or None.
         """
+        _check_finite("biogenic_carbon_withdrawal", value)
         if value is not None and (not isinstance(value, (int, float)) or value > 0):
             raise ValueError("biogenic_carbon_withdrawal must be a non-positive number")
         self._biogenic_carbon_withdrawal = value
@@ -695,8 +794,10 @@ class CarbonFootprint:
             value (float | None): The emissions to set.
 
         Raises:
+            ValueError: If value is NaN or infinite.
             ValueError: If value is not a non-negative number or None.
         """
+        _check_finite("iluc_ghg_emissions", value)
         if value is not None and (not isinstance(value, (int, float)) or value < 0):
             raise ValueError("iluc_ghg_emissions must be a non-negative number")
         self._iluc_ghg_emissions = value
@@ -718,8 +819,10 @@ class CarbonFootprint:
             value (float | None): The emissions to set.
 
         Raises:
+            ValueError: If value is NaN or infinite.
             ValueError: If value is not a non-negative number or None.
         """
+        _check_finite("aircraft_ghg_emissions", value)
         if value is not None and (not isinstance(value, (int, float)) or value < 0):
             raise ValueError("aircraft_ghg_emissions must be a non-negative number")
         self._aircraft_ghg_emissions = value
@@ -741,8 +844,10 @@ class CarbonFootprint:
             value (float | None): The emissions to set.
 
         Raises:
+            ValueError: If value is NaN or infinite.
             ValueError: If packaging emissions are not included and value is defined, or if value is not a non-negative number when packaging emissions are included.
         """
+        _check_finite("packaging_ghg_emissions", value)
         if self.packaging_emissions_included and (value is None or not isinstance(value, (int, float)) or value < 0):
             raise ValueError("packaging_ghg_emissions must be a non-negative number if packaging_emissions_included is true")
         elif value is not None and not self.packaging_emissions_included:
@@ -937,7 +1042,30 @@ class CarbonFootprint:
         )
 
     def __eq__(self, other):
-        return self.__dict__ == other.__dict__
+        """
+        Compares two CarbonFootprint instances by their content digest.
+
+        Args:
+            other (object): The object to compare with.
+
+        Returns:
+            bool: True if other is a CarbonFootprint with the same content, False otherwise.
+        """
+        if not isinstance(other, CarbonFootprint):
+            return False
+        return self is other or self.content_digest == other.content_digest
 
     def __ne__(self, other):
-        return not self.__eq__(other)
\ No newline at end of file
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        """
+        Returns a hash of the content digest.
+
+        The hash changes when the CarbonFootprint changes, so it must not be modified while it is
+        used as a dict key or set member.
+
+        Returns:
+            int: The hash value.
+        """
+        return hash(self.content_digest)
\ No newline at end of file
@@ -1,9 +1,10 @@
 from typing import Iterable, Set
 
 from pact_methodology.carbon_footprint.cross_sectoral_standard import CrossSectoralStandard
+from pact_methodology.canonical import ContentDigestMixin
 
 
-class CrossSectoralStandardSet:
+class CrossSectoralStandardSet(ContentDigestMixin):
     """
     CrossSectoralStandardSet is a set of CrossSectoralStandard values.
 
@@ -46,10 +47,12 @@ class CrossSectoralStandardSet:
     def add(self, standard: CrossSectoralStandard):
         """Add a standard to the set."""
         self._standards.add(standard)
+        self._invalidate_content_digest()
 
     def remove(self, standard: CrossSectoralStandard):
         """Remove a standard from the set."""
         self._standards.discard(standard)
+        self._invalidate_content_digest()
 
     def add_multiple(self, standards: Iterable[CrossSectoralStandard]):
         """Add multiple standards to the set."""
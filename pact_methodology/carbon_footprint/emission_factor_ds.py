@@ -1,4 +1,7 @@
-class EmissionFactorDS:
+from pact_methodology.canonical import ContentDigestMixin
+
+
+class EmissionFactorDS(ContentDigestMixin):
     """Represents an emission factor database reference.
 
     This class represents references to emission factor databases as defined in
@@ -1,9 +1,10 @@
 from typing import List, Optional
 from pact_methodology.carbon_footprint.emission_factor_ds import EmissionFactorDS
 from pact_methodology.exceptions import DuplicateIdError
+from pact_methodology.canonical import ContentDigestMixin
 
 
-class EmissionFactorDSSet:
+class EmissionFactorDSSet(ContentDigestMixin):
     """A set of emission factor database references.
 
     This class represents a collection of one or more emission factor database references
@@ -151,6 +152,7 @@ class EmissionFactorDSSet:
             raise DuplicateIdError("duplicate emission factor database reference")
 
         self._emission_factor_ds_list.append(ds)
+        self._invalidate_content_digest()
 
     def remove_ds(self, ds: EmissionFactorDS):
         """Remove an emission factor database reference from the set.
@@ -180,6 +182,7 @@ class EmissionFactorDSSet:
         if ds not in self._emission_factor_ds_list:
             raise ValueError("reference not found in the set")
         self._emission_factor_ds_list.remove(ds)
+        self._invalidate_content_digest()
 
     def to_dict(self) -> List[dict]:
         """Convert the set to a JSON-compatible format.
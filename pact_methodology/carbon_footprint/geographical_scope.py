@@ -3,6 +3,7 @@ from enum import Enum
 import pycountry
 
 from pact_methodology.carbon_footprint.region_or_subregion import RegionOrSubregion
+from pact_methodology.canonical import ContentDigestMixin
 
 
 class GeographicalGranularity(Enum):
@@ -40,7 +41,7 @@ class GeographicalGranularity(Enum):
         return f"GeographicalGranularity.{self.name}"
 
 
-class CarbonFootprintGeographicalScope:
+class CarbonFootprintGeographicalScope(ContentDigestMixin):
     """
     Represents the geographical scope of a Carbon Footprint.
 
@@ -92,9 +93,6 @@ class CarbonFootprintGeographicalScope:
         geography_region_or_subregion: RegionOrSubregion | str = None,
     ) -> None:
 
-        self.scope: str | RegionOrSubregion
-        self.granularity: GeographicalGranularity
-
         if global_scope and (
             geography_country_subdivision
             or geography_country
@@ -141,6 +139,26 @@ class CarbonFootprintGeographicalScope:
                 "At least one argument must be provided from: global_scope, geography_country_subdivision, geography_country, or geography_region_or_subregion"
             )
 
+    @property
+    def scope(self) -> str | RegionOrSubregion:
+        """Gets the geographical scope."""
+        return self._scope
+
+    @scope.setter
+    def scope(self, value: str | RegionOrSubregion):
+        """Sets the geographical scope."""
+        self._scope = value
+
+    @property
+    def granularity(self) -> GeographicalGranularity:
+        """Gets the granularity of the geographical scope."""
+        return self._granularity
+
+    @granularity.setter
+    def granularity(self, value: GeographicalGranularity):
+        """Sets the granularity of the geographical scope."""
+        self._granularity = value
+
     def __str__(self):
         return f"Geographical scope: {self.scope} (at {self.granularity.value} level)"
         
@@ -1,9 +1,10 @@
 from pact_methodology.carbon_footprint.product_or_sector_specific_rule_operator import (
     ProductOrSectorSpecificRuleOperator
 )
+from pact_methodology.canonical import ContentDigestMixin
 
 
-class ProductOrSectorSpecificRule:
+class ProductOrSectorSpecificRule(ContentDigestMixin):
     """Represents a product or sector specific rule for calculating carbon footprints.
 
     This class represents rules and methodologies published by specific operators that must be followed
@@ -1,7 +1,8 @@
 from typing import List, Optional
 from pact_methodology.carbon_footprint.product_or_sector_specific_rule import ProductOrSectorSpecificRule
+from pact_methodology.canonical import ContentDigestMixin
 
-class ProductOrSectorSpecificRuleSet:
+class ProductOrSectorSpecificRuleSet(ContentDigestMixin):
     """A set of product or sector specific rules published by operators and applied during product carbon footprint calculation.
 
     This class represents a collection of one or more ProductOrSectorSpecificRule objects. Each rule defines specific 
@@ -173,6 +174,7 @@ class ProductOrSectorSpecificRuleSet:
         if not isinstance(rule, ProductOrSectorSpecificRule):
             raise ValueError("rule must be an instance of ProductOrSectorSpecificRule")
         self.rules.append(rule)
+        self._invalidate_content_digest()
 
     def remove_rule(self, rule: ProductOrSectorSpecificRule):
         """Remove a product/sector specific rule from the set.
@@ -209,6 +211,7 @@ class ProductOrSectorSpecificRuleSet:
         if rule not in self.rules:
             raise ValueError("rule not found in the set")
         self.rules.remove(rule)
+        self._invalidate_content_digest()
 
     def to_dict(self) -> List[dict]:
         """Convert the rule set to a JSON-compatible format.
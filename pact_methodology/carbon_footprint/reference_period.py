@@ -1,9 +1,10 @@
 from __future__ import annotations  # For forward references within the module
 
 from pact_methodology.datetime import DateTime
+from pact_methodology.canonical import ContentDigestMixin
 
 
-class ReferencePeriod:
+class ReferencePeriod(ContentDigestMixin):
 
     def __init__(self, start: DateTime, end: DateTime):
         """Represents a reference period with a start and end date.
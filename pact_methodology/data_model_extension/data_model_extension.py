@@ -1,9 +1,10 @@
 from packaging.version import Version, InvalidVersion
 from urllib.parse import urlparse
 import json
+from pact_methodology.canonical import ContentDigestMixin
 
 
-class DataModelExtension:
+class DataModelExtension(ContentDigestMixin):
     """
     Data Model Extension class.
 
@@ -74,6 +75,46 @@ class DataModelExtension:
         self.data = data
         self.documentation = documentation
 
+    @property
+    def spec_version(self) -> str:
+        """Gets the version of the Data Model Extension specification."""
+        return self._spec_version
+
+    @spec_version.setter
+    def spec_version(self, value: str):
+        """Sets the version of the Data Model Extension specification."""
+        self._spec_version = value
+
+    @property
+    def data_schema(self) -> str:
+        """Gets the URL of the Extension Schema File."""
+        return self._data_schema
+
+    @data_schema.setter
+    def data_schema(self, value: str):
+        """Sets the URL of the Extension Schema File."""
+        self._data_schema = value
+
+    @property
+    def data(self) -> dict:
+        """Gets the JSON Object conforming to the extension schema."""
+        return self._data
+
+    @data.setter
+    def data(self, value: dict):
+        """Sets the JSON Object conforming to the extension schema."""
+        self._data = value
+
+    @property
+    def documentation(self) -> str | None:
+        """Gets the URL of the Extension Documentation."""
+        return self._documentation
+
+    @documentation.setter
+    def documentation(self, value: str | None):
+        """Sets the URL of the Extension Documentation."""
+        self._documentation = value
+
     def __eq__(self, other):
         """
         Returns True if the other object is a DataModelExtension with the same attributes.
@@ -8,11 +8,15 @@ Each DQI is represented as a set of attributes, including a reference period and
 This module provides the `DataQualityIndicators` class to encapsulate and validate DQI values.
 """
 
+import math
+
 from pact_methodology.carbon_footprint.reference_period import ReferencePeriod
 from pact_methodology.data_quality_indicators.data_quality_rating import DataQualityRating
 from pact_methodology.datetime import DateTime
+from pact_methodology.canonical import ContentDigestMixin
+from pact_methodology.rules import DEFAULT_SPEC_VERSION, REGISTRY, Regime
 
-class DataQualityIndicators:
+class DataQualityIndicators(ContentDigestMixin):
     """
     Represents quantitative data quality indicators.
 
@@ -89,21 +93,23 @@ class DataQualityIndicators:
         self.completeness_dqr = completeness_dqr
         self.reliability_dqr = reliability_dqr
 
-        required_attributes_after_2025 = [
-            "coverage_percent",
-            "technological_dqr",
-            "temporal_dqr",
-            "geographical_dqr",
-            "completeness_dqr",
-            "reliability_dqr",
-        ]
-
-        if reference_period is not None and reference_period.includes_2025_or_later():
-            for attr in required_attributes_after_2025:
-                if not hasattr(self, attr) or getattr(self, attr) is None:
-                    raise ValueError(
-                        f"Attribute '{attr}' must be defined and not None for reference periods including 2025 or later"
-                    )
+        self.validate_required_attributes()
+
+    def validate_required_attributes(self, spec_version: str = DEFAULT_SPEC_VERSION) -> None:
+        """
+        Checks the attributes required for the reference period of the data quality indicators.
+
+        The rules are registered in pact_methodology.rules.REGISTRY.
+
+        Args:
+            spec_version (str): The spec version whose rules to check. Defaults to DEFAULT_SPEC_VERSION.
+
+        Raises:
+            ValueError: If coverage_percent or a rating is None for a reference period including 2025 or later,
+                or no rules are registered for spec_version.
+        """
+        if self.reference_period is not None:
+            REGISTRY.compiled("DataQualityIndicators", spec_version, Regime.of(self.reference_period))(self)
 
     @property
     def reference_period(self):
@@ -162,7 +168,7 @@ class DataQualityIndicators:
             value (float | None): The coverage percentage to set.
 
         Raises:
-            ValueError: If value is not a number.
+            ValueError: If value is not a number, or is NaN or infinite.
 
         Examples:
             >>> from pact_methodology.datetime import DateTime
@@ -179,6 +185,8 @@ class DataQualityIndicators:
         """
         if value is not None and not isinstance(value, (int, float)):
             raise ValueError("coverage_percent must be a number")
+        if isinstance(value, float) and not math.isfinite(value):
+            raise ValueError("coverage_percent must be a finite number")
         self._coverage_percent = value
 
     @property
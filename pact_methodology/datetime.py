@@ -90,6 +90,19 @@ class DateTime:
             return False
         return self.iso_string == other.iso_string
 
+    def __hash__(self) -> int:
+        """
+        Returns the hash of the ISO 8601 string, consistent with __eq__.
+
+        Returns:
+            int: The hash value.
+        """
+        return hash(self.iso_string)
+
+    def __reduce__(self):
+        """Pickles the DateTime as its ISO 8601 string."""
+        return DateTime, (self.iso_string,)
+
     def __lt__(self, other: "DateTime") -> bool:
         """
         Compares this DateTime object with another DateTime object for less than.
@@ -2,3 +2,78 @@ class DuplicateIdError(ValueError):
     """Raised when there are duplicate IDs in the list."""
 
     pass
+
+
+class LineageCycleError(ValueError):
+    """Raised when linking a footprint through preceding_pf_ids would create a cycle."""
+
+    pass
+
+
+class BomCycleError(ValueError):
+    """Raised when a bill of materials contains an assembly among its own components."""
+
+    pass
+
+
+class JsonPatchError(ValueError):
+    """Raised when a JSON Patch operation is malformed, fails, or leaves a footprint invalid."""
+
+    pass
+
+
+class BulkBuildError(ValueError):
+    """Raised when a record cannot be decoded into a valid footprint during a bulk build."""
+
+    pass
+
+
+class PactApiError(ValueError):
+    """
+    Raised when a PACT host cannot be reached or returns an error or an invalid response.
+
+    Attributes:
+        status (int | None): The HTTP status of an error response.
+        code (str | None): The PACT error code of an error response, for example "NoSuchFootprint".
+    """
+
+    def __init__(self, message: str, status: int | None = None, code: str | None = None):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+
+
+class FilterError(ValueError):
+    """Raised when a $filter expression is malformed or uses a field or operator that is not supported."""
+
+    pass
+
+
+class SnapshotExpiredError(ValueError):
+    """Raised when a cursor refers to a repository snapshot whose replaced footprints are no longer kept."""
+
+    pass
+
+
+class CsvImportError(ValueError):
+    """Raised when a CSV file of footprints cannot be read or one of its rows is invalid."""
+
+    pass
+
+
+class LogCorruptedError(ValueError):
+    """Raised when a write-ahead log or snapshot file is damaged anywhere but at the end of the log."""
+
+    pass
+
+
+class SnapshotFileError(ValueError):
+    """Raised when a repository snapshot file is truncated, damaged or of an unknown format."""
+
+    pass
+
+
+class CatalogFileError(ValueError):
+    """Raised when a catalog generation file is truncated, damaged or of an unknown format."""
+
+    pass
@@ -0,0 +1,424 @@
+"""
+An asyncio client for the PACT Data Exchange API.
+
+`PactClient` authenticates with the client credentials flow of the PACT Technical Specifications
+and reads footprints from a host system:
+
+- `token` requests an access token from `/auth/token` and caches it until shortly before it expires.
+- `list_footprints` runs the `ListFootprints` action (`GET /2/footprints`) and follows the `Link`
+  header from page to page. It yields `ProductFootprint` objects as a stream, and requests the next
+  page while the current one is decoded.
+- `get_footprint` runs the `GetFootprint` action (`GET /2/footprints/{id}`).
+
+Requests to each host share a pool of keep-alive connections.
+
+Examples:
+    >>> async with PactClient("https://pact.example.com", "client-id", "secret") as client:
+    ...     async for footprint in client.list_footprints(limit=100):
+    ...         repository.add(footprint)
+"""
+
+import asyncio
+import base64
+import json
+import random
+import re
+import ssl
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass
+from urllib.parse import quote, urlencode
+
+from pact_methodology.exceptions import PactApiError
+from pact_methodology.exchange.http import DEFAULT_TIMEOUT, ConnectionPool, Response, split_url
+from pact_methodology.exchange.json_codec import decode_product_footprint
+from pact_methodology.product_footprint.id import ProductFootprintId
+from pact_methodology.product_footprint.product_footprint import ProductFootprint
+
+TOKEN_EXPIRY_MARGIN = 30.0
+"""The number of seconds before its expiry at which a cached access token is replaced."""
+
+_LINK = re.compile(r'<([^>]*)>\s*((?:;\s*[^;,]*)*)')
+_REL = re.compile(r';\s*rel\s*=\s*"?([^";,]+)"?', re.IGNORECASE)
+
+
+def parse_link_header(value: str) -> dict[str, str]:
+    """
+    Parses an HTTP Link header.
+
+    Args:
+        value (str): The header value, for example '<https://example.com/2/footprints?offset=10>; rel="next"'.
+
+    Returns:
+        dict[str, str]: The URL of each link relation, for example {"next": "https://..."}.
+
+    Examples:
+        >>> parse_link_header('<https://example.com/2/footprints?offset=10>; rel="next"')
+        {'next': 'https://example.com/2/footprints?offset=10'}
+    """
+    links = {}
+    for match in _LINK.finditer(value):
+        for rel in _REL.findall(match.group(2)):
+            for name in rel.split():
+                links.setdefault(name.lower(), match.group(1))
+    return links
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    When and how long to wait before repeating a failed request.
+
+    Requests are repeated if the host cannot be reached, times out, or answers with one of the
+    retryable statuses. The delay doubles with every attempt, with random jitter so that many
+    clients do not retry in step, and is at least the Retry-After of the response.
+
+    Attributes:
+        attempts (int): The largest number of attempts per request, including the first.
+        backoff (float): The delay in seconds before the second attempt.
+        max_backoff (float): The longest delay in seconds.
+        statuses (frozenset[int]): The response statuses that are retried.
+    """
+
+    attempts: int = 3
+    backoff: float = 0.5
+    max_backoff: float = 30.0
+    statuses: frozenset[int] = frozenset({429, 500, 502, 503, 504})
+
+    def __post_init__(self):
+        if self.attempts < 1:
+            raise ValueError("attempts must be positive")
+        if self.backoff < 0 or self.max_backoff < 0:
+            raise ValueError("backoff and max_backoff must not be negative")
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float:
+        """
+        Returns the time to wait after a failed attempt.
+
+        Args:
+            attempt (int): The number of the failed attempt, starting at 1.
+            retry_after (float | None): The Retry-After of the response in seconds, if any.
+
+        Returns:
+            float: The delay in seconds, at most max_backoff.
+        """
+        delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1)) * random.uniform(0.5, 1.0)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return min(delay, self.max_backoff)
+
+
+class RateLimiter:
+    """
+    A token bucket limiting the rate of requests.
+
+    Up to burst requests can start at once; after that, requests start at the given rate.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Initializes a RateLimiter with a full bucket.
+
+        Args:
+            rate (float): The sustained number of requests per second.
+            burst (int): The number of requests that can start without waiting.
+
+        Raises:
+            ValueError: If rate or burst is not positive.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst < 1:
+            raise ValueError("burst must be positive")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated: float | None = None
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Waits until a request may start."""
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            now = loop.time()
+            if self._updated is not None:
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._updated = loop.time()
+                self._tokens = 1.0
+            self._tokens -= 1
+
+
+class PactClient:
+    """
+    A client for the PACT Data Exchange API of one host system.
+
+    Use the client as an async context manager, or call `close` when done, to close its connections.
+
+    Attributes:
+        base_url (str): The URL the API paths are relative to.
+        auth_url (str): The URL of the token endpoint.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        client_id: str,
+        client_secret: str,
+        *,
+        auth_url: str | None = None,
+        max_connections: int = 4,
+        timeout: float = DEFAULT_TIMEOUT,
+        ssl_context: ssl.SSLContext | None = None,
+        retry: RetryPolicy | None = None,
+        rate_limiter: RateLimiter | None = None,
+        on_response: Callable[[str, str, int | None, float], None] | None = None,
+    ):
+        """
+        Initializes a PactClient.
+
+        Args:
+            base_url (str): The URL of the host system, for example "https://pact.example.com".
+            client_id (str): The client id of the credentials.
+            client_secret (str): The client secret of the credentials.
+            auth_url (str | None): The URL of the token endpoint. Defaults to base_url + "/auth/token".
+            max_connections (int): The largest number of open connections per host.
+            timeout (float): The time in seconds to wait for each response.
+            ssl_context (ssl.SSLContext | None): The TLS settings. Defaults to ssl.create_default_context().
+            retry (RetryPolicy | None): When to repeat failed requests. By default they are not repeated.
+            rate_limiter (RateLimiter | None): Limits the rate of requests, including token requests.
+                It can be shared between clients.
+            on_response (Callable[[str, str, int | None, float], None] | None): Called after every
+                attempt with the method, URL, response status and duration in seconds. The status is
+                None if no response was received.
+
+        Raises:
+            ValueError: If a URL is not an absolute http or https URL.
+        """
+        self.base_url = base_url.rstrip("/")
+        self.auth_url = auth_url or f"{self.base_url}/auth/token"
+        split_url(self.base_url)
+        split_url(self.auth_url)
+        credentials = f"{client_id}:{client_secret}".encode()
+        self._basic_auth = "Basic " + base64.b64encode(credentials).decode("ascii")
+        self._pool_options = {"max_connections": max_connections, "timeout": timeout, "ssl_context": ssl_context}
+        self._pools: dict[str, ConnectionPool] = {}
+        self._token: str | None = None
+        self._token_expires = 0.0
+        self._token_lock = asyncio.Lock()
+        self.retry = retry or RetryPolicy(attempts=1)
+        self.rate_limiter = rate_limiter
+        self.on_response = on_response
+
+    async def __aenter__(self) -> "PactClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Closes the pooled connections."""
+        pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            await pool.close()
+
+    async def token(self) -> str:
+        """
+        Returns an access token, requesting a new one if there is no valid cached token.
+
+        Tokens without an expiry are cached until the host rejects them.
+
+        Returns:
+            str: The access token.
+
+        Raises:
+            PactApiError: If the host rejects the credentials or returns an invalid response.
+        """
+        async with self._token_lock:
+            loop = asyncio.get_running_loop()
+            if self._token is not None and loop.time() < self._token_expires:
+                return self._token
+            response = await self._send(
+                "POST",
+                self.auth_url,
+                {
+                    "Authorization": self._basic_auth,
+                    "Content-Type": "application/x-www-form-urlencoded",
+                    "Accept": "application/json",
+                },
+                urlencode({"grant_type": "client_credentials"}).encode("ascii"),
+            )
+            data = _json_object(response)
+            token = data.get("access_token")
+            if not isinstance(token, str) or not token:
+                raise PactApiError("Token response has no access_token")
+            expires_in = data.get("expires_in")
+            if isinstance(expires_in, (int, float)) and not isinstance(expires_in, bool):
+                self._token_expires = loop.time() + expires_in - min(TOKEN_EXPIRY_MARGIN, expires_in / 2)
+            else:
+                self._token_expires = float("inf")
+            self._token = token
+            return token
+
+    async def list_footprints(
+        self, *, limit: int | None = None, filter: str | None = None, yield_errors: bool = False
+    ) -> AsyncIterator[ProductFootprint | ValueError]:
+        """
+        Streams the footprints of the ListFootprints action, following the pagination links.
+
+        The next page is requested before the footprints of the current page are decoded, so the
+        transfer of one page overlaps with the decoding of the previous one.
+
+        Args:
+            limit (int | None): The largest number of footprints per page.
+            filter (str | None): A $filter expression, for hosts that support filtering.
+            yield_errors (bool): Whether to yield the error of a footprint that fails to decode in
+                its place and go on with the next one, instead of raising it.
+
+        Yields:
+            ProductFootprint | ValueError: The footprints, in the order the host returns them, and
+                with yield_errors, the errors of the invalid ones.
+
+        Raises:
+            PactApiError: If the host returns an error or an invalid response, or links to another host.
+            ValueError: If limit is not positive, or a footprint is invalid and yield_errors is False.
+        """
+        if limit is not None and limit < 1:
+            raise ValueError("limit must be positive")
+        query = {key: value for key, value in (("limit", limit), ("$filter", filter)) if value is not None}
+        url = f"{self.base_url}/2/footprints"
+        if query:
+            url += "?" + urlencode(query, quote_via=quote)
+        origin, _ = split_url(url)
+
+        fetch = asyncio.ensure_future(self._get(url))
+        try:
+            while fetch is not None:
+                response = await fetch
+                fetch = None
+                next_url = parse_link_header(response.headers.get("link", "")).get("next")
+                if next_url is not None:
+                    if split_url(next_url)[0] != origin:
+                        raise PactApiError(f"Next page link points to another host: {next_url}")
+                    fetch = asyncio.ensure_future(self._get(next_url))
+                    # Let the request go out before decoding the page.
+                    await asyncio.sleep(0)
+                data = _json_object(response).get("data")
+                if not isinstance(data, list):
+                    raise PactApiError("ListFootprints response has no data array")
+                for item in data:
+                    if not yield_errors:
+                        yield decode_product_footprint(item)
+                        continue
+                    try:
+                        footprint = decode_product_footprint(item)
+                    except ValueError as error:
+                        footprint = error
+                    yield footprint
+        finally:
+            if fetch is not None:
+                fetch.cancel()
+                if fetch.done() and not fetch.cancelled():
+                    fetch.exception()
+
+    async def get_footprint(self, id: ProductFootprintId | str) -> ProductFootprint:
+        """
+        Returns one footprint by id with the GetFootprint action.
+
+        Args:
+            id (ProductFootprintId | str): The footprint id.
+
+        Returns:
+            ProductFootprint: The footprint.
+
+        Raises:
+            PactApiError: If the host returns an error, for example NoSuchFootprint, or an invalid response.
+            ValueError: If the footprint is invalid.
+        """
+        response = await self._get(f"{self.base_url}/2/footprints/{quote(str(id), safe='')}")
+        return decode_product_footprint(_json_object(response).get("data"))
+
+    async def _get(self, url: str) -> Response:
+        """Sends an authenticated GET request, renewing the token once if the host rejects it."""
+        token = await self.token()
+        response = await self._send("GET", url, _bearer(token), raise_for_status=False)
+        if response.status == 401:
+            async with self._token_lock:
+                if self._token == token:
+                    self._token = None
+            response = await self._send("GET", url, _bearer(await self.token()), raise_for_status=False)
+        _raise_for_status(response)
+        return response
+
+    async def _send(
+        self, method: str, url: str, headers: dict[str, str], body: bytes = b"", raise_for_status: bool = True
+    ) -> Response:
+        """Sends a request on the pool of the URL's origin, repeating it as the retry policy allows."""
+        origin, target = split_url(url)
+        pool = self._pools.get(origin)
+        if pool is None:
+            pool = self._pools[origin] = ConnectionPool(origin, **self._pool_options)
+        loop = asyncio.get_running_loop()
+        attempt = 0
+        while True:
+            attempt += 1
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire()
+            start = loop.time()
+            try:
+                response = await pool.request(method, target, headers, body)
+            except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError, ValueError) as error:
+                self._report(method, url, None, loop.time() - start)
+                if attempt >= self.retry.attempts:
+                    raise PactApiError(f"{method} {url} failed: {error!r}") from error
+                await asyncio.sleep(self.retry.delay(attempt))
+                continue
+            self._report(method, url, response.status, loop.time() - start)
+            if response.status not in self.retry.statuses or attempt >= self.retry.attempts:
+                break
+            await asyncio.sleep(self.retry.delay(attempt, _retry_after(response)))
+        if raise_for_status:
+            _raise_for_status(response)
+        return response
+
+    def _report(self, method: str, url: str, status: int | None, seconds: float) -> None:
+        if self.on_response is not None:
+            self.on_response(method, url, status, seconds)
+
+
+def _retry_after(response: Response) -> float | None:
+    """Returns the Retry-After of a response in seconds, if it is given as a number."""
+    try:
+        return max(0.0, float(response.headers["retry-after"]))
+    except (KeyError, ValueError):
+        return None
+
+
+def _bearer(token: str) -> dict[str, str]:
+    return {"Authorization": f"Bearer {token}", "Accept": "application/json"}
+
+
+def _json_object(response: Response) -> dict:
+    """Returns the JSON object in the body of a response."""
+    try:
+        data = response.json()
+    except ValueError as error:
+        raise PactApiError(f"Response is not valid JSON: {error}") from error
+    if not isinstance(data, dict):
+        raise PactApiError("Response is not a JSON object")
+    return data
+
+
+def _raise_for_status(response: Response) -> None:
+    """Raises PactApiError with the PACT error code and message of an error response."""
+    if response.status < 400:
+        return
+    try:
+        error = json.loads(response.body)
+    except ValueError:
+        error = None
+    if isinstance(error, dict) and "code" in error:
+        code = str(error["code"])
+        raise PactApiError(f"HTTP {response.status} {code}: {error.get('message', '')}", response.status, code)
+    raise PactApiError(f"HTTP {response.status}", response.status)
@@ -0,0 +1,583 @@
+"""
+Streaming import of footprints from CSV files.
+
+Suppliers often send footprints as flat CSV exports with one row per footprint. A `ColumnMapping`
+names the CSV column of each member of the PACT JSON representation, by its path such as
+"pcf/pCfExcludingBiogenic", and gives default cell texts for members the file lacks. `CsvImporter`
+reads a file a chunk of rows at a time, so its memory use depends on the chunk size and not on the
+size of the file, and emits either:
+
+- ProductFootprint objects with `footprints`, decoded and validated like PACT JSON by
+  `decode_product_footprint`, or
+- a FootprintTable per chunk with `tables`, decoded a column at a time with NumPy. Every distinct
+  CPC code, enum value and geography is validated once, numbers are range-checked a column at a
+  time, and no model objects are built, which makes this path faster by two orders of magnitude.
+  Only the members stored in the table are read and validated.
+
+Invalid rows raise a CsvImportError naming the line, or are passed to on_error and skipped.
+
+Examples:
+    >>> mapping = ColumnMapping(
+    ...     {"id": "PCF ID", "productCategoryCpc": "CPC", "pcf/pCfExcludingBiogenic": "PCF (kg CO2e)", ...},
+    ...     defaults={"specVersion": "2.3.0", "status": "Active"},
+    ... )
+    >>> importer = CsvImporter(mapping, chunk_size=50_000)
+    >>> for table in importer.tables("supplier.csv"):
+    ...     print(len(table), table.column("p_cf_excluding_biogenic").sum())
+"""
+
+import contextlib
+import csv
+import itertools
+import os
+import uuid
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from pact_methodology._support import collection_paused
+from pact_methodology.aggregation.footprint_table import (
+    CATEGORICAL_COLUMNS,
+    DQR_COLUMNS,
+    NUMERIC_COLUMNS,
+    FootprintTable,
+)
+from pact_methodology.carbon_footprint.declared_unit import DeclaredUnit
+from pact_methodology.carbon_footprint.geographical_scope import CarbonFootprintGeographicalScope
+from pact_methodology.carbon_footprint.region_or_subregion import RegionOrSubregion
+from pact_methodology.exceptions import CsvImportError
+from pact_methodology.exchange.json_codec import (
+    ASSURANCE_FIELDS,
+    CARBON_FOOTPRINT_FIELDS,
+    DQI_FIELDS,
+    PRODUCT_FOOTPRINT_FIELDS,
+    decode_cpc,
+    decode_product_footprint,
+)
+from pact_methodology.product_footprint.product_footprint import ProductFootprint
+from pact_methodology.product_footprint.status import Status
+
+DEFAULT_CHUNK_SIZE = 10_000
+"""The default number of rows read and decoded at a time."""
+
+_NESTED = {"pcf": CARBON_FOOTPRINT_FIELDS, "pcf/dqi": DQI_FIELDS, "pcf/assurance": ASSURANCE_FIELDS}
+_UNSUPPORTED = {"extensions", "pcf/productOrSectorSpecificRules", "pcf/secondaryEmissionFactorSources"}
+
+MEMBERS = frozenset(
+    f"{prefix}/{field.name}" if prefix else field.name
+    for prefix, fields in {"": PRODUCT_FOOTPRINT_FIELDS, **_NESTED}.items()
+    for field in fields
+    if field.fields is None
+) - _UNSUPPORTED
+"""The paths of the JSON members a CSV column can hold."""
+
+_LISTS = {"companyIds", "productIds", "precedingPfIds", "pcf/ipccCharacterizationFactorsSources", "pcf/crossSectoralStandardsUsed"}
+_INTEGERS = {"version", *(f"pcf/dqi/{name}DQR" for name in ("technological", "temporal", "geographical", "completeness", "reliability"))}
+_FLOATS = {"pcf/exemptedEmissionsPercent", "pcf/primaryDataShare", "pcf/dqi/coveragePercent"}
+_BOOLEANS = {"pcf/packagingEmissionsIncluded", "pcf/assurance/assurance"}
+_TRUE = {"true", "yes", "1"}
+_FALSE = {"false", "no", "0"}
+
+_NUMERIC_MEMBERS = {
+    "unitary_product_amount": "pcf/unitaryProductAmount",
+    "p_cf_excluding_biogenic": "pcf/pCfExcludingBiogenic",
+    "p_cf_including_biogenic": "pcf/pCfIncludingBiogenic",
+    "fossil_ghg_emissions": "pcf/fossilGhgEmissions",
+    "fossil_carbon_content": "pcf/fossilCarbonContent",
+    "biogenic_carbon_content": "pcf/biogenicCarbonContent",
+    "d_luc_ghg_emissions": "pcf/dLucGhgEmissions",
+    "land_management_ghg_emissions": "pcf/landManagementGhgEmissions",
+    "other_biogenic_ghg_emissions": "pcf/otherBiogenicGhgEmissions",
+    "iluc_ghg_emissions": "pcf/iLucGhgEmissions",
+    "biogenic_carbon_withdrawal": "pcf/biogenicCarbonWithdrawal",
+    "aircraft_ghg_emissions": "pcf/aircraftGhgEmissions",
+    "packaging_ghg_emissions": "pcf/packagingGhgEmissions",
+    "exempted_emissions_percent": "pcf/exemptedEmissionsPercent",
+    "primary_data_share": "pcf/primaryDataShare",
+    "coverage_percent": "pcf/dqi/coveragePercent",
+}
+_REQUIRED_NUMERIC = {
+    "unitary_product_amount",
+    "p_cf_excluding_biogenic",
+    "fossil_ghg_emissions",
+    "fossil_carbon_content",
+    "biogenic_carbon_content",
+    "exempted_emissions_percent",
+}
+_NON_NEGATIVE = (lambda values: values >= 0, "must be equal to or greater than 0")
+_NUMERIC_RANGES = {
+    "unitary_product_amount": (lambda values: values > 0, "must be strictly greater than 0"),
+    "p_cf_excluding_biogenic": _NON_NEGATIVE,
+    "fossil_ghg_emissions": _NON_NEGATIVE,
+    "fossil_carbon_content": _NON_NEGATIVE,
+    "biogenic_carbon_content": _NON_NEGATIVE,
+    "d_luc_ghg_emissions": _NON_NEGATIVE,
+    "other_biogenic_ghg_emissions": _NON_NEGATIVE,
+    "iluc_ghg_emissions": _NON_NEGATIVE,
+    "aircraft_ghg_emissions": _NON_NEGATIVE,
+    "packaging_ghg_emissions": _NON_NEGATIVE,
+    "biogenic_carbon_withdrawal": (lambda values: values <= 0, "must be equal to or less than 0"),
+    "exempted_emissions_percent": (lambda values: (values >= 0) & (values <= 5), "must be between 0.0 and 5.0"),
+}
+"""The checks of CarbonFootprint on numeric columns, as a vectorized condition and the error message."""
+_DQR_MEMBERS = {name: f"pcf/dqi/{name.removesuffix('_dqr')}DQR" for name in DQR_COLUMNS}
+_CATEGORICAL_MEMBERS = {
+    "product_category_cpc": ("productCategoryCpc", lambda label: decode_cpc(label).code),
+    "declared_unit": ("pcf/declaredUnit", lambda label: DeclaredUnit(label).value),
+    "company_name": ("companyName", lambda label: label),
+    "status": ("status", lambda label: Status(label).value),
+}
+_GEOGRAPHY_MEMBERS = (
+    "pcf/geographyCountrySubdivision",
+    "pcf/geographyCountry",
+    "pcf/geographyRegionOrSubregion",
+)
+_HYPHENS = [8, 13, 18, 23]
+
+
+@dataclass(frozen=True)
+class ColumnMapping:
+    """
+    Where the members of footprints are in the columns of a CSV file.
+
+    Attributes:
+        columns (Mapping[str, str]): The header of the column holding each member, by member path
+            such as "companyName" or "pcf/dqi/coveragePercent". See MEMBERS.
+        defaults (Mapping[str, str]): The cell text of members whose column is not mapped, or is
+            empty in a row, for example {"specVersion": "2.3.0"}.
+        separator (str): The separator of the items of list members, such as companyIds, in a cell.
+
+    Raises:
+        ValueError: If a path is not in MEMBERS or separator is empty.
+    """
+
+    columns: Mapping[str, str]
+    defaults: Mapping[str, str] = field(default_factory=dict)
+    separator: str = "|"
+
+    def __post_init__(self):
+        unknown = sorted((set(self.columns) | set(self.defaults)) - MEMBERS)
+        if unknown:
+            raise ValueError(f"Unsupported members: {', '.join(unknown)}")
+        if not self.separator:
+            raise ValueError("separator must not be empty")
+
+
+def _line_count(row: list[str]) -> int:
+    """Returns the number of lines of a row, counting line breaks like the universal newlines of text files."""
+    return 1 + sum(cell.count("\n") + cell.count("\r") - cell.count("\r\n") for cell in row)
+
+
+def _json_value(path: str, text: str, separator: str):
+    """Returns the JSON value of a member from its cell text."""
+    if path in _LISTS:
+        return [item.strip() for item in text.split(separator) if item.strip()]
+    if path in _INTEGERS:
+        try:
+            return int(text)
+        except ValueError:
+            raise ValueError(f"{path} must be an integer, got {text!r}") from None
+    if path in _FLOATS:
+        try:
+            return float(text)
+        except ValueError:
+            raise ValueError(f"{path} must be a number, got {text!r}") from None
+    if path in _BOOLEANS:
+        if text.lower() in _TRUE:
+            return True
+        if text.lower() in _FALSE:
+            return False
+        raise ValueError(f"{path} must be true or false, got {text!r}")
+    return text
+
+
+class CsvImporter:
+    """
+    Reads footprints from CSV files in chunks.
+
+    Attributes:
+        mapping (ColumnMapping): The columns of the members.
+        chunk_size (int): The number of rows read and decoded at a time.
+
+    Examples:
+        >>> importer = CsvImporter(mapping)
+        >>> repository.add_all(importer.footprints("supplier.csv"))
+    """
+
+    def __init__(
+        self,
+        mapping: ColumnMapping,
+        *,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        delimiter: str = ",",
+        encoding: str = "utf-8-sig",
+        on_error: Callable[[int, str], None] | None = None,
+    ):
+        """
+        Initializes a CsvImporter.
+
+        Args:
+            mapping (ColumnMapping): The columns of the members.
+            chunk_size (int): The number of rows read and decoded at a time.
+            delimiter (str): The CSV field delimiter, for example ";" for many spreadsheet exports.
+            encoding (str): The encoding of files opened by path. The default skips a byte order mark.
+            on_error (Callable[[int, str], None] | None): Called with the line number and error
+                message of every invalid row, which is then skipped.
+
+        Raises:
+            ValueError: If chunk_size is not positive.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        self.mapping = mapping
+        self.chunk_size = chunk_size
+        self.delimiter = delimiter
+        self.encoding = encoding
+        self.on_error = on_error
+
+    def footprints(self, file) -> Iterator[ProductFootprint]:
+        """
+        Reads the footprints of a CSV file.
+
+        Args:
+            file (str | os.PathLike | Iterable[str]): The path of the file, or an open text file.
+
+        Yields:
+            ProductFootprint: The footprint of every valid row, in file order.
+
+        Raises:
+            CsvImportError: If a row is invalid and on_error is not given, or a mapped column is
+                missing from the header.
+        """
+        separator = self.mapping.separator
+        for positions, rows, lines in self._chunks(file):
+            plan = [
+                (positions.get(path), path.split("/"), self.mapping.defaults.get(path, ""), path)
+                for path in set(self.mapping.columns) | set(self.mapping.defaults)
+            ]
+            for row, line in zip(rows, lines):
+                data = {}
+                try:
+                    for position, parts, default, path in plan:
+                        text = (row[position] if position is not None else "") or default
+                        if not text:
+                            continue
+                        target = data
+                        for part in parts[:-1]:
+                            target = target.setdefault(part, {})
+                        target[parts[-1]] = _json_value(path, text, separator)
+                    footprint = decode_product_footprint(data)
+                except ValueError as error:
+                    self._report(line, str(error))
+                    continue
+                yield footprint
+
+    def tables(self, file) -> Iterator[FootprintTable]:
+        """
+        Reads a CSV file into a FootprintTable per chunk of rows.
+
+        The tables of one file share their category lists, so their codes can be compared and
+        concatenated.
+
+        Args:
+            file (str | os.PathLike | Iterable[str]): The path of the file, or an open text file.
+
+        Yields:
+            FootprintTable: The valid rows of every chunk, in file order.
+
+        Raises:
+            CsvImportError: If a row is invalid and on_error is not given, or a column needed by the
+                table is neither mapped nor has a default.
+        """
+        missing = [
+            path
+            for path in ("id", "created", "version", *(member for member, _ in _CATEGORICAL_MEMBERS.values()))
+            if path not in self.mapping.columns and path not in self.mapping.defaults
+        ]
+        if missing:
+            raise CsvImportError(f"Tables need a column or default for: {', '.join(missing)}")
+        builder = _TableBuilder(self.mapping)
+        for positions, rows, lines in self._chunks(file):
+            with collection_paused():
+                table, errors = builder.build(positions, rows)
+            for index in sorted(errors):
+                self._report(lines[index], errors[index])
+            yield table
+
+    def read_table(self, file) -> FootprintTable:
+        """
+        Reads a whole CSV file into one FootprintTable.
+
+        Args:
+            file (str | os.PathLike | Iterable[str]): The path of the file, or an open text file.
+
+        Returns:
+            FootprintTable: The valid rows of the file.
+
+        Raises:
+            CsvImportError: If a row is invalid and on_error is not given.
+        """
+        tables = list(self.tables(file))
+        if not tables:
+            return FootprintTable.from_footprints(())
+        return FootprintTable(
+            ids=np.concatenate([table.ids for table in tables]),
+            created=np.concatenate([table.created for table in tables]),
+            version=np.concatenate([table.version for table in tables]),
+            numeric={name: np.concatenate([table.numeric[name] for table in tables]) for name in NUMERIC_COLUMNS},
+            dqr=np.concatenate([table.dqr for table in tables]),
+            codes={name: np.concatenate([table.codes[name] for table in tables]) for name in CATEGORICAL_COLUMNS},
+            categories=tables[-1].categories,
+        )
+
+    def _chunks(self, file) -> Iterator[tuple[dict[str, int], list[list[str]], Sequence[int]]]:
+        """Yields the column positions of the mapped members, and the rows and line numbers of each chunk."""
+        if isinstance(file, (str, os.PathLike)):
+            opened = open(file, newline="", encoding=self.encoding)
+        else:
+            opened = contextlib.nullcontext(file)
+        with opened as stream:
+            reader = csv.reader(stream, delimiter=self.delimiter)
+            header = next(reader, None)
+            if header is None:
+                return
+            indexes = {name: index for index, name in reversed(list(enumerate(header)))}
+            missing = sorted(column for column in self.mapping.columns.values() if column not in indexes)
+            if missing:
+                raise CsvImportError(f"Columns missing from the header: {', '.join(missing)}")
+            positions = {path: indexes[column] for path, column in self.mapping.columns.items()}
+            width = len(header)
+            while True:
+                first = reader.line_num + 1
+                with collection_paused():
+                    rows = list(itertools.islice(reader, self.chunk_size))
+                if not rows:
+                    return
+                if reader.line_num - first + 1 == len(rows):
+                    lines = range(first, reader.line_num + 1)
+                else:
+                    # Some quoted cells span lines.
+                    lines = list(itertools.accumulate(map(_line_count, rows[:-1]), initial=first))
+                if set(map(len, rows)) != {width}:
+                    for row, line in zip(rows, lines):
+                        if row and len(row) != width:
+                            self._report(line, f"Expected {width} cells, got {len(row)}")
+                    lines = [line for row, line in zip(rows, lines) if len(row) == width]
+                    rows = [row for row in rows if len(row) == width]
+                    if not rows:
+                        continue
+                yield positions, rows, lines
+
+    def _report(self, line: int, message: str) -> None:
+        if self.on_error is None:
+            raise CsvImportError(f"Line {line}: {message}")
+        self.on_error(line, message)
+
+
+class _TableBuilder:
+    """Decodes chunks of rows into FootprintTable columns, keeping the categories of a whole file."""
+
+    def __init__(self, mapping: ColumnMapping):
+        self.mapping = mapping
+        self.lookups: dict[str, dict[str, int]] = {name: {} for name in CATEGORICAL_COLUMNS}
+        self.categories: dict[str, list[str]] = {name: [] for name in CATEGORICAL_COLUMNS}
+        self.geographies: dict[tuple[str, str, str], str] = {}
+
+    def build(self, positions: dict[str, int], rows: list[list[str]]) -> tuple[FootprintTable, dict[int, str]]:
+        """Returns the table of the valid rows of a chunk, and the error message of every invalid row."""
+        count = len(rows)
+        errors: dict[int, str] = {}
+
+        columns = list(zip(*rows))
+
+        def cells(path: str) -> Sequence[str]:
+            default = self.mapping.defaults.get(path, "")
+            position = positions.get(path)
+            if position is None:
+                return [default] * count
+            values = columns[position]
+            return [value or default for value in values] if default and "" in values else values
+
+        numeric = {name: self._floats(cells(path), path, name, errors) for name, path in _NUMERIC_MEMBERS.items()}
+        dqr = np.column_stack(
+            [self._ratings(cells(path), path, errors) for path in _DQR_MEMBERS.values()]
+        ).reshape(count, len(DQR_COLUMNS))
+        codes = {
+            name: self._codes(name, cells(path), path, validate, errors)
+            for name, (path, validate) in _CATEGORICAL_MEMBERS.items()
+        }
+        codes["geography"] = self._geography([cells(path) for path in _GEOGRAPHY_MEMBERS], errors)
+        table = FootprintTable(
+            ids=self._ids(cells("id"), errors),
+            created=self._created(cells("created"), errors),
+            version=self._version(cells("version"), errors),
+            numeric=numeric,
+            dqr=dqr,
+            codes=codes,
+            categories=self.categories,
+        )
+        if errors:
+            keep = np.ones(count, dtype=bool)
+            keep[list(errors)] = False
+            table = table.select(keep)
+        return table, errors
+
+    @staticmethod
+    def _ids(texts: Sequence[str], errors: dict[int, str]) -> np.ndarray:
+        """Parses UUIDs, decoding the hex digits of a chunk at once when all ids have the canonical form."""
+        try:
+            grid = np.frombuffer("".join(texts).encode("ascii"), dtype="S1").reshape(len(texts), 36)
+            if (grid[:, _HYPHENS] == b"-").all():
+                digits = np.delete(grid, _HYPHENS, axis=1).tobytes().decode("ascii")
+                return np.frombuffer(bytearray.fromhex(digits), dtype="S16")
+        except ValueError:
+            pass
+        ids = np.empty(len(texts), dtype="S16")
+        for index, text in enumerate(texts):
+            try:
+                ids[index] = uuid.UUID(text).bytes
+            except ValueError:
+                errors.setdefault(index, f"Invalid id: {text!r}")
+        return ids
+
+    @staticmethod
+    def _created(texts: Sequence[str], errors: dict[int, str]) -> np.ndarray:
+        """Parses UTC date-times, which must end with Z or +00:00."""
+        stripped = []
+        for index, text in enumerate(texts):
+            if "T" in text and text.endswith("Z"):
+                stripped.append(text[:-1])
+            elif "T" in text and text.endswith("+00:00"):
+                stripped.append(text[:-6])
+            else:
+                stripped.append("NaT")
+                errors.setdefault(index, f"created must be a UTC date and time, got {text!r}")
+        try:
+            return np.array(stripped, dtype="datetime64[us]")
+        except ValueError:
+            created = np.empty(len(texts), dtype="datetime64[us]")
+            for index, text in enumerate(stripped):
+                try:
+                    created[index] = np.datetime64(text, "us")
+                except ValueError:
+                    created[index] = np.datetime64("NaT")
+                    errors.setdefault(index, f"created must be a UTC date and time, got {texts[index]!r}")
+            return created
+
+    @staticmethod
+    def _version(texts: Sequence[str], errors: dict[int, str]) -> np.ndarray:
+        version = _TableBuilder._integers(texts, "version", errors, missing=-1)
+        for index in np.flatnonzero((version < 0) | (version > 2**31 - 1)):
+            errors.setdefault(int(index), f"version must be an integer from 0 to 2^31-1, got {texts[index]!r}")
+        return version.clip(0, 2**31 - 1).astype(np.int32)
+
+    @staticmethod
+    def _ratings(texts: Sequence[str], path: str, errors: dict[int, str]) -> np.ndarray:
+        ratings = _TableBuilder._integers(texts, path, errors, missing=0)
+        for index in np.flatnonzero((ratings < 0) | (ratings > 3)):
+            errors.setdefault(int(index), f"{path} must be a rating from 1 to 3, got {texts[index]!r}")
+        return ratings.clip(0, 3).astype(np.int8)
+
+    @staticmethod
+    def _integers(texts: Sequence[str], path: str, errors: dict[int, str], missing: int) -> np.ndarray:
+        """Parses integers, with missing for empty cells and invalid ones."""
+        values = [text or str(missing) for text in texts] if "" in texts else texts
+        try:
+            return np.array(values, dtype=np.int64)
+        except (ValueError, OverflowError):
+            integers = np.full(len(texts), missing, dtype=np.int64)
+            for index, text in enumerate(values):
+                try:
+                    integers[index] = int(text)
+                except (ValueError, OverflowError):
+                    errors.setdefault(index, f"{path} must be an integer, got {text!r}")
+            return integers
+
+    @staticmethod
+    def _floats(texts: Sequence[str], path: str, name: str, errors: dict[int, str]) -> np.ndarray:
+        """Parses numbers, with NaN for empty cells, and checks them like CarbonFootprint."""
+        values = texts
+        filled = np.ones(len(texts), dtype=bool)
+        if "" in texts:
+            filled = np.fromiter(map(bool, texts), dtype=bool, count=len(texts))
+            if name in _REQUIRED_NUMERIC:
+                for index in np.flatnonzero(~filled):
+                    errors.setdefault(int(index), f"{path} is required")
+            values = [text or "nan" for text in texts]
+        try:
+            floats = np.array(values, dtype=np.float64)
+        except ValueError:
+            floats = np.full(len(texts), np.nan)
+            for index, text in enumerate(values):
+                try:
+                    floats[index] = float(text)
+                except ValueError:
+                    errors.setdefault(index, f"{path} must be a number, got {text!r}")
+        finite = np.isfinite(floats)
+        for index in np.flatnonzero(filled & ~finite):
+            errors.setdefault(int(index), f"{path} must be a finite number, got {texts[index]!r}")
+        if name in _NUMERIC_RANGES:
+            condition, requirement = _NUMERIC_RANGES[name]
+            for index in np.flatnonzero(finite & ~condition(floats)):
+                errors.setdefault(int(index), f"{path} {requirement}, got {texts[index]!r}")
+        return floats
+
+    def _codes(
+        self, name: str, labels: Sequence[str], path: str, validate: Callable[[str], str], errors: dict[int, str]
+    ) -> np.ndarray:
+        """Returns the category codes of labels, validating each label the first time it occurs."""
+        lookup = self.lookups[name]
+        invalid = {}
+        for label in set(labels).difference(lookup):
+            try:
+                if not label:
+                    raise ValueError(f"{path} is required")
+                canonical = validate(label)
+            except ValueError as error:
+                invalid[label] = str(error)
+                continue
+            if canonical not in lookup:
+                lookup[canonical] = len(self.categories[name])
+                self.categories[name].append(canonical)
+            # Labels that decode to the same value share its code.
+            lookup[label] = lookup[canonical]
+        if invalid:
+            for index, label in enumerate(labels):
+                if label in invalid:
+                    errors.setdefault(index, invalid[label])
+        return np.array(list(map(lookup.get, labels, itertools.repeat(0))), dtype=np.int32)
+
+    def _geography(self, columns: list[Sequence[str]], errors: dict[int, str]) -> np.ndarray:
+        """Returns the geography codes of rows from their subdivision, country and region cells."""
+        used = [position for position, column in enumerate(columns) if any(column)]
+        if len(used) == 1:
+            # Files usually fill a single geography column, whose cells can be looked up on their own.
+            keys = columns[used[0]]
+            scopes = {text: tuple(text if position in used else "" for position in range(3)) for text in set(keys)}
+        else:
+            keys = list(zip(*columns))
+            scopes = {key: key for key in set(keys)}
+        labels, invalid = {}, {}
+        for key, scope in scopes.items():
+            if scope not in self.geographies:
+                subdivision, country, region = scope
+                try:
+                    self.geographies[scope] = str(
+                        CarbonFootprintGeographicalScope(
+                            global_scope=not any(scope),
+                            geography_country_subdivision=subdivision or None,
+                            geography_country=country or None,
+                            geography_region_or_subregion=RegionOrSubregion(region) if region else None,
+                        ).scope
+                    )
+                except ValueError as error:
+                    invalid[key] = str(error)
+                    continue
+            labels[key] = self.geographies[scope]
+        if invalid:
+            for index, key in enumerate(keys):
+                if key in invalid:
+                    errors.setdefault(index, invalid[key])
+        rows = list(map(labels.get, keys, itertools.repeat("Global")))
+        return self._codes("geography", rows, "geography", lambda label: label, errors)
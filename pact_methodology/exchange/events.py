@@ -0,0 +1,277 @@
+"""
+Ingestion of PACT events into a FootprintRepository.
+
+A data owner announces new and updated footprints with a `PublishedEvent` naming their ids, and a
+data recipient asks for footprints with a `RequestCreatedEvent`. `EventIngestor` accepts both
+through `submit`, which can be passed as the `on_event` handler of a PactServer. Submitted events
+wait in a bounded queue. A single worker takes them in batches: every event that arrives within
+`window` seconds of the first one, up to `batch_size` events, is handled together. Ids named more
+than once in a batch are fetched once, and the footprints of a batch are fetched concurrently over
+the data owner's PactClient and added to the repository, which updates its indexes.
+
+When the queue is full, `submit` waits for the worker to make room. A server passing events to it
+therefore answers more slowly during a burst instead of holding an unbounded backlog. If the worker
+stops with an error meanwhile, the waiting submissions fail instead of waiting forever.
+
+Examples:
+    >>> async with EventIngestor(repository, {"//supplier.example/events": client}) as ingestor:
+    ...     server = PactServer(repository, credentials, on_event=ingestor.submit)
+    ...     async with await server.start("0.0.0.0", 8080) as listener:
+    ...         await listener.serve_forever()
+"""
+
+import asyncio
+import inspect
+import uuid
+from collections.abc import Awaitable, Callable, Mapping
+
+from pact_methodology.exceptions import PactApiError
+from pact_methodology.exchange.client import PactClient
+from pact_methodology.exchange.server import PUBLISHED_EVENT, REQUEST_CREATED_EVENT
+from pact_methodology.product_footprint.product_footprint import ProductFootprint
+from pact_methodology.repository.repository import FootprintRepository, footprint_key
+
+_REQUEST_INDEXES = {
+    "productIds": "product_ids",
+    "companyIds": "company_ids",
+    "productCategoryCpc": "product_category_cpc",
+}
+
+_STOP = object()
+
+
+class EventIngestor:
+    """
+    Applies PACT events to a FootprintRepository in coalesced batches.
+
+    Attributes:
+        repository (FootprintRepository): The repository updated with fetched footprints.
+        clients (Mapping[str, PactClient]): The client of every data owner, by the source of its events.
+        window (float): The number of seconds to collect events into a batch after its first event.
+        batch_size (int): The largest number of events in a batch.
+        events (int): The number of events handled.
+        coalesced (int): The number of footprint ids and requests skipped as repeated within a batch.
+        applied (int): The number of fetched footprints added to the repository.
+        failed (int): The number of footprints that could not be fetched.
+        batches (int): The number of batches handled.
+    """
+
+    def __init__(
+        self,
+        repository: FootprintRepository,
+        clients: Mapping[str, PactClient],
+        *,
+        window: float = 0.05,
+        batch_size: int = 100,
+        max_queued: int = 1000,
+        max_fetches: int = 8,
+        on_request: Callable[[dict, list[ProductFootprint]], object | Awaitable[object]] | None = None,
+        on_error: Callable[[str, uuid.UUID, Exception], None] | None = None,
+    ):
+        """
+        Initializes an EventIngestor. The worker starts with start or when entering the context.
+
+        Args:
+            repository (FootprintRepository): The repository to update.
+            clients (Mapping[str, PactClient]): The client of every data owner, by the source
+                attribute of its events.
+            window (float): The number of seconds to collect events into a batch after its first event.
+            batch_size (int): The largest number of events in a batch.
+            max_queued (int): The largest number of events waiting for the worker.
+            max_fetches (int): The largest number of footprints fetched at the same time.
+            on_request (Callable[[dict, list[ProductFootprint]], object | Awaitable[object]] | None):
+                Called with every RequestCreatedEvent and the stored footprints matching its
+                productIds, companyIds and productCategoryCpc. Without it, requests are rejected.
+            on_error (Callable[[str, uuid.UUID, Exception], None] | None): Called with the source,
+                id and error of every footprint that could not be fetched.
+
+        Raises:
+            ValueError: If window is negative or batch_size, max_queued or max_fetches is not positive.
+        """
+        if window < 0:
+            raise ValueError("window must not be negative")
+        if batch_size < 1 or max_queued < 1 or max_fetches < 1:
+            raise ValueError("batch_size, max_queued and max_fetches must be positive")
+        self.repository = repository
+        self.clients = clients
+        self.window = window
+        self.batch_size = batch_size
+        self.max_fetches = max_fetches
+        self.on_request = on_request
+        self.on_error = on_error
+        self.events = 0
+        self.coalesced = 0
+        self.applied = 0
+        self.failed = 0
+        self.batches = 0
+        self._queue: asyncio.Queue = asyncio.Queue(max_queued)
+        self._worker: asyncio.Task | None = None
+
+    async def submit(self, event: dict) -> None:
+        """
+        Queues an event, waiting while the queue is full.
+
+        Args:
+            event (dict): A PublishedEvent or RequestCreatedEvent as a CloudEvent in JSON form.
+
+        Raises:
+            ValueError: If the event is not a valid PublishedEvent from a known source or a valid
+                RequestCreatedEvent, or requests are not handled.
+            RuntimeError: If the ingestor is not running, or its worker stopped while the event waited.
+        """
+        item = self._parse(event)
+        worker = self._worker
+        if worker is None or worker.done():
+            raise RuntimeError("EventIngestor is not running")
+        if not self._queue.full():
+            self._queue.put_nowait(item)
+            return
+        put = asyncio.ensure_future(self._queue.put(item))
+        try:
+            await asyncio.wait({put, worker}, return_when=asyncio.FIRST_COMPLETED)
+            if not put.done():
+                error = None if worker.cancelled() else worker.exception()
+                raise RuntimeError("EventIngestor stopped before the event was queued") from error
+        finally:
+            put.cancel()
+
+    async def join(self) -> None:
+        """
+        Waits until every event submitted so far has been handled.
+
+        Raises:
+            Exception: The error of on_request, if it stopped the worker.
+        """
+        joined = asyncio.ensure_future(self._queue.join())
+        try:
+            if self._worker is not None:
+                await asyncio.wait({joined, self._worker}, return_when=asyncio.FIRST_COMPLETED)
+            if not joined.done():
+                self._worker.result()
+        finally:
+            joined.cancel()
+
+    async def start(self) -> None:
+        """
+        Starts the worker.
+
+        Raises:
+            RuntimeError: If the worker is already running.
+        """
+        if self._worker is not None:
+            raise RuntimeError("EventIngestor is already running")
+        self._worker = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """Handles the queued events and stops the worker."""
+        if self._worker is None:
+            return
+        if not self._worker.done():
+            await self._queue.put(_STOP)
+        worker, self._worker = self._worker, None
+        await worker
+
+    async def __aenter__(self) -> "EventIngestor":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def _parse(self, event: dict) -> tuple[str, str, object]:
+        """Returns the queue item of an event: its type, its source, and its ids or the event."""
+        if not isinstance(event, dict) or not isinstance(event.get("data"), dict):
+            raise ValueError("Event must be a JSON object with a data object")
+        source = event.get("source")
+        if event.get("type") == PUBLISHED_EVENT:
+            if source not in self.clients:
+                raise ValueError(f"Unknown event source: {source!r}")
+            pf_ids = event["data"].get("pfIds")
+            if not isinstance(pf_ids, list) or not pf_ids:
+                raise ValueError("PublishedEvent data must have a non-empty pfIds list")
+            return PUBLISHED_EVENT, source, [footprint_key(pf_id) for pf_id in pf_ids]
+        if event.get("type") == REQUEST_CREATED_EVENT:
+            if self.on_request is None:
+                raise ValueError("Footprint requests are not handled")
+            if not isinstance(event["data"].get("pf"), dict):
+                raise ValueError("RequestCreatedEvent data must have a pf object")
+            return REQUEST_CREATED_EVENT, source, event
+        raise ValueError(f"Unsupported event type: {event.get('type')!r}")
+
+    async def _run(self) -> None:
+        """Takes batches of events from the queue and handles them until stopped."""
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.window
+            while batch[-1] is not _STOP and len(batch) < self.batch_size:
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), deadline - loop.time()))
+                except asyncio.TimeoutError:
+                    break
+            if batch[-1] is _STOP:
+                stopping = True
+            try:
+                await self._handle([item for item in batch if item is not _STOP])
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _handle(self, batch: list[tuple[str, str, object]]) -> None:
+        """Fetches the footprints named in a batch once each, then answers its requests."""
+        if not batch:
+            return
+        pending: dict[tuple[str, uuid.UUID], None] = {}
+        requests: dict[tuple[str, str], dict] = {}
+        for kind, source, payload in batch:
+            self.events += 1
+            if kind == PUBLISHED_EVENT:
+                for id in payload:
+                    if (source, id) in pending:
+                        self.coalesced += 1
+                    pending[(source, id)] = None
+            else:
+                key = (source, payload.get("id"))
+                if key in requests:
+                    self.coalesced += 1
+                requests[key] = payload
+
+        semaphore = asyncio.Semaphore(self.max_fetches)
+
+        async def fetch(source: str, id: uuid.UUID) -> None:
+            async with semaphore:
+                try:
+                    footprint = await self.clients[source].get_footprint(id)
+                except (PactApiError, ValueError) as error:
+                    self.failed += 1
+                    if self.on_error is not None:
+                        self.on_error(source, id, error)
+                    return
+            self._store(footprint)
+
+        await asyncio.gather(*(fetch(source, id) for source, id in pending))
+        for event in requests.values():
+            result = self.on_request(event, self._matching(event["data"]["pf"]))
+            if inspect.isawaitable(result):
+                await result
+        self.batches += 1
+
+    def _store(self, footprint: ProductFootprint) -> None:
+        """Adds a fetched footprint unless the repository already has a later version of it."""
+        stored = self.repository.get(footprint.id)
+        if stored is not None and stored.version.version > footprint.version.version:
+            return
+        self.repository.add(footprint)
+        self.applied += 1
+
+    def _matching(self, pf: dict) -> list[ProductFootprint]:
+        """Returns the stored footprints matching every indexed property of a request's pf object."""
+        ids = None
+        for name, index in _REQUEST_INDEXES.items():
+            if name not in pf:
+                continue
+            keys = pf[name] if isinstance(pf[name], list) else [pf[name]]
+            found = frozenset().union(*(self.repository.lookup(index, str(key)) for key in keys))
+            ids = found if ids is None else ids & found
+        return self.repository.in_order(ids) if ids else []
@@ -0,0 +1,229 @@
+"""
+Concurrent fetching of footprints from many PACT host systems.
+
+`fetch_all` lists the footprints of every endpoint with its own `PactClient`, running up to
+max_concurrency hosts at a time. Each host has its own rate limit, failed requests are retried with
+exponential backoff, and every decoded footprint is passed to a single sink, such as a repository's
+add method. Footprints that fail to decode are counted in the report of their host and skipped. A
+host that still fails after its retries is recorded in its report and does not stop the others.
+
+Examples:
+    >>> reports = await fetch_all(endpoints, repository.add, max_concurrency=50, rate=5.0)
+    >>> for report in reports:
+    ...     print(report.name, report.footprints, report.invalid_footprints, f"{report.throughput:.0f}/s", report.error)
+    supplier-a 1200 3 240/s None
+    supplier-b 0 0 0/s HTTP 503
+"""
+
+import asyncio
+import inspect
+import math
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+
+from pact_methodology.exceptions import PactApiError
+from pact_methodology.exchange.client import PactClient, RateLimiter, RetryPolicy
+from pact_methodology.exchange.http import DEFAULT_TIMEOUT, split_url
+from pact_methodology.product_footprint.product_footprint import ProductFootprint
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    """
+    A PACT host system and the credentials to access it.
+
+    Attributes:
+        name (str): The name the host is reported under, for example the supplier's name.
+        base_url (str): The URL of the host system.
+        client_id (str): The client id of the credentials.
+        client_secret (str): The client secret of the credentials.
+        auth_url (str | None): The URL of the token endpoint, if it is not base_url + "/auth/token".
+
+    Raises:
+        ValueError: If a URL is not an absolute http or https URL.
+    """
+
+    name: str
+    base_url: str
+    client_id: str
+    client_secret: str = field(repr=False)
+    auth_url: str | None = None
+
+    def __post_init__(self):
+        split_url(self.base_url)
+        if self.auth_url is not None:
+            split_url(self.auth_url)
+
+
+@dataclass
+class HostReport:
+    """
+    The outcome of fetching the footprints of one host.
+
+    Attributes:
+        name (str): The name of the endpoint.
+        footprints (int): The number of footprints passed to the sink.
+        invalid_footprints (int): The number of footprints skipped because they failed to decode.
+        invalid_errors (list[str]): The decoding error of every skipped footprint.
+        requests (int): The number of requests sent, including retries and token requests.
+        failed_requests (int): The number of requests that got no response or an error status.
+        latencies (list[float]): The duration of every request in seconds.
+        elapsed (float): The time in seconds from the first request to the end of the last page.
+        error (str | None): Why fetching stopped early, or None if every page was fetched.
+    """
+
+    name: str
+    footprints: int = 0
+    invalid_footprints: int = 0
+    invalid_errors: list[str] = field(default_factory=list, repr=False)
+    requests: int = 0
+    failed_requests: int = 0
+    latencies: list[float] = field(default_factory=list, repr=False)
+    elapsed: float = 0.0
+    error: str | None = None
+
+    @property
+    def throughput(self) -> float:
+        """The number of footprints fetched per second."""
+        return self.footprints / self.elapsed if self.elapsed > 0 else 0.0
+
+    def latency(self, quantile: float = 0.5) -> float | None:
+        """
+        Returns a quantile of the request durations, by the nearest-rank method.
+
+        Args:
+            quantile (float): The quantile between 0 and 1, for example 0.95.
+
+        Returns:
+            float | None: The duration in seconds, or None if no request was sent.
+
+        Raises:
+            ValueError: If quantile is not between 0 and 1.
+        """
+        if not 0 <= quantile <= 1:
+            raise ValueError("quantile must be between 0 and 1")
+        if not self.latencies:
+            return None
+        latencies = sorted(self.latencies)
+        return latencies[max(0, math.ceil(quantile * len(latencies)) - 1)]
+
+
+async def fetch_all(
+    endpoints: Iterable[Endpoint],
+    sink: Callable[[ProductFootprint], object | Awaitable[object]],
+    *,
+    max_concurrency: int = 32,
+    rate: float | None = None,
+    burst: int = 1,
+    retry: RetryPolicy | None = None,
+    limit: int | None = None,
+    filter: str | None = None,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> list[HostReport]:
+    """
+    Fetches the footprints of many hosts concurrently and passes them to one sink.
+
+    Args:
+        endpoints (Iterable[Endpoint]): The hosts to fetch from.
+        sink (Callable[[ProductFootprint], object | Awaitable[object]]): Called with every footprint.
+            If it returns an awaitable, the host's stream waits for it. Calls never overlap unless
+            the sink awaits.
+        max_concurrency (int): The largest number of hosts fetched at the same time.
+        rate (float | None): The largest number of requests per second to each host. Unlimited by default.
+        burst (int): The number of requests to a host that can start without waiting for the rate limit.
+        retry (RetryPolicy | None): When to repeat failed requests. Defaults to RetryPolicy().
+        limit (int | None): The page size to request.
+        filter (str | None): A $filter expression to send to every host.
+        timeout (float): The time in seconds to wait for each response.
+
+    Returns:
+        list[HostReport]: A report per endpoint, in the order of endpoints.
+
+    Raises:
+        ValueError: If max_concurrency or limit is not positive. Errors of the sink are raised as
+            well, after the other hosts have been stopped.
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be positive")
+    if limit is not None and limit < 1:
+        raise ValueError("limit must be positive")
+    endpoints = list(endpoints)
+    retry = retry or RetryPolicy()
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def fetch(endpoint: Endpoint) -> HostReport:
+        async with semaphore:
+            return await _fetch_host(
+                endpoint,
+                sink,
+                retry=retry,
+                rate_limiter=RateLimiter(rate, burst) if rate is not None else None,
+                limit=limit,
+                filter=filter,
+                timeout=timeout,
+            )
+
+    tasks = [asyncio.ensure_future(fetch(endpoint)) for endpoint in endpoints]
+    try:
+        return list(await asyncio.gather(*tasks))
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def _fetch_host(
+    endpoint: Endpoint,
+    sink: Callable[[ProductFootprint], object],
+    *,
+    retry: RetryPolicy,
+    rate_limiter: RateLimiter | None,
+    limit: int | None,
+    filter: str | None,
+    timeout: float,
+) -> HostReport:
+    """Lists the footprints of one host into the sink and reports how it went."""
+    report = HostReport(endpoint.name)
+
+    def record(method: str, url: str, status: int | None, seconds: float) -> None:
+        report.requests += 1
+        report.latencies.append(seconds)
+        if status is None or status >= 400:
+            report.failed_requests += 1
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    try:
+        async with PactClient(
+            endpoint.base_url,
+            endpoint.client_id,
+            endpoint.client_secret,
+            auth_url=endpoint.auth_url,
+            timeout=timeout,
+            retry=retry,
+            rate_limiter=rate_limiter,
+            on_response=record,
+        ) as client:
+            stream = client.list_footprints(limit=limit, filter=filter, yield_errors=True)
+            try:
+                while True:
+                    try:
+                        footprint = await anext(stream)
+                    except StopAsyncIteration:
+                        break
+                    except PactApiError as error:
+                        report.error = str(error)
+                        break
+                    if isinstance(footprint, ValueError):
+                        report.invalid_footprints += 1
+                        report.invalid_errors.append(str(footprint))
+                        continue
+                    # Errors of the sink are not the host's fault and are raised to the caller.
+                    result = sink(footprint)
+                    if inspect.isawaitable(result):
+                        await result
+                    report.footprints += 1
+            finally:
+                await stream.aclose()
+    finally:
+        report.elapsed = loop.time() - start
+    return report
@@ -0,0 +1,611 @@
+"""
+Compilation of PACT `$filter` expressions.
+
+Data recipients can narrow a ListFootprints request with an OData-style `$filter`, for example
+`productCategoryCpc eq '3342' and created ge '2024-01-01T00:00:00Z'` or
+`companyIds/any(companyId: companyId eq 'urn:uuid:...')`. `compile_filter` parses an expression
+once into a `FootprintFilter`, which can then be evaluated in three ways:
+
+- `matches` tests a single footprint.
+- `apply` selects the matching footprints of a FootprintRepository, and `page` selects them a page
+  at a time from a snapshot. Equality on an indexed field is answered from the repository's
+  secondary indexes and comparisons on `created` bound the creation order, so only the candidates
+  they leave are tested one by one. The candidates are worked out once per repository revision.
+- `mask` evaluates the expression over the columns of a FootprintTable as NumPy operations.
+
+The supported subset of OData is:
+
+- The comparison operators `eq`, `ne`, `lt`, `le`, `gt` and `ge`, with the field on the left and a
+  literal on the right.
+- The logical operators `and`, `or` and `not`, and parentheses.
+- `any` over `companyIds` and `productIds`, with a comparison of the lambda variable inside.
+- String literals in single quotes, with `''` for a quote, integer literals, `null`, and date-times,
+  quoted or not.
+
+The fields are the keys of `FIELDS`. As in OData, a comparison with a missing value, such as
+`updated` of a footprint that was never updated, is false except for `ne` and `eq null`.
+
+Examples:
+    >>> expression = compile_filter("productCategoryCpc eq '0111' and created lt '2024-01-01T00:00:00Z'")
+    >>> expression.apply(repository)
+    [ProductFootprint(...), ...]
+    >>> table.select(expression.mask(table))
+    FootprintTable(rows=12)
+"""
+
+import functools
+import operator
+import re
+import uuid
+import weakref
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from pact_methodology.aggregation.footprint_table import FootprintTable
+from pact_methodology.carbon_footprint.geographical_scope import GeographicalGranularity
+from pact_methodology.datetime import DateTime
+from pact_methodology.exceptions import FilterError
+from pact_methodology.product_footprint.product_footprint import ProductFootprint
+from pact_methodology.repository.repository import Candidates, Cursor, FootprintRepository
+
+_OPERATORS = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "lt": operator.lt,
+    "le": operator.le,
+    "gt": operator.gt,
+    "ge": operator.ge,
+}
+
+_RESOLUTION = timedelta(microseconds=1)
+
+_Bounds = tuple[datetime | None, datetime | None, frozenset[uuid.UUID] | None]
+"""The creation time range and ids that a condition can be true for, as (start, end, keys)."""
+
+
+def _parse_string(value, name: str) -> str:
+    if not isinstance(value, str):
+        raise FilterError(f"{name} must be compared with a string, got {value!r}")
+    return value
+
+
+def _parse_datetime(value, name: str) -> datetime:
+    if not isinstance(value, str):
+        raise FilterError(f"{name} must be compared with a date-time, got {value!r}")
+    try:
+        return DateTime(value).iso_datetime
+    except ValueError:
+        raise FilterError(f"{name} must be compared with a UTC date-time, got {value!r}") from None
+
+
+def _parse_integer(value, name: str) -> int:
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise FilterError(f"{name} must be compared with an integer, got {value!r}")
+    return value
+
+
+def _country(footprint: ProductFootprint) -> str | None:
+    scope = footprint.pcf.geographical_scope
+    return scope.scope if scope.granularity == GeographicalGranularity.COUNTRY else None
+
+
+def _country_label(label: str) -> str | None:
+    # Country codes are the only two-letter labels of the geography column.
+    return label if len(label) == 2 else None
+
+
+@dataclass(frozen=True)
+class _Field:
+    """
+    A field that filters can refer to.
+
+    Attributes:
+        get: Returns the value of the field of a footprint, or its list of values for a collection.
+        parse: Converts a literal into a value comparable with the field's values.
+        index: The repository index whose keys are the field's values, if there is one.
+        column: The FootprintTable column of the field: "created", "version" or a categorical column.
+        label: Converts a category label of the column into a value of the field.
+        collection: Whether the field is a list, which can only be tested with any.
+    """
+
+    get: Callable[[ProductFootprint], object]
+    parse: Callable[[object, str], object]
+    index: str | None = None
+    column: str | None = None
+    label: Callable[[str], object] | None = None
+    collection: bool = False
+
+
+FIELDS: dict[str, _Field] = {
+    "created": _Field(lambda footprint: footprint.created.iso_datetime, _parse_datetime, column="created"),
+    "updated": _Field(
+        lambda footprint: footprint.updated.iso_datetime if footprint.updated is not None else None,
+        _parse_datetime,
+    ),
+    "version": _Field(lambda footprint: footprint.version.version, _parse_integer, column="version"),
+    "status": _Field(lambda footprint: footprint.status.value, _parse_string, "status", "status"),
+    "companyName": _Field(lambda footprint: footprint.company_name, _parse_string, column="company_name"),
+    "productCategoryCpc": _Field(
+        lambda footprint: footprint.product_category_cpc.code,
+        _parse_string,
+        "product_category_cpc",
+        "product_category_cpc",
+    ),
+    "companyIds": _Field(
+        lambda footprint: [str(company_id) for company_id in footprint.company_ids],
+        _parse_string,
+        "company_ids",
+        collection=True,
+    ),
+    "productIds": _Field(
+        lambda footprint: [str(product_id) for product_id in footprint.product_ids],
+        _parse_string,
+        "product_ids",
+        collection=True,
+    ),
+    "pcf/declaredUnit": _Field(
+        lambda footprint: footprint.pcf.declared_unit.value, _parse_string, column="declared_unit"
+    ),
+    "pcf/geographyCountry": _Field(_country, _parse_string, column="geography", label=_country_label),
+    "pcf/referencePeriodStart": _Field(
+        lambda footprint: footprint.pcf.reference_period.start.iso_datetime, _parse_datetime
+    ),
+    "pcf/referencePeriodEnd": _Field(
+        lambda footprint: footprint.pcf.reference_period.end.iso_datetime, _parse_datetime
+    ),
+}
+"""The fields a filter can refer to, by their path in the JSON representation of a footprint."""
+
+
+class _Comparison:
+    """A comparison of a field, or of the variable of an any lambda, with a literal."""
+
+    def __init__(self, name: str, field: _Field, op: str, value):
+        self.name = name
+        self.field = field
+        self.op = op
+        self.value = value
+        self._compare = _OPERATORS[op]
+
+    def test(self, value) -> bool:
+        if value is None or self.value is None:
+            if self.op == "eq":
+                return value is self.value
+            return self.op == "ne" and value is not self.value
+        return self._compare(value, self.value)
+
+    def matches(self, footprint) -> bool:
+        return self.test(self.field.get(footprint))
+
+    def bounds(self, repository: FootprintRepository) -> _Bounds | None:
+        if self.value is None:
+            return None
+        if self.field.column == "created":
+            bounds = {
+                "eq": (self.value, self.value + _RESOLUTION),
+                "lt": (None, self.value),
+                "le": (None, self.value + _RESOLUTION),
+                "gt": (self.value + _RESOLUTION, None),
+                "ge": (self.value, None),
+            }.get(self.op)
+            return (*bounds, None) if bounds else None
+        if self.op == "eq" and self.field.index is not None:
+            return None, None, repository.lookup(self.field.index, self.value)
+        return None
+
+    def mask(self, table: FootprintTable) -> np.ndarray:
+        column = self.field.column
+        if column is None:
+            raise FilterError(f"{self.name} is not a column of FootprintTable")
+        if column in ("created", "version"):
+            values = table.created if column == "created" else table.version
+            if self.value is None:
+                return np.full(len(table), self.op == "ne")
+            literal = self.value
+            if column == "created":
+                literal = np.datetime64(literal.astimezone(timezone.utc).replace(tzinfo=None), "us")
+            return self._compare(values, literal)
+        # Evaluate the comparison once per category and look the result up by code.
+        label = self.field.label or (lambda label: label)
+        results = np.array([self.test(label(category)) for category in table.categories[column]], dtype=bool)
+        return results[table.codes[column]]
+
+
+class _Any:
+    """A test whether any value of a collection field satisfies a condition."""
+
+    def __init__(self, name: str, field: _Field, condition):
+        self.name = name
+        self.field = field
+        self.condition = condition
+        self.keys = _equal_keys(condition)
+
+    def matches(self, footprint) -> bool:
+        condition = self.condition
+        return any(condition.matches(value) for value in self.field.get(footprint))
+
+    def bounds(self, repository: FootprintRepository) -> _Bounds | None:
+        if self.keys is None:
+            return None
+        return None, None, frozenset().union(*(repository.lookup(self.field.index, key) for key in self.keys))
+
+    def mask(self, table: FootprintTable) -> np.ndarray:
+        raise FilterError(f"{self.name} is not a column of FootprintTable")
+
+
+class _And:
+    def __init__(self, left, right):
+        self.left = left
+        self.right = right
+
+    def matches(self, footprint) -> bool:
+        return self.left.matches(footprint) and self.right.matches(footprint)
+
+    def bounds(self, repository: FootprintRepository) -> _Bounds | None:
+        left = self.left.bounds(repository)
+        right = self.right.bounds(repository)
+        if left is None or right is None:
+            return right if left is None else left
+        (left_start, left_end, left_keys), (right_start, right_end, right_keys) = left, right
+        return (
+            left_start if right_start is None else right_start if left_start is None else max(left_start, right_start),
+            left_end if right_end is None else right_end if left_end is None else min(left_end, right_end),
+            left_keys if right_keys is None else right_keys if left_keys is None else left_keys & right_keys,
+        )
+
+    def mask(self, table: FootprintTable) -> np.ndarray:
+        return self.left.mask(table) & self.right.mask(table)
+
+
+class _Or:
+    def __init__(self, left, right):
+        self.left = left
+        self.right = right
+
+    def matches(self, footprint) -> bool:
+        return self.left.matches(footprint) or self.right.matches(footprint)
+
+    def bounds(self, repository: FootprintRepository) -> _Bounds | None:
+        left = self.left.bounds(repository)
+        if left is None:
+            return None
+        right = self.right.bounds(repository)
+        if right is None:
+            return None
+        (left_start, left_end, left_keys), (right_start, right_end, right_keys) = left, right
+        bounds = (
+            None if left_start is None or right_start is None else min(left_start, right_start),
+            None if left_end is None or right_end is None else max(left_end, right_end),
+            None if left_keys is None or right_keys is None else left_keys | right_keys,
+        )
+        return None if bounds == (None, None, None) else bounds
+
+    def mask(self, table: FootprintTable) -> np.ndarray:
+        return self.left.mask(table) | self.right.mask(table)
+
+
+class _Not:
+    def __init__(self, operand):
+        self.operand = operand
+
+    def matches(self, footprint) -> bool:
+        return not self.operand.matches(footprint)
+
+    def bounds(self, repository: FootprintRepository) -> None:
+        return None
+
+    def mask(self, table: FootprintTable) -> np.ndarray:
+        return ~self.operand.mask(table)
+
+
+def _equal_keys(condition) -> set[str] | None:
+    """Returns the values a lambda condition can only be true for, or None if it is not an equality."""
+    if isinstance(condition, _Comparison):
+        return {condition.value} if condition.op == "eq" and condition.value is not None else None
+    if isinstance(condition, _Or):
+        left = _equal_keys(condition.left)
+        right = _equal_keys(condition.right)
+        return None if left is None or right is None else left | right
+    return None
+
+
+class FootprintFilter:
+    """
+    A compiled $filter expression.
+
+    Attributes:
+        expression (str): The source of the expression.
+
+    Examples:
+        >>> expression = compile_filter("companyIds/any(c: c eq 'urn:uuid:...') and status eq 'Active'")
+        >>> expression.matches(footprint)
+        True
+    """
+
+    __slots__ = ("expression", "_root", "_plan")
+
+    def __init__(self, expression: str, root):
+        """
+        Initializes a FootprintFilter. Use compile_filter to create one from a string.
+
+        Args:
+            expression (str): The source of the expression.
+            root: The parsed expression.
+        """
+        self.expression = expression
+        self._root = root
+        # The repository, revision and candidates of the last call to candidates.
+        self._plan: tuple[weakref.ref, int, Candidates | None] | None = None
+
+    def matches(self, footprint: ProductFootprint) -> bool:
+        """
+        Tests whether a footprint satisfies the filter.
+
+        Args:
+            footprint (ProductFootprint): The footprint.
+
+        Returns:
+            bool: Whether the footprint satisfies the filter.
+        """
+        return self._root.matches(footprint)
+
+    def candidates(self, repository: FootprintRepository) -> Candidates | None:
+        """
+        Returns the footprints of a repository that can satisfy the filter, from its indexes.
+
+        The candidates are kept until the repository changes, so the pages of one revision share them.
+
+        Args:
+            repository (FootprintRepository): The repository.
+
+        Returns:
+            Candidates | None: A superset of the matching footprints at the current revision, or
+                None if the indexes cannot narrow the search and every footprint has to be tested.
+        """
+        plan = self._plan
+        if plan is not None and plan[0]() is repository and plan[1] == repository.revision:
+            return plan[2]
+        bounds = self._root.bounds(repository)
+        candidates = None if bounds is None else repository.candidates(bounds[2], bounds[0], bounds[1])
+        self._plan = weakref.ref(repository), repository.revision, candidates
+        return candidates
+
+    def apply(self, repository: FootprintRepository) -> list[ProductFootprint]:
+        """
+        Returns the footprints of a repository that satisfy the filter.
+
+        Args:
+            repository (FootprintRepository): The repository.
+
+        Returns:
+            list[ProductFootprint]: The matching footprints, ordered by created time and then id.
+        """
+        candidates = self.candidates(repository)
+        if candidates is None:
+            footprints = repository.ordered()
+        elif candidates.keys is None:
+            footprints = repository.in_order(repository.created_between(candidates.start, candidates.end))
+        else:
+            footprints = repository.in_order(candidates.keys)
+        matches = self._root.matches
+        return [footprint for footprint in footprints if matches(footprint)]
+
+    def page(
+        self, repository: FootprintRepository, limit: int, cursor: Cursor | None = None
+    ) -> tuple[list[ProductFootprint], Cursor | None]:
+        """
+        Returns a page of the footprints of a repository snapshot that satisfy the filter.
+
+        Args:
+            repository (FootprintRepository): The repository.
+            limit (int): The largest number of footprints to return.
+            cursor (Cursor | None): The cursor returned with the previous page, or None for the first page.
+
+        Returns:
+            tuple[list[ProductFootprint], Cursor | None]: The matching footprints in creation order,
+                and the cursor of the next page, or None if this is the last page.
+
+        Raises:
+            ValueError: If limit is not positive or cursor is not from the repository.
+            SnapshotExpiredError: If the cursor's snapshot has expired.
+        """
+        return repository.page(limit, cursor, where=self._root.matches, candidates=self.candidates(repository))
+
+    def mask(self, table: FootprintTable) -> np.ndarray:
+        """
+        Evaluates the filter over the rows of a FootprintTable.
+
+        Args:
+            table (FootprintTable): The table.
+
+        Returns:
+            numpy.ndarray: A boolean mask with True for every row that satisfies the filter.
+
+        Raises:
+            FilterError: If the filter refers to a field that is not a column of the table, such as
+                companyIds or updated.
+        """
+        return np.asarray(self._root.mask(table), dtype=bool)
+
+    def __repr__(self) -> str:
+        return f"FootprintFilter({self.expression!r})"
+
+
+@functools.lru_cache(maxsize=256)
+def compile_filter(expression: str) -> FootprintFilter:
+    """
+    Parses a $filter expression.
+
+    Compiled filters are cached, so a client paging through the results of one filter parses it once.
+
+    Args:
+        expression (str): The expression, for example "productCategoryCpc eq '0111'".
+
+    Returns:
+        FootprintFilter: The compiled filter.
+
+    Raises:
+        FilterError: If the expression is malformed or refers to an unsupported field or operator.
+    """
+    if not isinstance(expression, str):
+        raise FilterError(f"Expected a filter expression, got {expression!r}")
+    parser = _Parser(expression)
+    root = parser.disjunction()
+    if parser.peek() is not None:
+        parser.fail("Unexpected")
+    return FootprintFilter(expression, root)
+
+
+_TOKEN = re.compile(
+    r"""\s*(?:
+        (?P<string>'(?:[^']|'')*')
+      | (?P<datetime>\d{4}-\d{2}-\d{2}T\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:\d{2}))
+      | (?P<number>-?\d+(?:\.\d+)?)
+      | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+      | (?P<punctuation>[()/:])
+    )""",
+    re.VERBOSE,
+)
+
+_LITERALS = {"true": True, "false": False, "null": None}
+
+
+def _tokenize(expression: str) -> list[tuple[str, object, int]]:
+    """Returns the tokens of an expression as (kind, value, position) tuples."""
+    tokens = []
+    position = 0
+    while expression[position:].strip():
+        match = _TOKEN.match(expression, position)
+        if match is None:
+            start = len(expression) - len(expression[position:].lstrip())
+            raise FilterError(f"Invalid character {expression[start]!r} at position {start}")
+        kind = match.lastgroup
+        text = match.group(kind)
+        value = text
+        if kind == "string":
+            value = text[1:-1].replace("''", "'")
+        elif kind == "number":
+            value = float(text) if "." in text else int(text)
+        tokens.append((kind, value, match.start(kind)))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """A recursive descent parser of the supported subset of OData $filter."""
+
+    def __init__(self, expression: str):
+        self.tokens = _tokenize(expression)
+        self.position = 0
+        self.variable: str | None = None
+
+    def peek(self) -> tuple[str, object, int] | None:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def fail(self, message: str):
+        token = self.peek()
+        if token is None:
+            raise FilterError(f"{message} end of filter expression")
+        raise FilterError(f"{message} {token[1]!r} at position {token[2]}")
+
+    def keyword(self, *words: str) -> str | None:
+        """Consumes and returns the next token if it is one of words."""
+        token = self.peek()
+        if token is not None and token[0] == "name" and token[1] in words:
+            self.position += 1
+            return token[1]
+        return None
+
+    def punctuation(self, symbol: str) -> bool:
+        token = self.peek()
+        if token is not None and token[0] == "punctuation" and token[1] == symbol:
+            self.position += 1
+            return True
+        return False
+
+    def expect(self, symbol: str) -> None:
+        if not self.punctuation(symbol):
+            self.fail(f"Expected {symbol!r}, got")
+
+    def disjunction(self):
+        node = self.conjunction()
+        while self.keyword("or"):
+            node = _Or(node, self.conjunction())
+        return node
+
+    def conjunction(self):
+        node = self.negation()
+        while self.keyword("and"):
+            node = _And(node, self.negation())
+        return node
+
+    def negation(self):
+        if self.keyword("not"):
+            return _Not(self.negation())
+        return self.primary()
+
+    def primary(self):
+        if self.punctuation("("):
+            node = self.disjunction()
+            self.expect(")")
+            return node
+        token = self.peek()
+        if token is None or token[0] != "name" or token[1] in _LITERALS:
+            self.fail("Expected a field, got")
+        self.position += 1
+        path = [token[1]]
+        while self.punctuation("/"):
+            segment = self.peek()
+            if segment is None or segment[0] != "name":
+                self.fail("Expected a field name, got")
+            self.position += 1
+            path.append(segment[1])
+        if path[-1] == "any" and len(path) > 1:
+            return self.lambda_any("/".join(path[:-1]), token[2])
+        return self.comparison("/".join(path), token[2])
+
+    def lambda_any(self, name: str, position: int) -> _Any:
+        field = FIELDS.get(name)
+        if field is None or not field.collection or self.variable is not None:
+            raise FilterError(f"any is not supported on {name!r} at position {position}")
+        self.expect("(")
+        token = self.peek()
+        if token is None or token[0] != "name" or token[1] in _LITERALS:
+            self.fail("Expected a lambda variable, got")
+        self.position += 1
+        self.expect(":")
+        self.variable = token[1]
+        try:
+            condition = self.disjunction()
+        finally:
+            self.variable = None
+        self.expect(")")
+        return _Any(name, field, condition)
+
+    def comparison(self, name: str, position: int) -> _Comparison:
+        if self.variable is not None:
+            if name != self.variable:
+                raise FilterError(
+                    f"Only the lambda variable can be used within any, got {name!r} at position {position}"
+                )
+            field = _Field(lambda value: value, _parse_string)
+        else:
+            field = FIELDS.get(name)
+            if field is None:
+                raise FilterError(f"Unsupported field {name!r} at position {position}")
+            if field.collection:
+                raise FilterError(f"{name} can only be filtered with any, at position {position}")
+        op = self.keyword(*_OPERATORS)
+        if op is None:
+            self.fail("Expected a comparison operator, got")
+        token = self.peek()
+        if token is None or token[0] == "punctuation" or (token[0] == "name" and token[1] not in _LITERALS):
+            self.fail("Expected a literal, got")
+        self.position += 1
+        value = _LITERALS[token[1]] if token[0] == "name" else token[1]
+        if value is not None:
+            value = field.parse(value, name)
+        return _Comparison(name, field, op, value)
@@ -0,0 +1,368 @@
+"""
+Minimal HTTP/1.1 over asyncio streams, with pooled keep-alive connections.
+
+The PACT Data Exchange client and server only need a few request shapes: small GET and POST
+requests with JSON or form bodies, answered by JSON. This module implements exactly that on top of
+the standard library, so the package does not depend on an HTTP library. Each `ConnectionPool`
+keeps idle connections to one origin open and reuses them, which saves the TCP and TLS handshakes
+for every page after the first. `read_request` and `encode_response_head` are the server side.
+"""
+
+import asyncio
+import json
+import ssl
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from urllib.parse import urlsplit
+
+DEFAULT_TIMEOUT = 30.0
+"""The default time in seconds to wait for a response, including connecting."""
+
+MAX_BODY_SIZE = 1 << 20
+"""The largest request body read_request accepts, in bytes."""
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS", "TRACE"})
+"""The methods whose requests ConnectionPool may send again after a connection fails."""
+
+
+@dataclass
+class Request:
+    """
+    An HTTP request.
+
+    Attributes:
+        method (str): The request method.
+        target (str): The request target, usually a path and query.
+        headers (dict[str, str]): The headers, by lowercase name. Repeated headers are joined with ", ".
+        body (bytes): The body.
+        keep_alive (bool): Whether the client wants to send more requests on the connection.
+    """
+
+    method: str
+    target: str
+    headers: dict[str, str] = field(default_factory=dict)
+    body: bytes = b""
+    keep_alive: bool = True
+
+
+@dataclass
+class Response:
+    """
+    An HTTP response.
+
+    Attributes:
+        status (int): The status code.
+        headers (dict[str, str]): The headers, by lowercase name. Repeated headers are joined with ", ".
+        body (bytes): The body.
+    """
+
+    status: int
+    headers: dict[str, str] = field(default_factory=dict)
+    body: bytes = b""
+
+    def json(self):
+        """
+        Parses the body as JSON.
+
+        Returns:
+            The parsed value.
+
+        Raises:
+            ValueError: If the body is not valid JSON.
+        """
+        return json.loads(self.body)
+
+
+def split_url(url: str) -> tuple[str, str]:
+    """
+    Splits an absolute http or https URL into its origin and request target.
+
+    Args:
+        url (str): The URL, for example "https://example.com/2/footprints?limit=10".
+
+    Returns:
+        tuple[str, str]: The origin, such as "https://example.com", and the target, such as
+            "/2/footprints?limit=10".
+
+    Raises:
+        ValueError: If url is not an absolute http or https URL.
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise ValueError(f"Expected an absolute http or https URL, got {url!r}")
+    target = parts.path or "/"
+    if parts.query:
+        target += "?" + parts.query
+    return f"{parts.scheme}://{parts.netloc}", target
+
+
+class ConnectionPool:
+    """
+    Keep-alive connections to one origin.
+
+    At most max_connections requests run at once; further requests wait for a connection to be
+    returned to the pool. An idle connection that the server has closed in the meantime is dropped
+    before a request is written to it. If the server closes an idle connection while a request is
+    sent on it, the request is sent again on another connection only if its method is in
+    IDEMPOTENT_METHODS, since the server may have acted on it already.
+
+    Examples:
+        >>> pool = ConnectionPool("https://example.com")
+        >>> response = await pool.request("GET", "/2/footprints", {"Authorization": "Bearer ..."})
+        >>> response.status
+        200
+        >>> await pool.close()
+    """
+
+    def __init__(
+        self,
+        origin: str,
+        *,
+        max_connections: int = 10,
+        timeout: float = DEFAULT_TIMEOUT,
+        ssl_context: ssl.SSLContext | None = None,
+    ):
+        """
+        Initializes a ConnectionPool. No connection is opened until the first request.
+
+        Args:
+            origin (str): The scheme, host and optional port, for example "https://example.com:8443".
+            max_connections (int): The largest number of open connections.
+            timeout (float): The time in seconds to wait for each response.
+            ssl_context (ssl.SSLContext | None): The TLS settings for https origins. Defaults to
+                ssl.create_default_context().
+
+        Raises:
+            ValueError: If origin is not an http or https origin or max_connections is not positive.
+        """
+        parts = urlsplit(origin)
+        if parts.scheme not in ("http", "https") or not parts.hostname or parts.path not in ("", "/"):
+            raise ValueError(f"Expected an http or https origin, got {origin!r}")
+        if max_connections < 1:
+            raise ValueError("max_connections must be positive")
+        self.origin = f"{parts.scheme}://{parts.netloc}"
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.timeout = timeout
+        self._ssl = (ssl_context or ssl.create_default_context()) if parts.scheme == "https" else None
+        self._host_header = parts.netloc.rsplit("@", 1)[-1]
+        self._semaphore = asyncio.Semaphore(max_connections)
+        self._idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self.connections_opened = 0
+
+    async def request(
+        self, method: str, target: str, headers: dict[str, str] | None = None, body: bytes = b""
+    ) -> Response:
+        """
+        Sends a request and reads the response.
+
+        Args:
+            method (str): The request method, for example "GET".
+            target (str): The path and query, for example "/2/footprints?limit=10".
+            headers (dict[str, str] | None): Additional request headers.
+            body (bytes): The request body.
+
+        Returns:
+            Response: The response.
+
+        Raises:
+            OSError: If the connection fails.
+            asyncio.TimeoutError: If no complete response arrives within the timeout.
+            asyncio.IncompleteReadError: If the connection closes before the response is complete.
+            ValueError: If the response is not valid HTTP/1.1.
+        """
+        message = _encode_request(method, target, self._host_header, headers or {}, body)
+        async with self._semaphore:
+            while self._idle:
+                reader, writer = self._idle.pop()
+                if reader.at_eof() or writer.is_closing():
+                    # The server closed the idle connection, and nothing has been written to it.
+                    writer.close()
+                    continue
+                try:
+                    return await asyncio.wait_for(self._exchange(reader, writer, message, method), self.timeout)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    # The server may have closed the connection after it received the request.
+                    if method not in IDEMPOTENT_METHODS:
+                        raise
+            return await asyncio.wait_for(self._exchange(None, None, message, method), self.timeout)
+
+    async def close(self) -> None:
+        """Closes the idle connections."""
+        idle, self._idle = self._idle, []
+        for _, writer in idle:
+            writer.close()
+        for _, writer in idle:
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, ssl.SSLError):
+                pass
+
+    async def _exchange(
+        self,
+        reader: asyncio.StreamReader | None,
+        writer: asyncio.StreamWriter | None,
+        message: bytes,
+        method: str,
+    ) -> Response:
+        """Sends a request on a connection, opening one if needed, and returns it to the pool after."""
+        if writer is None:
+            reader, writer = await asyncio.open_connection(self.host, self.port, ssl=self._ssl)
+            self.connections_opened += 1
+        try:
+            writer.write(message)
+            await writer.drain()
+            response, keep_alive = await read_response(reader, method)
+        except BaseException:
+            writer.close()
+            raise
+        if keep_alive:
+            self._idle.append((reader, writer))
+        else:
+            writer.close()
+        return response
+
+
+def _encode_request(method: str, target: str, host: str, headers: dict[str, str], body: bytes) -> bytes:
+    """Returns the bytes of an HTTP/1.1 request."""
+    lines = [f"{method} {target} HTTP/1.1", f"Host: {host}"]
+    lines += [f"{name}: {value}" for name, value in headers.items()]
+    if body or method in ("POST", "PUT", "PATCH"):
+        lines.append(f"Content-Length: {len(body)}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+
+async def read_response(reader: asyncio.StreamReader, method: str = "GET") -> tuple[Response, bool]:
+    """
+    Reads one HTTP/1.1 response from a stream.
+
+    Args:
+        reader (asyncio.StreamReader): The stream.
+        method (str): The method of the request, which decides whether the response has a body.
+
+    Returns:
+        tuple[Response, bool]: The response, and whether the connection can be used for another request.
+
+    Raises:
+        asyncio.IncompleteReadError: If the stream ends before the response is complete.
+        ValueError: If the response is not valid HTTP/1.1.
+    """
+    head = await reader.readuntil(b"\r\n\r\n")
+    status_line, *header_lines = head[:-4].decode("latin-1").split("\r\n")
+    version, _, rest = status_line.partition(" ")
+    status = rest[:3]
+    if not version.startswith("HTTP/1.") or not status.isdigit():
+        raise ValueError(f"Invalid HTTP status line: {status_line!r}")
+    headers = parse_headers(header_lines)
+
+    connection = headers.get("connection", "").lower()
+    keep_alive = "close" not in connection if version == "HTTP/1.1" else "keep-alive" in connection
+    status = int(status)
+    if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+        body = b""
+    elif "chunked" in headers.get("transfer-encoding", "").lower():
+        body = await _read_chunked(reader)
+    elif "content-length" in headers:
+        body = await reader.readexactly(int(headers["content-length"]))
+    else:
+        body = await reader.read()
+        keep_alive = False
+    return Response(status, headers, body), keep_alive
+
+
+async def read_request(reader: asyncio.StreamReader, max_body_size: int = MAX_BODY_SIZE) -> Request | None:
+    """
+    Reads one HTTP/1.1 request from a stream.
+
+    Args:
+        reader (asyncio.StreamReader): The stream.
+        max_body_size (int): The largest body to accept, in bytes.
+
+    Returns:
+        Request | None: The request, or None if the stream ended before a new request started.
+
+    Raises:
+        asyncio.IncompleteReadError: If the stream ends within a request.
+        ValueError: If the request is not valid HTTP/1.1, is chunked, or its body is too large.
+    """
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as error:
+        if not error.partial.strip():
+            return None
+        raise
+    request_line, *header_lines = head[:-4].decode("latin-1").split("\r\n")
+    parts = request_line.split(" ")
+    if len(parts) != 3 or not parts[2].startswith("HTTP/1."):
+        raise ValueError(f"Invalid HTTP request line: {request_line!r}")
+    method, target, version = parts
+    headers = parse_headers(header_lines)
+
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        raise ValueError("Chunked request bodies are not supported")
+    length = headers.get("content-length", "0")
+    if not length.isdigit() or int(length) > max_body_size:
+        raise ValueError(f"Invalid Content-Length: {length!r}")
+    body = await reader.readexactly(int(length)) if int(length) else b""
+    connection = headers.get("connection", "").lower()
+    keep_alive = "close" not in connection if version == "HTTP/1.1" else "keep-alive" in connection
+    return Request(method, target, headers, body, keep_alive)
+
+
+def encode_response_head(status: int, headers: dict[str, str], content_length: int) -> bytes:
+    """
+    Returns the status line and headers of an HTTP/1.1 response.
+
+    Args:
+        status (int): The status code.
+        headers (dict[str, str]): The headers, other than Content-Length.
+        content_length (int): The length of the body that follows.
+
+    Returns:
+        bytes: The response head, ending with the empty line before the body.
+    """
+    try:
+        reason = HTTPStatus(status).phrase
+    except ValueError:
+        reason = ""
+    lines = [f"HTTP/1.1 {status} {reason}", f"Content-Length: {content_length}"]
+    lines += [f"{name}: {value}" for name, value in headers.items()]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+def parse_headers(lines: list[str]) -> dict[str, str]:
+    """
+    Parses header lines into a dict by lowercase name.
+
+    Args:
+        lines (list[str]): The header lines, without line endings.
+
+    Returns:
+        dict[str, str]: The headers. Repeated headers are joined with ", ".
+
+    Raises:
+        ValueError: If a line is not a header.
+    """
+    headers = {}
+    for line in lines:
+        name, separator, value = line.partition(":")
+        if not separator or not name or name != name.strip():
+            raise ValueError(f"Invalid HTTP header: {line!r}")
+        name = name.lower()
+        value = value.strip()
+        headers[name] = f"{headers[name]}, {value}" if name in headers else value
+    return headers
+
+
+async def _read_chunked(reader: asyncio.StreamReader) -> bytes:
+    """Reads a body sent with chunked transfer encoding, discarding any trailers."""
+    chunks = []
+    while True:
+        size_line = await reader.readuntil(b"\r\n")
+        size = int(size_line.split(b";", 1)[0], 16)
+        if size == 0:
+            while await reader.readuntil(b"\r\n") != b"\r\n":
+                pass
+            return b"".join(chunks)
+        chunks.append(await reader.readexactly(size))
+        await reader.readexactly(2)
@@ -0,0 +1,893 @@
+"""
+Encoding and decoding of the PACT JSON representation of the data model.
+
+The PACT Technical Specifications exchange footprints as JSON objects with camelCase members.
+Decimal values (emissions and amounts) are encoded as strings such as "0.5", percentages and data
+quality ratings as numbers, and dates as ISO 8601 strings. Undefined optional values are left out.
+
+Every model class with a JSON representation has a tuple of `Field` objects that reads and writes
+one JSON member on an instance. `encode` and the decode functions are built on these fields, and
+`pact_methodology.exchange.patch` uses them to apply JSON Patch operations attribute by attribute.
+"""
+
+import functools
+import json
+import math
+from collections.abc import Callable
+from decimal import Decimal, InvalidOperation
+
+from pact_methodology.assurance.assurance import Assurance, Boundary, Coverage, Level
+from pact_methodology.carbon_footprint.biogenic_accounting_methodology import BiogenicAccountingMethodology
+from pact_methodology.carbon_footprint.carbon_footprint import CarbonFootprint
+from pact_methodology.carbon_footprint.characterization_factors import CharacterizationFactors
+from pact_methodology.carbon_footprint.cross_sectoral_standard import CrossSectoralStandard
+from pact_methodology.carbon_footprint.cross_sectoral_standard_set import CrossSectoralStandardSet
+from pact_methodology.carbon_footprint.declared_unit import DeclaredUnit
+from pact_methodology.carbon_footprint.emission_factor_ds import EmissionFactorDS
+from pact_methodology.carbon_footprint.emission_factor_ds_set import EmissionFactorDSSet
+from pact_methodology.carbon_footprint.geographical_scope import (
+    CarbonFootprintGeographicalScope,
+    GeographicalGranularity,
+)
+from pact_methodology.carbon_footprint.product_or_sector_specific_rule import ProductOrSectorSpecificRule
+from pact_methodology.carbon_footprint.product_or_sector_specific_rule_operator import (
+    ProductOrSectorSpecificRuleOperator,
+)
+from pact_methodology.carbon_footprint.product_or_sector_specific_rule_set import ProductOrSectorSpecificRuleSet
+from pact_methodology.carbon_footprint.reference_period import ReferencePeriod
+from pact_methodology.carbon_footprint.region_or_subregion import RegionOrSubregion
+from pact_methodology.data_model_extension.data_model_extension import DataModelExtension
+from pact_methodology.data_quality_indicators.data_quality_indicators import DataQualityIndicators
+from pact_methodology.data_quality_indicators.data_quality_rating import DataQualityRating
+from pact_methodology.datetime import DateTime
+from pact_methodology.product_footprint.company_id_list import CompanyIdList
+from pact_methodology.product_footprint.cpc import CPC, CPCCodeLookup
+from pact_methodology.product_footprint.id import ProductFootprintId
+from pact_methodology.product_footprint.product_footprint import ProductFootprint
+from pact_methodology.product_footprint.product_id_list import ProductIdList
+from pact_methodology.product_footprint.status import ProductFootprintStatus, Status
+from pact_methodology.product_footprint.validity_period import ValidityPeriod
+from pact_methodology.product_footprint.version import Version
+from pact_methodology.urn import CompanyId, ProductId
+
+
+class Field:
+    """
+    One member of the JSON representation of a model class.
+
+    Attributes:
+        name (str): The JSON member name.
+        get (Callable): Returns the JSON value of the member for an instance, None if undefined.
+        set (Callable): Decodes a JSON value, None to remove it, and assigns it to an instance
+            through the model's setters.
+        child (Callable | None): For members holding a nested model object, returns that object.
+        fields (tuple[Field, ...] | None): For members holding a nested model object, its fields.
+        group (FieldGroup | None): The group of the member, if it is decoded together with others.
+    """
+
+    __slots__ = ("name", "get", "set", "child", "fields", "group")
+
+    def __init__(
+        self,
+        name: str,
+        get: Callable,
+        set: Callable,
+        child: Callable | None = None,
+        fields: tuple["Field", ...] | None = None,
+        group: "FieldGroup | None" = None,
+    ):
+        self.name = name
+        self.get = get
+        self.set = set
+        self.child = child
+        self.fields = fields
+        self.group = group
+
+    def __repr__(self) -> str:
+        return f"Field({self.name!r})"
+
+
+class FieldGroup:
+    """
+    Members of a JSON object that are decoded together.
+
+    Some members map onto a single model value, such as referencePeriodStart and referencePeriodEnd,
+    or are validated against each other, such as packagingEmissionsIncluded and
+    packagingGhgEmissions. Changing one of them on its own may be invalid until the others have
+    changed too, so a group assigns all of its members at once.
+
+    Attributes:
+        name (str): The name of the group.
+        members (dict[str, Callable]): The JSON member names, mapped to functions returning their
+            JSON values for an instance.
+        commit (Callable): Decodes the JSON values of all members, given as a dict, and assigns them
+            to an instance.
+    """
+
+    __slots__ = ("name", "members", "commit")
+
+    def __init__(self, name: str, members: dict[str, Callable], commit: Callable):
+        self.name = name
+        self.members = members
+        self.commit = commit
+
+    def values(self, obj) -> dict:
+        """Returns the JSON values of all members for an instance."""
+        return {name: get(obj) for name, get in self.members.items()}
+
+    def fields(self) -> tuple[Field, ...]:
+        """Returns a field for each member, which commits the group with one value replaced."""
+        return tuple(
+            Field(name, get, functools.partial(self._set, name), group=self) for name, get in self.members.items()
+        )
+
+    def _set(self, name: str, obj, value) -> None:
+        self.commit(obj, {**self.values(obj), name: value})
+
+    def __repr__(self) -> str:
+        return f"FieldGroup({self.name!r})"
+
+
+def encode_decimal(value: float | None) -> str | None:
+    """
+    Encodes a number as a PACT decimal string.
+
+    Args:
+        value (float | None): The number.
+
+    Returns:
+        str | None: The number in positional notation, for example "0.0000012", or None.
+    """
+    if value is None:
+        return None
+    text = format(Decimal(repr(float(value))), "f")
+    return text if "." in text else f"{text}.0"
+
+
+def decode_decimal(value) -> float | None:
+    """
+    Decodes a PACT decimal string. Plain JSON numbers are accepted as well.
+
+    Args:
+        value (str | int | float | None): The JSON value.
+
+    Returns:
+        float | None: The number, or None.
+
+    Raises:
+        ValueError: If value is not a decimal string or a number, or is not finite, such as "NaN"
+            or "Infinity".
+    """
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+        raise ValueError(f"Invalid decimal: {value!r}")
+    try:
+        number = float(Decimal(value)) if isinstance(value, str) else float(value)
+    except (InvalidOperation, OverflowError):
+        raise ValueError(f"Invalid decimal: {value!r}") from None
+    if not math.isfinite(number):
+        raise ValueError(f"Invalid decimal: {value!r}")
+    return number
+
+
+def decode_datetime(value) -> DateTime | None:
+    """
+    Decodes an ISO 8601 UTC date and time string.
+
+    Args:
+        value (str | None): The JSON value.
+
+    Returns:
+        DateTime | None: The date and time, or None.
+
+    Raises:
+        ValueError: If value is not a valid ISO 8601 string with UTC timezone.
+    """
+    if value is None:
+        return None
+    if not isinstance(value, str):
+        raise ValueError(f"Invalid date and time: {value!r}")
+    return DateTime(value)
+
+
+@functools.cache
+def cpc_code_lookup() -> CPCCodeLookup:
+    """Returns the CPC code table shared by all decoders."""
+    return CPCCodeLookup()
+
+
+def decode_cpc(value) -> CPC:
+    """
+    Decodes a CPC code.
+
+    Args:
+        value (str): The CPC code.
+
+    Returns:
+        CPC: The CPC code with its title.
+
+    Raises:
+        ValueError: If value is not a known CPC code.
+    """
+    if not isinstance(value, str):
+        raise ValueError(f"Invalid CPC code: {value!r}")
+    cpc = cpc_code_lookup().lookup(value)
+    if cpc is None:
+        raise ValueError(f"Unknown CPC code: {value}")
+    return cpc
+
+
+_cached_company_id = functools.lru_cache(maxsize=4096)(CompanyId)
+_cached_product_id = functools.lru_cache(maxsize=4096)(ProductId)
+
+
+def decode_company_id(value) -> CompanyId:
+    """
+    Decodes a company id URN.
+
+    The same ids recur across the footprints of a company, so decoded ids are cached. URNs are
+    value objects, which footprints can share.
+
+    Args:
+        value (str): The URN.
+
+    Returns:
+        CompanyId: The company id.
+
+    Raises:
+        ValueError: If value is not a URN.
+    """
+    return _cached_company_id(_string(value))
+
+
+def decode_product_id(value) -> ProductId:
+    """
+    Decodes a product id URN, caching decoded ids like decode_company_id.
+
+    Args:
+        value (str): The URN.
+
+    Returns:
+        ProductId: The product id.
+
+    Raises:
+        ValueError: If value is not a URN.
+    """
+    return _cached_product_id(_string(value))
+
+
+def _optional(decode: Callable) -> Callable:
+    """Wraps a decoder so that None decodes to None."""
+    return lambda value: None if value is None else decode(value)
+
+
+def _iso(value: DateTime | None) -> str | None:
+    return None if value is None else value.iso_string
+
+
+def _enum_value(value) -> str | None:
+    return None if value is None else value.value
+
+
+def _list(value, decode: Callable) -> list:
+    if not isinstance(value, list):
+        raise ValueError(f"Expected a JSON array, got {value!r}")
+    return [decode(item) for item in value]
+
+
+def _attribute(name: str, attribute: str, encode: Callable = None, decode: Callable = None) -> Field:
+    """Returns a field that maps a JSON member to one attribute, with optional value conversions."""
+    encode = encode or (lambda value: value)
+    decode = decode or (lambda value: value)
+    return Field(
+        name,
+        lambda obj: encode(getattr(obj, attribute)),
+        lambda obj, value: setattr(obj, attribute, decode(value)),
+    )
+
+
+# Data quality indicators
+
+def _rating(value) -> DataQualityRating:
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return DataQualityRating(value)
+
+
+DQI_FIELDS = (
+    _attribute("coveragePercent", "coverage_percent"),
+    *(
+        _attribute(name, attribute, lambda rating: None if rating is None else rating.rating, _optional(_rating))
+        for name, attribute in (
+            ("technologicalDQR", "technological_dqr"),
+            ("temporalDQR", "temporal_dqr"),
+            ("geographicalDQR", "geographical_dqr"),
+            ("completenessDQR", "completeness_dqr"),
+            ("reliabilityDQR", "reliability_dqr"),
+        )
+    ),
+)
+"""The members of the JSON representation of DataQualityIndicators."""
+
+
+def decode_dqi(data: dict, reference_period: ReferencePeriod) -> DataQualityIndicators:
+    """
+    Decodes data quality indicators.
+
+    Args:
+        data (dict): The JSON object.
+        reference_period (ReferencePeriod): The reference period of the enclosing carbon footprint.
+
+    Returns:
+        DataQualityIndicators: The data quality indicators.
+
+    Raises:
+        ValueError: If a member is invalid.
+    """
+    _check_object(data)
+    return DataQualityIndicators(
+        reference_period=reference_period,
+        coverage_percent=data.get("coveragePercent"),
+        technological_dqr=_optional(_rating)(data.get("technologicalDQR")),
+        temporal_dqr=_optional(_rating)(data.get("temporalDQR")),
+        geographical_dqr=_optional(_rating)(data.get("geographicalDQR")),
+        completeness_dqr=_optional(_rating)(data.get("completenessDQR")),
+        reliability_dqr=_optional(_rating)(data.get("reliabilityDQR")),
+    )
+
+
+# Assurance
+
+ASSURANCE_FIELDS = (
+    _attribute("assurance", "assurance"),
+    _attribute("providerName", "provider_name"),
+    _attribute("coverage", "coverage", _enum_value, _optional(Coverage)),
+    _attribute("level", "level", _enum_value, _optional(Level)),
+    _attribute("boundary", "boundary", _enum_value, _optional(Boundary)),
+    _attribute("completedAt", "completed_at", _iso, decode_datetime),
+    _attribute("standardName", "standard_name"),
+    _attribute("comments", "comments"),
+)
+"""The members of the JSON representation of Assurance."""
+
+
+def decode_assurance(data: dict) -> Assurance:
+    """
+    Decodes assurance information.
+
+    Args:
+        data (dict): The JSON object.
+
+    Returns:
+        Assurance: The assurance information.
+
+    Raises:
+        ValueError: If a member is invalid.
+    """
+    _check_object(data)
+    return Assurance(
+        assurance=data.get("assurance"),
+        provider_name=data.get("providerName"),
+        coverage=_optional(Coverage)(data.get("coverage")),
+        level=_optional(Level)(data.get("level")),
+        boundary=_optional(Boundary)(data.get("boundary")),
+        completed_at=decode_datetime(data.get("completedAt")),
+        standard_name=data.get("standardName"),
+        comments=data.get("comments"),
+    )
+
+
+# Carbon footprint
+
+def _encode_standards(standards: CrossSectoralStandardSet) -> list[str]:
+    return sorted(standard.value for standard in standards._standards)
+
+
+def _decode_standards(value) -> CrossSectoralStandardSet:
+    standards = CrossSectoralStandardSet()
+    standards.add_multiple(_list(value, CrossSectoralStandard))
+    return standards
+
+
+def _encode_rules(rules: ProductOrSectorSpecificRuleSet | None) -> list[dict] | None:
+    if rules is None:
+        return None
+    encoded = []
+    for rule in rules.rules:
+        item = {"operator": rule.operator.value, "ruleNames": list(rule.rule_names)}
+        if rule.other_operator_name is not None:
+            item["otherOperatorName"] = rule.other_operator_name
+        encoded.append(item)
+    return encoded
+
+
+def _decode_rule(value) -> ProductOrSectorSpecificRule:
+    _check_object(value)
+    return ProductOrSectorSpecificRule(
+        operator=ProductOrSectorSpecificRuleOperator(value.get("operator")),
+        rule_names=value.get("ruleNames"),
+        other_operator_name=value.get("otherOperatorName"),
+    )
+
+
+def _encode_sources(sources: EmissionFactorDSSet | None) -> list[dict] | None:
+    if sources is None:
+        return None
+    return [{"name": source.name, "version": source.version} for source in sources.emission_factor_ds_list]
+
+
+def _decode_source(value) -> EmissionFactorDS:
+    _check_object(value)
+    return EmissionFactorDS(name=value.get("name"), version=value.get("version"))
+
+
+def _geography_field(name: str, granularity: GeographicalGranularity, argument: str, decode: Callable) -> Field:
+    """Returns a field for one of the mutually exclusive geography members."""
+
+    def get(pcf: CarbonFootprint):
+        scope = pcf.geographical_scope
+        if scope.granularity != granularity:
+            return None
+        return scope.scope.value if isinstance(scope.scope, RegionOrSubregion) else scope.scope
+
+    def set(pcf: CarbonFootprint, value):
+        if value is not None:
+            pcf.geographical_scope = CarbonFootprintGeographicalScope(**{argument: decode(value)})
+        elif pcf.geographical_scope.granularity == granularity:
+            pcf.geographical_scope = CarbonFootprintGeographicalScope(global_scope=True)
+
+    return Field(name, get, set)
+
+
+def _commit_reference_period(pcf: CarbonFootprint, values: dict) -> None:
+    """Assigns the reference period, which is shared with the data quality indicators."""
+    start = decode_datetime(values["referencePeriodStart"])
+    end = decode_datetime(values["referencePeriodEnd"])
+    if start is None or end is None:
+        raise ValueError("referencePeriodStart and referencePeriodEnd must be defined")
+    period = ReferencePeriod(start=start, end=end)
+    pcf.reference_period = period
+    if pcf.dqi is not None:
+        pcf.dqi.reference_period = period
+
+
+REFERENCE_PERIOD = FieldGroup(
+    "referencePeriod",
+    {
+        "referencePeriodStart": lambda pcf: _iso(pcf.reference_period.start),
+        "referencePeriodEnd": lambda pcf: _iso(pcf.reference_period.end),
+    },
+    _commit_reference_period,
+)
+
+
+def _commit_packaging(pcf: CarbonFootprint, values: dict) -> None:
+    """Assigns packagingEmissionsIncluded before packagingGhgEmissions, which is checked against it."""
+    pcf.packaging_emissions_included = values["packagingEmissionsIncluded"]
+    pcf.packaging_ghg_emissions = decode_decimal(values["packagingGhgEmissions"])
+
+
+PACKAGING = FieldGroup(
+    "packaging",
+    {
+        "packagingEmissionsIncluded": lambda pcf: pcf.packaging_emissions_included,
+        "packagingGhgEmissions": lambda pcf: encode_decimal(pcf.packaging_ghg_emissions),
+    },
+    _commit_packaging,
+)
+
+
+def _set_dqi(pcf: CarbonFootprint, value) -> None:
+    pcf.dqi = None if value is None else decode_dqi(value, pcf.reference_period)
+
+
+def _set_assurance(pcf: CarbonFootprint, value) -> None:
+    pcf.assurance = None if value is None else decode_assurance(value)
+
+
+CARBON_FOOTPRINT_FIELDS = (
+    _attribute("declaredUnit", "declared_unit", _enum_value, DeclaredUnit),
+    *(
+        _attribute(name, attribute, encode_decimal, decode_decimal)
+        for name, attribute in (
+            ("unitaryProductAmount", "unitary_product_amount"),
+            ("pCfExcludingBiogenic", "p_cf_excluding_biogenic"),
+            ("pCfIncludingBiogenic", "p_cf_including_biogenic"),
+            ("fossilGhgEmissions", "fossil_ghg_emissions"),
+            ("fossilCarbonContent", "fossil_carbon_content"),
+            ("biogenicCarbonContent", "biogenic_carbon_content"),
+            ("dLucGhgEmissions", "d_luc_ghg_emissions"),
+            ("landManagementGhgEmissions", "land_management_ghg_emissions"),
+            ("otherBiogenicGhgEmissions", "other_biogenic_ghg_emissions"),
+            ("iLucGhgEmissions", "iluc_ghg_emissions"),
+            ("biogenicCarbonWithdrawal", "biogenic_carbon_withdrawal"),
+            ("aircraftGhgEmissions", "aircraft_ghg_emissions"),
+        )
+    ),
+    _attribute("characterizationFactors", "characterization_factors", _enum_value, CharacterizationFactors),
+    _attribute("ipccCharacterizationFactorsSources", "ipcc_characterization_factors_sources", list, list),
+    _attribute("crossSectoralStandardsUsed", "cross_sectoral_standards_used", _encode_standards, _decode_standards),
+    _attribute(
+        "productOrSectorSpecificRules",
+        "product_or_sector_specific_rules",
+        _encode_rules,
+        _optional(lambda value: ProductOrSectorSpecificRuleSet(_list(value, _decode_rule))),
+    ),
+    _attribute(
+        "biogenicAccountingMethodology",
+        "biogenic_accounting_methodology",
+        _enum_value,
+        _optional(BiogenicAccountingMethodology),
+    ),
+    _attribute("boundaryProcessesDescription", "boundary_processes_description"),
+    *REFERENCE_PERIOD.fields(),
+    _geography_field(
+        "geographyCountrySubdivision",
+        GeographicalGranularity.COUNTRY_SUBDIVISION,
+        "geography_country_subdivision",
+        str,
+    ),
+    _geography_field("geographyCountry", GeographicalGranularity.COUNTRY, "geography_country", str),
+    _geography_field(
+        "geographyRegionOrSubregion",
+        GeographicalGranularity.REGION_OR_SUBREGION,
+        "geography_region_or_subregion",
+        RegionOrSubregion,
+    ),
+    _attribute(
+        "secondaryEmissionFactorSources",
+        "secondary_emission_factor_sources",
+        _encode_sources,
+        _optional(lambda value: EmissionFactorDSSet(_list(value, _decode_source))),
+    ),
+    _attribute("exemptedEmissionsPercent", "exempted_emissions_percent"),
+    _attribute("exemptedEmissionsDescription", "exempted_emissions_description"),
+    *PACKAGING.fields(),
+    _attribute("allocationRulesDescription", "allocation_rules_description"),
+    _attribute("uncertaintyAssessmentDescription", "uncertainty_assessment_description"),
+    _attribute("primaryDataShare", "primary_data_share"),
+    Field(
+        "dqi",
+        lambda pcf: None if pcf.dqi is None else encode(pcf.dqi),
+        _set_dqi,
+        child=lambda pcf: pcf.dqi,
+        fields=DQI_FIELDS,
+    ),
+    Field(
+        "assurance",
+        lambda pcf: None if pcf.assurance is None else encode(pcf.assurance),
+        _set_assurance,
+        child=lambda pcf: pcf.assurance,
+        fields=ASSURANCE_FIELDS,
+    ),
+)
+"""The members of the JSON representation of CarbonFootprint."""
+
+
+def decode_carbon_footprint(data: dict) -> CarbonFootprint:
+    """
+    Decodes a carbon footprint.
+
+    Args:
+        data (dict): The JSON object.
+
+    Returns:
+        CarbonFootprint: The carbon footprint.
+
+    Raises:
+        ValueError: If a member is missing or invalid.
+    """
+    _check_object(data)
+    reference_period = ReferencePeriod(
+        start=decode_datetime(_required(data, "referencePeriodStart")),
+        end=decode_datetime(_required(data, "referencePeriodEnd")),
+    )
+    if "geographyCountrySubdivision" in data:
+        geographical_scope = CarbonFootprintGeographicalScope(
+            geography_country_subdivision=data["geographyCountrySubdivision"]
+        )
+    elif "geographyCountry" in data:
+        geographical_scope = CarbonFootprintGeographicalScope(geography_country=data["geographyCountry"])
+    elif "geographyRegionOrSubregion" in data:
+        geographical_scope = CarbonFootprintGeographicalScope(
+            geography_region_or_subregion=RegionOrSubregion(data["geographyRegionOrSubregion"])
+        )
+    else:
+        geographical_scope = CarbonFootprintGeographicalScope(global_scope=True)
+    rules = data.get("productOrSectorSpecificRules")
+    sources = data.get("secondaryEmissionFactorSources")
+    biogenic_accounting_methodology = data.get("biogenicAccountingMethodology")
+
+    return CarbonFootprint(
+        declared_unit=DeclaredUnit(_required(data, "declaredUnit")),
+        unitary_product_amount=decode_decimal(_required(data, "unitaryProductAmount")),
+        p_cf_excluding_biogenic=decode_decimal(_required(data, "pCfExcludingBiogenic")),
+        p_cf_including_biogenic=decode_decimal(data.get("pCfIncludingBiogenic")),
+        fossil_ghg_emissions=decode_decimal(_required(data, "fossilGhgEmissions")),
+        fossil_carbon_content=decode_decimal(_required(data, "fossilCarbonContent")),
+        biogenic_carbon_content=decode_decimal(_required(data, "biogenicCarbonContent")),
+        d_luc_ghg_emissions=decode_decimal(data.get("dLucGhgEmissions")),
+        land_management_ghg_emissions=decode_decimal(data.get("landManagementGhgEmissions")),
+        other_biogenic_ghg_emissions=decode_decimal(data.get("otherBiogenicGhgEmissions")),
+        iluc_ghg_emissions=decode_decimal(data.get("iLucGhgEmissions")),
+        biogenic_carbon_withdrawal=decode_decimal(data.get("biogenicCarbonWithdrawal")),
+        aircraft_ghg_emissions=decode_decimal(data.get("aircraftGhgEmissions")),
+        characterization_factors=CharacterizationFactors(_required(data, "characterizationFactors")),
+        ipcc_characterization_factors_sources=_required(data, "ipccCharacterizationFactorsSources"),
+        cross_sectoral_standards_used=_decode_standards(_required(data, "crossSectoralStandardsUsed")),
+        product_or_sector_specific_rules=(
+            None if rules is None else ProductOrSectorSpecificRuleSet(_list(rules, _decode_rule))
+        ),
+        biogenic_accounting_methodology=(
+            None if biogenic_accounting_methodology is None else BiogenicAccountingMethodology(biogenic_accounting_methodology)
+        ),
+        boundary_processes_description=_required(data, "boundaryProcessesDescription"),
+        reference_period=reference_period,
+        geographical_scope=geographical_scope,
+        secondary_emission_factor_sources=(
+            None if sources is None else EmissionFactorDSSet(_list(sources, _decode_source))
+        ),
+        exempted_emissions_percent=_required(data, "exemptedEmissionsPercent"),
+        exempted_emissions_description=_required(data, "exemptedEmissionsDescription"),
+        packaging_emissions_included=_required(data, "packagingEmissionsIncluded"),
+        packaging_ghg_emissions=decode_decimal(data.get("packagingGhgEmissions")),
+        allocation_rules_description=data.get("allocationRulesDescription"),
+        uncertainty_assessment_description=data.get("uncertaintyAssessmentDescription"),
+        primary_data_share=data.get("primaryDataShare"),
+        dqi=None if data.get("dqi") is None else decode_dqi(data["dqi"], reference_period),
+        assurance=None if data.get("assurance") is None else decode_assurance(data["assurance"]),
+    )
+
+
+# Product footprint
+
+def _encode_extension(extension: DataModelExtension) -> dict:
+    encoded = {
+        "specVersion": extension.spec_version,
+        "dataSchema": extension.data_schema,
+        "data": extension.data,
+    }
+    if extension.documentation is not None:
+        encoded["documentation"] = extension.documentation
+    return encoded
+
+
+def _decode_extension(value) -> DataModelExtension:
+    _check_object(value)
+    return DataModelExtension(
+        spec_version=value.get("specVersion"),
+        data_schema=value.get("dataSchema"),
+        data=value.get("data"),
+        documentation=value.get("documentation"),
+    )
+
+
+def _set_status(footprint: ProductFootprint, value) -> None:
+    footprint.status_info = ProductFootprintStatus(Status(value), footprint.status_comment)
+
+
+def _set_status_comment(footprint: ProductFootprint, value) -> None:
+    footprint.status_info = ProductFootprintStatus(footprint.status, value)
+
+
+def _decode_validity_period(start, end) -> ValidityPeriod | None:
+    """Decodes the validity period, which is either fully defined or undefined."""
+    start = decode_datetime(start)
+    end = decode_datetime(end)
+    if (start is None) != (end is None):
+        raise ValueError("validityPeriodStart and validityPeriodEnd must be defined together")
+    return None if start is None else ValidityPeriod(start=start, end=end)
+
+
+def _commit_validity_period(footprint: ProductFootprint, values: dict) -> None:
+    footprint.validity_period = _decode_validity_period(values["validityPeriodStart"], values["validityPeriodEnd"])
+
+
+def _validity_period_member(attribute: str) -> Callable:
+    def get(footprint: ProductFootprint):
+        period = footprint.validity_period
+        return None if period is None else _iso(getattr(period, attribute))
+
+    return get
+
+
+VALIDITY_PERIOD = FieldGroup(
+    "validityPeriod",
+    {
+        "validityPeriodStart": _validity_period_member("start"),
+        "validityPeriodEnd": _validity_period_member("end"),
+    },
+    _commit_validity_period,
+)
+
+
+def _set_pcf(footprint: ProductFootprint, value) -> None:
+    if value is None:
+        raise ValueError("pcf must be defined")
+    footprint.pcf = decode_carbon_footprint(value)
+
+
+PRODUCT_FOOTPRINT_FIELDS = (
+    _attribute("id", "id", str, lambda value: ProductFootprintId(_string(value))),
+    _attribute("specVersion", "spec_version"),
+    _attribute(
+        "precedingPfIds",
+        "preceding_pf_ids",
+        lambda ids: None if ids is None else [str(pf_id) for pf_id in ids],
+        _optional(lambda value: _list(value, lambda item: ProductFootprintId(_string(item)))),
+    ),
+    _attribute("version", "version", lambda version: version.version, Version),
+    _attribute("created", "created", _iso, decode_datetime),
+    _attribute("updated", "updated", _iso, decode_datetime),
+    Field("status", lambda footprint: footprint.status.value, _set_status),
+    Field("statusComment", lambda footprint: footprint.status_comment, _set_status_comment),
+    *VALIDITY_PERIOD.fields(),
+    _attribute("companyName", "company_name"),
+    _attribute(
+        "companyIds",
+        "company_ids",
+        lambda ids: [str(company_id) for company_id in ids],
+        lambda value: CompanyIdList(_list(value, decode_company_id)),
+    ),
+    _attribute("productDescription", "product_description"),
+    _attribute(
+        "productIds",
+        "product_ids",
+        lambda ids: [str(product_id) for product_id in ids],
+        lambda value: ProductIdList(_list(value, decode_product_id)),
+    ),
+    _attribute("productCategoryCpc", "product_category_cpc", lambda cpc: cpc.code, decode_cpc),
+    _attribute("productNameCompany", "product_name_company"),
+    _attribute("comment", "comment"),
+    Field(
+        "pcf",
+        lambda footprint: encode(footprint.pcf),
+        _set_pcf,
+        child=lambda footprint: footprint.pcf,
+        fields=CARBON_FOOTPRINT_FIELDS,
+    ),
+    _attribute(
+        "extensions",
+        "extensions",
+        lambda extensions: None if extensions is None else [_encode_extension(item) for item in extensions],
+        _optional(lambda value: _list(value, _decode_extension)),
+    ),
+)
+"""The members of the JSON representation of ProductFootprint."""
+
+
+def decode_product_footprint(data: dict) -> ProductFootprint:
+    """
+    Decodes a product footprint.
+
+    Args:
+        data (dict): The JSON object.
+
+    Returns:
+        ProductFootprint: The product footprint.
+
+    Raises:
+        ValueError: If a member is missing or invalid.
+
+    Examples:
+        >>> footprint = decode_product_footprint(json.loads(response_body)["data"])
+        >>> footprint.pcf.p_cf_excluding_biogenic
+        0.5
+    """
+    _check_object(data)
+    pcf = decode_carbon_footprint(_required(data, "pcf"))
+    validity_period = _decode_validity_period(data.get("validityPeriodStart"), data.get("validityPeriodEnd"))
+    preceding_pf_ids = data.get("precedingPfIds")
+    extensions = data.get("extensions")
+
+    return ProductFootprint(
+        id=ProductFootprintId(_string(_required(data, "id"))),
+        spec_version=_required(data, "specVersion"),
+        preceding_pf_ids=(
+            None
+            if preceding_pf_ids is None
+            else _list(preceding_pf_ids, lambda item: ProductFootprintId(_string(item)))
+        ),
+        version=Version(_required(data, "version")),
+        created=decode_datetime(_required(data, "created")),
+        updated=decode_datetime(data.get("updated")),
+        status_info=ProductFootprintStatus(Status(_required(data, "status")), data.get("statusComment")),
+        validity_period=validity_period,
+        company_name=_required(data, "companyName"),
+        company_ids=CompanyIdList(_list(_required(data, "companyIds"), decode_company_id)),
+        product_description=_required(data, "productDescription"),
+        product_ids=ProductIdList(_list(_required(data, "productIds"), decode_product_id)),
+        product_category_cpc=decode_cpc(_required(data, "productCategoryCpc")),
+        product_name_company=_required(data, "productNameCompany"),
+        comment=_required(data, "comment"),
+        extensions=None if extensions is None else _list(extensions, _decode_extension),
+        pcf=pcf,
+    )
+
+
+FIELDS = {
+    ProductFootprint: PRODUCT_FOOTPRINT_FIELDS,
+    CarbonFootprint: CARBON_FOOTPRINT_FIELDS,
+    DataQualityIndicators: DQI_FIELDS,
+    Assurance: ASSURANCE_FIELDS,
+}
+"""The JSON fields of every model class with a JSON representation."""
+
+
+def encode(obj) -> dict:
+    """
+    Encodes a model object as a PACT JSON object.
+
+    Args:
+        obj (ProductFootprint | CarbonFootprint | DataQualityIndicators | Assurance): The object.
+
+    Returns:
+        dict: The JSON object, without members for undefined values.
+
+    Raises:
+        ValueError: If obj has no JSON representation.
+
+    Examples:
+        >>> encode(footprint)["pcf"]["pCfExcludingBiogenic"]
+        '0.5'
+    """
+    fields = next((FIELDS[cls] for cls in type(obj).__mro__ if cls in FIELDS), None)
+    if fields is None:
+        raise ValueError(f"{type(obj).__name__} has no JSON representation")
+    encoded = {}
+    for field in fields:
+        value = field.get(obj)
+        if value is not None:
+            encoded[field.name] = value
+    return encoded
+
+
+def dumps(footprint: ProductFootprint) -> str:
+    """
+    Serializes a product footprint to a PACT JSON string.
+
+    Args:
+        footprint (ProductFootprint): The footprint.
+
+    Returns:
+        str: The JSON text.
+    """
+    return json.dumps(encode(footprint), ensure_ascii=False)
+
+
+def loads(text: str | bytes) -> ProductFootprint:
+    """
+    Parses a product footprint from a PACT JSON string.
+
+    Args:
+        text (str | bytes): The JSON text.
+
+    Returns:
+        ProductFootprint: The footprint.
+
+    Raises:
+        ValueError: If the text is not valid JSON or not a valid product footprint.
+    """
+    return decode_product_footprint(json.loads(text))
+
+
+def _check_object(value) -> None:
+    """Raises ValueError if a JSON value is not an object."""
+    if not isinstance(value, dict):
+        raise ValueError(f"Expected a JSON object, got {value!r}")
+
+
+def _required(data: dict, name: str):
+    """Returns a required member of a JSON object."""
+    value = data.get(name)
+    if value is None:
+        raise ValueError(f"Missing required member: {name}")
+    return value
+
+
+def _string(value) -> str:
+    """Returns value if it is a string."""
+    if not isinstance(value, str):
+        raise ValueError(f"Expected a string, got {value!r}")
+    return value
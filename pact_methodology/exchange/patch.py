@@ -0,0 +1,379 @@
+"""
+JSON Patch (RFC 6902) updates of product footprints.
+
+A patch is a list of operations on the PACT JSON representation of a footprint, addressed by JSON
+Pointers (RFC 6901) such as `/pcf/pCfExcludingBiogenic` or `/productIds/0`. Rather than encoding
+the whole footprint, patching the JSON document and decoding it again, `apply_patch` maps each
+pointer onto the `Field` of the model object it addresses and assigns the new value through that
+object's property setters, so only the touched attributes are decoded and checked.
+
+Rules that relate several attributes are checked once, after the last operation, and only when the
+patch touched an attribute they depend on. These are the reference period rules of
+`CarbonFootprint` and `DataQualityIndicators`, which also run when the reference period changes, and
+the consistency of the packaging emissions. If an operation or a rule fails, the footprint is
+restored to its state before the patch.
+"""
+
+import copy
+import functools
+from collections.abc import Iterable
+
+from pact_methodology.data_quality_indicators.data_quality_indicators import DataQualityIndicators
+from pact_methodology.exceptions import JsonPatchError
+from pact_methodology.exchange.json_codec import DQI_FIELDS, PRODUCT_FOOTPRINT_FIELDS, REFERENCE_PERIOD, Field
+from pact_methodology.product_footprint.product_footprint import ProductFootprint
+
+OPERATIONS = ("add", "remove", "replace", "move", "copy", "test")
+"""The operations defined by RFC 6902."""
+
+RULE_DEPENDENCIES = {
+    DataQualityIndicators: frozenset(field.name for field in DQI_FIELDS),
+}
+"""The JSON members each class's validate_required_attributes depends on.
+
+CarbonFootprint is not listed, as it tracks its changed attributes itself; see CarbonFootprint.revalidate.
+"""
+
+
+def apply_patch(footprint: ProductFootprint, operations: list[dict]) -> ProductFootprint:
+    """
+    Applies a JSON Patch to a product footprint in place.
+
+    The operations are applied in order. The patch is atomic: if any operation fails, or the
+    footprint is invalid after the last one, the footprint is left unchanged.
+
+    Args:
+        footprint (ProductFootprint): The footprint to update.
+        operations (list[dict]): The JSON Patch operations, for example
+            `{"op": "replace", "path": "/pcf/pCfExcludingBiogenic", "value": "0.75"}`.
+
+    Returns:
+        ProductFootprint: The updated footprint, which is the same object as footprint.
+
+    Raises:
+        JsonPatchError: If an operation is malformed, addresses an unknown member, fails, or leaves
+            the footprint invalid.
+
+    Examples:
+        >>> apply_patch(footprint, [
+        ...     {"op": "replace", "path": "/pcf/pCfExcludingBiogenic", "value": "0.75"},
+        ...     {"op": "remove", "path": "/pcf/assurance"},
+        ... ])
+        >>> footprint.pcf.p_cf_excluding_biogenic
+        0.75
+    """
+    if not isinstance(footprint, ProductFootprint):
+        raise JsonPatchError("footprint must be an instance of ProductFootprint")
+    if not isinstance(operations, list):
+        raise JsonPatchError("operations must be a list")
+
+    snapshot = _snapshot(footprint)
+    try:
+        patch = _Patch(footprint)
+        for index, operation in enumerate(operations):
+            try:
+                patch.apply(operation)
+            except (ValueError, TypeError) as error:
+                raise JsonPatchError(f"Operation {index} failed: {error}") from error
+        try:
+            patch.finish()
+        except (ValueError, TypeError) as error:
+            raise JsonPatchError(f"Patched footprint is invalid: {error}") from error
+    except BaseException:
+        _restore(snapshot)
+        raise
+    return footprint
+
+
+def apply_patches(patches: Iterable[tuple[ProductFootprint, list[dict]]]) -> list[JsonPatchError | None]:
+    """
+    Applies a batch of JSON Patches, each to its own footprint.
+
+    Each patch is applied as by `apply_patch`. A failing patch leaves its footprint unchanged and
+    does not stop the rest of the batch.
+
+    Args:
+        patches (Iterable[tuple[ProductFootprint, list[dict]]]): Pairs of a footprint and the
+            operations to apply to it.
+
+    Returns:
+        list[JsonPatchError | None]: For each pair in order, the error of its patch, or None if it was
+            applied.
+
+    Examples:
+        >>> errors = apply_patches((footprint, operations) for footprint, operations in updates)
+        >>> [error for error in errors if error is not None]
+        []
+    """
+    errors = []
+    for footprint, operations in patches:
+        try:
+            apply_patch(footprint, operations)
+        except JsonPatchError as error:
+            errors.append(error)
+        else:
+            errors.append(None)
+    return errors
+
+
+def parse_pointer(pointer: str) -> list[str]:
+    """
+    Splits a JSON Pointer into its reference tokens.
+
+    Args:
+        pointer (str): The JSON Pointer, for example "/pcf/dqi/coveragePercent".
+
+    Returns:
+        list[str]: The unescaped reference tokens, empty for the whole document.
+
+    Raises:
+        ValueError: If pointer is not a valid JSON Pointer.
+    """
+    if not isinstance(pointer, str) or (pointer and not pointer.startswith("/")):
+        raise ValueError(f"Invalid JSON Pointer: {pointer!r}")
+    tokens = pointer.split("/")[1:]
+    for token in tokens:
+        if "~" in token.replace("~0", "").replace("~1", ""):
+            raise ValueError(f"Invalid JSON Pointer: {pointer!r}")
+    return [token.replace("~1", "/").replace("~0", "~") for token in tokens]
+
+
+class _Patch:
+    """The state of a patch being applied to one footprint."""
+
+    def __init__(self, footprint: ProductFootprint):
+        self.footprint = footprint
+        # Values of field groups, keyed by the id of the object and the group name, are collected
+        # here and assigned by finish.
+        self.staged: dict[tuple[int, str], tuple[object, object, dict]] = {}
+        # The JSON members changed on each object, keyed by the id of the object.
+        self.touched: dict[int, tuple[object, set[str]]] = {}
+
+    def apply(self, operation: dict) -> None:
+        if not isinstance(operation, dict):
+            raise ValueError("operation must be a JSON object")
+        op = operation.get("op")
+        if op not in OPERATIONS:
+            raise ValueError(f"unknown operation: {op!r}")
+        path = operation.get("path")
+        if op in ("add", "replace", "test") and "value" not in operation:
+            raise ValueError(f"{op} requires a value")
+        if op in ("move", "copy") and "from" not in operation:
+            raise ValueError(f"{op} requires from")
+
+        if op == "add":
+            self.add(path, operation["value"])
+        elif op == "remove":
+            self.remove(path)
+        elif op == "replace":
+            self.replace(path, operation["value"])
+        elif op == "test":
+            actual = self.get(path)
+            if not _json_equal(actual, operation["value"]):
+                raise ValueError(f"test failed at {path}: {actual!r} != {operation['value']!r}")
+        else:
+            source = operation["from"]
+            value = copy.deepcopy(self.get(source))
+            if op == "move":
+                if path == source:
+                    return
+                if path.startswith(f"{source}/"):
+                    raise ValueError(f"cannot move {source} into its own child {path}")
+                self.remove(source)
+            self.add(path, value)
+
+    def get(self, path: str):
+        obj, field, rest = self.resolve(path)
+        value = self.read(obj, field)
+        if value is None:
+            raise ValueError(f"path not found: {path}")
+        return _json_get(value, rest, path)
+
+    def add(self, path: str, value) -> None:
+        obj, field, rest = self.resolve(path)
+        if rest:
+            document = self.document(obj, field, path)
+            value = _json_add(document, rest, copy.deepcopy(value), path)
+        self.write(obj, field, value)
+
+    def remove(self, path: str) -> None:
+        obj, field, rest = self.resolve(path)
+        if rest:
+            self.write(obj, field, _json_remove(self.document(obj, field, path), rest, path))
+            return
+        if self.read(obj, field) is None:
+            raise ValueError(f"path not found: {path}")
+        self.write(obj, field, None)
+
+    def replace(self, path: str, value) -> None:
+        obj, field, rest = self.resolve(path)
+        if rest:
+            document = self.document(obj, field, path)
+            value = _json_replace(document, rest, copy.deepcopy(value), path)
+        elif self.read(obj, field) is None:
+            raise ValueError(f"path not found: {path}")
+        self.write(obj, field, value)
+
+    def resolve(self, path: str) -> tuple[object, Field, list[str]]:
+        """Returns the model object and field a path addresses, and the tokens below that field."""
+        tokens = parse_pointer(path)
+        if not tokens:
+            raise ValueError("the whole footprint cannot be replaced by a patch operation")
+        obj, fields = self.footprint, PRODUCT_FOOTPRINT_FIELDS
+        while True:
+            field = _index(fields).get(tokens[0])
+            if field is None:
+                raise ValueError(f"unknown member: {tokens[0]!r} in {path}")
+            rest = tokens[1:]
+            child = field.child(obj) if rest and field.child is not None else None
+            if child is None:
+                return obj, field, rest
+            obj, fields, tokens = child, field.fields, rest
+
+    def read(self, obj, field: Field):
+        if field.group is not None:
+            staged = self.staged.get((id(obj), field.group.name))
+            if staged is not None:
+                return staged[2][field.name]
+        return field.get(obj)
+
+    def document(self, obj, field: Field, path: str):
+        """Returns a copy of the JSON value of a field, to apply an operation below it."""
+        value = self.read(obj, field)
+        if value is None:
+            raise ValueError(f"path not found: {path}")
+        return copy.deepcopy(value)
+
+    def write(self, obj, field: Field, value) -> None:
+        if field.group is not None:
+            key = (id(obj), field.group.name)
+            if key not in self.staged:
+                self.staged[key] = (obj, field.group, field.group.values(obj))
+            self.staged[key][2][field.name] = value
+        else:
+            if field.child is not None:
+                replaced = field.child(obj)
+                if replaced is not None:
+                    # Changes staged on a replaced object no longer apply to the footprint.
+                    self.staged = {key: entry for key, entry in self.staged.items() if entry[0] is not replaced}
+                    self.touched.pop(id(replaced), None)
+            field.set(obj, value)
+        self.touched.setdefault(id(obj), (obj, set()))[1].add(field.name)
+
+    def finish(self) -> None:
+        """Assigns the staged field groups and checks the rules depending on the touched members."""
+        for obj, group, values in self.staged.values():
+            group.commit(obj, values)
+
+        pcf = self.footprint.pcf
+        pcf.revalidate()
+        pcf_entry = self.touched.get(id(pcf))
+        if pcf_entry is not None and pcf.dqi is not None and pcf_entry[1] & set(REFERENCE_PERIOD.members):
+            self.touched.setdefault(id(pcf.dqi), (pcf.dqi, set()))[1].update(REFERENCE_PERIOD.members)
+
+        for obj, names in self.touched.values():
+            dependencies = RULE_DEPENDENCIES.get(type(obj))
+            if dependencies is not None and names & dependencies:
+                obj.validate_required_attributes()
+
+
+@functools.cache
+def _index(fields: tuple[Field, ...]) -> dict[str, Field]:
+    """Returns the fields of a class by JSON member name."""
+    return {field.name: field for field in fields}
+
+
+def _snapshot(footprint: ProductFootprint) -> list[tuple[object, dict]]:
+    """Returns the attributes of the model objects a patch can assign to."""
+    objects = [footprint, footprint.pcf, footprint.pcf.dqi, footprint.pcf.assurance]
+    return [(obj, dict(vars(obj))) for obj in objects if obj is not None]
+
+
+def _restore(snapshot: list[tuple[object, dict]]) -> None:
+    """Restores the attributes saved by _snapshot."""
+    for obj, attributes in snapshot:
+        vars(obj).clear()
+        vars(obj).update(attributes)
+        obj._invalidate_content_digest()
+
+
+def _json_equal(a, b) -> bool:
+    """Compares two JSON values as RFC 6902 test does, without treating booleans as numbers."""
+    if isinstance(a, bool) or isinstance(b, bool):
+        return type(a) is type(b) and a == b
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(_json_equal(a[key], b[key]) for key in a)
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(_json_equal(x, y) for x, y in zip(a, b))
+    if _is_number(a) and _is_number(b):
+        return a == b
+    return type(a) is type(b) and a == b
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _child(container, token: str, path: str):
+    """Returns the member or item of a JSON object or array addressed by a token."""
+    if isinstance(container, dict):
+        if token not in container:
+            raise ValueError(f"path not found: {path}")
+        return container[token]
+    if isinstance(container, list):
+        return container[_array_index(container, token, path)]
+    raise ValueError(f"path not found: {path}")
+
+
+def _array_index(array: list, token: str, path: str, *, end: bool = False) -> int:
+    """Returns the index addressed by a token, allowing len(array) when end is True."""
+    if end and token == "-":
+        return len(array)
+    if not token.isdigit() or (len(token) > 1 and token.startswith("0")):
+        raise ValueError(f"invalid array index {token!r} in {path}")
+    index = int(token)
+    if index > len(array) or (index == len(array) and not end):
+        raise ValueError(f"array index out of range in {path}")
+    return index
+
+
+def _json_get(document, tokens: list[str], path: str):
+    for token in tokens:
+        document = _child(document, token, path)
+    return document
+
+
+def _parent(document, tokens: list[str], path: str):
+    parent = _json_get(document, tokens[:-1], path)
+    if not isinstance(parent, (dict, list)):
+        raise ValueError(f"path not found: {path}")
+    return parent
+
+
+def _json_add(document, tokens: list[str], value, path: str):
+    parent = _parent(document, tokens, path)
+    if isinstance(parent, dict):
+        parent[tokens[-1]] = value
+    else:
+        parent.insert(_array_index(parent, tokens[-1], path, end=True), value)
+    return document
+
+
+def _json_remove(document, tokens: list[str], path: str):
+    parent = _parent(document, tokens, path)
+    _child(parent, tokens[-1], path)
+    if isinstance(parent, dict):
+        del parent[tokens[-1]]
+    else:
+        del parent[_array_index(parent, tokens[-1], path)]
+    return document
+
+
+def _json_replace(document, tokens: list[str], value, path: str):
+    parent = _parent(document, tokens, path)
+    _child(parent, tokens[-1], path)
+    if isinstance(parent, dict):
+        parent[tokens[-1]] = value
+    else:
+        parent[_array_index(parent, tokens[-1], path)] = value
+    return document
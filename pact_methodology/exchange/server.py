@@ -0,0 +1,341 @@
+"""
+A PACT Data Exchange host server over asyncio, serving footprints from a FootprintRepository.
+
+`PactServer` implements the actions a data owner offers to its data recipients:
+
+- `POST /auth/token` issues access tokens to clients with known credentials.
+- `ListFootprints` (`GET /2/footprints`) returns the footprints in pages of `limit`, with a `Link`
+  header to the next page. A `$filter` expression narrows the list, see `filter_expression`.
+  The link carries a cursor into a snapshot of the repository, so a client following the links
+  sees every footprint exactly once even while footprints are added or replaced.
+- `GetFootprint` (`GET /2/footprints/{id}`) returns one footprint.
+- `Events` (`POST /2/events`) accepts the CloudEvents of the PACT event types and passes them to a
+  handler.
+
+The JSON encoding of every footprint is cached, so a list response is written as the concatenation
+of cached encodings rather than built and serialized as a whole. Errors are answered with the PACT
+error codes, such as `AccessDenied` or `NoSuchFootprint`.
+
+Examples:
+    >>> server = PactServer(repository, {"client-id": "secret"})
+    >>> async with await server.start("0.0.0.0", 8080) as listener:
+    ...     await listener.serve_forever()
+"""
+
+import asyncio
+import base64
+import inspect
+import json
+import secrets
+import uuid
+from collections.abc import Awaitable, Callable
+from urllib.parse import parse_qs, quote, urlencode, urlsplit
+
+from pact_methodology.exchange.filter_expression import compile_filter
+from pact_methodology.exchange.http import Request, encode_response_head, read_request
+from pact_methodology.exchange.json_codec import encode
+from pact_methodology.product_footprint.product_footprint import ProductFootprint
+from pact_methodology.repository.repository import Cursor, FootprintRepository, footprint_key
+
+PUBLISHED_EVENT = "org.wbcsd.pathfinder.ProductFootprint.Published.v1"
+"""The type of the event a data owner sends when footprints are published or updated."""
+
+REQUEST_CREATED_EVENT = "org.wbcsd.pathfinder.ProductFootprintRequest.Created.v1"
+"""The type of the event a data recipient sends to ask for a footprint."""
+
+REQUEST_FULFILLED_EVENT = "org.wbcsd.pathfinder.ProductFootprintRequest.Fulfilled.v1"
+"""The type of the event a data owner sends to answer a footprint request."""
+
+REQUEST_REJECTED_EVENT = "org.wbcsd.pathfinder.ProductFootprintRequest.Rejected.v1"
+"""The type of the event a data owner sends to reject a footprint request."""
+
+EVENT_TYPES = frozenset({PUBLISHED_EVENT, REQUEST_CREATED_EVENT, REQUEST_FULFILLED_EVENT, REQUEST_REJECTED_EVENT})
+"""The event types the Events action accepts."""
+
+DEFAULT_PAGE_SIZE = 100
+"""The page size of ListFootprints responses when the client does not send a limit."""
+
+_ERROR_STATUS = {
+    "AccessDenied": 403,
+    "BadRequest": 400,
+    "NoSuchFootprint": 404,
+    "NotImplemented": 400,
+    "TokenExpired": 401,
+    "InternalError": 500,
+}
+
+_JSON = "application/json"
+
+
+class _Reply:
+    """A response to write: its status, headers and body as a list of byte strings."""
+
+    __slots__ = ("status", "headers", "parts")
+
+    def __init__(self, status: int, parts: list[bytes], headers: dict[str, str] | None = None):
+        self.status = status
+        self.parts = parts
+        self.headers = headers or {}
+
+
+def _json_reply(status: int, value, headers: dict[str, str] | None = None) -> _Reply:
+    return _Reply(status, [json.dumps(value).encode()], {"Content-Type": _JSON, **(headers or {})})
+
+
+def _error(code: str, message: str) -> _Reply:
+    return _json_reply(_ERROR_STATUS[code], {"code": code, "message": message})
+
+
+class PactServer:
+    """
+    A PACT host system serving the footprints of a FootprintRepository.
+
+    The server reads the repository on every request, so footprints added to it are served at once.
+
+    Attributes:
+        repository (FootprintRepository): The footprints served.
+        page_size (int): The page size when the client does not send a limit.
+        max_page_size (int): The largest page size the server returns, whatever the client asks for.
+    """
+
+    def __init__(
+        self,
+        repository: FootprintRepository,
+        credentials: dict[str, str],
+        *,
+        token_lifetime: float = 3600.0,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        max_page_size: int = 1000,
+        base_url: str | None = None,
+        on_event: Callable[[dict], object | Awaitable[object]] | None = None,
+    ):
+        """
+        Initializes a PactServer.
+
+        Args:
+            repository (FootprintRepository): The footprints to serve.
+            credentials (dict[str, str]): The client secret of every client id allowed to get tokens.
+            token_lifetime (float): The number of seconds an access token is valid.
+            page_size (int): The page size when the client does not send a limit.
+            max_page_size (int): The largest page size to return.
+            base_url (str | None): The public URL of the server, used in pagination links. Defaults
+                to http:// and the Host header of each request.
+            on_event (Callable[[dict], object | Awaitable[object]] | None): Called with every event
+                accepted by the Events action. Without it, the Events action is not implemented.
+                It raises ValueError to answer an event with BadRequest.
+
+        Raises:
+            ValueError: If a page size or the token lifetime is not positive.
+        """
+        if page_size < 1 or max_page_size < page_size:
+            raise ValueError("page_size must be positive and at most max_page_size")
+        if token_lifetime <= 0:
+            raise ValueError("token_lifetime must be positive")
+        self.repository = repository
+        self.page_size = page_size
+        self.max_page_size = max_page_size
+        self.token_lifetime = token_lifetime
+        self.base_url = base_url.rstrip("/") if base_url else None
+        self.on_event = on_event
+        self._credentials = {
+            "Basic " + base64.b64encode(f"{client_id}:{secret}".encode()).decode("ascii"): client_id
+            for client_id, secret in credentials.items()
+        }
+        self._tokens: dict[str, float] = {}
+        self._encoded: dict[uuid.UUID, tuple[ProductFootprint, bytes]] = {}
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0, **kwargs) -> asyncio.Server:
+        """
+        Starts listening for connections.
+
+        Args:
+            host (str): The address to listen on.
+            port (int): The port to listen on. 0 picks a free port.
+            **kwargs: Further arguments to asyncio.start_server, such as ssl.
+
+        Returns:
+            asyncio.Server: The listening server.
+        """
+        return await asyncio.start_server(self.handle, host, port, **kwargs)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Serves the requests of one connection until the client closes it.
+
+        Args:
+            reader (asyncio.StreamReader): The connection's reader.
+            writer (asyncio.StreamWriter): The connection's writer.
+        """
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except ValueError as error:
+                    self._write(writer, _error("BadRequest", str(error)))
+                    await writer.drain()
+                    return
+                if request is None:
+                    return
+                self._write(writer, await self._respond(request))
+                await writer.drain()
+                if not request.keep_alive:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            return
+        finally:
+            writer.close()
+
+    async def _respond(self, request: Request) -> _Reply:
+        """Returns the reply to one request."""
+        url = urlsplit(request.target)
+        path = url.path.rstrip("/")
+        try:
+            if path == "/auth/token":
+                return self._token(request) if request.method == "POST" else _error("BadRequest", "Use POST")
+            if path.startswith("/2/"):
+                denied = self._authorize(request)
+                if denied is not None:
+                    return denied
+                if path == "/2/footprints" and request.method == "GET":
+                    return self._list_footprints(request, parse_qs(url.query))
+                if path.startswith("/2/footprints/") and request.method == "GET":
+                    return self._get_footprint(path.removeprefix("/2/footprints/"))
+                if path == "/2/events" and request.method == "POST":
+                    return await self._event(request)
+            return _error("BadRequest", f"Unknown action: {request.method} {url.path}")
+        except Exception as error:  # noqa: BLE001 - a failing request must not take down the connection
+            return _error("InternalError", f"{type(error).__name__}: {error}")
+
+    def _token(self, request: Request) -> _Reply:
+        """Issues an access token with the client credentials flow."""
+        if self._credentials.get(request.headers.get("authorization", "")) is None:
+            return _json_reply(401, {"error": "invalid_client"}, {"WWW-Authenticate": "Basic"})
+        if parse_qs(request.body.decode("latin-1")).get("grant_type") != ["client_credentials"]:
+            return _json_reply(400, {"error": "unsupported_grant_type"})
+        now = asyncio.get_running_loop().time()
+        if len(self._tokens) > 1000:
+            self._tokens = {token: expiry for token, expiry in self._tokens.items() if expiry > now}
+        token = secrets.token_urlsafe(32)
+        self._tokens[token] = now + self.token_lifetime
+        return _json_reply(
+            200, {"access_token": token, "token_type": "bearer", "expires_in": int(self.token_lifetime)}
+        )
+
+    def _authorize(self, request: Request) -> _Reply | None:
+        """Returns an error reply unless the request has a valid access token."""
+        scheme, _, token = request.headers.get("authorization", "").partition(" ")
+        expiry = self._tokens.get(token) if scheme.lower() == "bearer" else None
+        if expiry is None:
+            return _error("AccessDenied", "Access token is missing or invalid")
+        if expiry <= asyncio.get_running_loop().time():
+            del self._tokens[token]
+            return _error("TokenExpired", "Access token has expired")
+        return None
+
+    def _list_footprints(self, request: Request, query: dict[str, list[str]]) -> _Reply:
+        """Returns a page of footprints, with a link to the next page if there is one."""
+        try:
+            limit = int(query.get("limit", [self.page_size])[0])
+        except ValueError:
+            return _error("BadRequest", "limit must be an integer")
+        if limit < 1:
+            return _error("BadRequest", "limit must be positive")
+        limit = min(limit, self.max_page_size)
+
+        expression = query.get("$filter", [None])[0]
+        try:
+            cursor = Cursor.decode(query["cursor"][0]) if "cursor" in query else None
+            if expression is None:
+                footprints, next_cursor = self.repository.page(limit, cursor)
+            else:
+                footprints, next_cursor = compile_filter(expression).page(self.repository, limit, cursor)
+        except ValueError as error:
+            # Invalid filters and cursors, and cursors of expired snapshots.
+            return _error("BadRequest", str(error))
+        headers = {"Content-Type": _JSON}
+        if next_cursor is not None:
+            next_query = {"limit": limit, "cursor": next_cursor.encode()}
+            if expression is not None:
+                next_query = {"$filter": expression, **next_query}
+            headers["Link"] = f'<{self._base_url(request)}/2/footprints?{urlencode(next_query)}>; rel="next"'
+        return _Reply(200, self._page(footprints), headers)
+
+    def _get_footprint(self, id: str) -> _Reply:
+        """Returns one footprint."""
+        try:
+            footprint = self.repository.get(footprint_key(id))
+        except ValueError:
+            footprint = None
+        if footprint is None:
+            return _error("NoSuchFootprint", "The requested footprint could not be found")
+        return _Reply(200, [b'{"data":', self._encode(footprint), b"}"], {"Content-Type": _JSON})
+
+    async def _event(self, request: Request) -> _Reply:
+        """Accepts a PACT event and passes it to the event handler."""
+        if self.on_event is None:
+            return _error("NotImplemented", "Events are not supported")
+        try:
+            event = json.loads(request.body)
+        except ValueError:
+            return _error("BadRequest", "Event is not valid JSON")
+        problem = _event_problem(event)
+        if problem is not None:
+            return _error("BadRequest", problem)
+        if event["type"] not in EVENT_TYPES:
+            return _error("NotImplemented", f"Unsupported event type: {event['type']}")
+        try:
+            result = self.on_event(event)
+            if inspect.isawaitable(result):
+                await result
+        except ValueError as error:
+            return _error("BadRequest", str(error))
+        return _Reply(200, [])
+
+    def _page(self, footprints: list[ProductFootprint]) -> list[bytes]:
+        """Returns the body of a list response as cached footprint encodings and separators."""
+        parts = [b'{"data":[']
+        for index, footprint in enumerate(footprints):
+            if index:
+                parts.append(b",")
+            parts.append(self._encode(footprint))
+        parts.append(b"]}")
+        return parts
+
+    def _encode(self, footprint: ProductFootprint) -> bytes:
+        """Returns the cached JSON encoding of a footprint, encoding it on first use."""
+        key = footprint.id
+        cached = self._encoded.get(key)
+        if cached is not None and cached[0] is footprint:
+            return cached[1]
+        if len(self._encoded) > 2 * len(self.repository) + 1000:
+            # Drop the encodings of footprints that have been removed or replaced.
+            self._encoded = {
+                key: entry for key, entry in self._encoded.items() if self.repository.get(key) is entry[0]
+            }
+        encoded = json.dumps(encode(footprint), ensure_ascii=False, separators=(",", ":")).encode()
+        self._encoded[key] = (footprint, encoded)
+        return encoded
+
+    def _base_url(self, request: Request) -> str:
+        if self.base_url is not None:
+            return self.base_url
+        return "http://" + quote(request.headers.get("host", "localhost"), safe=":[]")
+
+    @staticmethod
+    def _write(writer: asyncio.StreamWriter, reply: _Reply) -> None:
+        length = sum(len(part) for part in reply.parts)
+        writer.writelines([encode_response_head(reply.status, reply.headers, length), *reply.parts])
+
+
+def _event_problem(event) -> str | None:
+    """Returns why a value is not a valid PACT CloudEvent, or None if it is."""
+    if not isinstance(event, dict):
+        return "Event must be a JSON object"
+    for name in ("type", "specversion", "id", "source"):
+        if not isinstance(event.get(name), str) or not event[name]:
+            return f"Event attribute {name} must be a non-empty string"
+    if event["specversion"] != "1.0":
+        return "Event specversion must be 1.0"
+    if not isinstance(event.get("data"), dict):
+        return "Event data must be a JSON object"
+    return None
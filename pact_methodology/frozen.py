@@ -0,0 +1,427 @@
+"""
+Immutable variants of the data model classes.
+
+`freeze` turns a model object and everything it contains into frozen variants of their classes.
+A frozen variant is a subclass of the model class, so it passes every isinstance check and has the
+same properties, but assigning an attribute raises `dataclasses.FrozenInstanceError` and container
+methods such as `ProductIdList.append` raise as well. Lists are stored as tuples, sets as frozensets
+and dicts as `FrozenDict`.
+
+Frozen objects compare and hash by their content digest, which `freeze` computes up front, so
+reading a frozen footprint never writes to it. They can be shared between threads without locks or copies,
+and used as dict keys. A frozen object has the same content digest as the mutable object it was
+made from, so the two compare equal.
+
+Use `evolve` to make a modified frozen copy, or `replace` for a modified mutable one. Unchanged
+sub-objects are shared with the original rather than copied. `thaw` returns a mutable deep copy.
+
+`lazy` makes a frozen object whose attributes are loaded on first use, for stores that keep
+footprints in encoded form. Given the content digest up front, it compares and hashes without
+loading.
+
+Examples:
+    >>> shared = freeze(footprint)
+    >>> shared.comment = "Edited"
+    Traceback (most recent call last):
+        ...
+    dataclasses.FrozenInstanceError: cannot assign to field 'comment'
+    >>> edited = shared.evolve(comment="Edited")
+    >>> edited.pcf is shared.pcf
+    True
+"""
+
+import functools
+from collections.abc import Callable
+from dataclasses import FrozenInstanceError
+
+from pact_methodology.canonical import ContentDigestMixin, own
+
+MUTATORS = (
+    "__setitem__",
+    "__delitem__",
+    "append",
+    "insert",
+    "remove",
+    "add",
+    "add_multiple",
+    "add_ds",
+    "remove_ds",
+    "add_rule",
+    "remove_rule",
+)
+"""The names of the methods that change model containers in place."""
+
+
+class FrozenDict(dict):
+    """A dict that cannot be changed after construction."""
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("FrozenDict cannot be changed")
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return FrozenDict, (dict(self),)
+
+
+def is_frozen(obj) -> bool:
+    """
+    Checks whether an object is a frozen variant of a model class.
+
+    Args:
+        obj: The object to check.
+
+    Returns:
+        bool: True if obj was made by freeze or evolve.
+    """
+    return isinstance(obj, ContentDigestMixin) and getattr(type(obj), "_mutable_class", None) is not None
+
+
+@functools.cache
+def frozen_class(cls: type) -> type:
+    """
+    Returns the frozen variant of a model class, creating it on first use.
+
+    Args:
+        cls (type): A data model class, for example CarbonFootprint.
+
+    Returns:
+        type: A subclass of cls named Frozen<cls name>.
+
+    Raises:
+        ValueError: If cls is not a data model class or is already frozen.
+    """
+    if not isinstance(cls, type) or not issubclass(cls, ContentDigestMixin):
+        raise ValueError("cls must be a data model class")
+    if getattr(cls, "_mutable_class", None) is not None:
+        raise ValueError(f"{cls.__name__} is already frozen")
+
+    namespace = {
+        "__doc__": f"Frozen variant of {cls.__name__}. See pact_methodology.frozen.",
+        "__module__": __name__,
+        "_mutable_class": cls,
+        "_canonical_type": cls.__name__,
+        "__setattr__": _frozen_setattr,
+        "__delattr__": _frozen_delattr,
+        "__eq__": _frozen_eq,
+        "__ne__": _frozen_ne,
+        "__hash__": _frozen_hash,
+        "__copy__": _self,
+        "__deepcopy__": lambda self, memo: self,
+        "__reduce__": _frozen_reduce,
+        # A frozen object never changes, so nothing has to be told when it does.
+        "_register_digest_owner": lambda self, owner: None,
+        "_invalidate_content_digest": lambda self: None,
+        "evolve": evolve,
+    }
+    for name in MUTATORS:
+        if hasattr(cls, name):
+            namespace[name] = _frozen_method(name)
+    return type(f"Frozen{cls.__name__}", (cls,), namespace)
+
+
+def freeze(value, _memo: dict | None = None):
+    """
+    Returns a frozen copy of a model object and everything it contains.
+
+    Frozen objects are returned as they are. An object contained in several places, such as a
+    ReferencePeriod shared by a CarbonFootprint and its DataQualityIndicators, is frozen once.
+
+    Args:
+        value: A model object, or a list, set or dict of model objects and values.
+
+    Returns:
+        The frozen copy. Value types such as DateTime or enum members are returned as they are.
+
+    Examples:
+        >>> shared = freeze(footprint)
+        >>> shared == footprint
+        True
+        >>> {shared: "cached"}[freeze(footprint)]
+        'cached'
+    """
+    memo = {} if _memo is None else _memo
+    if id(value) in memo:
+        return memo[id(value)]
+    if isinstance(value, ContentDigestMixin):
+        if is_frozen(value):
+            return value
+        cls = frozen_class(type(value))
+        frozen = cls.__new__(cls)
+        memo[id(value)] = frozen
+        vars(frozen).update({name: freeze(item, memo) for name, item in vars(value).items()})
+        frozen.content_digest
+        return frozen
+    if isinstance(value, (list, tuple)):
+        frozen = tuple(freeze(item, memo) for item in value)
+    elif isinstance(value, (set, frozenset)):
+        frozen = frozenset(freeze(item, memo) for item in value)
+    elif isinstance(value, dict) and not isinstance(value, FrozenDict):
+        frozen = FrozenDict((key, freeze(item, memo)) for key, item in value.items())
+    else:
+        return value
+    memo[id(value)] = frozen
+    return frozen
+
+
+def thaw(value, _memo: dict | None = None):
+    """
+    Returns a mutable deep copy of a model object, frozen or not.
+
+    Args:
+        value: A model object, or a tuple, frozenset or FrozenDict of model objects and values.
+
+    Returns:
+        The mutable copy, with lists, sets and dicts in place of tuples, frozensets and FrozenDicts.
+    """
+    memo = {} if _memo is None else _memo
+    if id(value) in memo:
+        return memo[id(value)]
+    if isinstance(value, ContentDigestMixin):
+        cls = getattr(type(value), "_mutable_class", None) or type(value)
+        thawed = cls.__new__(cls)
+        memo[id(value)] = thawed
+        vars(thawed).update({name: own(thaw(item, memo)) for name, item in vars(value).items()})
+        return thawed
+    if isinstance(value, (list, tuple)):
+        thawed = [thaw(item, memo) for item in value]
+    elif isinstance(value, (set, frozenset)):
+        thawed = {thaw(item, memo) for item in value}
+    elif isinstance(value, dict):
+        thawed = {key: thaw(item, memo) for key, item in value.items()}
+    else:
+        return value
+    memo[id(value)] = thawed
+    return thawed
+
+
+def evolve(obj: ContentDigestMixin, **changes) -> ContentDigestMixin:
+    """
+    Returns a frozen copy of a model object with some attributes changed.
+
+    The changed values are checked by the property setters of the model class, and the object's
+    rules across attributes are checked afterwards. Unchanged attributes are shared with obj, not
+    copied, so the cost depends on the size of the change rather than the size of obj.
+
+    Args:
+        obj (ContentDigestMixin): The model object, frozen or not.
+        **changes: New values by attribute name.
+
+    Returns:
+        ContentDigestMixin: The frozen copy.
+
+    Raises:
+        ValueError: If an attribute does not exist or cannot be set, or if a new value is invalid.
+
+    Examples:
+        >>> updated = frozen_pcf.evolve(p_cf_excluding_biogenic=0.75, primary_data_share=60.0)
+        >>> updated.dqi is frozen_pcf.dqi
+        True
+    """
+    if not changes and is_frozen(obj):
+        return obj
+    return freeze(replace(freeze(obj), **changes))
+
+
+def replace(obj: ContentDigestMixin, **changes) -> ContentDigestMixin:
+    """
+    Returns a mutable shallow copy of a model object with some attributes changed.
+
+    The copy shares every unchanged attribute value with obj. The changed values are checked by
+    the property setters of the model class, and the object's rules across attributes are checked
+    afterwards. If obj is frozen, the shared values stay frozen, so they cannot be changed in place
+    by mistake; assign new values to the copy instead.
+
+    Args:
+        obj (ContentDigestMixin): The model object, frozen or not.
+        **changes: New values by attribute name.
+
+    Returns:
+        ContentDigestMixin: The copy, an instance of the mutable model class.
+
+    Raises:
+        ValueError: If an attribute does not exist or cannot be set, or if a new value is invalid.
+    """
+    if not isinstance(obj, ContentDigestMixin):
+        raise ValueError("obj must be a data model object")
+    cls = getattr(type(obj), "_mutable_class", None) or type(obj)
+    draft = cls.__new__(cls)
+    vars(draft).update(vars(obj))
+    for name, value in changes.items():
+        attribute = getattr(cls, name, None)
+        if not isinstance(attribute, property) or attribute.fset is None:
+            raise ValueError(f"{cls.__name__} has no attribute {name!r} that can be changed")
+        setattr(draft, name, value)
+    if changes:
+        revalidate = getattr(draft, "revalidate", None) or getattr(draft, "validate_required_attributes", None)
+        if revalidate is not None:
+            revalidate()
+    return draft
+
+
+@functools.cache
+def lazy_class(cls: type) -> type:
+    """
+    Returns the lazy variant of a model class, creating it on first use.
+
+    Args:
+        cls (type): A data model class, for example ProductFootprint.
+
+    Returns:
+        type: A subclass of the frozen variant of cls named Lazy<cls name>.
+
+    Raises:
+        ValueError: If cls is not a data model class or is already frozen.
+    """
+    frozen = frozen_class(cls)
+    # The descriptor of the real instance dict, which the __dict__ property below hides.
+    instance_dict = next(klass.__dict__["__dict__"] for klass in cls.__mro__ if "__dict__" in klass.__dict__)
+
+    def load(self) -> None:
+        try:
+            loader = loader_slot.__get__(self)
+        except AttributeError:
+            return
+        if loader is None:
+            return
+        loaded = freeze(loader())
+        if not isinstance(loaded, cls):
+            raise ValueError(f"Loaded {type(loaded).__name__}, expected {cls.__name__}")
+        instance_dict.__get__(self).update(instance_dict.__get__(loaded))
+        object.__setattr__(self, "_content_digest", loaded.content_digest)
+        object.__setattr__(self, "_loader", None)
+
+    def __getattr__(self, name):
+        # Only called for attributes that are not in the instance dict yet.
+        if name.startswith("__") or name == "_loader" or getattr(self, "_loader", None) is None:
+            raise AttributeError(f"{cls.__name__!r} object has no attribute {name!r}")
+        load(self)
+        return getattr(self, name)
+
+    def __dict__(self) -> dict:
+        load(self)
+        return instance_dict.__get__(self)
+
+    namespace = {
+        "__doc__": f"Lazy variant of {cls.__name__}. See pact_methodology.frozen.lazy.",
+        "__module__": __name__,
+        "__slots__": ("_loader",),
+        "__getattr__": __getattr__,
+        "__dict__": property(__dict__),
+    }
+    lazy = type(f"Lazy{cls.__name__}", (frozen,), namespace)
+    loader_slot = lazy.__dict__["_loader"]
+    return lazy
+
+
+def lazy(cls: type, load: Callable[[], ContentDigestMixin], content_digest: bytes | None = None):
+    """
+    Returns a frozen object of a model class whose attributes are loaded on first use.
+
+    The first attribute read, vars call or pickling calls load and freezes its result. Until then
+    the object holds only load and the content digest, so building many of them is cheap.
+
+    Args:
+        cls (type): A data model class, for example ProductFootprint.
+        load (Callable[[], ContentDigestMixin]): Returns the object, for example by decoding it.
+        content_digest (bytes | None): The content digest of the object, if known. The lazy object
+            then compares and hashes without loading.
+
+    Returns:
+        A frozen instance of cls.
+
+    Raises:
+        ValueError: When loaded, if load returns an object that is not an instance of cls.
+
+    Examples:
+        >>> footprint = lazy(ProductFootprint, lambda: loads(document), digest)
+        >>> footprint == stored
+        True
+        >>> footprint.company_name
+        'Acme Corp'
+    """
+    lazy_cls = lazy_class(cls)
+    obj = lazy_cls.__new__(lazy_cls)
+    object.__setattr__(obj, "_loader", load)
+    if content_digest is not None:
+        object.__setattr__(obj, "_content_digest", content_digest)
+    return obj
+
+
+def is_loaded(obj) -> bool:
+    """
+    Checks whether an object has its attributes, which is the case for all but unloaded lazy objects.
+
+    Args:
+        obj: The object to check.
+
+    Returns:
+        bool: False if obj was made by lazy and has not been loaded yet.
+    """
+    return getattr(obj, "_loader", None) is None
+
+
+def _frozen_reduce(self):
+    # Frozen classes are created at runtime and cannot be pickled by name, so the mutable class is
+    # pickled instead and the frozen class is looked up again when unpickling. The digest is pickled
+    # too, since computing it again would cost more than the rest of unpickling.
+    names, values = self._pickle_state()
+    return _unpickle_frozen, (self._mutable_class, names, values, self.content_digest)
+
+
+def _unpickle_frozen(
+    cls: type, names: tuple[str, ...] | int, values: tuple, content_digest: bytes | None = None
+) -> ContentDigestMixin:
+    frozen_cls = frozen_class(cls)
+    frozen = frozen_cls.__new__(frozen_cls)
+    vars(frozen).update(zip(cls._state_names(names), values))
+    if content_digest is not None:
+        object.__setattr__(frozen, "_content_digest", content_digest)
+    frozen.content_digest
+    return frozen
+
+
+def _frozen_setattr(self, name, value):
+    raise FrozenInstanceError(f"cannot assign to field {name!r}")
+
+
+def _frozen_delattr(self, name):
+    raise FrozenInstanceError(f"cannot delete field {name!r}")
+
+
+def _frozen_eq(self, other) -> bool:
+    if not isinstance(other, ContentDigestMixin):
+        return NotImplemented
+    if (other._canonical_type or type(other).__name__) != self._canonical_type:
+        return False
+    return self is other or self.content_digest == other.content_digest
+
+
+def _frozen_ne(self, other) -> bool:
+    equal = _frozen_eq(self, other)
+    return equal if equal is NotImplemented else not equal
+
+
+def _frozen_hash(self) -> int:
+    return hash(self.content_digest)
+
+
+def _self(self):
+    return self
+
+
+def _frozen_method(name: str):
+    """Returns a replacement for a mutator method that raises FrozenInstanceError."""
+
+    def mutator(self, *args, **kwargs):
+        raise FrozenInstanceError(f"cannot call {name} on a frozen {type(self)._mutable_class.__name__}")
+
+    mutator.__name__ = name
+    return mutator
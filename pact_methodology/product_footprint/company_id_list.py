@@ -1,8 +1,9 @@
 from pact_methodology.urn import CompanyId
 from pact_methodology.exceptions import DuplicateIdError
+from pact_methodology.canonical import ContentDigestMixin
 
 
-class CompanyIdList:
+class CompanyIdList(ContentDigestMixin):
     """
     A list of CompanyId objects.
 
@@ -33,6 +34,16 @@ class CompanyIdList:
             raise DuplicateIdError("Duplicate company_ids are not allowed")
         self.company_ids = company_ids
 
+    @property
+    def company_ids(self) -> list[CompanyId]:
+        """Gets the CompanyId objects in the list."""
+        return self._company_ids
+
+    @company_ids.setter
+    def company_ids(self, value: list[CompanyId]):
+        """Sets the CompanyId objects in the list."""
+        self._company_ids = value
+
     def __iter__(self):
         """
         Returns an iterator over the CompanyId objects in the list.
@@ -77,6 +88,7 @@ class CompanyIdList:
         if not isinstance(value, CompanyId):
             raise ValueError("company_id must be an instance of CompanyId")
         self.company_ids[index] = value
+        self._invalidate_content_digest()
 
     def __delitem__(self, index):
         """
@@ -86,6 +98,7 @@ class CompanyIdList:
             index (int): The index of the CompanyId object to delete.
         """
         del self.company_ids[index]
+        self._invalidate_content_digest()
 
     def append(self, company_id):
         """
@@ -103,6 +116,7 @@ class CompanyIdList:
         if company_id in self.company_ids:
             raise DuplicateIdError("Duplicate company_ids are not allowed")
         self.company_ids.append(company_id)
+        self._invalidate_content_digest()
 
     def insert(self, index, company_id):
         """
@@ -121,6 +135,7 @@ class CompanyIdList:
         if company_id in self.company_ids:
             raise DuplicateIdError("Duplicate company_ids are not allowed")
         self.company_ids.insert(index, company_id)
+        self._invalidate_content_digest()
 
     def remove(self, company_id):
         """
@@ -135,3 +150,4 @@ class CompanyIdList:
         if company_id not in self.company_ids:
             raise ValueError("company_id is not in the list")
         self.company_ids.remove(company_id)
+        self._invalidate_content_digest()
@@ -55,6 +55,19 @@ class CPC:
             return False
         return self.code == other.code
 
+    def __hash__(self):
+        """Returns the hash of the CPC code, consistent with __eq__.
+
+        Example:
+            >>> hash(CPC("0111", "Wheat")) == hash(CPC("0111", "Wheat"))
+            True
+        """
+        return hash(self.code)
+
+    def __reduce__(self):
+        """Pickles the CPC as its code and title."""
+        return CPC, (self.code, self.title)
+
 
 class CPCCodeLookup:
     """A lookup table for CPC codes.
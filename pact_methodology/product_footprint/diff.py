@@ -0,0 +1,130 @@
+"""
+Structural diff between two versions of a ProductFootprint.
+
+`diff` walks two object trees side by side and reports each attribute that differs, by its dotted
+path, for example `pcf.p_cf_excluding_biogenic` or `product_ids[1]`. Subtrees with the same
+content digest are skipped without being walked, so comparing two versions that differ in a
+single attribute only descends along the path to that attribute.
+"""
+
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any
+
+from pact_methodology.canonical import ContentDigestMixin, to_primitive
+
+
+class ChangeKind(str, Enum):
+    """
+    The kind of a change between two versions.
+
+    Attributes:
+        ADDED (str): The new version has a value or list item the old version does not have.
+        REMOVED (str): The old version has a value or list item the new version does not have.
+        CHANGED (str): Both versions have a value and the values differ.
+    """
+
+    ADDED = "added"
+    REMOVED = "removed"
+    CHANGED = "changed"
+
+
+@dataclass(frozen=True)
+class Change:
+    """
+    One difference between two versions.
+
+    Attributes:
+        path (str): The dotted path of the attribute, with list indices in brackets.
+        kind (ChangeKind): Whether the value was added, removed or changed.
+        old (Any): The old value, None if the value was added.
+        new (Any): The new value, None if the value was removed.
+    """
+
+    path: str
+    kind: ChangeKind
+    old: Any
+    new: Any
+
+
+def diff(old: ContentDigestMixin, new: ContentDigestMixin, *, ignore=()) -> list[Change]:
+    """
+    Returns the differences between two versions of a data model object.
+
+    Model objects are compared attribute by attribute and lists item by item. Values of other types,
+    such as DateTime or Version, are compared by their canonical encoding. Sets are compared by
+    their members. A value that is None in one version and not in the other is reported as added
+    or removed.
+
+    Args:
+        old (ContentDigestMixin): The old version, typically a ProductFootprint.
+        new (ContentDigestMixin): The new version.
+        ignore (Iterable[str]): Paths to leave out, including everything below them.
+
+    Returns:
+        list[Change]: The changes in attribute order. Empty if the versions have the same content.
+
+    Raises:
+        ValueError: If old or new is not a data model object.
+
+    Examples:
+        >>> [change.path for change in diff(first_version, second_version, ignore=("id", "version"))]
+        ['updated', 'pcf.p_cf_excluding_biogenic', 'pcf.dqi.coverage_percent']
+    """
+    if not isinstance(old, ContentDigestMixin) or not isinstance(new, ContentDigestMixin):
+        raise ValueError("old and new must be data model objects")
+    changes: list[Change] = []
+    _diff(old, new, "", frozenset(ignore), changes)
+    return changes
+
+
+def _diff(old, new, path: str, ignore: frozenset, changes: list[Change]) -> None:
+    """Appends the changes between two values at path to changes."""
+    if path in ignore:
+        return
+    if old is None or new is None:
+        if old is not new:
+            kind = ChangeKind.ADDED if old is None else ChangeKind.REMOVED
+            changes.append(Change(path, kind, old, new))
+        return
+    if isinstance(old, ContentDigestMixin) and type(old) is type(new):
+        if old is new or old.content_digest == new.content_digest:
+            return
+        old_fields = _fields(old)
+        new_fields = _fields(new)
+        if len(old_fields) == 1 and old_fields.keys() == new_fields.keys():
+            # Containers such as ProductIdList wrap a single list or set; report its items at the
+            # container's own path.
+            (name,) = old_fields
+            _diff(old_fields[name], new_fields[name], path, ignore, changes)
+            return
+        names = list(old_fields) + [name for name in new_fields if name not in old_fields]
+        for name in names:
+            _diff(old_fields.get(name), new_fields.get(name), _join(path, name), ignore, changes)
+        return
+    if isinstance(old, (list, tuple)) and isinstance(new, (list, tuple)):
+        for index in range(max(len(old), len(new))):
+            _diff(
+                old[index] if index < len(old) else None,
+                new[index] if index < len(new) else None,
+                f"{path}[{index}]",
+                ignore,
+                changes,
+            )
+        return
+    if isinstance(old, (set, frozenset)) and isinstance(new, (set, frozenset)):
+        if old != new:
+            changes.append(Change(path, ChangeKind.CHANGED, old, new))
+        return
+    if to_primitive(old) != to_primitive(new):
+        changes.append(Change(path, ChangeKind.CHANGED, old, new))
+
+
+def _fields(obj: ContentDigestMixin) -> dict:
+    """Returns the attributes of a model object, without leading underscores."""
+    return {name.lstrip("_"): value for name, value in vars(obj).items()}
+
+
+def _join(path: str, name: str) -> str:
+    """Appends an attribute name to a dotted path."""
+    return f"{path}.{name}" if path else name
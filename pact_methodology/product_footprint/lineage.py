@@ -0,0 +1,295 @@
+from pact_methodology.exceptions import DuplicateIdError, LineageCycleError
+from pact_methodology.product_footprint.id import ProductFootprintId
+from pact_methodology.product_footprint.product_footprint import ProductFootprint
+from pact_methodology.product_footprint.status import Status
+from pact_methodology.urn import ProductId
+
+
+class _LineageNode:
+    """The subset of a ProductFootprint kept by the lineage index."""
+
+    __slots__ = ("id", "version", "status", "product_ids", "preceding_pf_ids")
+
+    def __init__(
+        self,
+        id: ProductFootprintId,
+        version: int,
+        status: Status,
+        product_ids: tuple[ProductId, ...],
+        preceding_pf_ids: tuple[ProductFootprintId, ...],
+    ):
+        self.id = id
+        self.version = version
+        self.status = status
+        self.product_ids = product_ids
+        self.preceding_pf_ids = preceding_pf_ids
+
+
+class VersionLineage:
+    """
+    An incremental index of the version history described by ProductFootprint.preceding_pf_ids.
+
+    Each footprint added to the index is linked to the footprints it supersedes. The index keeps
+    the set of heads (footprints that nothing supersedes yet) for every ProductId, so the current
+    head of a product is answered without walking the history, and the history of a footprint is
+    answered by walking its ancestors only.
+
+    Footprints may be added in any order: a footprint that names an id which has not been added yet
+    is linked as soon as that id arrives.
+
+    Attributes:
+        forks (set[ProductFootprintId]): The ids of footprints superseded by more than one footprint.
+
+    Examples:
+        >>> lineage = VersionLineage()
+        >>> lineage.add(first_footprint)
+        >>> lineage.add(second_footprint)  # second_footprint.preceding_pf_ids == [first_footprint.id]
+        >>> lineage.head(product_id) == second_footprint.id
+        True
+        >>> lineage.history(second_footprint.id) == [second_footprint.id, first_footprint.id]
+        True
+    """
+
+    def __init__(self):
+        """Initializes an empty VersionLineage."""
+        self._nodes: dict[ProductFootprintId, _LineageNode] = {}
+        self._successors: dict[ProductFootprintId, list[ProductFootprintId]] = {}
+        self._heads: dict[ProductId, set[ProductFootprintId]] = {}
+        self._forks: set[ProductFootprintId] = set()
+
+    def add(self, footprint: ProductFootprint) -> None:
+        """
+        Adds a ProductFootprint to the index and links it to the footprints it supersedes.
+
+        Args:
+            footprint (ProductFootprint): The footprint to add.
+
+        Raises:
+            ValueError: If footprint is not an instance of ProductFootprint.
+            DuplicateIdError: If a footprint with the same id has already been added.
+            LineageCycleError: If the footprint's preceding_pf_ids would make it its own ancestor.
+        """
+        if not isinstance(footprint, ProductFootprint):
+            raise ValueError("footprint must be an instance of ProductFootprint")
+        pf_id = footprint.id
+        if pf_id in self._nodes:
+            raise DuplicateIdError(f"footprint {pf_id} has already been added")
+
+        preceding_pf_ids = tuple(footprint.preceding_pf_ids or ())
+        if pf_id in preceding_pf_ids:
+            raise LineageCycleError(f"footprint {pf_id} cannot precede itself")
+        # The existing graph is acyclic, so a new cycle has to pass through this footprint. That is
+        # only possible when a footprint added earlier already names it as a predecessor.
+        if pf_id in self._successors and self._is_ancestor(pf_id, preceding_pf_ids):
+            raise LineageCycleError(f"footprint {pf_id} would become its own ancestor")
+
+        node = _LineageNode(
+            id=pf_id,
+            version=footprint.version.version,
+            status=footprint.status,
+            product_ids=tuple(footprint.product_ids),
+            preceding_pf_ids=preceding_pf_ids,
+        )
+        self._nodes[pf_id] = node
+
+        for preceding_id in preceding_pf_ids:
+            successors = self._successors.setdefault(preceding_id, [])
+            successors.append(pf_id)
+            if len(successors) > 1:
+                self._forks.add(preceding_id)
+            preceding = self._nodes.get(preceding_id)
+            if preceding is not None:
+                self._discard_head(preceding)
+
+        if pf_id not in self._successors:
+            for product_id in node.product_ids:
+                self._heads.setdefault(product_id, set()).add(pf_id)
+
+    def add_all(self, footprints) -> None:
+        """
+        Adds every ProductFootprint of an iterable to the index.
+
+        Args:
+            footprints (Iterable[ProductFootprint]): The footprints to add.
+        """
+        for footprint in footprints:
+            self.add(footprint)
+
+    def set_status(self, pf_id: ProductFootprintId, status: Status) -> None:
+        """
+        Records a status change of a footprint that is already in the index.
+
+        Args:
+            pf_id (ProductFootprintId): The id of the footprint.
+            status (Status): The new status.
+
+        Raises:
+            KeyError: If no footprint with this id has been added.
+            ValueError: If status is not an instance of Status.
+        """
+        if not isinstance(status, Status):
+            raise ValueError("status must be an instance of Status")
+        self._nodes[pf_id].status = status
+
+    def head(self, product_id: ProductId) -> ProductFootprintId | None:
+        """
+        Returns the current active head for a product.
+
+        The head is the active footprint of the product that no other footprint supersedes. When the
+        history has forked into several active heads, the one with the highest version wins.
+
+        Args:
+            product_id (ProductId): The product to look up.
+
+        Returns:
+            ProductFootprintId | None: The id of the active head, or None if the product has no active head.
+        """
+        best = None
+        for pf_id in self._heads.get(product_id, ()):
+            node = self._nodes[pf_id]
+            if node.status != Status.ACTIVE:
+                continue
+            if best is None or (node.version, str(node.id)) > (best.version, str(best.id)):
+                best = node
+        return best.id if best is not None else None
+
+    def heads(self, product_id: ProductId) -> list[ProductFootprintId]:
+        """
+        Returns every head for a product, regardless of status, highest version first.
+
+        Args:
+            product_id (ProductId): The product to look up.
+
+        Returns:
+            list[ProductFootprintId]: The ids of the heads. More than one head means the history has forked.
+        """
+        nodes = [self._nodes[pf_id] for pf_id in self._heads.get(product_id, ())]
+        nodes.sort(key=lambda node: (node.version, str(node.id)), reverse=True)
+        return [node.id for node in nodes]
+
+    def history(self, pf_id: ProductFootprintId) -> list[ProductFootprintId]:
+        """
+        Returns the full history of a footprint, starting with the footprint itself.
+
+        Ancestors are listed breadth first, so direct predecessors come before their own predecessors.
+        Ids named in preceding_pf_ids that have not been added to the index are skipped.
+
+        Args:
+            pf_id (ProductFootprintId): The id of the footprint.
+
+        Returns:
+            list[ProductFootprintId]: The footprint id followed by the ids of all of its ancestors.
+
+        Raises:
+            KeyError: If no footprint with this id has been added.
+        """
+        node = self._nodes[pf_id]
+        history = [node.id]
+        seen = {node.id}
+        index = 0
+        while index < len(history):
+            for preceding_id in self._nodes[history[index]].preceding_pf_ids:
+                if preceding_id not in seen and preceding_id in self._nodes:
+                    seen.add(preceding_id)
+                    history.append(preceding_id)
+            index += 1
+        return history
+
+    def predecessors(self, pf_id: ProductFootprintId) -> list[ProductFootprintId]:
+        """
+        Returns the ids a footprint directly supersedes.
+
+        Args:
+            pf_id (ProductFootprintId): The id of the footprint.
+
+        Returns:
+            list[ProductFootprintId]: The preceding_pf_ids of the footprint.
+
+        Raises:
+            KeyError: If no footprint with this id has been added.
+        """
+        return list(self._nodes[pf_id].preceding_pf_ids)
+
+    def successors(self, pf_id: ProductFootprintId) -> list[ProductFootprintId]:
+        """
+        Returns the ids of the footprints that directly supersede a footprint.
+
+        Args:
+            pf_id (ProductFootprintId): The id of the footprint.
+
+        Returns:
+            list[ProductFootprintId]: The ids of the superseding footprints, in the order they were added.
+        """
+        return list(self._successors.get(pf_id, ()))
+
+    def is_head(self, pf_id: ProductFootprintId) -> bool:
+        """
+        Checks if a footprint has been added and is not superseded by any other footprint.
+
+        Args:
+            pf_id (ProductFootprintId): The id of the footprint.
+
+        Returns:
+            bool: True if the footprint is a head, False otherwise.
+        """
+        return pf_id in self._nodes and pf_id not in self._successors
+
+    @property
+    def forks(self) -> set[ProductFootprintId]:
+        """Gets the ids of the footprints superseded by more than one footprint."""
+        return set(self._forks)
+
+    def _is_ancestor(self, pf_id: ProductFootprintId, preceding_pf_ids: tuple[ProductFootprintId, ...]) -> bool:
+        """Checks if pf_id is reachable by walking the predecessors of preceding_pf_ids."""
+        stack = list(preceding_pf_ids)
+        seen = set(stack)
+        while stack:
+            node = self._nodes.get(stack.pop())
+            if node is None:
+                continue
+            for preceding_id in node.preceding_pf_ids:
+                if preceding_id == pf_id:
+                    return True
+                if preceding_id not in seen:
+                    seen.add(preceding_id)
+                    stack.append(preceding_id)
+        return False
+
+    def _discard_head(self, node: _LineageNode) -> None:
+        """Removes a superseded footprint from the heads of its products."""
+        for product_id in node.product_ids:
+            heads = self._heads.get(product_id)
+            if heads is not None:
+                heads.discard(node.id)
+                if not heads:
+                    del self._heads[product_id]
+
+    def __len__(self) -> int:
+        """
+        Returns the number of footprints in the index.
+
+        Returns:
+            int: The number of footprints.
+        """
+        return len(self._nodes)
+
+    def __contains__(self, pf_id: ProductFootprintId) -> bool:
+        """
+        Checks if a footprint with the given id has been added.
+
+        Args:
+            pf_id (ProductFootprintId): The id to check.
+
+        Returns:
+            bool: True if the footprint has been added, False otherwise.
+        """
+        return pf_id in self._nodes
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the VersionLineage.
+
+        Returns:
+            str: A string representation of the VersionLineage.
+        """
+        return f"VersionLineage(footprints={len(self._nodes)}, forks={len(self._forks)})"
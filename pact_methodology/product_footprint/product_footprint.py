@@ -11,9 +11,11 @@ from pact_methodology.product_footprint.validity_period import ValidityPeriod
 from pact_methodology.urn import CompanyId, ProductId
 from pact_methodology.product_footprint.product_id_list import ProductIdList
 from pact_methodology.product_footprint.company_id_list import CompanyIdList
+from pact_methodology.canonical import ContentDigestMixin
+from pact_methodology.frozen import evolve, is_frozen, replace
 
 
-class ProductFootprint:
+class ProductFootprint(ContentDigestMixin):
     """
     Represents the carbon footprint of a product under a specific scope and with values calculated in accordance
     with the Pathfinder Framework.
@@ -247,7 +249,7 @@ class ProductFootprint:
         Raises:
             ValueError: If value is not an instance of Status.
         """
-        self._status_info.status = value
+        self.status_info = ProductFootprintStatus(value, self.status_comment)
 
     @property
     def status_comment(self):
@@ -264,7 +266,7 @@ class ProductFootprint:
         Raises:
             ValueError: If value is not a string or None.
         """
-        self._status_info.comment = value
+        self.status_info = ProductFootprintStatus(self.status, value)
 
     @property
     def status_info(self):
@@ -497,6 +499,64 @@ class ProductFootprint:
                 raise ValueError("preceding_pf_ids must not contain duplicates")
         self._preceding_pf_ids = value
 
+    def new_version(
+        self,
+        *,
+        pcf_changes: dict | None = None,
+        updated: DateTime | None = None,
+        **changes,
+    ) -> "ProductFootprint":
+        """
+        Creates the next version of the ProductFootprint.
+
+        The new version gets a new id and the next version number, lists this footprint's id last in
+        preceding_pf_ids, and has updated set. Changes to the carbon footprint are given separately in
+        pcf_changes.
+
+        The new version shares every unchanged attribute with this footprint, such as the dqi, so the
+        cost of a new version depends on the size of the change. If this footprint is frozen (see
+        pact_methodology.frozen), the new version is frozen as well. Otherwise the new version is
+        mutable, and its shared attribute values are the same objects as this footprint's: assign new
+        values to change one version, rather than changing a shared value in place, or thaw a version
+        first to give it its own copies.
+
+        Args:
+            pcf_changes (dict | None): New values of CarbonFootprint attributes, by attribute name.
+            updated (DateTime | None): The time of the update. Defaults to the current time.
+            **changes: New values of other ProductFootprint attributes, by attribute name.
+
+        Returns:
+            ProductFootprint: The new version. This footprint is left unchanged.
+
+        Raises:
+            ValueError: If changes sets id, version or preceding_pf_ids, if an attribute does not exist,
+                or if a new value is invalid.
+
+        Examples:
+            >>> second = first.new_version(pcf_changes={"p_cf_excluding_biogenic": 0.75})
+            >>> second.version, second.preceding_pf_ids == [first.id]
+            (Version(2), True)
+            >>> second.pcf.dqi is first.pcf.dqi
+            True
+        """
+        reserved = {"id", "version", "preceding_pf_ids"} & changes.keys()
+        if reserved:
+            raise ValueError(f"new_version sets {', '.join(sorted(reserved))} itself")
+        changes = {
+            "id": ProductFootprintId(),
+            "version": Version(self.version.version + 1),
+            "preceding_pf_ids": [*(self.preceding_pf_ids or ()), self.id],
+            "updated": updated if updated is not None else DateTime.now(),
+            **changes,
+        }
+        if is_frozen(self):
+            if pcf_changes:
+                changes["pcf"] = replace(self.pcf, **pcf_changes)
+            return evolve(self, **changes)
+        if pcf_changes:
+            changes["pcf"] = replace(self.pcf, **pcf_changes)
+        return replace(self, **changes)
+
     def __str__(self):
         """
         Returns a string representation of the ProductFootprint instance.
@@ -563,6 +623,9 @@ class ProductFootprint:
         """
         Compares two ProductFootprint instances for equality.
 
+        Footprints are equal when their content digests are equal. The digests are cached, so
+        repeated comparisons do not walk the nested objects.
+
         Examples:
             >>> pcf = CarbonFootprint(...)  # Assume CarbonFootprint is properly initialized
             >>> product_footprint1 = ProductFootprint(
@@ -594,7 +657,9 @@ class ProductFootprint:
             >>> product_footprint1 == product_footprint2
             True
         """
-        return self.__dict__ == other.__dict__
+        if not isinstance(other, ProductFootprint):
+            return False
+        return self is other or self.content_digest == other.content_digest
 
     def __ne__(self, other):
         """
@@ -631,4 +696,17 @@ class ProductFootprint:
             >>> product_footprint1 != product_footprint2
             True
         """
-        return not self.__eq__(other)
\ No newline at end of file
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        """
+        Returns a hash of the content digest, so that footprints can be deduplicated in sets and dicts.
+
+        The hash changes when the ProductFootprint changes, so it must not be modified while it is
+        used as a dict key or set member.
+
+        Examples:
+            >>> len({product_footprint, copy.deepcopy(product_footprint)})
+            1
+        """
+        return hash(self.content_digest)
@@ -1,8 +1,9 @@
 from pact_methodology.exceptions import DuplicateIdError
 from pact_methodology.urn import ProductId
+from pact_methodology.canonical import ContentDigestMixin
 
 
-class ProductIdList:
+class ProductIdList(ContentDigestMixin):
     """
     A list of ProductId objects.
 
@@ -33,6 +34,16 @@ class ProductIdList:
             raise DuplicateIdError("Duplicate product_ids are not allowed")
         self.product_ids = product_ids
 
+    @property
+    def product_ids(self) -> list[ProductId]:
+        """Gets the ProductId objects in the list."""
+        return self._product_ids
+
+    @product_ids.setter
+    def product_ids(self, value: list[ProductId]):
+        """Sets the ProductId objects in the list."""
+        self._product_ids = value
+
     def __iter__(self):
         """
         Returns an iterator over the ProductId objects in the list.
@@ -77,6 +88,7 @@ class ProductIdList:
         if not isinstance(value, ProductId):
             raise ValueError("product_id must be an instance of ProductId")
         self.product_ids[index] = value
+        self._invalidate_content_digest()
 
     def __delitem__(self, index):
         """
@@ -86,6 +98,7 @@ class ProductIdList:
             index (int): The index of the ProductId object to delete.
         """
         del self.product_ids[index]
+        self._invalidate_content_digest()
 
     def append(self, product_id):
         """
@@ -103,6 +116,7 @@ class ProductIdList:
         if product_id in self.product_ids:
             raise DuplicateIdError("Duplicate product_ids are not allowed")
         self.product_ids.append(product_id)
+        self._invalidate_content_digest()
 
     def insert(self, index, product_id):
         """
@@ -121,6 +135,7 @@ class ProductIdList:
         if product_id in self.product_ids:
             raise DuplicateIdError("Duplicate product_ids are not allowed")
         self.product_ids.insert(index, product_id)
+        self._invalidate_content_digest()
 
     def remove(self, product_id):
         """
@@ -135,3 +150,4 @@ class ProductIdList:
         if product_id not in self.product_ids:
             raise ValueError("product_id is not in the list")
         self.product_ids.remove(product_id)
+        self._invalidate_content_digest()
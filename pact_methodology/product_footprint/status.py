@@ -1,4 +1,5 @@
 from enum import Enum
+from pact_methodology.canonical import ContentDigestMixin
 
 class Status(Enum):
     """
@@ -17,7 +18,7 @@ class Status(Enum):
     ACTIVE = "Active"
     DEPRECATED = "Deprecated"
 
-class ProductFootprintStatus:
+class ProductFootprintStatus(ContentDigestMixin):
     """
     Represents the status information of a product footprint, including the status and an optional comment.
 
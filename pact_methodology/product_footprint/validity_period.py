@@ -2,9 +2,10 @@ from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
 
 from pact_methodology.datetime import DateTime
+from pact_methodology.canonical import ContentDigestMixin
 
 
-class ValidityPeriod:
+class ValidityPeriod(ContentDigestMixin):
     """
     Represents a validity period with a start and end date.
 
@@ -52,6 +53,26 @@ class ValidityPeriod:
             self.start = start
             self.end = end
 
+    @property
+    def start(self) -> DateTime:
+        """Gets the start date of the validity period."""
+        return self._start
+
+    @start.setter
+    def start(self, value: DateTime):
+        """Sets the start date of the validity period."""
+        self._start = value
+
+    @property
+    def end(self) -> DateTime:
+        """Gets the end date of the validity period."""
+        return self._end
+
+    @end.setter
+    def end(self, value: DateTime):
+        """Sets the end date of the validity period."""
+        self._end = value
+
     @classmethod
     def three_years_from_end(cls, end_date: DateTime) -> DateTime:
         """
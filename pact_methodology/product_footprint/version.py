@@ -39,6 +39,19 @@ class Version:
             return False
         return self.version == other.version
 
+    def __hash__(self) -> int:
+        """
+        Returns the hash of the version number, consistent with __eq__.
+
+        Returns:
+            int: The hash value.
+        """
+        return hash(self.version)
+
+    def __reduce__(self):
+        """Pickles the Version as its version number."""
+        return Version, (self.version,)
+
     def __repr__(self) -> str:
         """
         Returns a string representation of the Version object.
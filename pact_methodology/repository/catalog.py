@@ -0,0 +1,396 @@
+"""
+A read-only footprint catalog that worker processes share through memory-mapped files.
+
+Pre-fork servers hold a copy of their footprints in every worker. A catalog is published once
+instead, as a generation file that workers map read-only, so the operating system keeps a single
+copy in its page cache however many workers read it. `publish` writes a generation with
+
+* a columnar section: the columns of a FootprintTable, ready for vectorized queries;
+* an id index: the ids in sorted order with their rows, searched by binary search;
+* a string arena: the UTF-8 category labels and the PACT JSON document of every footprint.
+
+`SharedCatalog.current` returns the latest generation as a `CatalogGeneration`, whose columns are
+arrays and whose documents are memoryviews of the mapped file: queries copy nothing, and a
+document can be sent to a client as it is. A publisher swaps in a new generation atomically by
+replacing the `CURRENT` file that names it. Readers see the new generation on their next call to
+`current`, while the generations they already hold stay valid until they drop them, even once the
+publisher deletes their files.
+
+Put the directory on a memory file system such as /dev/shm to keep the catalog out of disk I/O.
+
+Examples:
+    >>> publish("/dev/shm/footprints", repository)
+    1
+    >>> catalog = SharedCatalog("/dev/shm/footprints")
+    >>> generation = catalog.current()
+    >>> bytes(generation.document(footprint_id))
+    b'{"id": ...}'
+    >>> generation.table.column("p_cf_excluding_biogenic")[generation.where("status", "Active")].sum()
+    1234.5
+"""
+
+import math
+import mmap
+import os
+import pickle
+import struct
+import uuid
+from collections.abc import Iterable
+
+import numpy as np
+
+from pact_methodology._support import sync_directory
+from pact_methodology.aggregation.footprint_table import CATEGORICAL_COLUMNS, NUMERIC_COLUMNS, FootprintTable
+from pact_methodology.exceptions import CatalogFileError, DuplicateIdError
+from pact_methodology.exchange.json_codec import dumps, loads
+from pact_methodology.product_footprint.product_footprint import ProductFootprint
+from pact_methodology.repository.repository import footprint_key
+
+CURRENT = "CURRENT"
+"""The name of the file naming the current generation in a catalog directory."""
+
+_MAGIC = b"PACTCATL"
+_FORMAT_VERSION = 1
+# The magic, format version, number of rows, generation, and offset and length of the directory.
+_HEADER = struct.Struct("<8sIQQQQ")
+_SUFFIX = ".catalog"
+
+
+def publish(directory: str | os.PathLike, footprints: Iterable[ProductFootprint], *, keep: int = 2) -> int:
+    """
+    Publishes footprints as the next generation of a catalog, and deletes old generations.
+
+    Only one process may publish to a directory at a time.
+
+    Args:
+        directory (str | os.PathLike): The catalog directory, which is created if needed.
+        footprints (Iterable[ProductFootprint]): The footprints, in the order of the table rows.
+        keep (int): The number of generations to keep, including the new one. Readers holding a
+            deleted generation can still use it.
+
+    Returns:
+        int: The number of the new generation.
+
+    Raises:
+        ValueError: If keep is not positive.
+        DuplicateIdError: If two footprints have the same id.
+        OSError: If the directory cannot be written.
+    """
+    if keep < 1:
+        raise ValueError("keep must be positive")
+    directory = os.fspath(directory)
+    os.makedirs(directory, exist_ok=True)
+    footprints = list(footprints)
+    table = FootprintTable.from_footprints(footprints)
+    if len(np.unique(table.ids)) != len(table):
+        raise DuplicateIdError("Duplicate footprint ids are not allowed")
+    documents = [dumps(footprint).encode() for footprint in footprints]
+    labels = [label.encode() for name in CATEGORICAL_COLUMNS for label in table.categories[name]]
+
+    id_index = np.argsort(table.ids, kind="stable").astype("<u4")
+    sections = {
+        "ids": table.ids,
+        "created": table.created,
+        "version": table.version,
+        "dqr": table.dqr,
+        **{f"numeric/{name}": table.numeric[name] for name in NUMERIC_COLUMNS},
+        **{f"codes/{name}": table.codes[name] for name in CATEGORICAL_COLUMNS},
+        "sorted_ids": table.ids[id_index],
+        "id_index": id_index,
+        "label_offsets": _offsets(labels),
+        "labels": np.frombuffer(b"".join(labels), dtype=np.uint8),
+        "document_offsets": _offsets(documents),
+        "documents": np.frombuffer(b"".join(documents), dtype=np.uint8),
+    }
+    label_counts = {name: len(table.categories[name]) for name in CATEGORICAL_COLUMNS}
+
+    generation = _current_generation(directory) + 1
+    path = os.path.join(directory, f"{generation:020d}{_SUFFIX}")
+    with open(f"{path}.tmp", "wb") as file:
+        file.write(bytes(_HEADER.size))
+        layout = {}
+        for name, array in sections.items():
+            # Aligned, so that the columns can be read from the mapped file in place.
+            file.write(bytes(-file.tell() % 8))
+            layout[name] = (file.tell(), array.dtype.str, array.shape)
+            file.write(np.ascontiguousarray(array))
+        directory_bytes = pickle.dumps({"sections": layout, "label_counts": label_counts})
+        directory_offset = file.tell()
+        file.write(directory_bytes)
+        file.seek(0)
+        file.write(_HEADER.pack(_MAGIC, _FORMAT_VERSION, len(table), generation, directory_offset, len(directory_bytes)))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(f"{path}.tmp", path)
+
+    current = os.path.join(directory, CURRENT)
+    with open(f"{current}.tmp", "w") as file:
+        file.write(os.path.basename(path))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(f"{current}.tmp", current)
+    sync_directory(directory)
+
+    for name in os.listdir(directory):
+        number = name.removesuffix(_SUFFIX)
+        if name.endswith(_SUFFIX) and number.isdigit() and int(number) <= generation - keep:
+            try:
+                os.remove(os.path.join(directory, name))
+            except PermissionError:
+                # Windows cannot delete files that a reader still maps.
+                pass
+    return generation
+
+
+class CatalogGeneration:
+    """
+    One published generation of a catalog, mapped read-only.
+
+    The columns of `table` and the documents are views of the mapped file. The mapping is released
+    once the generation and every view of it are no longer referenced.
+
+    Attributes:
+        path (str): The path of the generation file.
+        number (int): The generation number.
+        table (FootprintTable): The columns, with a row per footprint in publishing order.
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        """
+        Maps a generation file.
+
+        Args:
+            path (str | os.PathLike): The path of the file.
+
+        Raises:
+            CatalogFileError: If the file is not a catalog generation, or is truncated or damaged.
+            OSError: If the file cannot be read.
+        """
+        self.path = os.fspath(path)
+        with open(self.path, "rb") as file:
+            try:
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise CatalogFileError(f"{self.path} is empty") from None
+        if len(mapped) < _HEADER.size or mapped[: len(_MAGIC)] != _MAGIC:
+            raise CatalogFileError(f"{self.path} is not a footprint catalog")
+        _, version, rows, self.number, directory_offset, directory_length = _HEADER.unpack_from(mapped)
+        if version != _FORMAT_VERSION:
+            raise CatalogFileError(f"{self.path} has the unknown format version {version}")
+        try:
+            directory = pickle.loads(mapped[directory_offset : directory_offset + directory_length])
+            sections = {
+                name: self._section(mapped, name, offset, np.dtype(dtype), shape)
+                for name, (offset, dtype, shape) in directory["sections"].items()
+            }
+            label_counts = directory["label_counts"]
+            labels = self._strings(sections["labels"], sections["label_offsets"])
+            categories, start = {}, 0
+            for name in CATEGORICAL_COLUMNS:
+                categories[name] = labels[start : start + label_counts[name]]
+                start += label_counts[name]
+            self.table = FootprintTable(
+                ids=sections["ids"],
+                created=sections["created"],
+                version=sections["version"],
+                numeric={name: sections[f"numeric/{name}"] for name in NUMERIC_COLUMNS},
+                dqr=sections["dqr"],
+                codes={name: sections[f"codes/{name}"] for name in CATEGORICAL_COLUMNS},
+                categories=categories,
+            )
+            self._sorted_ids = sections["sorted_ids"]
+            self._id_index = sections["id_index"]
+            self._document_offsets = sections["document_offsets"]
+            self._documents = memoryview(sections["documents"]).toreadonly()
+        except CatalogFileError:
+            raise
+        except (pickle.UnpicklingError, EOFError, KeyError, TypeError, ValueError) as error:
+            raise CatalogFileError(f"{self.path} is damaged: {error}") from None
+        if len(self.table) != rows or len(self._document_offsets) != rows + 1:
+            raise CatalogFileError(f"{self.path} is damaged: the sections do not have {rows} rows")
+        self._codes = {name: {label: code for code, label in enumerate(categories[name])} for name in categories}
+
+    def row(self, id: uuid.UUID | str) -> int | None:
+        """
+        Returns the table row of a footprint.
+
+        Args:
+            id (uuid.UUID | str): The footprint id.
+
+        Returns:
+            int | None: The row, or None if no footprint has the id.
+        """
+        try:
+            key = footprint_key(id).bytes
+        except ValueError:
+            return None
+        position = int(np.searchsorted(self._sorted_ids, key))
+        # NumPy drops the trailing zero bytes of "S16" values, so the key is compared without them.
+        if position < len(self._sorted_ids) and self._sorted_ids[position] == key.rstrip(b"\x00"):
+            return int(self._id_index[position])
+        return None
+
+    def document(self, id: uuid.UUID | str) -> memoryview | None:
+        """
+        Returns the PACT JSON document of a footprint, without copying it.
+
+        Args:
+            id (uuid.UUID | str): The footprint id.
+
+        Returns:
+            memoryview | None: The UTF-8 encoded document, or None if no footprint has the id.
+        """
+        row = self.row(id)
+        return None if row is None else self.document_at(row)
+
+    def document_at(self, row: int) -> memoryview:
+        """
+        Returns the PACT JSON document of the footprint in a row, without copying it.
+
+        Args:
+            row (int): The row.
+
+        Returns:
+            memoryview: The UTF-8 encoded document.
+
+        Raises:
+            IndexError: If there is no such row.
+        """
+        if not 0 <= row < len(self.table):
+            raise IndexError(f"Row {row} is out of range")
+        return self._documents[int(self._document_offsets[row]) : int(self._document_offsets[row + 1])]
+
+    def footprint(self, id: uuid.UUID | str) -> ProductFootprint | None:
+        """
+        Decodes a footprint from its document.
+
+        Args:
+            id (uuid.UUID | str): The footprint id.
+
+        Returns:
+            ProductFootprint | None: The footprint, or None if no footprint has the id.
+        """
+        document = self.document(id)
+        return None if document is None else loads(bytes(document))
+
+    def where(self, name: str, label: str) -> np.ndarray:
+        """
+        Returns the rows with a label in a categorical column.
+
+        Args:
+            name (str): One of CATEGORICAL_COLUMNS, for example "status".
+            label (str): The label, for example "Active".
+
+        Returns:
+            numpy.ndarray: The rows in ascending order, empty if no row has the label.
+
+        Raises:
+            KeyError: If name is not a categorical column.
+        """
+        code = self._codes[name].get(label)
+        if code is None:
+            return np.empty(0, dtype=np.intp)
+        return np.flatnonzero(self.table.codes[name] == code)
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def __contains__(self, id) -> bool:
+        return isinstance(id, (uuid.UUID, str)) and self.row(id) is not None
+
+    def __repr__(self) -> str:
+        return f"CatalogGeneration(number={self.number}, rows={len(self)})"
+
+    def _section(self, mapped: mmap.mmap, name: str, offset: int, dtype: np.dtype, shape: tuple) -> np.ndarray:
+        count = math.prod(shape)
+        if offset + count * dtype.itemsize > len(mapped):
+            raise CatalogFileError(f"{self.path} is damaged: the {name} section is truncated")
+        return np.frombuffer(mapped, dtype=dtype, count=count, offset=offset).reshape(shape)
+
+    @staticmethod
+    def _strings(arena: np.ndarray, offsets: np.ndarray) -> list[str]:
+        data = arena.tobytes()
+        bounds = offsets.tolist()
+        return [data[start:stop].decode() for start, stop in zip(bounds, bounds[1:])]
+
+
+class SharedCatalog:
+    """
+    The reader side of a catalog directory, following the generations a publisher swaps in.
+
+    Attributes:
+        directory (str): The catalog directory.
+    """
+
+    def __init__(self, directory: str | os.PathLike):
+        """
+        Initializes a SharedCatalog. The current generation is mapped on the first call to current.
+
+        Args:
+            directory (str | os.PathLike): The catalog directory.
+        """
+        self.directory = os.fspath(directory)
+        self._generation: CatalogGeneration | None = None
+        self._stamp = None
+
+    def current(self) -> CatalogGeneration:
+        """
+        Returns the current generation, mapping it if it was published since the last call.
+
+        Checking for a new generation costs a stat call. Use the returned generation for all the
+        queries of one request, so that they see the same footprints.
+
+        Returns:
+            CatalogGeneration: The generation.
+
+        Raises:
+            FileNotFoundError: If nothing was published to the directory yet.
+            CatalogFileError: If the generation file is damaged.
+        """
+        current = os.path.join(self.directory, CURRENT)
+        while True:
+            stat = os.stat(current)
+            stamp = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            if stamp == self._stamp:
+                return self._generation
+            with open(current) as file:
+                name = file.read().strip()
+            try:
+                generation = CatalogGeneration(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                stat = os.stat(current)
+                if (stat.st_ino, stat.st_mtime_ns, stat.st_size) == stamp:
+                    raise
+                # Another generation was published and this one deleted meanwhile.
+                continue
+            self._generation, self._stamp = generation, stamp
+            return generation
+
+    def close(self) -> None:
+        """Drops the current generation, whose mapping is released once no query result refers to it."""
+        self._generation = self._stamp = None
+
+    def __enter__(self) -> "SharedCatalog":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"SharedCatalog(directory={self.directory!r})"
+
+
+def _offsets(items: list[bytes]) -> np.ndarray:
+    offsets = np.zeros(len(items) + 1, dtype="<u8")
+    np.cumsum([len(item) for item in items], out=offsets[1:])
+    return offsets
+
+
+def _current_generation(directory: str) -> int:
+    """Returns the number of the latest generation in a directory, or 0 if there is none."""
+    numbers = [
+        int(name.removesuffix(_SUFFIX))
+        for name in os.listdir(directory)
+        if name.endswith(_SUFFIX) and name.removesuffix(_SUFFIX).isdigit()
+    ]
+    return max(numbers, default=0)
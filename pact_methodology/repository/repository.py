@@ -0,0 +1,710 @@
+"""
+An in-memory store of product footprints with secondary indexes.
+
+`FootprintRepository` keeps frozen footprints by id, in the order of their creation time, and
+maintains an index for every entry of `INDEXES`, so that lookups such as "all footprints of this
+company" or "all footprints in this CPC class" return a set of ids without scanning the store.
+Footprints are frozen when they are added, so they can be shared with readers, and the indexes can
+never go stale through a footprint being changed in place.
+
+Replaced and removed footprints are kept for a while as older versions, so that `page` can return
+the repository as it was at an earlier revision. A client paging through the footprints with a
+`Cursor` therefore sees a consistent snapshot, without skipped or repeated footprints, however the
+repository changes in between.
+"""
+
+import base64
+import bisect
+import heapq
+import math
+import struct
+import uuid
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from pact_methodology.exceptions import SnapshotExpiredError
+from pact_methodology.frozen import evolve, freeze
+from pact_methodology.product_footprint.product_footprint import ProductFootprint
+from pact_methodology.product_footprint.status import Status
+
+INDEXES: dict[str, Callable[[ProductFootprint], Iterable[str]]] = {
+    "company_ids": lambda footprint: {str(company_id) for company_id in footprint.company_ids},
+    "product_ids": lambda footprint: {str(product_id) for product_id in footprint.product_ids},
+    "product_category_cpc": lambda footprint: (footprint.product_category_cpc.code,),
+    "status": lambda footprint: (footprint.status.value,),
+    "preceding_pf_ids": lambda footprint: {str(pf_id) for pf_id in footprint.preceding_pf_ids or ()},
+}
+"""The secondary indexes, mapping each index name to the function returning a footprint's keys in it."""
+
+
+def footprint_key(id: uuid.UUID | str) -> uuid.UUID:
+    """
+    Returns the key a footprint id is stored under.
+
+    Args:
+        id (uuid.UUID | str): A ProductFootprintId, or its string form.
+
+    Returns:
+        uuid.UUID: The id as a UUID, which compares and hashes equal to the ProductFootprintId.
+
+    Raises:
+        ValueError: If id is not a UUID.
+    """
+    if isinstance(id, uuid.UUID):
+        return id
+    if not isinstance(id, str):
+        raise ValueError(f"Expected a footprint id, got {id!r}")
+    return uuid.UUID(id)
+
+
+DEFAULT_HISTORY = 10_000
+"""The default number of changes for which replaced and removed footprints are kept for snapshots."""
+
+_SCAN_SHARE = 0.25
+"""The share of the repository above which page scans the creation order instead of ordering the candidates."""
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_CURSOR = struct.Struct(">Qq16s")
+
+
+def _sort_key(footprint: ProductFootprint) -> tuple[datetime, bytes]:
+    """Returns the position of a footprint in the creation order: its created time, then its id."""
+    return footprint.created.iso_datetime, footprint.id.bytes
+
+
+@dataclass(frozen=True)
+class Cursor:
+    """
+    A position in a snapshot of a FootprintRepository.
+
+    Attributes:
+        revision (int): The revision of the snapshot.
+        created (datetime): The created time of the last footprint returned.
+        id (uuid.UUID): The id of the last footprint returned.
+
+    Examples:
+        >>> footprints, cursor = repository.page(100)
+        >>> token = cursor.encode()
+        >>> Cursor.decode(token) == cursor
+        True
+    """
+
+    revision: int
+    created: datetime
+    id: uuid.UUID
+
+    def encode(self) -> str:
+        """
+        Returns the cursor as a URL-safe token.
+
+        Returns:
+            str: The token, 43 characters of URL-safe base64.
+        """
+        microseconds = (self.created - _EPOCH) // timedelta(microseconds=1)
+        packed = _CURSOR.pack(self.revision, microseconds, self.id.bytes)
+        return base64.urlsafe_b64encode(packed).rstrip(b"=").decode("ascii")
+
+    @classmethod
+    def decode(cls, token: str) -> "Cursor":
+        """
+        Parses a token returned by encode.
+
+        Args:
+            token (str): The token.
+
+        Returns:
+            Cursor: The cursor.
+
+        Raises:
+            ValueError: If token is not a cursor token.
+        """
+        try:
+            packed = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            revision, microseconds, id = _CURSOR.unpack(packed)
+            return cls(revision, _EPOCH + timedelta(microseconds=microseconds), uuid.UUID(bytes=id))
+        except (ValueError, TypeError, struct.error, OverflowError):
+            raise ValueError(f"Invalid cursor: {token!r}") from None
+
+
+class Candidates:
+    """
+    The footprints of a FootprintRepository revision that a condition can be true for.
+
+    These are the footprints created in a time range and, if keys is given, with one of a set of
+    ids. Create them with FootprintRepository.candidates and pass them to page. page sorts the keys
+    by creation time on first use and keeps the order in the Candidates, so the following pages of
+    the same revision start at their cursor by bisection.
+
+    Attributes:
+        revision (int): The revision of the repository the candidates were made at.
+        start (datetime | None): The earliest creation time included, or None if unbounded.
+        end (datetime | None): The creation time after the range, or None if unbounded.
+        keys (frozenset[uuid.UUID] | None): The ids, or None for every footprint in the range.
+    """
+
+    __slots__ = ("revision", "start", "end", "keys", "_order")
+
+    def __init__(
+        self,
+        revision: int,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        keys: frozenset[uuid.UUID] | None = None,
+    ):
+        self.revision = revision
+        self.start = start
+        self.end = end
+        self.keys = keys
+        # The sort keys and ids of the keys in the range in creation order, once page needs them.
+        self._order: tuple[list[tuple[datetime, bytes]], list[uuid.UUID]] | None = None
+
+    def __repr__(self) -> str:
+        keys = "all" if self.keys is None else len(self.keys)
+        return f"Candidates(revision={self.revision}, start={self.start}, end={self.end}, keys={keys})"
+
+
+class _Version:
+    """A footprint as stored from one revision until the revision that replaced or removed it."""
+
+    __slots__ = ("key", "footprint", "added", "removed", "previous")
+
+    def __init__(self, key: uuid.UUID, footprint: ProductFootprint, added: int, previous: "_Version | None"):
+        self.key = key
+        self.footprint = footprint
+        self.added = added
+        self.removed = math.inf
+        self.previous = previous
+
+    def sort_key(self) -> tuple[datetime, bytes, int]:
+        return self.footprint.created.iso_datetime, self.key.bytes, self.added
+
+    def visible(self, revision: int) -> bool:
+        return self.added <= revision < self.removed
+
+
+class FootprintRepository:
+    """
+    Frozen ProductFootprint objects by id, with secondary indexes and a creation order.
+
+    Adding a footprint with the id of a stored footprint replaces it. Every change increments
+    `revision`, so readers can tell whether anything changed since they last looked. The replaced
+    and removed versions of the last `history` changes are kept, so `page` can read any snapshot
+    from that far back.
+
+    Attributes:
+        revision (int): The number of changes made to the repository.
+        history (int): The number of changes for which replaced and removed footprints are kept.
+
+    Examples:
+        >>> repository = FootprintRepository()
+        >>> repository.add(footprint)
+        >>> repository.lookup("product_category_cpc", "0111")
+        frozenset({UUID('...')})
+        >>> repository[footprint.id] == footprint
+        True
+    """
+
+    def __init__(self, footprints: Iterable[ProductFootprint] = (), *, history: int = DEFAULT_HISTORY):
+        """
+        Initializes a FootprintRepository.
+
+        Args:
+            footprints (Iterable[ProductFootprint]): Footprints to add.
+            history (int): The number of changes for which replaced and removed footprints are kept.
+
+        Raises:
+            ValueError: If history is negative.
+        """
+        if history < 0:
+            raise ValueError("history must not be negative")
+        self._footprints: dict[uuid.UUID, ProductFootprint] = {}
+        self._indexes: dict[str, dict[str, set[uuid.UUID]]] = {name: {} for name in INDEXES}
+        self._order: list[tuple[datetime, bytes]] = []
+        self._ordered_ids: list[uuid.UUID] = []
+        # Every version visible to a retained snapshot, in creation order, and the latest version of
+        # every id, linked to the versions it replaced.
+        self._version_order: list[tuple[datetime, bytes, int]] = []
+        self._versions: list[_Version] = []
+        self._latest: dict[uuid.UUID, _Version] = {}
+        self._dead: deque[_Version] = deque()
+        self._expired = 0
+        self.history = history
+        self.revision = 0
+        self.add_all(footprints)
+
+    def add(self, footprint: ProductFootprint) -> ProductFootprint | None:
+        """
+        Stores a frozen copy of a footprint, replacing any stored footprint with the same id.
+
+        Args:
+            footprint (ProductFootprint): The footprint.
+
+        Returns:
+            ProductFootprint | None: The replaced footprint, or None if the id was new.
+
+        Raises:
+            ValueError: If footprint is not an instance of ProductFootprint.
+        """
+        if not isinstance(footprint, ProductFootprint):
+            raise ValueError("footprint must be an instance of ProductFootprint")
+        footprint = freeze(footprint)
+        key = footprint.id
+        replaced = self._footprints.get(key)
+        if replaced is not None:
+            self._unindex(key, replaced)
+        self._footprints[key] = footprint
+        self._index(key, footprint)
+        self.revision += 1
+        self._add_version(key, footprint)
+        return replaced
+
+    def add_all(self, footprints: Iterable[ProductFootprint]) -> None:
+        """
+        Stores every footprint of an iterable.
+
+        Args:
+            footprints (Iterable[ProductFootprint]): The footprints.
+        """
+        for footprint in footprints:
+            self.add(footprint)
+
+    def remove(self, id: uuid.UUID | str) -> ProductFootprint:
+        """
+        Removes a footprint.
+
+        Args:
+            id (uuid.UUID | str): The footprint id.
+
+        Returns:
+            ProductFootprint: The removed footprint.
+
+        Raises:
+            KeyError: If no footprint has the id.
+        """
+        key = footprint_key(id)
+        footprint = self._footprints.pop(key)
+        self._unindex(key, footprint)
+        self.revision += 1
+        self._retire(self._latest[key])
+        self._vacuum()
+        return footprint
+
+    def set_status(self, id: uuid.UUID | str, status: Status, comment: str | None = None) -> ProductFootprint:
+        """
+        Changes the status of a stored footprint.
+
+        Args:
+            id (uuid.UUID | str): The footprint id.
+            status (Status): The new status.
+            comment (str | None): The new status comment.
+
+        Returns:
+            ProductFootprint: The stored footprint with the new status.
+
+        Raises:
+            KeyError: If no footprint has the id.
+            ValueError: If status or comment is invalid.
+        """
+        footprint = self._footprints[footprint_key(id)]
+        updated = evolve(footprint, status=status, status_comment=comment)
+        self.add(updated)
+        return updated
+
+    def get(self, id: uuid.UUID | str, default=None) -> ProductFootprint | None:
+        """
+        Returns a footprint by id.
+
+        Args:
+            id (uuid.UUID | str): The footprint id.
+            default: The value to return if no footprint has the id.
+
+        Returns:
+            ProductFootprint | None: The footprint, or default.
+        """
+        try:
+            return self._footprints.get(footprint_key(id), default)
+        except ValueError:
+            return default
+
+    def lookup(self, index: str, key: str) -> frozenset[uuid.UUID]:
+        """
+        Returns the ids of the footprints with a key in a secondary index.
+
+        Args:
+            index (str): The name of an index in INDEXES, for example "company_ids".
+            key (str): The key, for example a company id URN, a CPC code or a status value.
+
+        Returns:
+            frozenset[uuid.UUID]: The ids.
+
+        Raises:
+            KeyError: If index is not the name of an index.
+        """
+        return frozenset(self._indexes[index].get(key, ()))
+
+    def keys(self, index: str) -> list[str]:
+        """
+        Returns the keys of a secondary index.
+
+        Args:
+            index (str): The name of an index in INDEXES.
+
+        Returns:
+            list[str]: The keys with at least one footprint.
+
+        Raises:
+            KeyError: If index is not the name of an index.
+        """
+        return list(self._indexes[index])
+
+    def ordered(self, start: int = 0, stop: int | None = None) -> list[ProductFootprint]:
+        """
+        Returns a range of footprints in creation order.
+
+        Args:
+            start (int): The position of the first footprint.
+            stop (int | None): The position after the last footprint. Defaults to the end.
+
+        Returns:
+            list[ProductFootprint]: The footprints, ordered by created time and then id.
+        """
+        return [self._footprints[key] for key in self._ordered_ids[start:stop]]
+
+    def created_between(self, start: datetime | None = None, end: datetime | None = None) -> list[uuid.UUID]:
+        """
+        Returns the ids of the footprints created in a time range, using the creation order.
+
+        Args:
+            start (datetime | None): The earliest creation time included. Unbounded by default.
+            end (datetime | None): The creation time after the range, which is not included.
+                Unbounded by default.
+
+        Returns:
+            list[uuid.UUID]: The ids, ordered by created time and then id.
+        """
+        low = bisect.bisect_left(self._order, (start,)) if start is not None else 0
+        high = bisect.bisect_left(self._order, (end,)) if end is not None else len(self._order)
+        return self._ordered_ids[low:high]
+
+    def candidates(
+        self,
+        keys: Iterable[uuid.UUID] | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> Candidates:
+        """
+        Returns the candidates of a condition at the current revision, for page.
+
+        Args:
+            keys (Iterable[uuid.UUID] | None): The ids in the current indexes of every footprint the
+                condition can be true for, for example from lookup. Defaults to every footprint.
+            start (datetime | None): The earliest creation time the condition can be true for.
+            end (datetime | None): The creation time from which the condition is false.
+
+        Returns:
+            Candidates: The candidates, valid until the repository changes.
+
+        Examples:
+            >>> active = repository.candidates(repository.lookup("status", "Active"), start=january)
+            >>> footprints, cursor = repository.page(100, where=is_active, candidates=active)
+        """
+        if keys is not None and not isinstance(keys, frozenset):
+            keys = frozenset(keys)
+        return Candidates(self.revision, start, end, keys)
+
+    def in_order(self, ids: Iterable[uuid.UUID | str]) -> list[ProductFootprint]:
+        """
+        Returns stored footprints by id, in creation order.
+
+        Args:
+            ids (Iterable[uuid.UUID | str]): The footprint ids.
+
+        Returns:
+            list[ProductFootprint]: The footprints, ordered by created time and then id.
+
+        Raises:
+            KeyError: If no footprint has one of the ids.
+        """
+        return sorted((self[id] for id in ids), key=_sort_key)
+
+    def page(
+        self,
+        limit: int,
+        cursor: Cursor | None = None,
+        *,
+        where: Callable[[ProductFootprint], bool] | None = None,
+        candidates: Candidates | Iterable[uuid.UUID] | None = None,
+    ) -> tuple[list[ProductFootprint], Cursor | None]:
+        """
+        Returns a page of footprints in creation order, from a snapshot of the repository.
+
+        The first page is read from the current revision. The returned cursor continues in the same
+        snapshot, so changes made between pages are not seen. A page costs O(limit), plus a step for
+        every footprint changed since the snapshot and for every footprint skipped by where. The
+        time range of candidates bounds the creation order by bisection. Without keys, or with keys
+        that are a large share of the repository, the footprints between matches are skipped in the
+        creation order as well. Smaller sets of keys are sorted by creation time once, kept in the
+        Candidates, and every page starts at the cursor by bisection.
+
+        Args:
+            limit (int): The largest number of footprints to return.
+            cursor (Cursor | None): The cursor returned with the previous page, or None for the first page.
+            where (Callable[[ProductFootprint], bool] | None): Returns whether to include a footprint.
+            candidates (Candidates | Iterable[uuid.UUID] | None): The footprints where can be true
+                for at the current revision, from candidates, or their ids. Only these footprints,
+                and those changed since the snapshot, are tested. Reuse the same Candidates for
+                every page read at one revision.
+
+        Returns:
+            tuple[list[ProductFootprint], Cursor | None]: The footprints, and the cursor of the next
+                page, or None if this is the last page.
+
+        Raises:
+            ValueError: If limit is not positive, cursor is not from this repository, or candidates
+                are from an earlier revision.
+            SnapshotExpiredError: If the versions of the cursor's snapshot are no longer kept.
+        """
+        if limit < 1:
+            raise ValueError("limit must be positive")
+        if candidates is not None and not isinstance(candidates, Candidates):
+            candidates = self.candidates(candidates)
+        if candidates is not None and candidates.revision != self.revision:
+            raise ValueError("The candidates are from an earlier revision of the repository")
+        if cursor is None:
+            revision, after = self.revision, None
+        else:
+            revision, after = cursor.revision, (cursor.created, cursor.id.bytes, math.inf)
+            if revision > self.revision:
+                raise ValueError("Cursor is from a later revision than the repository")
+            if revision < self._expired:
+                raise SnapshotExpiredError(f"The snapshot at revision {revision} has expired")
+        if candidates is None:
+            versions = self._scan(revision, after, where, limit + 1)
+        elif candidates.keys is None:
+            versions = self._scan(revision, after, where, limit + 1, candidates.start, candidates.end)
+        else:
+            versions = self._search(revision, after, where, candidates, limit + 1)
+        if len(versions) <= limit:
+            return [version.footprint for version in versions], None
+        last = versions[limit - 1]
+        next_cursor = Cursor(revision, last.footprint.created.iso_datetime, last.key)
+        return [version.footprint for version in versions[:limit]], next_cursor
+
+    def __getitem__(self, id: uuid.UUID | str) -> ProductFootprint:
+        """
+        Returns a footprint by id.
+
+        Raises:
+            KeyError: If no footprint has the id.
+        """
+        try:
+            return self._footprints[footprint_key(id)]
+        except ValueError:
+            raise KeyError(id) from None
+
+    def __contains__(self, id) -> bool:
+        return self.get(id) is not None
+
+    def __len__(self) -> int:
+        return len(self._footprints)
+
+    def __iter__(self) -> Iterator[ProductFootprint]:
+        """Iterates over the footprints in creation order."""
+        return iter(self.ordered())
+
+    def __repr__(self) -> str:
+        return f"FootprintRepository(footprints={len(self)}, revision={self.revision})"
+
+    @classmethod
+    def _restore(
+        cls,
+        keys: list[uuid.UUID],
+        footprints: list[ProductFootprint],
+        order: list[tuple[datetime, bytes]],
+        indexes: dict[str, dict[str, set[uuid.UUID]]],
+        revision: int,
+        history: int,
+    ) -> "FootprintRepository":
+        """
+        Builds a repository from saved state, without reading the footprints, which may be lazy.
+
+        keys, footprints and order are the ids, footprints and sort keys in creation order, and
+        indexes the contents of every index in INDEXES.
+        """
+        repository = cls(history=history)
+        repository._footprints = dict(zip(keys, footprints))
+        repository._indexes.update(indexes)
+        repository._order = order
+        repository._ordered_ids = keys
+        repository._version_order = [(created, key_bytes, revision) for created, key_bytes in order]
+        repository._versions = [_Version(key, footprint, revision, None) for key, footprint in zip(keys, footprints)]
+        repository._latest = dict(zip(keys, repository._versions))
+        # The earlier revisions were not saved, so cursors into them have expired.
+        repository.revision = repository._expired = revision
+        return repository
+
+    def _export(
+        self,
+    ) -> tuple[
+        list[uuid.UUID],
+        list[ProductFootprint],
+        list[tuple[datetime, bytes]],
+        dict[str, dict[str, set[uuid.UUID]]],
+        int,
+    ]:
+        """
+        Returns the state _restore builds a repository from, without reading lazy footprints.
+
+        These are the ids, footprints and sort keys in creation order, the contents of every index in
+        INDEXES, and the revision. The lists, dicts and sets are copies, which the repository does not
+        change afterwards.
+        """
+        keys = list(self._ordered_ids)
+        footprints = self._footprints
+        indexes = {name: {key: set(ids) for key, ids in index.items()} for name, index in self._indexes.items()}
+        return keys, [footprints[key] for key in keys], list(self._order), indexes, self.revision
+
+    def _scan(
+        self,
+        revision: int,
+        after,
+        where,
+        count: int,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        keys: frozenset | None = None,
+        changed: set | None = None,
+    ) -> list[_Version]:
+        """
+        Returns up to count versions visible at revision, after a position in the creation order.
+
+        Only versions created in [start, end) are read, and with keys, only those of keys or changed.
+        """
+        found = []
+        versions = self._versions
+        version_order = self._version_order
+        position = bisect.bisect_right(version_order, after) if after is not None else 0
+        if start is not None:
+            position = max(position, bisect.bisect_left(version_order, (start,)))
+        stop = bisect.bisect_left(version_order, (end,)) if end is not None else len(versions)
+        while position < stop and len(found) < count:
+            version = versions[position]
+            if (
+                version.visible(revision)
+                and (keys is None or version.key in keys or version.key in changed)
+                and (where is None or where(version.footprint))
+            ):
+                found.append(version)
+            position += 1
+        return found
+
+    def _search(self, revision: int, after, where, candidates: Candidates, count: int) -> list[_Version]:
+        """Returns the first count versions visible at revision among candidates with keys, after a position."""
+        # The indexes describe the current revision. A footprint can only be different in the
+        # snapshot if it was replaced or removed since, so those are tested on their own.
+        changed = set()
+        for version in reversed(self._dead):
+            if version.removed <= revision:
+                break
+            changed.add(version.key)
+        if len(candidates.keys) > _SCAN_SHARE * len(self._footprints):
+            return self._scan(revision, after, where, count, candidates.start, candidates.end, candidates.keys, changed)
+
+        found = []
+        for key in changed:
+            version = self._visible_version(key, revision)
+            if version is None or (after is not None and version.sort_key() <= after):
+                continue
+            if where is None or where(version.footprint):
+                found.append(version)
+        # The other candidates are unchanged since the snapshot, so their current creation order holds.
+        order, keys = self._candidate_order(candidates)
+        position = bisect.bisect_right(order, after) if after is not None else 0
+        matches = 0
+        while position < len(keys) and matches < count:
+            key = keys[position]
+            position += 1
+            if key in changed:
+                continue
+            version = self._visible_version(key, revision)
+            if version is not None and (where is None or where(version.footprint)):
+                found.append(version)
+                matches += 1
+        return heapq.nsmallest(count, found, key=_Version.sort_key)
+
+    def _visible_version(self, key: uuid.UUID, revision: int) -> _Version | None:
+        """Returns the version of a footprint visible at revision, if any."""
+        version = self._latest.get(key)
+        while version is not None and version.added > revision:
+            version = version.previous
+        return version if version is not None and version.visible(revision) else None
+
+    def _candidate_order(self, candidates: Candidates) -> tuple[list[tuple[datetime, bytes]], list[uuid.UUID]]:
+        """Returns the sort keys and ids of the stored candidates in their time range, in creation order."""
+        if candidates._order is None:
+            footprints = self._footprints
+            entries = sorted((_sort_key(footprints[key]), key) for key in candidates.keys if key in footprints)
+            if candidates.start is not None:
+                entries = entries[bisect.bisect_left(entries, ((candidates.start,),)) :]
+            if candidates.end is not None:
+                entries = entries[: bisect.bisect_left(entries, ((candidates.end,),))]
+            candidates._order = [sort_key for sort_key, _ in entries], [key for _, key in entries]
+        return candidates._order
+
+    def _add_version(self, key: uuid.UUID, footprint: ProductFootprint) -> None:
+        previous = self._latest.get(key)
+        if previous is not None and previous.removed == math.inf:
+            self._retire(previous)
+        version = _Version(key, footprint, self.revision, previous)
+        self._latest[key] = version
+        sort_key = version.sort_key()
+        position = bisect.bisect_left(self._version_order, sort_key)
+        self._version_order.insert(position, sort_key)
+        self._versions.insert(position, version)
+        self._vacuum()
+
+    def _retire(self, version: _Version) -> None:
+        version.removed = self.revision
+        self._dead.append(version)
+
+    def _vacuum(self) -> None:
+        """Drops the versions that no retained snapshot can see."""
+        horizon = self.revision - self.history
+        while self._dead and self._dead[0].removed <= horizon:
+            version = self._dead.popleft()
+            self._expired = version.removed
+            position = bisect.bisect_left(self._version_order, version.sort_key())
+            del self._version_order[position]
+            del self._versions[position]
+            # The oldest retained version of an id is the last one of its chain.
+            if self._latest.get(version.key) is version:
+                del self._latest[version.key]
+            else:
+                newer = self._latest[version.key]
+                while newer.previous is not version:
+                    newer = newer.previous
+                newer.previous = None
+
+    def _index(self, key: uuid.UUID, footprint: ProductFootprint) -> None:
+        for name, keys_of in INDEXES.items():
+            index = self._indexes[name]
+            for index_key in keys_of(footprint):
+                index.setdefault(index_key, set()).add(key)
+        sort_key = _sort_key(footprint)
+        position = bisect.bisect_left(self._order, sort_key)
+        self._order.insert(position, sort_key)
+        self._ordered_ids.insert(position, key)
+
+    def _unindex(self, key: uuid.UUID, footprint: ProductFootprint) -> None:
+        for name, keys_of in INDEXES.items():
+            index = self._indexes[name]
+            for index_key in keys_of(footprint):
+                ids = index[index_key]
+                ids.discard(key)
+                if not ids:
+                    del index[index_key]
+        position = bisect.bisect_left(self._order, _sort_key(footprint))
+        del self._order[position]
+        del self._ordered_ids[position]
@@ -0,0 +1,203 @@
+"""
+Compact snapshot files of a FootprintRepository, for a fast warm start.
+
+`dump` writes the footprints of a repository with its secondary indexes to a single file. `load`
+memory-maps the file and rebuilds the repository from the stored ids, creation times, content
+digests and indexes alone. Every footprint is a lazy object, unpickled from the mapped file when it
+is first read, so a restore costs a few microseconds per footprint instead of decoding them all,
+and footprints that are never read are never decoded.
+
+A file starts with a header, followed by the footprints in creation order, arrays of their offsets,
+ids, content digests, creation times and index entries, and a pickled directory of these sections
+and the index keys. Footprints are stored in the compact pickle form of the data model classes, so
+only load files written by trusted processes.
+
+Examples:
+    >>> dump(repository, "footprints.snapshot")
+    >>> restored = load("footprints.snapshot")
+    >>> restored.lookup("product_category_cpc", "0111") == repository.lookup("product_category_cpc", "0111")
+    True
+"""
+
+import mmap
+import os
+import pickle
+import struct
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from pact_methodology._support import collection_paused, sync_directory
+from pact_methodology.canonical import DIGEST_SIZE
+from pact_methodology.exceptions import SnapshotFileError
+from pact_methodology.frozen import lazy
+from pact_methodology.product_footprint.product_footprint import ProductFootprint
+from pact_methodology.repository.repository import DEFAULT_HISTORY, INDEXES, FootprintRepository
+
+_MAGIC = b"PACTREPO"
+_FORMAT_VERSION = 1
+# The magic, format version, number of footprints, revision, and offset and length of the directory.
+_HEADER = struct.Struct("<8sIQQQQ")
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+class _Record:
+    """Unpickles a footprint from its bytes in a mapped snapshot file."""
+
+    __slots__ = ("buffer", "start", "stop")
+
+    def __init__(self, buffer: memoryview, start: int, stop: int):
+        self.buffer = buffer
+        self.start = start
+        self.stop = stop
+
+    def __call__(self) -> ProductFootprint:
+        return pickle.loads(self.buffer[self.start : self.stop])
+
+
+def dump(repository: FootprintRepository, path: str | os.PathLike) -> None:
+    """
+    Writes a snapshot file of a repository, replacing the file atomically and durably.
+
+    The repository must not be changed while it is written. Footprints restored from another
+    snapshot file and never read are copied without being decoded.
+
+    Args:
+        repository (FootprintRepository): The repository.
+        path (str | os.PathLike): The path of the file.
+
+    Raises:
+        OSError: If the file cannot be written.
+    """
+    path = os.fspath(path)
+    keys, footprints, order, indexes, revision = repository._export()
+    positions = {key: position for position, key in enumerate(keys)}
+    index_keys, index_counts, index_positions = {}, {}, []
+    for name in INDEXES:
+        index = indexes[name]
+        index_keys[name] = list(index)
+        index_counts[name] = [len(ids) for ids in index.values()]
+        for ids in index.values():
+            index_positions.extend(sorted(positions[key] for key in ids))
+    arrays = {
+        "ids": b"".join(key.bytes for key in keys),
+        "digests": b"".join(footprint.content_digest for footprint in footprints),
+        "created": np.array([(created - _EPOCH) // _MICROSECOND for created, _ in order], dtype="<i8"),
+        "positions": np.array(index_positions, dtype="<u4"),
+    }
+    sections = {}
+    with open(f"{path}.tmp", "wb") as file:
+        file.write(bytes(_HEADER.size))
+        offsets = [0]
+        for footprint in footprints:
+            record = _record_bytes(footprint)
+            file.write(record)
+            offsets.append(offsets[-1] + len(record))
+        sections["records"] = (_HEADER.size, offsets[-1])
+        arrays = {"offsets": np.array(offsets, dtype="<u8"), **arrays}
+        for name, array in arrays.items():
+            # Aligned, so that the arrays can be read from the mapped file in place.
+            file.write(bytes(-file.tell() % 8))
+            sections[name] = (file.tell(), file.write(array))
+        directory = pickle.dumps(
+            {"sections": sections, "index_keys": index_keys, "index_counts": index_counts},
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+        directory_offset = file.tell()
+        file.write(directory)
+        file.seek(0)
+        file.write(
+            _HEADER.pack(_MAGIC, _FORMAT_VERSION, len(keys), revision, directory_offset, len(directory))
+        )
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(f"{path}.tmp", path)
+    sync_directory(os.path.dirname(path) or ".")
+
+
+def load(path: str | os.PathLike, *, history: int = DEFAULT_HISTORY) -> FootprintRepository:
+    """
+    Restores a repository from a snapshot file, with lazy footprints read from the mapped file.
+
+    The file stays mapped while any of its footprints has not been read, and must not be changed
+    in place meanwhile. dump replaces files rather than changing them, so it can write a new
+    snapshot to the same path.
+
+    Args:
+        path (str | os.PathLike): The path of the file.
+        history (int): The history of the repository, see FootprintRepository.
+
+    Returns:
+        FootprintRepository: The repository, at the revision it was written at.
+
+    Raises:
+        SnapshotFileError: If the file is not a snapshot file, or is truncated or damaged.
+        OSError: If the file cannot be read.
+    """
+    with open(path, "rb") as file:
+        try:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise SnapshotFileError(f"{path} is empty") from None
+    if len(mapped) < _HEADER.size:
+        raise SnapshotFileError(f"{path} is not a footprint repository snapshot")
+    magic, version, count, revision, directory_offset, directory_length = _HEADER.unpack_from(mapped)
+    if magic != _MAGIC:
+        raise SnapshotFileError(f"{path} is not a footprint repository snapshot")
+    if version != _FORMAT_VERSION:
+        raise SnapshotFileError(f"{path} has the unknown format version {version}")
+    try:
+        directory = pickle.loads(mapped[directory_offset : directory_offset + directory_length])
+        sections = directory["sections"]
+        index_keys, index_counts = directory["index_keys"], directory["index_counts"]
+    except Exception as error:
+        raise SnapshotFileError(f"{path} is damaged: {error}") from None
+    if set(index_keys) != set(INDEXES):
+        raise SnapshotFileError(f"{path} was written with other indexes than INDEXES")
+
+    def section(name: str, dtype: str, length: int) -> np.ndarray:
+        offset, size = sections[name]
+        itemsize = np.dtype(dtype).itemsize
+        if size != length * itemsize or offset + size > len(mapped):
+            raise SnapshotFileError(f"{path} is damaged: the {name} section is truncated")
+        return np.frombuffer(mapped, dtype=dtype, count=length, offset=offset)
+
+    offsets = section("offsets", "<u8", count + 1).tolist()
+    ids = section("ids", "S1", count * 16).tobytes()
+    digests = section("digests", "S1", count * DIGEST_SIZE).tobytes()
+    created = section("created", "<i8", count).tolist()
+    positions = section("positions", "<u4", sum(map(sum, index_counts.values()))).tolist()
+    records, records_size = sections["records"]
+    if offsets[-1] != records_size:
+        raise SnapshotFileError(f"{path} is damaged: the records section is truncated")
+
+    with collection_paused():
+        view = memoryview(mapped)
+        id_bytes = [ids[start : start + 16] for start in range(0, len(ids), 16)]
+        keys = [uuid.UUID(bytes=key_bytes) for key_bytes in id_bytes]
+        footprints = [
+            lazy(
+                ProductFootprint,
+                _Record(view, records + start, records + stop),
+                digests[position * DIGEST_SIZE : (position + 1) * DIGEST_SIZE],
+            )
+            for position, (start, stop) in enumerate(zip(offsets, offsets[1:]))
+        ]
+        order = [(_EPOCH + timedelta(microseconds=micros), key_bytes) for micros, key_bytes in zip(created, id_bytes)]
+        indexes, start = {}, 0
+        for name in INDEXES:
+            index = indexes[name] = {}
+            for index_key, length in zip(index_keys[name], index_counts[name]):
+                index[index_key] = {keys[position] for position in positions[start : start + length]}
+                start += length
+        return FootprintRepository._restore(keys, footprints, order, indexes, revision, history)
+
+
+def _record_bytes(footprint: ProductFootprint) -> bytes | memoryview:
+    """Returns the pickle of a footprint, copying it from a snapshot file if it has not been read."""
+    loader = getattr(footprint, "_loader", None)
+    if isinstance(loader, _Record):
+        return loader.buffer[loader.start : loader.stop]
+    return pickle.dumps(footprint, protocol=pickle.HIGHEST_PROTOCOL)
@@ -0,0 +1,430 @@
+"""
+Durable storage of product footprints in a SQLite database.
+
+`SqliteFootprintStore` keeps every footprint as its PACT JSON document, next to columns extracted
+from it for querying: the id, version, creation and update times, status, CPC code, validity
+period and main PCF values, and a side table for each list of keys in `INDEXES`, such as company
+and product ids. The document is the source of truth; the columns are rewritten with it.
+
+Writes go through `add_all`, which upserts footprints in batches with `executemany`, one
+transaction per batch, in write-ahead logging mode, so readers in other connections are not
+blocked. Queries return lazy frozen footprints that decode their document on first use, so a query
+over many rows costs little more than reading the rows.
+
+Examples:
+    >>> with SqliteFootprintStore("footprints.db") as store:
+    ...     store.add_all(footprints)
+    ...     acme = store.find(company_id="urn:pathfinder:company:customcode:buyer-assigned:acme-corp")
+    ...     [footprint.product_name_company for footprint in acme]
+    ['Widget', 'Gadget']
+"""
+
+import contextlib
+import itertools
+import os
+import sqlite3
+import uuid
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timedelta, timezone
+
+from pact_methodology.datetime import DateTime
+from pact_methodology.exchange.json_codec import dumps, loads
+from pact_methodology.frozen import evolve, lazy
+from pact_methodology.product_footprint.product_footprint import ProductFootprint
+from pact_methodology.product_footprint.status import Status
+from pact_methodology.repository.repository import INDEXES, footprint_key
+
+DEFAULT_BATCH_SIZE = 1000
+"""The default number of footprints written per transaction."""
+
+PCF_COLUMNS = (
+    "declared_unit",
+    "unitary_product_amount",
+    "p_cf_excluding_biogenic",
+    "p_cf_including_biogenic",
+    "fossil_ghg_emissions",
+    "fossil_carbon_content",
+    "biogenic_carbon_content",
+)
+"""The CarbonFootprint attributes stored as columns of the footprints table."""
+
+SIDE_TABLES = ("company_ids", "product_ids", "preceding_pf_ids")
+"""The indexes in INDEXES stored as side tables of (key, id) rows, one per key of a footprint."""
+
+_COLUMNS = (
+    "id",
+    "version",
+    "created",
+    "updated",
+    "status",
+    "product_category_cpc",
+    "validity_start",
+    "validity_end",
+    *PCF_COLUMNS,
+    "digest",
+    "document",
+)
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS footprints (
+    id BLOB NOT NULL UNIQUE,
+    version INTEGER NOT NULL,
+    created INTEGER NOT NULL,
+    updated INTEGER,
+    status TEXT NOT NULL,
+    product_category_cpc TEXT NOT NULL,
+    validity_start INTEGER,
+    validity_end INTEGER,
+    declared_unit TEXT NOT NULL,
+    unitary_product_amount REAL NOT NULL,
+    p_cf_excluding_biogenic REAL NOT NULL,
+    p_cf_including_biogenic REAL,
+    fossil_ghg_emissions REAL NOT NULL,
+    fossil_carbon_content REAL NOT NULL,
+    biogenic_carbon_content REAL NOT NULL,
+    digest BLOB NOT NULL,
+    document BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS footprints_created ON footprints (created, id);
+CREATE INDEX IF NOT EXISTS footprints_cpc ON footprints (product_category_cpc, created);
+CREATE INDEX IF NOT EXISTS footprints_status ON footprints (status, created);
+CREATE INDEX IF NOT EXISTS footprints_validity ON footprints (validity_end, validity_start);
+{"".join(f'''
+CREATE TABLE IF NOT EXISTS {table} (
+    key TEXT NOT NULL,
+    id BLOB NOT NULL,
+    PRIMARY KEY (key, id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS {table}_id ON {table} (id);''' for table in SIDE_TABLES)}
+"""
+
+_UPSERT = (
+    f"INSERT INTO footprints ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))}) "
+    f"ON CONFLICT (id) DO UPDATE SET {', '.join(f'{column} = excluded.{column}' for column in _COLUMNS[1:])}"
+)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _timestamp(value: DateTime | datetime | None) -> int | None:
+    """Returns a time as microseconds since the epoch, the form stored in time columns."""
+    if value is None:
+        return None
+    if isinstance(value, DateTime):
+        value = value.iso_datetime
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def _row(footprint: ProductFootprint) -> tuple:
+    """Returns the values of the columns of the footprints table for a footprint."""
+    pcf = footprint.pcf
+    validity = footprint.validity_period
+    return (
+        footprint.id.bytes,
+        footprint.version.version,
+        _timestamp(footprint.created),
+        _timestamp(footprint.updated),
+        footprint.status.value,
+        footprint.product_category_cpc.code,
+        _timestamp(validity.start) if validity is not None else None,
+        _timestamp(validity.end) if validity is not None else None,
+        pcf.declared_unit.value,
+        *(getattr(pcf, name) for name in PCF_COLUMNS[1:]),
+        footprint.content_digest,
+        dumps(footprint).encode(),
+    )
+
+
+def _lazy(digest: bytes, document: bytes) -> ProductFootprint:
+    """Returns a lazy footprint decoding a stored document."""
+    return lazy(ProductFootprint, lambda: loads(document), digest)
+
+
+class SqliteFootprintStore:
+    """
+    Product footprints by id in a SQLite database, with indexed columns and side tables.
+
+    Adding a footprint with the id of a stored footprint replaces it. Footprints are returned as
+    lazy frozen objects, which decode their document when an attribute is first read, and compare
+    and hash by their stored content digest without decoding.
+
+    A store holds one connection, which must only be used from the thread that opened it. Open a
+    store per thread or process to read concurrently.
+
+    Attributes:
+        path (str): The path of the database file, or ":memory:".
+        connection (sqlite3.Connection): The connection, for queries beyond those of the store,
+            such as aggregations over the PCF columns.
+
+    Examples:
+        >>> store = SqliteFootprintStore("footprints.db")
+        >>> store.add_all(footprints)
+        3
+        >>> store.lookup("product_category_cpc", "0111")
+        frozenset({UUID('...')})
+        >>> store[footprint.id] == footprint
+        True
+    """
+
+    def __init__(self, path: str | os.PathLike, *, timeout: float = 5.0):
+        """
+        Opens a store, creating the database file and its tables if needed.
+
+        Args:
+            path (str | os.PathLike): The path of the database file, or ":memory:".
+            timeout (float): The number of seconds to wait for another connection's write
+                transaction to finish.
+
+        Raises:
+            sqlite3.Error: If the database cannot be opened.
+        """
+        self.path = os.fspath(path)
+        # Transactions are begun and committed explicitly.
+        self.connection = sqlite3.connect(self.path, timeout=timeout, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        # In WAL mode, a commit is durable once the log is synced at the next checkpoint; a power
+        # loss can lose the last transactions but never corrupts the database.
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.executescript(_SCHEMA)
+
+    def add(self, footprint: ProductFootprint) -> None:
+        """
+        Stores a footprint, replacing any stored footprint with the same id.
+
+        Args:
+            footprint (ProductFootprint): The footprint.
+
+        Raises:
+            ValueError: If footprint is not an instance of ProductFootprint.
+        """
+        self.add_all((footprint,))
+
+    def add_all(self, footprints: Iterable[ProductFootprint], *, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        """
+        Stores footprints in batches, one transaction per batch.
+
+        A footprint named twice is stored as its last occurrence. If a batch fails, its transaction
+        is rolled back, and the earlier batches stay stored.
+
+        Args:
+            footprints (Iterable[ProductFootprint]): The footprints.
+            batch_size (int): The number of footprints written per transaction.
+
+        Returns:
+            int: The number of footprints stored.
+
+        Raises:
+            ValueError: If a footprint is not an instance of ProductFootprint, or batch_size is not positive.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+        count = 0
+        iterator = iter(footprints)
+        while batch := list(itertools.islice(iterator, batch_size)):
+            if not all(isinstance(footprint, ProductFootprint) for footprint in batch):
+                raise ValueError("footprint must be an instance of ProductFootprint")
+            # Only the last footprint with an id is stored, so only its keys may be indexed.
+            batch = list({footprint.id: footprint for footprint in batch}.values())
+            rows = [_row(footprint) for footprint in batch]
+            ids = [(row[0],) for row in rows]
+            keys = {table: [] for table in SIDE_TABLES}
+            for row, footprint in zip(rows, batch):
+                for table in SIDE_TABLES:
+                    keys[table].extend((key, row[0]) for key in INDEXES[table](footprint))
+            with self._transaction():
+                self.connection.executemany(_UPSERT, rows)
+                for table in SIDE_TABLES:
+                    self.connection.executemany(f"DELETE FROM {table} WHERE id = ?", ids)
+                    self.connection.executemany(f"INSERT OR IGNORE INTO {table} (key, id) VALUES (?, ?)", keys[table])
+            count += len(batch)
+        return count
+
+    def remove(self, id: uuid.UUID | str) -> ProductFootprint:
+        """
+        Removes a footprint.
+
+        Args:
+            id (uuid.UUID | str): The footprint id.
+
+        Returns:
+            ProductFootprint: The removed footprint.
+
+        Raises:
+            KeyError: If no footprint has the id.
+        """
+        footprint = self[id]
+        with self._transaction():
+            for table in ("footprints", *SIDE_TABLES):
+                self.connection.execute(f"DELETE FROM {table} WHERE id = ?", (footprint.id.bytes,))
+        return footprint
+
+    def set_status(self, id: uuid.UUID | str, status: Status, comment: str | None = None) -> ProductFootprint:
+        """
+        Changes the status of a stored footprint.
+
+        Args:
+            id (uuid.UUID | str): The footprint id.
+            status (Status): The new status.
+            comment (str | None): The new status comment.
+
+        Returns:
+            ProductFootprint: The stored footprint with the new status.
+
+        Raises:
+            KeyError: If no footprint has the id.
+            ValueError: If status or comment is invalid.
+        """
+        updated = evolve(self[id], status=status, status_comment=comment)
+        self.add(updated)
+        return updated
+
+    def get(self, id: uuid.UUID | str, default=None) -> ProductFootprint | None:
+        """
+        Returns a footprint by id.
+
+        Args:
+            id (uuid.UUID | str): The footprint id.
+            default: The value to return if no footprint has the id.
+
+        Returns:
+            ProductFootprint | None: The lazy footprint, or default.
+        """
+        try:
+            key = footprint_key(id)
+        except ValueError:
+            return default
+        row = self.connection.execute("SELECT digest, document FROM footprints WHERE id = ?", (key.bytes,)).fetchone()
+        return _lazy(*row) if row is not None else default
+
+    def lookup(self, index: str, key: str) -> frozenset[uuid.UUID]:
+        """
+        Returns the ids of the footprints with a key in a secondary index.
+
+        Args:
+            index (str): The name of an index in INDEXES, for example "company_ids".
+            key (str): The key, for example a company id URN, a CPC code or a status value.
+
+        Returns:
+            frozenset[uuid.UUID]: The ids.
+
+        Raises:
+            KeyError: If index is not the name of an index.
+        """
+        if index in SIDE_TABLES:
+            query = f"SELECT id FROM {index} WHERE key = ?"
+        elif index in INDEXES:
+            query = f"SELECT id FROM footprints WHERE {index} = ?"
+        else:
+            raise KeyError(index)
+        return frozenset(uuid.UUID(bytes=id) for (id,) in self.connection.execute(query, (key,)))
+
+    def find(
+        self,
+        *,
+        company_id: str | None = None,
+        product_id: str | None = None,
+        product_category_cpc: str | None = None,
+        status: Status | None = None,
+        created_from: datetime | DateTime | None = None,
+        created_before: datetime | DateTime | None = None,
+        valid_at: datetime | DateTime | None = None,
+        limit: int | None = None,
+    ) -> list[ProductFootprint]:
+        """
+        Returns the footprints matching every given condition, in creation order.
+
+        Args:
+            company_id (str | None): A company id URN the footprint must list.
+            product_id (str | None): A product id URN the footprint must list.
+            product_category_cpc (str | None): The CPC code of the footprint.
+            status (Status | None): The status of the footprint.
+            created_from (datetime | DateTime | None): The earliest creation time included.
+            created_before (datetime | DateTime | None): The creation time after the range, which is
+                not included.
+            valid_at (datetime | DateTime | None): A time within the footprint's validity period.
+                Footprints without a validity period do not match.
+            limit (int | None): The largest number of footprints to return.
+
+        Returns:
+            list[ProductFootprint]: The lazy footprints, ordered by created time and then id.
+        """
+        joins, conditions, parameters = [], [], []
+        for table, key in (("company_ids", company_id), ("product_ids", product_id)):
+            if key is not None:
+                joins.append(f"JOIN {table} ON {table}.id = footprints.id AND {table}.key = ?")
+                parameters.append(str(key))
+        for condition, value in (
+            ("product_category_cpc = ?", product_category_cpc),
+            ("status = ?", status.value if status is not None else None),
+            ("created >= ?", _timestamp(created_from)),
+            ("created < ?", _timestamp(created_before)),
+        ):
+            if value is not None:
+                conditions.append(condition)
+                parameters.append(value)
+        if valid_at is not None:
+            conditions.append("validity_end >= ? AND validity_start <= ?")
+            parameters += [_timestamp(valid_at)] * 2
+        query = "SELECT footprints.digest, footprints.document FROM footprints " + " ".join(joins)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY footprints.created, footprints.id"
+        if limit is not None:
+            query += " LIMIT ?"
+            parameters.append(limit)
+        return [_lazy(*row) for row in self.connection.execute(query, parameters)]
+
+    def close(self) -> None:
+        """Closes the connection."""
+        self.connection.close()
+
+    def __enter__(self) -> "SqliteFootprintStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __getitem__(self, id: uuid.UUID | str) -> ProductFootprint:
+        """
+        Returns a footprint by id.
+
+        Raises:
+            KeyError: If no footprint has the id.
+        """
+        footprint = self.get(id)
+        if footprint is None:
+            raise KeyError(id)
+        return footprint
+
+    def __contains__(self, id) -> bool:
+        try:
+            key = footprint_key(id)
+        except ValueError:
+            return False
+        return self.connection.execute("SELECT 1 FROM footprints WHERE id = ?", (key.bytes,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT count(*) FROM footprints").fetchone()[0]
+
+    def __iter__(self) -> Iterator[ProductFootprint]:
+        """Iterates over the footprints in creation order, reading them from the database as needed."""
+        # A cursor of its own, so that the store can be used while iterating.
+        cursor = self.connection.execute("SELECT digest, document FROM footprints ORDER BY created, id")
+        while rows := cursor.fetchmany(DEFAULT_BATCH_SIZE):
+            for row in rows:
+                yield _lazy(*row)
+
+    def __repr__(self) -> str:
+        return f"SqliteFootprintStore(path={self.path!r})"
+
+    @contextlib.contextmanager
+    def _transaction(self) -> Iterator[None]:
+        """Runs a block in a write transaction, which is rolled back if the block raises."""
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self.connection.execute("ROLLBACK")
+            raise
+        self.connection.execute("COMMIT")
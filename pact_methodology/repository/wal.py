@@ -0,0 +1,477 @@
+"""
+A write-ahead log of footprint changes, for an in-memory repository that survives restarts.
+
+`FootprintLog` owns a FootprintRepository and records every change to it in an append-only log in a
+directory: inserts and updates with the whole footprint, status changes, and removals. `add`,
+`add_all`, `set_status` and `remove` return once their records are on disk, so a change that was
+accepted is not lost in a crash.
+
+Syncing the log after every record would limit writers to a few hundred changes a second, so
+records are committed in groups. A writer that finds no sync in progress writes and syncs every
+record appended so far, and writers appending meanwhile wait for that sync or lead the next one.
+Concurrent writers, and the records of one `add_all` call, therefore share syncs.
+
+Every `snapshot_interval` records, a snapshot of the repository is written in the background, and
+the log segments and snapshots it replaces are deleted. Opening a log loads the latest snapshot and
+replays the records after it. A record cut short by a crash at the end of the log is discarded,
+since its writer was never told it was stored. Damage to any other record raises LogCorruptedError.
+
+Records and snapshots hold footprints in the compact pickle form of the data model classes, so
+only open logs written by trusted processes.
+
+Examples:
+    >>> with FootprintLog("/var/lib/footprints") as log:
+    ...     log.add(footprint)
+    ...     log.repository.lookup("product_category_cpc", "0111")
+    frozenset({UUID('...')})
+"""
+
+import os
+import pickle
+import struct
+import threading
+import uuid
+import zlib
+from collections.abc import Iterable
+
+from pact_methodology._support import sync_directory
+from pact_methodology.exceptions import LogCorruptedError
+from pact_methodology.frozen import freeze
+from pact_methodology.product_footprint.product_footprint import ProductFootprint
+from pact_methodology.product_footprint.status import Status
+from pact_methodology.repository.repository import DEFAULT_HISTORY, FootprintRepository, footprint_key
+
+DEFAULT_SNAPSHOT_INTERVAL = 100_000
+"""The default number of records between snapshots."""
+
+_HEADER = struct.Struct(">QII")  # The sequence number, payload length and CRC-32 of a record.
+_INSERT, _UPDATE, _STATUS, _REMOVE = b"I", b"U", b"S", b"R"
+_SNAPSHOT_MAGIC = b"PACT-SNAPSHOT-1\n"
+_SNAPSHOT_BATCH = 1000
+_LOG, _SNAPSHOT = ".log", ".snapshot"
+
+
+def _checksum(sequence: int, payload: bytes) -> int:
+    return zlib.crc32(payload, zlib.crc32(_HEADER.pack(sequence, len(payload), 0)))
+
+
+def _has_record(data: bytes, start: int, sequence: int) -> bool:
+    """Returns whether an intact record with a sequence number is stored in data after start."""
+    marker = sequence.to_bytes(8, "big")
+    position = data.find(marker, start)
+    while position != -1:
+        end = position + _HEADER.size
+        if end <= len(data):
+            _, length, checksum = _HEADER.unpack_from(data, position)
+            payload = data[end : end + length]
+            if len(payload) == length and _checksum(sequence, payload) == checksum:
+                return True
+        position = data.find(marker, position + 1)
+    return False
+
+
+class FootprintLog:
+    """
+    A FootprintRepository whose changes are logged to disk before they are acknowledged.
+
+    Read from `repository`, and change it only through the methods of the log. Only one
+    FootprintLog, in one process, may use a directory at a time. The methods can be called from
+    several threads.
+
+    Attributes:
+        directory (str): The directory of the log segments and snapshots.
+        repository (FootprintRepository): The footprints, as of the last record.
+        snapshot_interval (int): The number of records between snapshots.
+        commit_delay (float): The number of seconds a writer waits for others to join its sync.
+        sequence (int): The sequence number of the last record.
+        synced (int): The sequence number of the last record on disk.
+        snapshot_sequence (int): The sequence number of the last record in the latest snapshot.
+        replayed (int): The number of records replayed when the log was opened.
+        syncs (int): The number of syncs of the log since it was opened.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike,
+        *,
+        snapshot_interval: int = DEFAULT_SNAPSHOT_INTERVAL,
+        commit_delay: float = 0.0,
+        history: int = DEFAULT_HISTORY,
+    ):
+        """
+        Opens a log, creating its directory if needed, and rebuilds the repository from it.
+
+        Args:
+            directory (str | os.PathLike): The directory of the log.
+            snapshot_interval (int): The number of records between snapshots.
+            commit_delay (float): The number of seconds a writer waits for others to join its sync.
+                A small delay, such as 0.002, makes groups larger under concurrent writes at the cost
+                of latency.
+            history (int): The history of the repository, see FootprintRepository.
+
+        Raises:
+            ValueError: If snapshot_interval is not positive or commit_delay is negative.
+            LogCorruptedError: If a snapshot, or a record before the end of the log, is damaged.
+            OSError: If the directory cannot be read or written.
+        """
+        if snapshot_interval < 1:
+            raise ValueError("snapshot_interval must be positive")
+        if commit_delay < 0:
+            raise ValueError("commit_delay must not be negative")
+        self.directory = os.fspath(directory)
+        self.snapshot_interval = snapshot_interval
+        self.commit_delay = commit_delay
+        self.repository = FootprintRepository(history=history)
+        self.sequence = 0
+        self.synced = 0
+        self.snapshot_sequence = 0
+        self.replayed = 0
+        self.syncs = 0
+        self._lock = threading.Lock()
+        self._written = threading.Condition(self._lock)
+        self._pending: list[bytes] = []
+        self._writing = False
+        self._error: BaseException | None = None
+        self._snapshotting = threading.Lock()
+        self._snapshot_thread: threading.Thread | None = None
+        self._snapshot_error: BaseException | None = None
+        os.makedirs(self.directory, exist_ok=True)
+        self._file = self._recover()
+
+    def add(self, footprint: ProductFootprint) -> ProductFootprint | None:
+        """
+        Stores a footprint, replacing any stored footprint with the same id, and logs it.
+
+        Args:
+            footprint (ProductFootprint): The footprint.
+
+        Returns:
+            ProductFootprint | None: The replaced footprint, or None if the id was new.
+
+        Raises:
+            ValueError: If footprint is not an instance of ProductFootprint.
+            OSError: If the log cannot be written. The log must then be closed and opened again.
+        """
+        [replaced] = self._add((footprint,))
+        return replaced
+
+    def add_all(self, footprints: Iterable[ProductFootprint]) -> int:
+        """
+        Stores footprints and logs them with a single sync.
+
+        Args:
+            footprints (Iterable[ProductFootprint]): The footprints.
+
+        Returns:
+            int: The number of footprints stored.
+
+        Raises:
+            ValueError: If a footprint is not an instance of ProductFootprint. No footprint is stored then.
+            OSError: If the log cannot be written. The log must then be closed and opened again.
+        """
+        return len(self._add(footprints))
+
+    def set_status(self, id: uuid.UUID | str, status: Status, comment: str | None = None) -> ProductFootprint:
+        """
+        Changes the status of a stored footprint, and logs the change.
+
+        Args:
+            id (uuid.UUID | str): The footprint id.
+            status (Status): The new status.
+            comment (str | None): The new status comment.
+
+        Returns:
+            ProductFootprint: The stored footprint with the new status.
+
+        Raises:
+            KeyError: If no footprint has the id.
+            ValueError: If status or comment is invalid.
+            OSError: If the log cannot be written. The log must then be closed and opened again.
+        """
+        with self._lock:
+            self._check()
+            updated = self.repository.set_status(id, status, comment)
+            sequence = self._append(_STATUS + pickle.dumps((updated.id.bytes, status.value, comment)))
+        self._commit(sequence)
+        return updated
+
+    def remove(self, id: uuid.UUID | str) -> ProductFootprint:
+        """
+        Removes a footprint, and logs the removal.
+
+        Args:
+            id (uuid.UUID | str): The footprint id.
+
+        Returns:
+            ProductFootprint: The removed footprint.
+
+        Raises:
+            KeyError: If no footprint has the id.
+            OSError: If the log cannot be written. The log must then be closed and opened again.
+        """
+        with self._lock:
+            self._check()
+            removed = self.repository.remove(id)
+            sequence = self._append(_REMOVE + removed.id.bytes)
+        self._commit(sequence)
+        return removed
+
+    def snapshot(self) -> int:
+        """
+        Writes a snapshot of the repository, and deletes the log segments and snapshots it replaces.
+
+        Returns:
+            int: The sequence number of the last record in the snapshot.
+
+        Raises:
+            OSError: If the snapshot or the log cannot be written.
+        """
+        with self._snapshotting:
+            sequence, footprints = self._rotate()
+            if sequence > self.snapshot_sequence:
+                self._write_snapshot(sequence, footprints)
+        return sequence
+
+    def close(self) -> None:
+        """
+        Waits for a snapshot being written in the background, and closes the log.
+
+        Raises:
+            OSError: If the background snapshot failed.
+        """
+        if self._snapshot_thread is not None:
+            self._snapshot_thread.join()
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+        if self._snapshot_error is not None:
+            error, self._snapshot_error = self._snapshot_error, None
+            raise error
+
+    def __enter__(self) -> "FootprintLog":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"FootprintLog(directory={self.directory!r}, sequence={self.sequence})"
+
+    def _add(self, footprints: Iterable[ProductFootprint]) -> list[ProductFootprint | None]:
+        """Stores and logs footprints, pickling them before taking the lock."""
+        footprints = list(footprints)
+        if not all(isinstance(footprint, ProductFootprint) for footprint in footprints):
+            raise ValueError("footprint must be an instance of ProductFootprint")
+        footprints = [freeze(footprint) for footprint in footprints]
+        bodies = [pickle.dumps(footprint, protocol=pickle.HIGHEST_PROTOCOL) for footprint in footprints]
+        replaced = []
+        with self._lock:
+            self._check()
+            for footprint, body in zip(footprints, bodies):
+                replaced.append(self.repository.add(footprint))
+                sequence = self._append((_INSERT if replaced[-1] is None else _UPDATE) + body)
+        if footprints:
+            self._commit(sequence)
+        return replaced
+
+    def _append(self, payload: bytes) -> int:
+        """Appends a record to the group of the next sync. The lock must be held."""
+        self.sequence += 1
+        self._pending.append(_HEADER.pack(self.sequence, len(payload), _checksum(self.sequence, payload)) + payload)
+        return self.sequence
+
+    def _commit(self, sequence: int) -> None:
+        """Returns once the records up to sequence are on disk, syncing them unless another thread is."""
+        with self._lock:
+            while self.synced < sequence:
+                self._check()
+                if self._writing:
+                    self._written.wait()
+                    continue
+                self._writing = True
+                try:
+                    if self.commit_delay:
+                        # Let other writers append records to this group.
+                        self._written.wait(self.commit_delay)
+                    records, self._pending, target = self._pending, [], self.sequence
+                    self._lock.release()
+                    try:
+                        self._write(records)
+                    finally:
+                        self._lock.acquire()
+                    self.synced = target
+                except BaseException as error:
+                    self._error = error
+                    raise
+                finally:
+                    self._writing = False
+                    self._written.notify_all()
+        if self.sequence - self.snapshot_sequence >= self.snapshot_interval:
+            self._snapshot_in_background()
+
+    def _write(self, records: list[bytes]) -> None:
+        self._file.write(b"".join(records))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.syncs += 1
+
+    def _check(self) -> None:
+        """Raises if an earlier write failed, since the repository is then ahead of the log."""
+        if self._error is not None:
+            raise OSError(f"The log could not be written and must be opened again: {self._error}")
+        if self._file.closed:
+            raise ValueError("The log is closed")
+
+    def _snapshot_in_background(self) -> None:
+        if not self._snapshotting.acquire(blocking=False):
+            return
+
+        def run() -> None:
+            try:
+                sequence, footprints = self._rotate()
+                self._write_snapshot(sequence, footprints)
+            except BaseException as error:
+                self._snapshot_error = error
+            finally:
+                self._snapshotting.release()
+
+        if self._snapshot_thread is not None:
+            self._snapshot_thread.join()
+        self._snapshot_thread = threading.Thread(target=run, name="FootprintLog snapshot")
+        self._snapshot_thread.start()
+
+    def _rotate(self) -> tuple[int, list[ProductFootprint]]:
+        """Syncs the pending records and starts a new segment. Returns the sequence and footprints to snapshot."""
+        with self._lock:
+            self._check()
+            while self._writing:
+                self._written.wait()
+            if self._pending:
+                records, self._pending = self._pending, []
+                self._write(records)
+                self.synced = self.sequence
+                self._written.notify_all()
+            sequence, footprints = self.sequence, self.repository.ordered()
+            path = self._path(sequence + 1, _LOG)
+            if path != self._file.name:
+                self._file.close()
+                self._file = open(path, "ab")
+                sync_directory(self.directory)
+        return sequence, footprints
+
+    def _write_snapshot(self, sequence: int, footprints: list[ProductFootprint]) -> None:
+        """Writes a snapshot file atomically, then deletes the files it replaces."""
+        path = self._path(sequence, _SNAPSHOT)
+        with open(f"{path}.tmp", "wb") as file:
+            file.write(_SNAPSHOT_MAGIC)
+            pickle.dump((sequence, len(footprints)), file)
+            for start in range(0, len(footprints), _SNAPSHOT_BATCH):
+                # Batches share the class references of their objects, without keeping a pickle memo
+                # of the whole repository.
+                pickle.dump(footprints[start : start + _SNAPSHOT_BATCH], file, protocol=pickle.HIGHEST_PROTOCOL)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(f"{path}.tmp", path)
+        sync_directory(self.directory)
+        self.snapshot_sequence = sequence
+        for number in self._numbers(_SNAPSHOT):
+            if number < sequence:
+                os.remove(self._path(number, _SNAPSHOT))
+        # Later segments start after the snapshot, so these hold only records in it.
+        for start in self._numbers(_LOG):
+            if start <= sequence:
+                os.remove(self._path(start, _LOG))
+
+    def _recover(self):
+        """Loads the latest snapshot, replays the records after it, and opens the last segment."""
+        for name in os.listdir(self.directory):
+            if name.endswith(".tmp"):
+                os.remove(os.path.join(self.directory, name))
+        snapshots = self._numbers(_SNAPSHOT)
+        if snapshots:
+            self._read_snapshot(snapshots[-1])
+        self.sequence = self.snapshot_sequence
+        segments = self._numbers(_LOG)
+        for index, start in enumerate(segments):
+            self._replay(self._path(start, _LOG), start, last=index == len(segments) - 1)
+        self.synced = self.sequence
+        path = self._path(segments[-1], _LOG) if segments else self._path(self.sequence + 1, _LOG)
+        file = open(path, "ab")
+        sync_directory(self.directory)
+        return file
+
+    def _read_snapshot(self, sequence: int) -> None:
+        path = self._path(sequence, _SNAPSHOT)
+        with open(path, "rb") as file:
+            if file.read(len(_SNAPSHOT_MAGIC)) != _SNAPSHOT_MAGIC:
+                raise LogCorruptedError(f"{path} is not a footprint snapshot")
+            try:
+                stored, count = pickle.load(file)
+                while count > 0:
+                    batch = pickle.load(file)
+                    self.repository.add_all(batch)
+                    count -= len(batch)
+            except (pickle.UnpicklingError, EOFError, ValueError, TypeError) as error:
+                raise LogCorruptedError(f"{path} is damaged: {error}") from error
+        if stored != sequence or count != 0:
+            raise LogCorruptedError(f"{path} is damaged")
+        self.snapshot_sequence = sequence
+
+    def _replay(self, path: str, start: int, last: bool) -> None:
+        """
+        Applies the records of a segment after the current sequence.
+
+        A damaged record is discarded, and the segment truncated before it, only if it is the last
+        record of the last segment: a record cut short by a crash. A damaged record followed by an
+        intact one means the log was damaged after it was written.
+        """
+        with open(path, "rb") as file:
+            data = file.read()
+        offset = 0
+        expected = start
+        while offset < len(data):
+            end = offset + _HEADER.size
+            if end <= len(data):
+                sequence, length, checksum = _HEADER.unpack_from(data, offset)
+                payload = data[end : end + length]
+            if end > len(data) or len(payload) < length or _checksum(sequence, payload) != checksum:
+                if not last or _has_record(data, offset + 1, expected + 1):
+                    raise LogCorruptedError(f"Damaged record at byte {offset} of {path}")
+                # Cut short by a crash while its group was written, so its writer was never told
+                # it was stored.
+                with open(path, "r+b") as file:
+                    file.truncate(offset)
+                    os.fsync(file.fileno())
+                return
+            offset = end + length
+            expected = sequence + 1
+            if sequence <= self.sequence:
+                continue
+            if sequence != self.sequence + 1:
+                raise LogCorruptedError(f"Record {sequence} in {path} follows record {self.sequence}")
+            self._apply(payload)
+            self.sequence = sequence
+            self.replayed += 1
+
+    def _apply(self, payload: bytes) -> None:
+        kind, body = payload[:1], payload[1:]
+        if kind in (_INSERT, _UPDATE):
+            self.repository.add(pickle.loads(body))
+        elif kind == _STATUS:
+            id, status, comment = pickle.loads(body)
+            self.repository.set_status(uuid.UUID(bytes=id), Status(status), comment)
+        elif kind == _REMOVE:
+            self.repository.remove(footprint_key(uuid.UUID(bytes=body)))
+        else:
+            raise LogCorruptedError(f"Unknown record type {kind!r}")
+
+    def _numbers(self, suffix: str) -> list[int]:
+        """Returns the numbers of the files with a suffix, in ascending order."""
+        return sorted(
+            int(name.removesuffix(suffix))
+            for name in os.listdir(self.directory)
+            if name.endswith(suffix) and name.removesuffix(suffix).isdigit()
+        )
+
+    def _path(self, number: int, suffix: str) -> str:
+        return os.path.join(self.directory, f"{number:020d}{suffix}")
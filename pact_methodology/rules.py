@@ -0,0 +1,250 @@
+"""
+Registry of the attribute requirements that depend on the spec version and reference period.
+
+Which attributes of a CarbonFootprint or DataQualityIndicators must be defined depends on the
+version of the PACT specification and on whether the reference period includes 2025 or later.
+These requirements are registered as `RequiredAttributes` rules, keyed by model name, spec version
+and `Regime`, and compiled once per key into a single check function. Models look up their compiled
+check on every validation, and batch validators can hold on to it and call it for many objects.
+
+Examples:
+    Checking many carbon footprints with the same compiled check:
+
+    >>> check = REGISTRY.compiled("CarbonFootprint", DEFAULT_SPEC_VERSION, Regime.FROM_2025)
+    >>> for pcf in footprints:
+    ...     check(pcf)
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from enum import Enum
+from operator import attrgetter
+
+DEFAULT_SPEC_VERSION = "2.2.0"
+"""The spec version used when a model does not state one."""
+
+
+class Regime(str, Enum):
+    """
+    The reference period regime a set of requirements applies to.
+
+    Attributes:
+        BEFORE_2025 (str): The reference period ends before 2025.
+        FROM_2025 (str): The reference period includes 2025 or later.
+    """
+
+    BEFORE_2025 = "before 2025"
+    FROM_2025 = "2025 or later"
+
+    @classmethod
+    def of(cls, reference_period) -> "Regime":
+        """
+        Returns the regime of a reference period.
+
+        Args:
+            reference_period (ReferencePeriod): The reference period.
+
+        Returns:
+            Regime: FROM_2025 if the reference period includes 2025 or later, otherwise BEFORE_2025.
+        """
+        return cls.FROM_2025 if reference_period.includes_2025_or_later() else cls.BEFORE_2025
+
+
+@dataclass(frozen=True)
+class RequiredAttributes:
+    """
+    A rule requiring attributes of a model object to be defined.
+
+    Attributes:
+        attributes (tuple[str, ...]): The attribute names.
+        any_of (bool): If True, at least one of the attributes must be defined, otherwise all of them.
+        message (str): The error message. For rules requiring all attributes, "{attribute}" is
+            replaced by the name of the first undefined attribute.
+    """
+
+    attributes: tuple[str, ...]
+    any_of: bool = False
+    message: str = "Attribute '{attribute}' must be defined and not None"
+
+    def __post_init__(self):
+        if not self.attributes or not all(isinstance(name, str) for name in self.attributes):
+            raise ValueError("attributes must be a non-empty tuple of attribute names")
+
+    def compile(self) -> Callable[[object], None]:
+        """
+        Returns a function that checks this rule for an object.
+
+        Returns:
+            Callable[[object], None]: A function raising ValueError if the rule fails.
+        """
+        attributes, message = self.attributes, self.message
+        getter = attrgetter(*attributes)
+        if len(attributes) == 1:
+            single = getter
+            getter = lambda obj: (single(obj),)  # noqa: E731
+
+        if self.any_of:
+
+            def check(obj) -> None:
+                if all(value is None for value in getter(obj)):
+                    raise ValueError(message)
+
+        else:
+
+            def check(obj) -> None:
+                for name, value in zip(attributes, getter(obj)):
+                    if value is None:
+                        raise ValueError(message.format(attribute=name))
+
+        return check
+
+
+class RuleRegistry:
+    """
+    Rules keyed by model name, spec version and regime, with a compiled check for each key.
+
+    A key without rules compiles to a check that always passes, as long as rules are registered for
+    its model and spec version under another regime. Spec versions without any rules for a model are
+    rejected, so that a mistyped or unsupported version does not skip every check.
+    """
+
+    def __init__(self):
+        self._rules: dict[tuple[str, str, Regime], tuple[RequiredAttributes, ...]] = {}
+        self._compiled: dict[tuple[str, str, Regime], Callable[[object], None]] = {}
+        self._dependencies: dict[str, frozenset[str]] = {}
+
+    def register(self, model: str, spec_version: str, regime: Regime, rule: RequiredAttributes) -> None:
+        """
+        Adds a rule.
+
+        Args:
+            model (str): The name of the model class, for example "CarbonFootprint".
+            spec_version (str): The spec version the rule applies to, for example "2.2.0".
+            regime (Regime): The reference period regime the rule applies to.
+            rule (RequiredAttributes): The rule.
+
+        Raises:
+            ValueError: If regime is not a Regime or rule is not a RequiredAttributes.
+        """
+        if not isinstance(regime, Regime):
+            raise ValueError("regime must be an instance of Regime")
+        if not isinstance(rule, RequiredAttributes):
+            raise ValueError("rule must be an instance of RequiredAttributes")
+        key = (model, spec_version, regime)
+        self._rules[key] = self._rules.get(key, ()) + (rule,)
+        self._compiled.pop(key, None)
+        self._dependencies.pop(model, None)
+
+    def rules(self, model: str, spec_version: str, regime: Regime) -> tuple[RequiredAttributes, ...]:
+        """Returns the rules registered for a key, in registration order."""
+        return self._rules.get((model, spec_version, regime), ())
+
+    def compiled(self, model: str, spec_version: str, regime: Regime) -> Callable[[object], None]:
+        """
+        Returns the check of all rules registered for a key, compiling it on first use.
+
+        Args:
+            model (str): The name of the model class.
+            spec_version (str): The spec version.
+            regime (Regime): The reference period regime.
+
+        Returns:
+            Callable[[object], None]: A function raising ValueError for the first rule an object fails.
+
+        Raises:
+            ValueError: If no rules are registered for the model and spec version in any regime.
+        """
+        key = (model, spec_version, regime)
+        check = self._compiled.get(key)
+        if check is None:
+            if not any(rule_key[:2] == (model, spec_version) for rule_key in self._rules):
+                raise ValueError(f"No rules are registered for {model} in spec version {spec_version!r}")
+            check = _combine([rule.compile() for rule in self.rules(*key)])
+            self._compiled[key] = check
+        return check
+
+    def dependencies(self, model: str) -> frozenset[str]:
+        """
+        Returns the attributes the rules of a model depend on, across all spec versions and regimes.
+
+        Args:
+            model (str): The name of the model class.
+
+        Returns:
+            frozenset[str]: The attribute names, including "reference_period", which selects the regime.
+        """
+        dependencies = self._dependencies.get(model)
+        if dependencies is None:
+            dependencies = frozenset(
+                name
+                for (rule_model, _, _), rules in self._rules.items()
+                if rule_model == model
+                for rule in rules
+                for name in rule.attributes
+            ) | {"reference_period"}
+            self._dependencies[model] = dependencies
+        return dependencies
+
+
+def _combine(checks: list[Callable[[object], None]]) -> Callable[[object], None]:
+    """Returns a function running checks in order."""
+    if not checks:
+        return lambda obj: None
+    if len(checks) == 1:
+        return checks[0]
+    checks = tuple(checks)
+
+    def check_all(obj) -> None:
+        for check in checks:
+            check(obj)
+
+    return check_all
+
+
+REGISTRY = RuleRegistry()
+"""The rules checked by the data model classes."""
+
+REGISTRY.register(
+    "CarbonFootprint",
+    "2.2.0",
+    Regime.BEFORE_2025,
+    RequiredAttributes(
+        ("primary_data_share", "dqi"),
+        any_of=True,
+        message="At least one of 'primary_data_share' or 'dqi' must be defined for reference periods before 2025",
+    ),
+)
+REGISTRY.register(
+    "CarbonFootprint",
+    "2.2.0",
+    Regime.FROM_2025,
+    RequiredAttributes(
+        (
+            "primary_data_share",
+            "dqi",
+            "p_cf_including_biogenic",
+            "d_luc_ghg_emissions",
+            "land_management_ghg_emissions",
+            "other_biogenic_ghg_emissions",
+            "biogenic_carbon_withdrawal",
+            "biogenic_accounting_methodology",
+        ),
+        message="Attribute '{attribute}' must be defined and not None for reference periods including 2025 or later",
+    ),
+)
+REGISTRY.register(
+    "DataQualityIndicators",
+    "2.2.0",
+    Regime.FROM_2025,
+    RequiredAttributes(
+        (
+            "coverage_percent",
+            "technological_dqr",
+            "temporal_dqr",
+            "geographical_dqr",
+            "completeness_dqr",
+            "reliability_dqr",
+        ),
+        message="Attribute '{attribute}' must be defined and not None for reference periods including 2025 or later",
+    ),
+)
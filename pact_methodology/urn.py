@@ -50,6 +50,14 @@ class URN:
             raise ValueError("Value must be a valid URN")
         self.value = value
 
+    def __reduce__(self):
+        """
+        Pickles the URN as its class and value.
+
+        The value was validated when the URN was created, so unpickling does not parse it again.
+        """
+        return _unpickle_urn, (type(self), self.value)
+
     def __str__(self) -> str:
         """
         Return the string representation of the URN.
@@ -400,3 +408,10 @@ class ProductId(URN):
         if not isinstance(other, ProductId):
             return False
         return self.value == other.value
+
+
+def _unpickle_urn(cls: type, value: str) -> URN:
+    """Rebuilds a URN pickled by URN.__reduce__."""
+    urn = object.__new__(cls)
+    urn.value = value
+    return urn
@@ -0,0 +1,151 @@
+import pytest
+
+from pact_methodology.aggregation.bom import ROLLUP_COLUMNS, BomEngine
+from pact_methodology.carbon_footprint.declared_unit import DeclaredUnit
+from pact_methodology.exceptions import BomCycleError
+from pact_methodology.product_footprint.product_id_list import ProductIdList
+from pact_methodology.urn import ProductId
+
+
+def product_id(code):
+    return ProductId(f"urn:pathfinder:product:customcode:buyer-assigned:{code}")
+
+
+@pytest.fixture
+def make_component(make_product_footprint, make_carbon_footprint):
+    def _make(code, **pcf):
+        return make_product_footprint(
+            product_ids=ProductIdList([product_id(code)]), pcf=make_carbon_footprint(**pcf)
+        )
+
+    return _make
+
+
+@pytest.fixture
+def engine(make_component):
+    engine = BomEngine()
+    engine.set_footprint(make_component("steel", p_cf_excluding_biogenic=2.0, primary_data_share=50.0))
+    engine.set_footprint(make_component("paint", p_cf_excluding_biogenic=10.0, primary_data_share=None))
+    engine.set_components(product_id("frame"), [(product_id("steel"), 2.5), (product_id("paint"), 0.1)])
+    engine.set_components(product_id("bike"), [(product_id("frame"), 1.0), (product_id("steel"), 0.5)])
+    return engine
+
+
+def test_rollup(engine):
+    values = engine.rollup(product_id("frame"))
+
+    assert set(values) == {*ROLLUP_COLUMNS, "primary_data_share"}
+    assert values["p_cf_excluding_biogenic"] == pytest.approx(6.0)
+    assert values["fossil_ghg_emissions"] == pytest.approx(0.78)
+    assert values["biogenic_carbon_withdrawal"] == pytest.approx(-2.6)
+    assert values["primary_data_share"] == pytest.approx(2.5 / 6.0 * 100)
+
+
+def test_nested_assembly(engine):
+    values = engine.rollup(product_id("bike"))
+
+    assert values["p_cf_excluding_biogenic"] == pytest.approx(7.0)
+    assert values["primary_data_share"] == pytest.approx(3.0 / 7.0 * 100)
+
+
+def test_undefined_component_values_stay_undefined(engine, make_component):
+    engine.set_footprint(make_component("paint", p_cf_excluding_biogenic=10.0, aircraft_ghg_emissions=None))
+    assert engine.rollup(product_id("frame"))["aircraft_ghg_emissions"] is None
+    assert engine.rollup(product_id("steel"))["aircraft_ghg_emissions"] == 0.01
+
+
+def test_new_footprint_version_updates_assemblies(engine, make_component):
+    assert engine.rollup(product_id("bike"))["p_cf_excluding_biogenic"] == pytest.approx(7.0)
+
+    engine.set_footprint(make_component("paint", p_cf_excluding_biogenic=20.0, primary_data_share=None))
+
+    assert engine.rollup(product_id("frame"))["p_cf_excluding_biogenic"] == pytest.approx(7.0)
+    assert engine.rollup(product_id("bike"))["p_cf_excluding_biogenic"] == pytest.approx(8.0)
+
+
+def test_replacing_components_updates_assemblies(engine):
+    engine.rollup(product_id("bike"))
+    engine.set_components(product_id("frame"), [(product_id("steel"), 1.0)])
+
+    assert engine.components(product_id("frame")) == [(product_id("steel"), 1.0)]
+    assert engine.rollup(product_id("bike"))["p_cf_excluding_biogenic"] == pytest.approx(3.0)
+
+
+def test_footprint_takes_precedence_over_components(engine, make_component):
+    engine.set_footprint(make_component("frame", p_cf_excluding_biogenic=4.0))
+    assert engine.rollup(product_id("bike"))["p_cf_excluding_biogenic"] == pytest.approx(5.0)
+
+    engine.remove_footprint(product_id("frame"))
+    assert engine.rollup(product_id("bike"))["p_cf_excluding_biogenic"] == pytest.approx(7.0)
+
+
+def test_repeated_components_are_added_up(engine):
+    engine.set_components(product_id("kit"), [(product_id("steel"), 1.0), (product_id("steel"), 2.0)])
+    assert engine.components(product_id("kit")) == [(product_id("steel"), 3.0)]
+    assert engine.rollup(product_id("kit"))["p_cf_excluding_biogenic"] == pytest.approx(6.0)
+
+
+def test_carbon_footprint(engine, make_carbon_footprint):
+    template = make_carbon_footprint()
+    pcf = engine.carbon_footprint(
+        product_id("frame"),
+        declared_unit=DeclaredUnit.KILOGRAM,
+        characterization_factors=template.characterization_factors,
+        ipcc_characterization_factors_sources=template.ipcc_characterization_factors_sources,
+        cross_sectoral_standards_used=template.cross_sectoral_standards_used,
+        boundary_processes_description="Cradle-to-gate roll-up",
+        exempted_emissions_percent=0.0,
+        exempted_emissions_description="",
+        reference_period=template.reference_period,
+        packaging_emissions_included=False,
+        geographical_scope=template.geographical_scope,
+    )
+
+    assert pcf.unitary_product_amount == 1.0
+    assert pcf.p_cf_excluding_biogenic == pytest.approx(6.0)
+    assert pcf.primary_data_share == pytest.approx(2.5 / 6.0 * 100)
+    assert pcf.packaging_ghg_emissions is None
+
+
+def test_carbon_footprint_rejects_computed_attributes(engine):
+    with pytest.raises(ValueError, match="Computed attributes cannot be given: p_cf_excluding_biogenic"):
+        engine.carbon_footprint(product_id("frame"), p_cf_excluding_biogenic=1.0)
+
+
+def test_cycle_is_detected(engine):
+    engine.set_components(product_id("steel-part"), [(product_id("bike"), 1.0)])
+    engine.set_components(product_id("frame"), [(product_id("steel-part"), 1.0)])
+    with pytest.raises(BomCycleError):
+        engine.rollup(product_id("bike"))
+    with pytest.raises(BomCycleError):
+        engine.set_components(product_id("bike"), [(product_id("bike"), 1.0)])
+
+
+def test_missing_component(engine):
+    engine.set_components(product_id("frame"), [(product_id("unknown"), 1.0)])
+    with pytest.raises(ValueError, match="has neither a footprint nor components"):
+        engine.rollup(product_id("bike"))
+
+
+@pytest.mark.parametrize(
+    "components",
+    [
+        [("urn:pathfinder:product:customcode:buyer-assigned:steel", 1.0)],
+        [(product_id("steel"), -1.0)],
+        [(product_id("steel"), "1")],
+    ],
+)
+def test_invalid_components(engine, components):
+    with pytest.raises(ValueError):
+        engine.set_components(product_id("frame"), components)
+
+
+def test_deep_bom(engine):
+    previous = product_id("steel")
+    for level in range(5000):
+        current = product_id(f"level-{level}")
+        engine.set_components(current, [(previous, 1.0)])
+        previous = current
+
+    assert engine.rollup(previous)["p_cf_excluding_biogenic"] == pytest.approx(2.0)
+    assert product_id("level-0") in engine
@@ -0,0 +1,101 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from pact_methodology.aggregation.bulk import SharedFootprintTable, build_table
+from pact_methodology.aggregation.footprint_table import FootprintTable
+from pact_methodology.carbon_footprint.declared_unit import DeclaredUnit
+from pact_methodology.exceptions import BulkBuildError
+from pact_methodology.exchange.json_codec import encode
+
+
+@pytest.fixture(scope="module")
+def executor():
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        yield executor
+
+
+@pytest.fixture
+def footprints(make_product_footprint, make_carbon_footprint, cpc_code_lookup):
+    return [
+        make_product_footprint(
+            product_category_cpc=cpc_code_lookup.lookup("2311" if index % 3 else "0111"),
+            pcf=make_carbon_footprint(
+                p_cf_excluding_biogenic=float(index),
+                declared_unit=DeclaredUnit.LITER if index >= 5 else DeclaredUnit.KILOGRAM,
+            ),
+        )
+        for index in range(8)
+    ]
+
+
+def assert_same_rows(table, expected):
+    assert len(table) == len(expected)
+    assert table.ids.tolist() == expected.ids.tolist()
+    assert table.created.tolist() == expected.created.tolist()
+    assert table.version.tolist() == expected.version.tolist()
+    assert np.array_equal(table.dqr, expected.dqr)
+    for name, values in expected.numeric.items():
+        assert np.array_equal(table.column(name), values, equal_nan=True)
+    for name in expected.codes:
+        assert table.labels(name).tolist() == expected.labels(name).tolist()
+
+
+def test_build_table(executor, footprints):
+    records = [encode(footprint) for footprint in footprints]
+
+    with build_table(records, executor=executor, chunk_size=3) as table:
+        assert isinstance(table, SharedFootprintTable)
+        assert_same_rows(table, FootprintTable.from_footprints(footprints))
+        assert table.categories["declared_unit"] == ["kilogram", "liter"]
+
+
+def test_build_table_raises_for_invalid_record(executor, footprints):
+    records = [encode(footprint) for footprint in footprints]
+    del records[4]["companyName"]
+
+    with pytest.raises(BulkBuildError, match="Record 4 is invalid: Missing required member: companyName"):
+        build_table(records, executor=executor, chunk_size=3)
+
+
+def test_build_table_skips_invalid_records(executor, footprints):
+    records = [encode(footprint) for footprint in footprints]
+    del records[1]["companyName"]
+    records[6]["pcf"]["pCfExcludingBiogenic"] = "-1"
+    errors = []
+
+    table = build_table(records, executor=executor, chunk_size=3, on_error=lambda *error: errors.append(error))
+
+    assert [index for index, _ in errors] == [1, 6]
+    valid = [footprint for index, footprint in enumerate(footprints) if index not in (1, 6)]
+    assert_same_rows(table, FootprintTable.from_footprints(valid))
+    table.close()
+
+
+def test_build_table_with_default_pool(footprints):
+    records = [encode(footprint) for footprint in footprints[:2]]
+    with build_table(records, max_workers=1) as table:
+        assert table.ids.tolist() == [footprint.id.bytes for footprint in footprints[:2]]
+
+
+def test_build_table_without_records():
+    table = build_table([])
+    assert len(table) == 0
+
+
+def test_closed_table_releases_columns(executor, footprints):
+    table = build_table([encode(footprints[0])], executor=executor)
+    column = table.column("p_cf_excluding_biogenic")
+    with pytest.raises(BufferError):
+        table.close()
+    del column
+    table.close()
+    assert table.ids is None
+
+
+def test_build_table_validates_arguments():
+    with pytest.raises(ValueError, match="chunk_size must be positive"):
+        build_table([{}], chunk_size=0)
+    with pytest.raises(ValueError, match="max_workers must be positive"):
+        build_table([{}], max_workers=0)
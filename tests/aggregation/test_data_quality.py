@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from pact_methodology.aggregation.data_quality import (
+    dqr_matrix,
+    summarize_data_quality,
+    summarize_table,
+)
+from pact_methodology.aggregation.footprint_table import FootprintTable
+from pact_methodology.data_quality_indicators.data_quality_indicators import DataQualityIndicators
+from pact_methodology.data_quality_indicators.data_quality_rating import DataQualityRating
+
+
+def test_dqr_matrix(make_carbon_footprint):
+    dqi = make_carbon_footprint().dqi
+    sparse = DataQualityIndicators(
+        reference_period=dqi.reference_period,
+        technological_dqr=DataQualityRating(3),
+    )
+    matrix = dqr_matrix([dqi, sparse, None])
+
+    assert matrix.dtype == np.int8
+    assert matrix.tolist() == [[2, 2, 1, 3, 2], [3, 0, 0, 0, 0], [0, 0, 0, 0, 0]]
+    assert dqr_matrix([]).shape == (0, 5)
+    with pytest.raises(ValueError):
+        dqr_matrix(["not a dqi"])
+
+
+def test_weighted_dqr_ignores_undefined_ratings():
+    dqr = np.array([[1, 2, 3, 2, 1], [3, 3, 3, 0, 3]], dtype=np.int8)
+    summary = summarize_data_quality(dqr, np.array([3.0, 1.0]))
+
+    assert summary.weighted_dqr["technological_dqr"] == 1.5
+    assert summary.weighted_dqr["geographical_dqr"] == 3.0
+    assert summary.weighted_dqr["completeness_dqr"] == 2.0
+    assert summary.total_weight == 4.0
+    assert np.isnan(summary.primary_data_share)
+
+
+def test_histograms():
+    dqr = np.array([[1, 2, 3, 2, 1], [3, 3, 3, 0, 3], [1, 1, 1, 1, 1]], dtype=np.int8)
+    summary = summarize_data_quality(dqr, np.array([3.0, 1.0, 0.5]))
+
+    assert summary.histograms["technological_dqr"].tolist() == [0, 2, 0, 1]
+    assert summary.histograms["completeness_dqr"].tolist() == [1, 1, 1, 0]
+    assert summary.weighted_histograms["technological_dqr"].tolist() == [0.0, 3.5, 0.0, 1.0]
+    assert summary.weighted_histograms["completeness_dqr"].tolist() == [1.0, 0.5, 3.0, 0.0]
+
+
+def test_weighted_shares_skip_undefined_values():
+    dqr = np.zeros((3, 5), dtype=np.int8)
+    summary = summarize_data_quality(
+        dqr,
+        np.array([1.0, 3.0, 6.0]),
+        primary_data_share=np.array([100.0, 20.0, np.nan]),
+        coverage_percent=np.array([90.0, 70.0, 80.0]),
+    )
+
+    assert summary.primary_data_share == 40.0
+    assert summary.coverage_percent == pytest.approx(78.0)
+    assert np.isnan(summary.weighted_dqr["temporal_dqr"])
+
+
+def test_summarize_table(make_product_footprint, make_carbon_footprint):
+    table = FootprintTable.from_footprints(
+        [
+            make_product_footprint(pcf=make_carbon_footprint(p_cf_excluding_biogenic=1.0, primary_data_share=50.0)),
+            make_product_footprint(pcf=make_carbon_footprint(p_cf_excluding_biogenic=3.0, primary_data_share=10.0)),
+        ]
+    )
+    summary = summarize_table(table, quantities=np.array([1.0, 1.0]))
+
+    assert summary.total_weight == 4.0
+    assert summary.primary_data_share == 20.0
+    assert summary.coverage_percent == 80.0
+    assert summary.weighted_dqr["completeness_dqr"] == 3.0
+    with pytest.raises(ValueError, match="quantities must have one value per row"):
+        summarize_table(table, quantities=np.array([1.0]))
+
+
+@pytest.mark.parametrize(
+    "dqr, weights",
+    [
+        (np.zeros((2, 4), dtype=np.int8), np.ones(2)),
+        (np.zeros((2, 5), dtype=np.int8), np.ones(3)),
+        (np.full((1, 5), 4, dtype=np.int8), np.ones(1)),
+        (np.zeros((1, 5), dtype=np.int8), np.array([-1.0])),
+    ],
+)
+def test_invalid_input(dqr, weights):
+    with pytest.raises(ValueError):
+        summarize_data_quality(dqr, weights)
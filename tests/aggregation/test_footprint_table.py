@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+
+from pact_methodology.aggregation.footprint_table import (
+    CATEGORICAL_COLUMNS,
+    DQR_COLUMNS,
+    NUMERIC_COLUMNS,
+    FootprintTable,
+    dqr_row,
+)
+from pact_methodology.carbon_footprint.declared_unit import DeclaredUnit
+from pact_methodology.carbon_footprint.geographical_scope import CarbonFootprintGeographicalScope
+from pact_methodology.datetime import DateTime
+
+
+@pytest.fixture
+def footprints(make_product_footprint, make_carbon_footprint, cpc_code_lookup):
+    return [
+        make_product_footprint(pcf=make_carbon_footprint(p_cf_excluding_biogenic=1.5)),
+        make_product_footprint(
+            created=DateTime("2024-06-01T12:30:00Z"),
+            product_category_cpc=cpc_code_lookup.lookup("2311"),
+            pcf=make_carbon_footprint(
+                declared_unit=DeclaredUnit.LITER,
+                geographical_scope=CarbonFootprintGeographicalScope(geography_country="FR"),
+                aircraft_ghg_emissions=None,
+            ),
+        ),
+    ]
+
+
+def test_from_footprints(footprints):
+    table = FootprintTable.from_footprints(footprints)
+
+    assert len(table) == 2
+    assert table.ids[0] == footprints[0].id.bytes
+    assert table.created[1] == np.datetime64("2024-06-01T12:30:00", "us")
+    assert table.version.tolist() == [1, 1]
+    assert table.column("p_cf_excluding_biogenic").tolist() == [1.5, 0.5]
+    assert table.column("aircraft_ghg_emissions")[0] == 0.01
+    assert np.isnan(table.column("aircraft_ghg_emissions")[1])
+    assert table.labels("declared_unit").tolist() == ["kilogram", "liter"]
+    assert table.labels("geography").tolist() == ["Global", "FR"]
+    assert table.labels("product_category_cpc").tolist() == ["0111", "2311"]
+    assert table.categories["company_name"] == ["Acme Corp"]
+    assert table.codes["company_name"].tolist() == [0, 0]
+
+
+def test_from_no_footprints():
+    table = FootprintTable.from_footprints([])
+    assert len(table) == 0
+    assert set(table.numeric) == set(NUMERIC_COLUMNS)
+    assert set(table.codes) == set(CATEGORICAL_COLUMNS)
+
+
+def test_select(footprints):
+    table = FootprintTable.from_footprints(footprints)
+    selected = table.select(table.column("p_cf_excluding_biogenic") > 1.0)
+
+    assert len(selected) == 1
+    assert selected.ids[0] == footprints[0].id.bytes
+    assert selected.labels("declared_unit").tolist() == ["kilogram"]
+
+
+def test_missing_column_is_rejected(footprints):
+    table = FootprintTable.from_footprints(footprints)
+    numeric = dict(table.numeric)
+    del numeric["p_cf_excluding_biogenic"]
+    with pytest.raises(ValueError, match="Missing columns: p_cf_excluding_biogenic"):
+        FootprintTable(
+            ids=table.ids,
+            created=table.created,
+            version=table.version,
+            numeric=numeric,
+            dqr=table.dqr,
+            codes=table.codes,
+            categories=table.categories,
+        )
+
+
+def test_column_lengths_must_match(footprints):
+    table = FootprintTable.from_footprints(footprints)
+    with pytest.raises(ValueError, match="All columns must have the same length"):
+        FootprintTable(
+            ids=table.ids,
+            created=table.created[:1],
+            version=table.version,
+            numeric=table.numeric,
+            dqr=table.dqr,
+            codes=table.codes,
+            categories=table.categories,
+        )
+
+
+def test_data_quality_columns(footprints):
+    table = FootprintTable.from_footprints(footprints)
+
+    assert table.dqr.dtype == np.int8
+    assert table.dqr.tolist() == [[2, 2, 1, 3, 2], [2, 2, 1, 3, 2]]
+    assert dqr_row(footprints[0].pcf.dqi) == [2, 2, 1, 3, 2] and dqr_row(None) == [0] * len(DQR_COLUMNS)
+    assert table.column("coverage_percent").tolist() == [80.0, 80.0]
+    assert table.select(np.array([1])).dqr.shape == (1, len(DQR_COLUMNS))
@@ -0,0 +1,114 @@
+import numpy as np
+import pytest
+
+from pact_methodology.aggregation.footprint_table import FootprintTable
+from pact_methodology.aggregation.portfolio import (
+    EMISSION_COLUMNS,
+    aggregate_portfolio,
+    group_codes,
+)
+from pact_methodology.carbon_footprint.declared_unit import DeclaredUnit
+
+
+@pytest.fixture
+def table(make_product_footprint, make_carbon_footprint, cpc_code_lookup):
+    footprints = [
+        make_product_footprint(
+            product_category_cpc=cpc_code_lookup.lookup("0111"),
+            pcf=make_carbon_footprint(unitary_product_amount=2.0, p_cf_excluding_biogenic=1.0),
+        ),
+        make_product_footprint(
+            product_category_cpc=cpc_code_lookup.lookup("0112"),
+            pcf=make_carbon_footprint(
+                unitary_product_amount=1.0, p_cf_excluding_biogenic=4.0, aircraft_ghg_emissions=None
+            ),
+        ),
+        make_product_footprint(
+            company_name="Other Corp",
+            product_category_cpc=cpc_code_lookup.lookup("2311"),
+            pcf=make_carbon_footprint(
+                declared_unit=DeclaredUnit.LITER, unitary_product_amount=0.5, p_cf_excluding_biogenic=2.0
+            ),
+        ),
+    ]
+    return FootprintTable.from_footprints(footprints)
+
+
+def test_group_by_cpc_code(table):
+    result = aggregate_portfolio(table, "cpc")
+
+    assert result.keys == ["0111", "0112", "2311"]
+    assert result.counts.tolist() == [1, 1, 1]
+    assert result.totals["p_cf_excluding_biogenic"].tolist() == [2.0, 4.0, 1.0]
+
+
+def test_group_by_cpc_level_with_quantities(table):
+    result = aggregate_portfolio(table, "cpc", cpc_level="division", quantities=np.array([10, 5, 2]))
+
+    assert result.keys == ["01", "23"]
+    assert result.counts.tolist() == [2, 1]
+    assert result.declared_units.tolist() == [25.0, 1.0]
+    assert result.totals["p_cf_excluding_biogenic"].tolist() == [40.0, 2.0]
+    assert result.means["p_cf_excluding_biogenic"].tolist() == [2.5, 2.0]
+    assert result.weighted_means["p_cf_excluding_biogenic"].tolist() == pytest.approx([1.6, 2.0])
+
+
+def test_every_emission_component_is_a_column(table):
+    result = aggregate_portfolio(table, "declared_unit")
+
+    assert set(result.totals) == set(EMISSION_COLUMNS)
+    assert result.keys == ["kilogram", "liter"]
+    assert result.totals["d_luc_ghg_emissions"].tolist() == pytest.approx([1.2, 0.2])
+    assert result.totals["biogenic_carbon_withdrawal"].tolist() == pytest.approx([-3.0, -0.5])
+
+
+def test_undefined_values_are_left_out(table):
+    result = aggregate_portfolio(table, "company")
+
+    assert result.keys == ["Acme Corp", "Other Corp"]
+    assert result.totals["aircraft_ghg_emissions"][0] == pytest.approx(0.02)
+    assert result.means["aircraft_ghg_emissions"][0] == pytest.approx(0.01)
+    assert result.weighted_means["aircraft_ghg_emissions"][0] == pytest.approx(0.01)
+
+
+def test_group_without_values_has_nan_means(table):
+    result = aggregate_portfolio(table.select(np.array([1])), "geography")
+
+    assert result.keys == ["Global"]
+    assert result.totals["aircraft_ghg_emissions"].tolist() == [0.0]
+    assert np.isnan(result.means["aircraft_ghg_emissions"][0])
+    assert np.isnan(result.weighted_means["aircraft_ghg_emissions"][0])
+
+
+def test_row(table):
+    row = aggregate_portfolio(table, "company").row("Other Corp")
+
+    assert row["count"] == 1
+    assert row["declared_units"] == 0.5
+    assert row["totals"]["p_cf_excluding_biogenic"] == 1.0
+    with pytest.raises(KeyError):
+        aggregate_portfolio(table, "company").row("Unknown Corp")
+
+
+def test_custom_columns(table):
+    result = aggregate_portfolio(table, "company", columns=("fossil_ghg_emissions",))
+    assert list(result.totals) == ["fossil_ghg_emissions"]
+
+
+@pytest.mark.parametrize(
+    "by, cpc_level, message",
+    [
+        ("supplier", None, "by must be one of"),
+        ("company", "division", "cpc_level can only be used when grouping by cpc"),
+        ("cpc", "chapter", "cpc_level must be one of"),
+    ],
+)
+def test_invalid_grouping(table, by, cpc_level, message):
+    with pytest.raises(ValueError, match=message):
+        group_codes(table, by, cpc_level)
+
+
+@pytest.mark.parametrize("quantities", [np.array([1.0, 2.0]), np.array([1.0, -1.0, 1.0])])
+def test_invalid_quantities(table, quantities):
+    with pytest.raises(ValueError):
+        aggregate_portfolio(table, "cpc", quantities=quantities)
@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+
+from pact_methodology.aggregation.bom import BomEngine
+from pact_methodology.aggregation.uncertainty import (
+    Fixed,
+    LogNormal,
+    MonteCarlo,
+    Normal,
+    Triangular,
+    Uniform,
+)
+from pact_methodology.product_footprint.product_id_list import ProductIdList
+from pact_methodology.urn import ProductId
+
+
+def product_id(code):
+    return ProductId(f"urn:pathfinder:product:customcode:buyer-assigned:{code}")
+
+
+@pytest.fixture
+def simulation():
+    return MonteCarlo({"steel": (2.0, Normal(1.0, 0.1)), "paint": (0.5, Uniform(0.0, 1.0)), "bolts": (3.0, Fixed(0.1))})
+
+
+def test_run(simulation):
+    result = simulation.run(200_000, seed=1, batch_size=50_000)
+
+    assert result.samples == 200_000
+    assert result.mean == pytest.approx(2.55, abs=0.01)
+    assert result.std == pytest.approx((0.04 + 0.25 / 12) ** 0.5, rel=0.01)
+    assert list(result.percentiles) == [2.5, 50.0, 97.5]
+    assert result.percentiles[2.5] < result.percentiles[50.0] < result.percentiles[97.5]
+    names = [name for name, _ in result.drivers]
+    shares = dict(result.drivers)
+    assert names[0] == "steel"
+    assert shares["bolts"] == pytest.approx(0.0, abs=1e-9)
+    assert sum(shares.values()) == pytest.approx(1.0, abs=0.01)
+    assert shares["steel"] == pytest.approx(0.04 / (0.04 + 0.25 / 12), abs=0.01)
+
+
+def test_runs_are_reproducible(simulation):
+    first = simulation.run(30_000, seed=7, batch_size=10_000)
+    second = simulation.run(30_000, seed=7, batch_size=10_000, workers=2)
+    assert first == second
+    assert simulation.run(30_000, seed=8, batch_size=10_000) != first
+
+
+def test_description(simulation):
+    result = simulation.run(1_000, seed=1)
+    description = result.description(drivers=1)
+
+    assert description.startswith("Monte Carlo simulation with 1000 samples: mean ")
+    assert "P2.5 " in description and "P97.5 " in description
+    assert description.endswith(f"Key drivers: steel ({dict(result.drivers)['steel']:.1%}).")
+
+
+def test_apply_to(simulation, make_carbon_footprint):
+    pcf = make_carbon_footprint()
+    result = simulation.run(1_000, seed=1)
+    result.apply_to(pcf)
+    assert pcf.uncertainty_assessment_description == result.description()
+
+
+def test_from_bom(make_product_footprint, make_carbon_footprint):
+    engine = BomEngine()
+    for code, value in [("steel", 2.0), ("paint", 10.0)]:
+        engine.set_footprint(
+            make_product_footprint(
+                product_ids=ProductIdList([product_id(code)]),
+                pcf=make_carbon_footprint(p_cf_excluding_biogenic=value),
+            )
+        )
+    engine.set_components(product_id("frame"), [(product_id("steel"), 2.5), (product_id("paint"), 0.1)])
+    engine.set_components(product_id("bike"), [(product_id("frame"), 2.0), (product_id("steel"), 1.0)])
+
+    assert engine.leaf_quantities(product_id("bike")) == {product_id("steel"): 6.0, product_id("paint"): 0.2}
+
+    simulation = MonteCarlo.from_bom(engine, product_id("bike"), {product_id("paint"): Normal(10.0, 1.0)})
+    result = simulation.run(50_000, seed=3)
+
+    assert result.mean == pytest.approx(14.0, abs=0.01)
+    assert result.drivers[0][0] == str(product_id("paint"))
+    assert result.drivers[0][1] == pytest.approx(1.0)
+
+
+def test_distributions_sample_within_bounds():
+    rng = np.random.default_rng(0)
+    assert (LogNormal(2.0, 1.5).sample(rng, 1000) > 0).all()
+    samples = Triangular(1.0, 2.0, 4.0).sample(rng, 1000)
+    assert samples.min() >= 1.0 and samples.max() <= 4.0
+
+
+@pytest.mark.parametrize(
+    "factory",
+    [
+        lambda: Normal(1.0, -1.0),
+        lambda: LogNormal(0.0, 1.5),
+        lambda: LogNormal(1.0, 0.5),
+        lambda: Uniform(2.0, 1.0),
+        lambda: Triangular(1.0, 3.0, 2.0),
+        lambda: MonteCarlo({}),
+        lambda: MonteCarlo({"steel": ("2", Fixed(1.0))}),
+        lambda: MonteCarlo({"steel": (2.0, 1.0)}),
+        lambda: MonteCarlo({"steel": (2.0, Fixed(1.0))}).run(0),
+    ],
+)
+def test_invalid_arguments(factory):
+    with pytest.raises(ValueError):
+        factory()
@@ -1,3 +1,5 @@
+import pickle
+
 import pytest
 
 from pact_methodology.assurance.assurance import (
@@ -930,3 +932,85 @@ def test_carbon_footprint_not_eq(valid_carbon_footprint_data):
     carbon_footprint1 = CarbonFootprint(**valid_carbon_footprint_data)
     carbon_footprint2 = CarbonFootprint(**{**valid_carbon_footprint_data, "unitary_product_amount": 2.0})
     assert carbon_footprint1 != carbon_footprint2
+
+
+def test_carbon_footprint_hash(valid_carbon_footprint_data):
+    carbon_footprint1 = CarbonFootprint(**valid_carbon_footprint_data)
+    carbon_footprint2 = CarbonFootprint(**valid_carbon_footprint_data)
+    assert hash(carbon_footprint1) == hash(carbon_footprint2)
+    carbon_footprint2.p_cf_excluding_biogenic = 2.0
+    assert carbon_footprint1 != carbon_footprint2
+    assert len({carbon_footprint1, carbon_footprint2}) == 2
+
+
+@pytest.mark.parametrize(
+    "attribute",
+    ["unitary_product_amount", "p_cf_excluding_biogenic", "exempted_emissions_percent", "primary_data_share", "biogenic_carbon_withdrawal"],
+)
+@pytest.mark.parametrize("value", [float("nan"), float("inf"), float("-inf")])
+def test_carbon_footprint_rejects_non_finite_numbers(valid_carbon_footprint_data, attribute, value):
+    carbon_footprint = CarbonFootprint(**valid_carbon_footprint_data)
+    with pytest.raises(ValueError, match=f"{attribute} must be a finite number"):
+        setattr(carbon_footprint, attribute, value)
+    with pytest.raises(ValueError, match=f"{attribute} must be a finite number"):
+        CarbonFootprint(**{**valid_carbon_footprint_data, attribute: value})
+    assert carbon_footprint == CarbonFootprint(**valid_carbon_footprint_data)
+
+
+def test_carbon_footprint_changed_fields(valid_carbon_footprint_data):
+    carbon_footprint = CarbonFootprint(**valid_carbon_footprint_data)
+    assert carbon_footprint.changed_fields == frozenset()
+
+    carbon_footprint.allocation_rules_description = "Mass allocation"
+    carbon_footprint.primary_data_share = 60.0
+
+    assert carbon_footprint.changed_fields == {"allocation_rules_description", "primary_data_share"}
+    carbon_footprint.revalidate()
+    assert carbon_footprint.changed_fields == frozenset()
+
+
+def test_carbon_footprint_tracks_changes_without_constructor(valid_carbon_footprint_data):
+    carbon_footprint = pickle.loads(pickle.dumps(CarbonFootprint(**valid_carbon_footprint_data)))
+    assert carbon_footprint.changed_fields == frozenset()
+
+    carbon_footprint.primary_data_share = 60.0
+    assert carbon_footprint.changed_fields == {"primary_data_share"}
+
+
+def test_carbon_footprint_revalidate_packaging(valid_carbon_footprint_data):
+    carbon_footprint = CarbonFootprint(**valid_carbon_footprint_data)
+    carbon_footprint.packaging_emissions_included = False
+
+    with pytest.raises(ValueError, match="must not be defined"):
+        carbon_footprint.revalidate()
+    assert "packaging_emissions_included" in carbon_footprint.changed_fields
+
+    carbon_footprint.packaging_ghg_emissions = None
+    carbon_footprint.revalidate()
+    assert carbon_footprint.changed_fields == frozenset()
+
+
+def test_carbon_footprint_revalidate_reference_period(valid_carbon_footprint_data):
+    carbon_footprint = CarbonFootprint(**valid_carbon_footprint_data)
+    carbon_footprint.biogenic_accounting_methodology = None
+    carbon_footprint.revalidate()
+
+    carbon_footprint.reference_period = ReferencePeriod(
+        start=DateTime("2025-01-01T00:00:00Z"), end=DateTime("2025-12-31T23:59:59Z")
+    )
+    with pytest.raises(ValueError, match="biogenic_accounting_methodology"):
+        carbon_footprint.revalidate()
+
+
+def test_carbon_footprint_revalidate_skips_unaffected_rules(valid_carbon_footprint_data, monkeypatch):
+    carbon_footprint = CarbonFootprint(**valid_carbon_footprint_data)
+    calls = []
+    monkeypatch.setattr(CarbonFootprint, "validate_required_attributes", lambda self: calls.append("required"))
+
+    carbon_footprint.fossil_ghg_emissions = 0.4
+    carbon_footprint.revalidate()
+    assert calls == []
+
+    carbon_footprint.dqi = None
+    carbon_footprint.revalidate()
+    assert calls == ["required"]
@@ -0,0 +1,132 @@
+import pytest
+
+from pact_methodology.assurance.assurance import Assurance, Boundary, Coverage, Level
+from pact_methodology.carbon_footprint.biogenic_accounting_methodology import BiogenicAccountingMethodology
+from pact_methodology.carbon_footprint.carbon_footprint import CarbonFootprint
+from pact_methodology.carbon_footprint.characterization_factors import CharacterizationFactors
+from pact_methodology.carbon_footprint.cross_sectoral_standard import CrossSectoralStandard
+from pact_methodology.carbon_footprint.cross_sectoral_standard_set import CrossSectoralStandardSet
+from pact_methodology.carbon_footprint.declared_unit import DeclaredUnit
+from pact_methodology.carbon_footprint.emission_factor_ds import EmissionFactorDS
+from pact_methodology.carbon_footprint.emission_factor_ds_set import EmissionFactorDSSet
+from pact_methodology.carbon_footprint.geographical_scope import CarbonFootprintGeographicalScope
+from pact_methodology.carbon_footprint.reference_period import ReferencePeriod
+from pact_methodology.data_model_extension.data_model_extension import DataModelExtension
+from pact_methodology.data_quality_indicators.data_quality_indicators import DataQualityIndicators
+from pact_methodology.data_quality_indicators.data_quality_rating import DataQualityRating
+from pact_methodology.datetime import DateTime
+from pact_methodology.product_footprint.company_id_list import CompanyIdList
+from pact_methodology.product_footprint.cpc import CPCCodeLookup
+from pact_methodology.product_footprint.product_footprint import ProductFootprint
+from pact_methodology.product_footprint.product_id_list import ProductIdList
+from pact_methodology.product_footprint.status import ProductFootprintStatus, Status
+from pact_methodology.product_footprint.version import Version
+from pact_methodology.urn import CompanyId, ProductId
+
+
+@pytest.fixture(scope="session")
+def cpc_code_lookup() -> CPCCodeLookup:
+    return CPCCodeLookup()
+
+
+@pytest.fixture
+def make_carbon_footprint():
+    """Factory building a valid CarbonFootprint, overriding any constructor argument."""
+
+    def _make(**overrides) -> CarbonFootprint:
+        standards_set = CrossSectoralStandardSet()
+        standards_set.add(CrossSectoralStandard.GHG_PROTOCOL)
+        reference_period = ReferencePeriod(
+            start=DateTime("2023-01-01T00:00:00Z"), end=DateTime("2023-12-31T23:59:59Z")
+        )
+        data = {
+            "declared_unit": DeclaredUnit.KILOGRAM,
+            "unitary_product_amount": 1.0,
+            "p_cf_excluding_biogenic": 0.5,
+            "p_cf_including_biogenic": 2.0,
+            "fossil_ghg_emissions": 0.3,
+            "fossil_carbon_content": 0.2,
+            "biogenic_carbon_content": 0.1,
+            "characterization_factors": CharacterizationFactors.AR6,
+            "ipcc_characterization_factors_sources": ["AR6"],
+            "cross_sectoral_standards_used": standards_set,
+            "boundary_processes_description": "boundary processes description",
+            "exempted_emissions_percent": 1.0,
+            "exempted_emissions_description": "Rationale for exclusion",
+            "reference_period": reference_period,
+            "packaging_emissions_included": True,
+            "geographical_scope": CarbonFootprintGeographicalScope(global_scope=True),
+            "primary_data_share": 50.0,
+            "dqi": DataQualityIndicators(
+                reference_period=reference_period,
+                coverage_percent=80.0,
+                technological_dqr=DataQualityRating(2),
+                temporal_dqr=DataQualityRating(2),
+                geographical_dqr=DataQualityRating(1),
+                completeness_dqr=DataQualityRating(3),
+                reliability_dqr=DataQualityRating(2),
+            ),
+            "secondary_emission_factor_sources": EmissionFactorDSSet(
+                [EmissionFactorDS(name="ecoinvent", version="3.9.1")]
+            ),
+            "d_luc_ghg_emissions": 0.4,
+            "land_management_ghg_emissions": 0.2,
+            "other_biogenic_ghg_emissions": 0.1,
+            "biogenic_carbon_withdrawal": -1.0,
+            "iluc_ghg_emissions": 0.05,
+            "aircraft_ghg_emissions": 0.01,
+            "packaging_ghg_emissions": 0.02,
+            "allocation_rules_description": "Allocation rules description",
+            "uncertainty_assessment_description": "Uncertainty assessment description",
+            "assurance": Assurance(
+                assurance=True,
+                provider_name="Assurance Corp",
+                coverage=Coverage.PRODUCT_LEVEL,
+                level=Level.REASONABLE,
+                boundary=Boundary.CRADLE_TO_GATE,
+                completed_at=DateTime("2024-02-01T00:00:00Z"),
+                standard_name="ISO 14064-3",
+                comments="Assurance comments",
+            ),
+            "biogenic_accounting_methodology": BiogenicAccountingMethodology.GHGP,
+        }
+        data.update(overrides)
+        return CarbonFootprint(**data)
+
+    return _make
+
+
+@pytest.fixture
+def make_product_footprint(make_carbon_footprint, cpc_code_lookup):
+    """Factory building a valid ProductFootprint, overriding any constructor argument."""
+
+    def _make(**overrides) -> ProductFootprint:
+        data = {
+            "version": Version(1),
+            "created": DateTime("2024-01-01T00:00:00Z"),
+            "status_info": ProductFootprintStatus(status=Status.ACTIVE),
+            "company_name": "Acme Corp",
+            "company_ids": CompanyIdList(
+                [CompanyId("urn:pathfinder:company:customcode:buyer-assigned:acme-corp")]
+            ),
+            "product_description": "Acme widget",
+            "product_ids": ProductIdList(
+                [ProductId("urn:pathfinder:product:customcode:buyer-assigned:acme-widget")]
+            ),
+            "product_category_cpc": cpc_code_lookup.lookup("0111"),
+            "product_name_company": "Widget",
+            "comment": "Comment",
+            "extensions": [
+                DataModelExtension(
+                    spec_version="2.0.0",
+                    data_schema="https://example.com/schema.json",
+                    data={"key": "value"},
+                )
+            ],
+        }
+        if "pcf" not in overrides:
+            data["pcf"] = make_carbon_footprint()
+        data.update(overrides)
+        return ProductFootprint(**data)
+
+    return _make
@@ -95,6 +95,9 @@ def test_coverage_percent_validation():
     )
     with pytest.raises(ValueError, match="coverage_percent must be a number"):
         DataQualityIndicators(reference_period=reference_period, coverage_percent="80")
+    for value in (float("nan"), float("inf")):
+        with pytest.raises(ValueError, match="coverage_percent must be a finite number"):
+            DataQualityIndicators(reference_period=reference_period, coverage_percent=value)
 
 
 def test_reference_period_validation():
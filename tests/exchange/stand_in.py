@@ -0,0 +1,88 @@
+"""A PACT host stand-in for the exchange client tests."""
+
+import asyncio
+import base64
+import json
+from contextlib import asynccontextmanager
+from urllib.parse import parse_qs, urlsplit
+
+from pact_methodology.exchange.http import parse_headers
+from pact_methodology.exchange.json_codec import encode
+
+
+class StandIn:
+    """A PACT host stand-in serving footprints with offset pagination."""
+
+    def __init__(self, footprints, expires_in=3600, failures=0):
+        self.footprints = [encode(footprint) for footprint in footprints]
+        self.expires_in = expires_in
+        # The number of footprint requests answered with 503 before serving them.
+        self.failures = failures
+        self.tokens_issued = 0
+        self.connections = 0
+        self.requests = []
+        self.rejected_tokens = set()
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    return
+                request_line, *lines = head[:-4].decode("latin-1").split("\r\n")
+                method, target, _ = request_line.split(" ")
+                headers = parse_headers(lines)
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                self.requests.append((method, target))
+                status, response_headers, payload = self.respond(method, target, headers, body)
+                data = json.dumps(payload).encode()
+                head = f"HTTP/1.1 {status} X\r\nContent-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                head += "".join(f"{name}: {value}\r\n" for name, value in response_headers.items())
+                writer.write(head.encode() + b"\r\n" + data)
+                await writer.drain()
+        finally:
+            writer.close()
+
+    def respond(self, method, target, headers, body):
+        url = urlsplit(target)
+        if url.path == "/auth/token":
+            expected = "Basic " + base64.b64encode(b"client:secret").decode()
+            valid = headers.get("authorization") == expected and body == b"grant_type=client_credentials"
+            if method != "POST" or not valid:
+                return 400, {}, {"error": "invalid_client"}
+            self.tokens_issued += 1
+            token = {"access_token": f"token-{self.tokens_issued}", "token_type": "bearer"}
+            if self.expires_in is not None:
+                token["expires_in"] = self.expires_in
+            return 200, {}, token
+
+        token = headers.get("authorization", "").removeprefix("Bearer ")
+        if not token.startswith("token-") or token in self.rejected_tokens:
+            return 401, {}, {"code": "BadRequest", "message": "Invalid access token"}
+        if self.failures:
+            self.failures -= 1
+            return 503, {"Retry-After": "0"}, {"code": "InternalError", "message": "Try again"}
+        if url.path == "/2/footprints":
+            query = parse_qs(url.query)
+            limit = int(query.get("limit", ["1000"])[0])
+            offset = int(query.get("offset", ["0"])[0])
+            page = self.footprints[offset : offset + limit]
+            links = {}
+            if offset + limit < len(self.footprints):
+                links["Link"] = f'<{self.origin}/2/footprints?limit={limit}&offset={offset + limit}>; rel="next"'
+            return 200, links, {"data": page}
+        for footprint in self.footprints:
+            if url.path == f"/2/footprints/{footprint['id']}":
+                return 200, {}, {"data": footprint}
+        return 404, {}, {"code": "NoSuchFootprint", "message": "The requested footprint could not be found"}
+
+
+@asynccontextmanager
+async def serve(stand_in):
+    server = await asyncio.start_server(stand_in.handle, "127.0.0.1", 0)
+    stand_in.origin = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+    async with server:
+        yield stand_in.origin
+        server.close()
@@ -0,0 +1,142 @@
+import asyncio
+
+import pytest
+
+from pact_methodology.exceptions import PactApiError
+from pact_methodology.exchange.client import PactClient, parse_link_header
+from tests.exchange.stand_in import StandIn, serve
+
+
+@pytest.fixture
+def footprints(make_product_footprint, make_carbon_footprint):
+    return [make_product_footprint(pcf=make_carbon_footprint(p_cf_excluding_biogenic=float(i))) for i in range(7)]
+
+
+def test_list_footprints_follows_links(footprints):
+    stand_in = StandIn(footprints)
+
+    async def run():
+        async with serve(stand_in) as origin, PactClient(origin, "client", "secret") as client:
+            return [footprint async for footprint in client.list_footprints(limit=3)]
+
+    listed = asyncio.run(run())
+
+    assert listed == footprints
+    assert [target for _, target in stand_in.requests if target.startswith("/2/")] == [
+        "/2/footprints?limit=3",
+        "/2/footprints?limit=3&offset=3",
+        "/2/footprints?limit=3&offset=6",
+    ]
+    assert stand_in.tokens_issued == 1
+
+
+def test_list_footprints_yields_decoding_errors(footprints):
+    stand_in = StandIn(footprints)
+    del stand_in.footprints[1]["companyName"]
+
+    async def run(yield_errors):
+        async with serve(stand_in) as origin, PactClient(origin, "client", "secret") as client:
+            return [footprint async for footprint in client.list_footprints(limit=3, yield_errors=yield_errors)]
+
+    listed = asyncio.run(run(True))
+
+    assert isinstance(listed[1], ValueError)
+    assert listed[:1] + listed[2:] == footprints[:1] + footprints[2:]
+    with pytest.raises(ValueError):
+        asyncio.run(run(False))
+
+
+def test_connections_are_reused(footprints):
+    stand_in = StandIn(footprints)
+
+    async def run():
+        async with serve(stand_in) as origin, PactClient(origin, "client", "secret") as client:
+            for footprint in footprints:
+                await client.get_footprint(footprint.id)
+            # Each page request may start while the previous page is still being read.
+            async for _ in client.list_footprints(limit=2):
+                pass
+
+    asyncio.run(run())
+    assert stand_in.connections <= 2
+    assert stand_in.tokens_issued == 1
+
+
+def test_token_is_renewed_when_rejected(footprints):
+    stand_in = StandIn(footprints, expires_in=None)
+
+    async def run():
+        async with serve(stand_in) as origin, PactClient(origin, "client", "secret") as client:
+            await client.get_footprint(footprints[0].id)
+            stand_in.rejected_tokens.add("token-1")
+            return await client.get_footprint(footprints[1].id)
+
+    assert asyncio.run(run()) == footprints[1]
+    assert stand_in.tokens_issued == 2
+
+
+def test_token_is_renewed_before_expiry(footprints):
+    stand_in = StandIn(footprints, expires_in=0)
+
+    async def run():
+        async with serve(stand_in) as origin, PactClient(origin, "client", "secret") as client:
+            return [await client.token(), await client.token()]
+
+    assert asyncio.run(run()) == ["token-1", "token-2"]
+
+
+def test_get_footprint_error(footprints):
+    stand_in = StandIn(footprints)
+
+    async def run():
+        async with serve(stand_in) as origin, PactClient(origin, "client", "secret") as client:
+            await client.get_footprint("5b1f5e0e-2c2a-4d58-8f59-e4b8e8c0a8b1")
+
+    with pytest.raises(PactApiError, match="HTTP 404 NoSuchFootprint") as error:
+        asyncio.run(run())
+    assert error.value.status == 404
+    assert error.value.code == "NoSuchFootprint"
+
+
+def test_invalid_credentials(footprints):
+    stand_in = StandIn(footprints)
+
+    async def run():
+        async with serve(stand_in) as origin, PactClient(origin, "client", "wrong") as client:
+            await client.token()
+
+    with pytest.raises(PactApiError, match="HTTP 400"):
+        asyncio.run(run())
+
+
+def test_unreachable_host():
+    async def run():
+        async with PactClient("http://127.0.0.1:9", "client", "secret", timeout=5) as client:
+            await client.token()
+
+    with pytest.raises(PactApiError, match="failed"):
+        asyncio.run(run())
+
+
+def test_link_to_another_host_is_rejected(footprints):
+    stand_in = StandIn(footprints)
+
+    async def run():
+        async with serve(stand_in) as origin, PactClient(origin, "client", "secret") as client:
+            stand_in.origin = "http://attacker.example"
+            return [footprint async for footprint in client.list_footprints(limit=5)]
+
+    with pytest.raises(PactApiError, match="another host"):
+        asyncio.run(run())
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ('<https://a.example/2?offset=10>; rel="next"', {"next": "https://a.example/2?offset=10"}),
+        ('<https://a.example/1>; rel="prev", <https://a.example/3>; rel=next', {"prev": "https://a.example/1", "next": "https://a.example/3"}),
+        ("", {}),
+    ],
+)
+def test_parse_link_header(value, expected):
+    assert parse_link_header(value) == expected
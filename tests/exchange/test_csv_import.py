@@ -0,0 +1,200 @@
+import csv
+import io
+
+import numpy as np
+import pytest
+
+from pact_methodology.aggregation.footprint_table import CATEGORICAL_COLUMNS, NUMERIC_COLUMNS, FootprintTable
+from pact_methodology.carbon_footprint.geographical_scope import CarbonFootprintGeographicalScope
+from pact_methodology.datetime import DateTime
+from pact_methodology.exceptions import CsvImportError
+from pact_methodology.exchange.csv_import import MEMBERS, ColumnMapping, CsvImporter
+from pact_methodology.exchange.json_codec import encode
+
+
+def flatten(data: dict, prefix: str = "") -> dict[str, str]:
+    """Returns the cell text of every member of an encoded footprint, by member path."""
+    cells = {}
+    for name, value in data.items():
+        path = f"{prefix}{name}"
+        if isinstance(value, dict):
+            cells.update(flatten(value, f"{path}/"))
+        elif path not in MEMBERS:
+            continue
+        elif isinstance(value, list):
+            cells[path] = "|".join(value)
+        elif isinstance(value, bool):
+            cells[path] = str(value).lower()
+        elif value is not None:
+            cells[path] = str(value)
+    return cells
+
+
+def write_csv(footprints, columns=None) -> str:
+    rows = [flatten(encode(footprint)) for footprint in footprints]
+    columns = columns or sorted(MEMBERS)
+    stream = io.StringIO()
+    writer = csv.writer(stream)
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow([row.get(column, "") for column in columns])
+    return stream.getvalue()
+
+
+MAPPING = ColumnMapping({path: path for path in MEMBERS})
+
+
+@pytest.fixture
+def footprints(make_product_footprint, make_carbon_footprint, cpc_code_lookup):
+    return [
+        make_product_footprint(),
+        make_product_footprint(
+            product_category_cpc=cpc_code_lookup.lookup("2311"),
+            created=DateTime("2024-02-01T12:30:00Z"),
+            pcf=make_carbon_footprint(geographical_scope=CarbonFootprintGeographicalScope(geography_country="DE")),
+        ),
+        make_product_footprint(company_name="Other Corp"),
+    ]
+
+
+def test_footprints_round_trip(footprints):
+    imported = list(CsvImporter(MAPPING, chunk_size=2).footprints(io.StringIO(write_csv(footprints))))
+
+    assert [flatten(encode(footprint)) for footprint in imported] == [
+        flatten(encode(footprint)) for footprint in footprints
+    ]
+
+
+def test_tables_match_from_footprints(footprints):
+    expected = FootprintTable.from_footprints(footprints)
+    tables = list(CsvImporter(MAPPING, chunk_size=2).tables(io.StringIO(write_csv(footprints))))
+    table = CsvImporter(MAPPING).read_table(io.StringIO(write_csv(footprints)))
+
+    assert [len(chunk) for chunk in tables] == [2, 1]
+    assert tables[0].categories is tables[1].categories
+    assert table.ids.tolist() == expected.ids.tolist()
+    assert table.created.tolist() == expected.created.tolist()
+    assert table.version.tolist() == expected.version.tolist()
+    for name in NUMERIC_COLUMNS:
+        np.testing.assert_array_equal(table.column(name), expected.column(name))
+    np.testing.assert_array_equal(table.dqr, expected.dqr)
+    for name in CATEGORICAL_COLUMNS:
+        assert table.labels(name).tolist() == expected.labels(name).tolist()
+
+
+def test_defaults_and_renamed_columns(footprints, tmp_path):
+    cells = flatten(encode(footprints[0]))
+    renamed = {path: f"Column {index}" for index, path in enumerate(sorted(cells)) if path != "specVersion"}
+    path = tmp_path / "footprints.csv"
+    with open(path, "w", newline="", encoding="utf-8-sig") as file:
+        writer = csv.writer(file, delimiter=";")
+        writer.writerow(renamed.values())
+        writer.writerow([cells[member] if member != "status" else "" for member in renamed])
+    mapping = ColumnMapping(renamed, defaults={"specVersion": cells["specVersion"], "status": "Active"})
+
+    [footprint] = CsvImporter(mapping, delimiter=";").footprints(path)
+    table = CsvImporter(mapping, delimiter=";").read_table(path)
+
+    assert flatten(encode(footprint)) == cells
+    assert table.labels("status").tolist() == ["Active"]
+
+
+@pytest.mark.parametrize(
+    "member, text, message",
+    [
+        ("id", "not an id", "Invalid id: 'not an id'"),
+        ("created", "2024-01-01", "created must be a UTC date and time, got '2024-01-01'"),
+        ("version", "x", "version must be an integer, got 'x'"),
+        ("pcf/pCfExcludingBiogenic", "", "pcf/pCfExcludingBiogenic is required"),
+        ("pcf/fossilGhgEmissions", "lots", "pcf/fossilGhgEmissions must be a number, got 'lots'"),
+        ("pcf/dqi/temporalDQR", "4", "pcf/dqi/temporalDQR must be a rating from 1 to 3, got '4'"),
+        ("productCategoryCpc", "99999", "99999"),
+        ("pcf/geographyCountry", "XX", "Invalid country code: XX"),
+        ("status", "Archived", "Archived"),
+    ],
+)
+def test_invalid_rows_are_reported(footprints, member, text, message):
+    rows = list(csv.reader(io.StringIO(write_csv(footprints))))
+    rows[2][rows[0].index(member)] = text
+    stream = io.StringIO()
+    csv.writer(stream).writerows(rows)
+    errors = []
+
+    table = CsvImporter(MAPPING, on_error=lambda *error: errors.append(error)).read_table(
+        io.StringIO(stream.getvalue())
+    )
+
+    np.testing.assert_array_equal(table.ids, np.array([footprints[0].id.bytes, footprints[2].id.bytes], dtype="S16"))
+    [(line, error)] = errors
+    assert line == 3 and message in error
+    with pytest.raises(CsvImportError, match="Line 3: "):
+        CsvImporter(MAPPING).read_table(io.StringIO(stream.getvalue()))
+    skipping = CsvImporter(MAPPING, on_error=lambda *error: None)
+    assert len(list(skipping.footprints(io.StringIO(stream.getvalue())))) == 2
+
+
+def test_footprints_and_tables_reject_the_same_rows(footprints):
+    changes = [
+        ("pcf/unitaryProductAmount", "-5"),
+        ("pcf/exemptedEmissionsPercent", "99"),
+        ("pcf/pCfExcludingBiogenic", "nan"),
+        ("pcf/fossilGhgEmissions", "inf"),
+        ("pcf/biogenicCarbonContent", "-Infinity"),
+        ("pcf/biogenicCarbonWithdrawal", "0.5"),
+        ("pcf/iLucGhgEmissions", "-0.1"),
+        ("pcf/primaryDataShare", "NaN"),
+        ("pcf/dqi/coveragePercent", "1e999"),
+        ("pcf/exemptedEmissionsPercent", "5"),
+        ("pcf/pCfIncludingBiogenic", "-2.5"),
+    ]
+    rows = list(csv.reader(io.StringIO(write_csv([footprints[0]] * len(changes)))))
+    for row, (member, text) in zip(rows[1:], changes):
+        row[rows[0].index(member)] = text
+    stream = io.StringIO()
+    csv.writer(stream).writerows(rows)
+    footprint_errors, table_errors = [], []
+
+    imported = list(
+        CsvImporter(MAPPING, on_error=lambda *error: footprint_errors.append(error)).footprints(
+            io.StringIO(stream.getvalue())
+        )
+    )
+    table = CsvImporter(MAPPING, on_error=lambda *error: table_errors.append(error)).read_table(
+        io.StringIO(stream.getvalue())
+    )
+
+    assert [line for line, _ in footprint_errors] == [line for line, _ in table_errors] == list(range(2, 11))
+    assert len(imported) == len(table) == 2
+    assert table_errors[0][1] == "pcf/unitaryProductAmount must be strictly greater than 0, got '-5'"
+    assert table_errors[2][1] == "pcf/pCfExcludingBiogenic must be a finite number, got 'nan'"
+
+
+def test_malformed_files(footprints):
+    text = write_csv(footprints)
+    errors = []
+
+    imported = list(
+        CsvImporter(MAPPING, on_error=lambda *error: errors.append(error)).footprints(
+            io.StringIO(text + "\n" + "short,row\n")
+        )
+    )
+
+    assert len(imported) == 3
+    assert errors == [(6, f"Expected {len(MEMBERS)} cells, got 2")]
+    assert list(CsvImporter(MAPPING).tables(io.StringIO(""))) == []
+
+    rows = list(csv.reader(io.StringIO(text)))
+    rows[1][rows[0].index("comment")] = "Two\nlines"
+    rows[3][rows[0].index("version")] = "x"
+    stream = io.StringIO()
+    csv.writer(stream).writerows(rows)
+    with pytest.raises(CsvImportError, match="Line 5: version must be an integer"):
+        CsvImporter(MAPPING).read_table(io.StringIO(stream.getvalue()))
+    with pytest.raises(CsvImportError, match="Columns missing from the header: companyName"):
+        list(CsvImporter(MAPPING).footprints(io.StringIO(text.replace("companyName", "name", 1))))
+    with pytest.raises(CsvImportError, match="Tables need a column or default for: version"):
+        list(CsvImporter(ColumnMapping({"id": "id", "created": "created"})).tables(io.StringIO(text)))
+    with pytest.raises(ValueError, match="Unsupported members: extensions"):
+        ColumnMapping({"extensions": "x"})
+    with pytest.raises(ValueError, match="chunk_size must be positive"):
+        CsvImporter(MAPPING, chunk_size=0)
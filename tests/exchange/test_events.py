@@ -0,0 +1,236 @@
+import asyncio
+import json
+
+import pytest
+
+from pact_methodology.exceptions import PactApiError
+from pact_methodology.exchange.client import PactClient
+from pact_methodology.exchange.events import EventIngestor
+from pact_methodology.exchange.http import ConnectionPool
+from pact_methodology.exchange.server import PUBLISHED_EVENT, REQUEST_CREATED_EVENT, PactServer
+from pact_methodology.product_footprint.version import Version
+from pact_methodology.repository.repository import FootprintRepository
+from tests.exchange.stand_in import StandIn, serve
+from tests.exchange.test_server import bearer
+
+SOURCE = "//supplier.example/events"
+
+
+@pytest.fixture
+def footprints(make_product_footprint):
+    return [make_product_footprint(version=Version(2)) for _ in range(4)]
+
+
+def published(*footprints, source=SOURCE):
+    return {
+        "type": PUBLISHED_EVENT,
+        "specversion": "1.0",
+        "id": "event",
+        "source": source,
+        "data": {"pfIds": [str(footprint.id) for footprint in footprints]},
+    }
+
+
+class Owner:
+    """A data owner answering GetFootprint from a dict, optionally waiting for a signal first."""
+
+    def __init__(self, footprints):
+        self.footprints = {footprint.id: footprint for footprint in footprints}
+        self.fetched = []
+        self.release = None
+
+    async def get_footprint(self, id):
+        self.fetched.append(id)
+        if self.release is not None:
+            await self.release.wait()
+        if id not in self.footprints:
+            raise PactApiError("The requested footprint could not be found", 404, "NoSuchFootprint")
+        return self.footprints[id]
+
+
+def test_events_are_coalesced_and_applied(footprints):
+    stand_in = StandIn(footprints)
+    repository = FootprintRepository()
+
+    async def scenario():
+        async with serve(stand_in) as origin, PactClient(origin, "client", "secret") as client:
+            async with EventIngestor(repository, {SOURCE: client}, window=0.05) as ingestor:
+                await ingestor.submit(published(*footprints[:2]))
+                await ingestor.submit(published(footprints[1], footprints[2]))
+                await ingestor.submit(published(footprints[0]))
+                await ingestor.join()
+                return ingestor
+
+    ingestor = asyncio.run(scenario())
+    fetches = [target for method, target in stand_in.requests if target.startswith("/2/footprints/")]
+    assert sorted(fetches) == sorted(f"/2/footprints/{footprint.id}" for footprint in footprints[:3])
+    assert sorted(footprint.id for footprint in repository) == sorted(footprint.id for footprint in footprints[:3])
+    assert repository.lookup("product_category_cpc", "0111") == {footprint.id for footprint in footprints[:3]}
+    assert (ingestor.events, ingestor.coalesced, ingestor.applied, ingestor.batches) == (3, 2, 3, 1)
+
+
+def test_batches_are_bounded(footprints):
+    owner = Owner(footprints)
+    repository = FootprintRepository()
+
+    async def scenario():
+        async with EventIngestor(repository, {SOURCE: owner}, window=1.0, batch_size=2) as ingestor:
+            for footprint in footprints:
+                await ingestor.submit(published(footprint))
+            await ingestor.join()
+            return ingestor
+
+    ingestor = asyncio.run(scenario())
+    assert ingestor.batches == 2
+    assert len(repository) == 4
+
+
+def test_full_queue_applies_backpressure(footprints):
+    owner = Owner(footprints)
+    repository = FootprintRepository()
+
+    async def scenario():
+        owner.release = asyncio.Event()
+        async with EventIngestor(repository, {SOURCE: owner}, window=0, max_queued=1) as ingestor:
+            await ingestor.submit(published(footprints[0]))
+            await asyncio.sleep(0.01)
+            # The worker waits for the first fetch, and the second event fills the queue.
+            await ingestor.submit(published(footprints[1]))
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(ingestor.submit(published(footprints[2])), 0.05)
+            owner.release.set()
+            await ingestor.submit(published(footprints[2]))
+            await ingestor.join()
+
+    asyncio.run(scenario())
+    assert len(repository) == 3
+
+
+def test_full_queue_fails_when_the_worker_stops(footprints):
+    request = {
+        "type": REQUEST_CREATED_EVENT,
+        "specversion": "1.0",
+        "id": "request",
+        "source": "//buyer.example/events",
+        "data": {"pf": {"productIds": ["urn:x"]}},
+    }
+
+    async def scenario():
+        release = asyncio.Event()
+
+        async def on_request(event, matches):
+            await release.wait()
+            raise OSError("The buyer cannot be reached")
+
+        ingestor = EventIngestor(FootprintRepository(), {}, window=0, max_queued=1, on_request=on_request)
+        await ingestor.start()
+        await ingestor.submit(request)
+        await asyncio.sleep(0.01)
+        await ingestor.submit({**request, "id": "queued"})
+        waiting = asyncio.ensure_future(ingestor.submit({**request, "id": "waiting"}))
+        await asyncio.sleep(0.01)
+        release.set()
+        with pytest.raises(RuntimeError, match="stopped") as error:
+            await asyncio.wait_for(waiting, 1)
+        assert isinstance(error.value.__cause__, OSError)
+        with pytest.raises(OSError):
+            await ingestor.close()
+
+    asyncio.run(scenario())
+
+
+def test_failed_fetches_and_stale_versions(footprints, make_product_footprint):
+    owner = Owner(footprints[:1])
+    later = make_product_footprint(id=footprints[0].id, version=Version(3))
+    repository = FootprintRepository([later])
+    missing = make_product_footprint()
+    errors = []
+
+    async def scenario():
+        async with EventIngestor(
+            repository, {SOURCE: owner}, on_error=lambda *error: errors.append(error)
+        ) as ingestor:
+            await ingestor.submit(published(footprints[0], missing))
+        return ingestor
+
+    ingestor = asyncio.run(scenario())
+    assert repository[later.id].version == Version(3)
+    assert (ingestor.applied, ingestor.failed) == (0, 1)
+    [(source, id, error)] = errors
+    assert (source, id, error.code) == (SOURCE, missing.id, "NoSuchFootprint")
+
+
+def test_requests(footprints, make_product_footprint):
+    repository = FootprintRepository(footprints)
+    answered = []
+    product_id = str(footprints[0].product_ids[0])
+    request = {
+        "type": REQUEST_CREATED_EVENT,
+        "specversion": "1.0",
+        "id": "request-1",
+        "source": "//buyer.example/events",
+        "data": {"pf": {"productIds": [product_id], "productCategoryCpc": "0111"}, "comment": "Please"},
+    }
+
+    async def scenario():
+        async with EventIngestor(repository, {}, on_request=lambda *args: answered.append(args)) as ingestor:
+            await ingestor.submit(request)
+            await ingestor.submit(request)
+            await ingestor.submit({**request, "id": "request-2", "data": {"pf": {"productIds": ["urn:x"]}}})
+        return ingestor
+
+    ingestor = asyncio.run(scenario())
+    assert [(event["id"], matches) for event, matches in answered] == [
+        ("request-1", list(repository)),
+        ("request-2", []),
+    ]
+    assert ingestor.coalesced == 1
+
+
+def test_invalid_events(footprints):
+    owner = Owner(footprints)
+
+    async def scenario():
+        ingestor = EventIngestor(FootprintRepository(), {SOURCE: owner})
+        with pytest.raises(RuntimeError, match="not running"):
+            await ingestor.submit(published(footprints[0]))
+        async with ingestor:
+            with pytest.raises(ValueError, match="Unknown event source"):
+                await ingestor.submit(published(footprints[0], source="//other.example"))
+            with pytest.raises(ValueError, match="pfIds"):
+                await ingestor.submit({**published(), "data": {"pfIds": []}})
+            with pytest.raises(ValueError):
+                await ingestor.submit({**published(), "data": {"pfIds": ["not an id"]}})
+            with pytest.raises(ValueError, match="Footprint requests are not handled"):
+                await ingestor.submit({**published(), "type": REQUEST_CREATED_EVENT})
+            with pytest.raises(ValueError, match="Unsupported event type"):
+                await ingestor.submit({**published(), "type": "x"})
+
+    asyncio.run(scenario())
+    with pytest.raises(ValueError, match="window must not be negative"):
+        EventIngestor(FootprintRepository(), {}, window=-1)
+
+
+def test_server_passes_events_to_ingestor(footprints):
+    owner = Owner(footprints)
+    repository = FootprintRepository()
+
+    async def scenario():
+        async with EventIngestor(repository, {SOURCE: owner}) as ingestor:
+            server = PactServer(repository, {"client": "secret"}, on_event=ingestor.submit)
+            listener = await server.start()
+            async with listener:
+                pool = ConnectionPool(f"http://127.0.0.1:{listener.sockets[0].getsockname()[1]}")
+                headers = await bearer(pool)
+                accepted = await pool.request("POST", "/2/events", headers, json.dumps(published(*footprints)).encode())
+                rejected = await pool.request(
+                    "POST", "/2/events", headers, json.dumps(published(source="//other.example")).encode()
+                )
+                await pool.close()
+            await ingestor.join()
+        return accepted, rejected
+
+    accepted, rejected = asyncio.run(scenario())
+    assert accepted.status == 200
+    assert rejected.json() == {"code": "BadRequest", "message": "Unknown event source: '//other.example'"}
+    assert len(repository) == 4
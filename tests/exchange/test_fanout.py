@@ -0,0 +1,135 @@
+import asyncio
+from contextlib import AsyncExitStack
+
+import pytest
+
+from pact_methodology.exchange.client import RateLimiter, RetryPolicy
+from pact_methodology.exchange.fanout import Endpoint, HostReport, fetch_all
+from tests.exchange.stand_in import StandIn, serve
+
+FAST_RETRY = RetryPolicy(attempts=3, backoff=0.0)
+
+
+@pytest.fixture
+def footprints(make_product_footprint, make_carbon_footprint):
+    return [make_product_footprint(pcf=make_carbon_footprint(p_cf_excluding_biogenic=float(i))) for i in range(6)]
+
+
+def run_hosts(stand_ins, sink, **options):
+    async def run():
+        async with AsyncExitStack() as stack:
+            endpoints = [
+                Endpoint(f"host-{index}", await stack.enter_async_context(serve(stand_in)), "client", "secret")
+                for index, stand_in in enumerate(stand_ins)
+            ]
+            return await fetch_all(endpoints, sink, **options)
+
+    return asyncio.run(run())
+
+
+def test_fetch_all_merges_hosts(footprints):
+    stand_ins = [StandIn(footprints[:4]), StandIn(footprints[4:])]
+    received = []
+
+    reports = run_hosts(stand_ins, received.append, limit=2, max_concurrency=1)
+
+    assert sorted(received, key=footprints.index) == footprints
+    assert [(report.name, report.footprints, report.error) for report in reports] == [
+        ("host-0", 4, None),
+        ("host-1", 2, None),
+    ]
+    # A token request and two pages for the first host.
+    assert reports[0].requests == 3
+    assert len(reports[0].latencies) == 3
+    assert reports[0].throughput > 0
+
+
+def test_failed_requests_are_retried(footprints):
+    stand_in = StandIn(footprints, failures=2)
+
+    [report] = run_hosts([stand_in], lambda footprint: None, retry=FAST_RETRY)
+
+    assert report.footprints == len(footprints)
+    assert report.failed_requests == 2
+    assert report.error is None
+
+
+def test_failing_host_does_not_stop_others(footprints):
+    stand_ins = [StandIn(footprints[:3], failures=5), StandIn(footprints[3:])]
+
+    reports = run_hosts(stand_ins, lambda footprint: None, retry=FAST_RETRY)
+
+    assert reports[0].error == "HTTP 503 InternalError: Try again"
+    assert reports[0].failed_requests == 3
+    assert reports[1].footprints == 3
+
+
+def test_invalid_footprints_are_counted_and_skipped(footprints):
+    stand_in = StandIn(footprints)
+    del stand_in.footprints[1]["companyName"]
+    stand_in.footprints[4]["pcf"]["declaredUnit"] = "bushel"
+    received = []
+
+    [report] = run_hosts([stand_in], received.append, limit=2)
+
+    assert received == [footprints[0], footprints[2], footprints[3], footprints[5]]
+    assert (report.footprints, report.invalid_footprints, report.error) == (4, 2, None)
+    assert len(report.invalid_errors) == 2
+
+
+def test_async_sink(footprints):
+    received = []
+
+    async def sink(footprint):
+        await asyncio.sleep(0)
+        received.append(footprint)
+
+    run_hosts([StandIn(footprints)], sink)
+    assert received == footprints
+
+
+def test_sink_errors_are_raised(footprints):
+    def sink(footprint):
+        raise ValueError("Repository is full")
+
+    with pytest.raises(ValueError, match="Repository is full"):
+        run_hosts([StandIn(footprints)], sink)
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError, match="max_concurrency"):
+        asyncio.run(fetch_all([], print, max_concurrency=0))
+    with pytest.raises(ValueError, match="limit"):
+        asyncio.run(fetch_all([], print, limit=0))
+    with pytest.raises(ValueError):
+        Endpoint("host", "not a url", "client", "secret")
+
+
+def test_latency():
+    report = HostReport("host", latencies=[0.4, 0.1, 0.3, 0.2])
+    assert report.latency() == 0.2
+    assert report.latency(0.95) == 0.4
+    assert report.latency(0) == 0.1
+    assert HostReport("host").latency() is None
+
+
+def test_retry_policy_delay():
+    policy = RetryPolicy(backoff=1.0, max_backoff=3.0)
+    assert 0.5 <= policy.delay(1) <= 1.0
+    assert policy.delay(10) <= 3.0
+    assert policy.delay(1, retry_after=2.5) == 2.5
+    with pytest.raises(ValueError):
+        RetryPolicy(attempts=0)
+
+
+def test_rate_limiter():
+    async def run():
+        limiter = RateLimiter(rate=50.0, burst=2)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for _ in range(5):
+            await limiter.acquire()
+        return loop.time() - start
+
+    # Two requests start at once and the other three wait 20 ms each.
+    assert 0.05 <= asyncio.run(run()) < 0.5
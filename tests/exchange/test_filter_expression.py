@@ -0,0 +1,155 @@
+import pytest
+
+from pact_methodology.aggregation.footprint_table import FootprintTable
+from pact_methodology.carbon_footprint.geographical_scope import CarbonFootprintGeographicalScope
+from pact_methodology.datetime import DateTime
+from pact_methodology.exceptions import FilterError
+from pact_methodology.exchange.filter_expression import compile_filter
+from pact_methodology.product_footprint.company_id_list import CompanyIdList
+from pact_methodology.product_footprint.status import Status
+from pact_methodology.repository.repository import FootprintRepository
+from pact_methodology.urn import CompanyId
+
+ACME = "urn:pathfinder:company:customcode:buyer-assigned:acme-corp"
+OTHER = "urn:pathfinder:company:customcode:buyer-assigned:other"
+
+
+@pytest.fixture
+def footprints(make_product_footprint, make_carbon_footprint, cpc_code_lookup):
+    return [
+        make_product_footprint(created=DateTime("2024-03-01T00:00:00Z")),
+        make_product_footprint(
+            created=DateTime("2024-01-01T00:00:00Z"),
+            product_category_cpc=cpc_code_lookup.lookup("2311"),
+            pcf=make_carbon_footprint(geographical_scope=CarbonFootprintGeographicalScope(geography_country="DE")),
+        ),
+        make_product_footprint(
+            created=DateTime("2024-02-01T00:00:00Z"),
+            updated=DateTime("2024-04-01T00:00:00Z"),
+            company_ids=CompanyIdList([CompanyId(OTHER)]),
+            company_name="Other Corp",
+        ),
+        make_product_footprint(created=DateTime("2024-02-01T00:00:00Z")),
+    ]
+
+
+@pytest.fixture
+def repository(footprints):
+    repository = FootprintRepository(footprints)
+    repository.set_status(footprints[3].id, Status.DEPRECATED)
+    return repository
+
+
+EXPRESSIONS = [
+    ("productCategoryCpc eq '2311'", True),
+    ("productCategoryCpc ne '2311'", False),
+    ("created ge '2024-02-01T00:00:00Z'", True),
+    ("created gt 2024-02-01T00:00:00Z", True),
+    ("created le '2024-02-01T00:00:00.000Z'", True),
+    ("created lt '2024-02-01T00:00:00Z' or created eq '2024-03-01T00:00:00Z'", True),
+    ("status eq 'Deprecated'", True),
+    ("not (status eq 'Active')", False),
+    ("companyName eq 'Other Corp' and version ge 1", False),
+    ("pcf/geographyCountry eq 'DE'", False),
+    ("pcf/geographyCountry ne 'DE'", False),
+    ("pcf/geographyCountry eq null", False),
+    (f"companyIds/any(c: c eq '{OTHER}')", True),
+    (f"companyIds/any(c: (c eq '{OTHER}' or c eq '{ACME}'))", True),
+    (f"companyIds/any(c: c ne '{ACME}')", False),
+    ("productIds/any(p: p eq 'urn:pathfinder:product:customcode:buyer-assigned:acme-widget')", True),
+    (f"companyIds/any(c: c eq '{ACME}') and created lt '2024-02-01T00:00:00Z'", True),
+    ("updated ge '2024-01-01T00:00:00Z'", False),
+    ("updated eq null", False),
+    ("pcf/referencePeriodStart ge '2023-01-01T00:00:00Z' and pcf/referencePeriodEnd lt '2024-01-01T00:00:00Z'", False),
+]
+
+
+@pytest.mark.parametrize("expression, indexed", EXPRESSIONS)
+def test_apply_matches_scan(repository, expression, indexed):
+    compiled = compile_filter(expression)
+    expected = [footprint for footprint in repository if compiled.matches(footprint)]
+
+    assert compiled.apply(repository) == expected
+    assert (compiled.candidates(repository) is not None) == indexed
+
+
+@pytest.mark.parametrize("expression, indexed", EXPRESSIONS)
+def test_mask_matches_scan(repository, expression, indexed):
+    compiled = compile_filter(expression)
+    table = FootprintTable.from_footprints(repository)
+    if "Ids/" in expression or "updated" in expression or "referencePeriod" in expression:
+        with pytest.raises(FilterError, match="is not a column of FootprintTable"):
+            compiled.mask(table)
+        return
+
+    mask = compiled.mask(table)
+
+    assert mask.tolist() == [compiled.matches(footprint) for footprint in repository]
+    assert len(table.select(mask)) == mask.sum()
+
+
+def test_results(repository, footprints):
+    assert compile_filter("productCategoryCpc eq '2311'").apply(repository) == [footprints[1]]
+    assert compile_filter(f"companyIds/any(c: c eq '{OTHER}')").apply(repository) == [footprints[2]]
+    assert compile_filter("created eq '2024-02-01T00:00:00Z'").apply(repository) == sorted(
+        [repository[footprints[2].id], repository[footprints[3].id]], key=lambda footprint: footprint.id.bytes
+    )
+    assert compile_filter("status eq 'Deprecated'").apply(repository) == [repository[footprints[3].id]]
+    assert compile_filter("pcf/geographyCountry eq 'DE'").apply(repository) == [footprints[1]]
+    assert compile_filter("updated eq null").apply(repository) == [
+        footprint for footprint in repository if footprint.id != footprints[2].id
+    ]
+    assert compile_filter("productCategoryCpc eq 'It''s'").apply(repository) == []
+
+
+def test_compiled_filters_are_cached():
+    assert compile_filter("status eq 'Active'") is compile_filter("status eq 'Active'")
+
+
+@pytest.mark.parametrize(
+    "expression, message",
+    [
+        ("", "Expected a field, got end of filter expression"),
+        ("unknown eq 'x'", "Unsupported field 'unknown' at position 0"),
+        ("status eq", "Expected a literal, got end of filter expression"),
+        ("status is 'Active'", "Expected a comparison operator, got 'is' at position 7"),
+        ("status eq 'Active' extra", "Unexpected 'extra' at position 19"),
+        ("(status eq 'Active'", "Expected ')', got end of filter expression"),
+        ("status eq 'Active' & version eq 1", "Invalid character '&' at position 19"),
+        ("version eq '1'", "version must be compared with an integer"),
+        ("created ge '2024-01-01'", "created must be compared with a UTC date-time"),
+        ("created ge '2024-01-01T00:00:00+02:00'", "created must be compared with a UTC date-time"),
+        ("companyIds eq 'x'", "companyIds can only be filtered with any"),
+        ("status/any(s: s eq 'Active')", "any is not supported on 'status'"),
+        ("companyIds/any(c: status eq 'Active')", "Only the lambda variable can be used within any"),
+        ("companyIds/any(c: c eq 1)", "c must be compared with a string"),
+    ],
+)
+def test_invalid_expressions(expression, message):
+    with pytest.raises(FilterError, match=message.replace("(", r"\(").replace(")", r"\)")):
+        compile_filter(expression)
+
+
+@pytest.mark.parametrize("expression, indexed", EXPRESSIONS)
+def test_pages_match_apply(repository, expression, indexed):
+    compiled = compile_filter(expression)
+    pages = []
+    footprints, cursor = compiled.page(repository, 1)
+    pages += footprints
+    while cursor is not None:
+        footprints, cursor = compiled.page(repository, 1, cursor)
+        pages += footprints
+
+    assert pages == compiled.apply(repository)
+
+
+def test_candidates_are_kept_per_revision(repository, footprints):
+    compiled = compile_filter("status eq 'Active' and created ge '2024-02-01T00:00:00Z'")
+    candidates = compiled.candidates(repository)
+
+    assert candidates.start == DateTime("2024-02-01T00:00:00Z").iso_datetime
+    assert candidates.keys == repository.lookup("status", "Active")
+    assert compiled.candidates(repository) is candidates
+    assert compiled.candidates(FootprintRepository(footprints)) is not candidates
+    repository.set_status(footprints[0].id, Status.DEPRECATED)
+    assert compiled.candidates(repository).keys == repository.lookup("status", "Active")
@@ -0,0 +1,129 @@
+import asyncio
+
+import pytest
+
+from pact_methodology.exchange.http import ConnectionPool, parse_headers, read_response, split_url
+
+
+def read(data: bytes, method: str = "GET"):
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        return await read_response(reader, method)
+
+    return asyncio.run(run())
+
+
+def test_read_response_with_content_length():
+    response, keep_alive = read(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\nX-A: 1\r\nX-A: 2\r\n\r\n{}")
+    assert response.status == 200
+    assert response.json() == {}
+    assert response.headers["x-a"] == "1, 2"
+    assert keep_alive
+
+
+def test_read_chunked_response():
+    response, _ = read(b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n3\r\nabc\r\n2;x=y\r\nde\r\n0\r\n\r\n")
+    assert response.body == b"abcde"
+
+
+@pytest.mark.parametrize(
+    "data, keep_alive",
+    [
+        (b"HTTP/1.1 200 OK\r\nConnection: close\r\nContent-Length: 0\r\n\r\n", False),
+        (b"HTTP/1.0 200 OK\r\nContent-Length: 0\r\n\r\n", False),
+        (b"HTTP/1.0 200 OK\r\nConnection: keep-alive\r\nContent-Length: 0\r\n\r\n", True),
+        (b"HTTP/1.1 200 OK\r\n\r\nuntil closed", False),
+    ],
+)
+def test_keep_alive(data, keep_alive):
+    assert read(data)[1] is keep_alive
+
+
+def test_read_response_without_body():
+    response, keep_alive = read(b"HTTP/1.1 204 No Content\r\n\r\n")
+    assert response.body == b""
+    assert keep_alive
+
+
+def test_read_invalid_response():
+    with pytest.raises(ValueError, match="Invalid HTTP status line"):
+        read(b"SSH-2.0-OpenSSH\r\n\r\n")
+    with pytest.raises(asyncio.IncompleteReadError):
+        read(b"HTTP/1.1 200 OK\r\nContent-Length: 10\r\n\r\nshort")
+
+
+def test_parse_invalid_header():
+    with pytest.raises(ValueError, match="Invalid HTTP header"):
+        parse_headers(["no separator"])
+
+
+def test_split_url():
+    assert split_url("https://example.com:8443/2/footprints?limit=1") == (
+        "https://example.com:8443",
+        "/2/footprints?limit=1",
+    )
+    assert split_url("http://example.com") == ("http://example.com", "/")
+    with pytest.raises(ValueError):
+        split_url("/2/footprints")
+
+
+def test_pool_retries_closed_idle_connection():
+    async def handle(reader, writer):
+        await reader.readuntil(b"\r\n\r\n")
+        # Claim keep-alive, then close the connection anyway.
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+        await writer.drain()
+        writer.close()
+
+    async def run():
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        async with server:
+            pool = ConnectionPool(f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}")
+            first = await pool.request("GET", "/")
+            await asyncio.sleep(0.05)
+            second = await pool.request("GET", "/")
+            await pool.close()
+            return first.body, second.body, pool.connections_opened
+
+    assert asyncio.run(run()) == (b"ok", b"ok", 2)
+
+
+@pytest.mark.parametrize("method, received", [("GET", 3), ("POST", 2)])
+def test_pool_resends_only_idempotent_requests(method, received):
+    requests = []
+
+    async def handle(reader, writer):
+        await reader.readuntil(b"\r\n\r\n")
+        requests.append(writer)
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+        await writer.drain()
+        # Drop the next request on this connection without answering it.
+        await reader.readuntil(b"\r\n\r\n")
+        requests.append(writer)
+        writer.close()
+
+    async def run():
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        async with server:
+            pool = ConnectionPool(f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}")
+            await pool.request(method, "/")
+            try:
+                return (await pool.request(method, "/")).body
+            finally:
+                await pool.close()
+
+    if method == "GET":
+        assert asyncio.run(run()) == b"ok"
+    else:
+        with pytest.raises(asyncio.IncompleteReadError):
+            asyncio.run(run())
+    assert len(requests) == received
+
+
+def test_pool_validates_origin():
+    with pytest.raises(ValueError, match="origin"):
+        ConnectionPool("https://example.com/path")
+    with pytest.raises(ValueError, match="max_connections"):
+        ConnectionPool("https://example.com", max_connections=0)
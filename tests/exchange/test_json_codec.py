@@ -0,0 +1,102 @@
+import json
+
+import pytest
+
+from pact_methodology.carbon_footprint.geographical_scope import CarbonFootprintGeographicalScope
+from pact_methodology.carbon_footprint.region_or_subregion import RegionOrSubregion
+from pact_methodology.exchange.json_codec import (
+    decode_carbon_footprint,
+    decode_decimal,
+    decode_product_footprint,
+    dumps,
+    encode,
+    encode_decimal,
+    loads,
+)
+from pact_methodology.exchange.patch import apply_patch
+
+
+def test_round_trip(make_product_footprint):
+    footprint = make_product_footprint()
+    assert loads(dumps(footprint)) == footprint
+
+
+def test_encoding(make_product_footprint):
+    encoded = encode(make_product_footprint())
+
+    assert encoded["specVersion"] == "2.2.0"
+    assert encoded["status"] == "Active"
+    assert "statusComment" not in encoded
+    assert encoded["productCategoryCpc"] == "0111"
+    assert encoded["pcf"]["pCfExcludingBiogenic"] == "0.5"
+    assert encoded["pcf"]["crossSectoralStandardsUsed"] == ["GHG Protocol Product standard"]
+    assert encoded["pcf"]["referencePeriodStart"] == "2023-01-01T00:00:00Z"
+    assert encoded["pcf"]["dqi"]["technologicalDQR"] == 2
+    assert encoded["pcf"]["assurance"]["completedAt"] == "2024-02-01T00:00:00Z"
+    assert "geographyCountry" not in encoded["pcf"]
+    json.dumps(encoded)
+
+
+@pytest.mark.parametrize(
+    "scope, member, value",
+    [
+        (CarbonFootprintGeographicalScope(geography_country="DE"), "geographyCountry", "DE"),
+        (CarbonFootprintGeographicalScope(geography_country_subdivision="DE-BY"), "geographyCountrySubdivision", "DE-BY"),
+        (
+            CarbonFootprintGeographicalScope(geography_region_or_subregion=RegionOrSubregion.EUROPE),
+            "geographyRegionOrSubregion",
+            "Europe",
+        ),
+    ],
+)
+def test_geography(make_carbon_footprint, scope, member, value):
+    encoded = encode(make_carbon_footprint(geographical_scope=scope))
+
+    assert encoded[member] == value
+    assert decode_carbon_footprint(encoded).geographical_scope.scope == scope.scope
+
+
+@pytest.mark.parametrize("value, text", [(0.5, "0.5"), (1, "1.0"), (1.2e-06, "0.0000012"), (None, None)])
+def test_encode_decimal(value, text):
+    assert encode_decimal(value) == text
+
+
+def test_decode_decimal():
+    assert decode_decimal("0.0000012") == 1.2e-06
+    assert decode_decimal(3) == 3.0
+    for invalid in ("abc", True, [1], "NaN", "-Infinity", "1e999", float("nan"), float("inf"), 10**400):
+        with pytest.raises(ValueError, match="Invalid decimal"):
+            decode_decimal(invalid)
+
+
+def test_missing_required_member(make_product_footprint):
+    encoded = encode(make_product_footprint())
+    del encoded["pcf"]["declaredUnit"]
+    with pytest.raises(ValueError, match="declaredUnit"):
+        decode_product_footprint(encoded)
+
+
+def test_invalid_members(make_product_footprint):
+    encoded = encode(make_product_footprint())
+    encoded["productCategoryCpc"] = "not a code"
+    with pytest.raises(ValueError):
+        decode_product_footprint(encoded)
+    with pytest.raises(ValueError):
+        decode_product_footprint([])
+
+
+@pytest.mark.parametrize("member", ["validityPeriodStart", "validityPeriodEnd"])
+def test_incomplete_validity_period(make_product_footprint, member):
+    footprint = make_product_footprint()
+    encoded = encode(footprint)
+    del encoded[member]
+
+    with pytest.raises(ValueError, match="must be defined together"):
+        decode_product_footprint(encoded)
+    with pytest.raises(ValueError, match="must be defined together"):
+        apply_patch(footprint, [{"op": "remove", "path": f"/{member}"}])
+
+
+def test_unsupported_type():
+    with pytest.raises(ValueError):
+        encode("not a model object")
@@ -0,0 +1,185 @@
+import pytest
+
+from pact_methodology.carbon_footprint.region_or_subregion import RegionOrSubregion
+from pact_methodology.datetime import DateTime
+from pact_methodology.exceptions import JsonPatchError
+from pact_methodology.exchange.json_codec import encode
+from pact_methodology.exchange.patch import apply_patch, apply_patches, parse_pointer
+from pact_methodology.urn import ProductId
+
+
+@pytest.fixture
+def footprint(make_product_footprint):
+    return make_product_footprint()
+
+
+def test_replace(footprint):
+    digest = footprint.content_digest
+
+    result = apply_patch(
+        footprint,
+        [
+            {"op": "replace", "path": "/pcf/pCfExcludingBiogenic", "value": "0.75"},
+            {"op": "replace", "path": "/pcf/dqi/technologicalDQR", "value": 1},
+            {"op": "replace", "path": "/companyName", "value": "Acme Inc"},
+        ],
+    )
+
+    assert result is footprint
+    assert footprint.pcf.p_cf_excluding_biogenic == 0.75
+    assert footprint.pcf.dqi.technological_dqr.rating == 1
+    assert footprint.company_name == "Acme Inc"
+    assert footprint.content_digest != digest
+
+
+def test_add_and_remove(footprint):
+    apply_patch(
+        footprint,
+        [
+            {"op": "add", "path": "/productIds/-", "value": "urn:pathfinder:product:customcode:buyer-assigned:gadget"},
+            {"op": "add", "path": "/statusComment", "value": "Reviewed"},
+            {"op": "remove", "path": "/pcf/assurance"},
+            {"op": "add", "path": "/pcf/geographyRegionOrSubregion", "value": "Europe"},
+        ],
+    )
+
+    assert footprint.product_ids[1] == ProductId("urn:pathfinder:product:customcode:buyer-assigned:gadget")
+    assert footprint.status_comment == "Reviewed"
+    assert footprint.pcf.assurance is None
+    assert footprint.pcf.geographical_scope.scope == RegionOrSubregion.EUROPE
+
+
+def test_nested_values(footprint):
+    apply_patch(
+        footprint,
+        [
+            {"op": "replace", "path": "/pcf/secondaryEmissionFactorSources/0/version", "value": "3.10"},
+            {"op": "add", "path": "/extensions/0/data/other", "value": 1},
+            {"op": "copy", "from": "/pcf/ipccCharacterizationFactorsSources/0", "path": "/pcf/ipccCharacterizationFactorsSources/-"},
+        ],
+    )
+
+    assert footprint.pcf.secondary_emission_factor_sources.emission_factor_ds_list[0].version == "3.10"
+    assert footprint.extensions[0].data == {"key": "value", "other": 1}
+    assert footprint.pcf.ipcc_characterization_factors_sources == ["AR6", "AR6"]
+
+
+def test_move_and_test(footprint):
+    apply_patch(
+        footprint,
+        [
+            {"op": "test", "path": "/pcf/dqi/coveragePercent", "value": 80},
+            {"op": "add", "path": "/statusComment", "value": "Reviewed"},
+            {"op": "move", "from": "/statusComment", "path": "/comment"},
+        ],
+    )
+    assert footprint.comment == "Reviewed"
+    assert footprint.status_comment is None
+
+    with pytest.raises(JsonPatchError, match="test failed"):
+        apply_patch(footprint, [{"op": "test", "path": "/pcf/packagingEmissionsIncluded", "value": 1}])
+
+
+def test_reference_period_members_are_applied_together(footprint):
+    apply_patch(
+        footprint,
+        [
+            {"op": "replace", "path": "/pcf/referencePeriodStart", "value": "2024-01-01T00:00:00Z"},
+            {"op": "replace", "path": "/pcf/referencePeriodEnd", "value": "2024-12-31T23:59:59Z"},
+        ],
+    )
+
+    assert footprint.pcf.reference_period.start == DateTime("2024-01-01T00:00:00Z")
+    assert footprint.pcf.dqi.reference_period is footprint.pcf.reference_period
+
+
+def test_packaging_members_are_applied_together(footprint):
+    apply_patch(
+        footprint,
+        [
+            {"op": "remove", "path": "/pcf/packagingGhgEmissions"},
+            {"op": "replace", "path": "/pcf/packagingEmissionsIncluded", "value": False},
+        ],
+    )
+    assert footprint.pcf.packaging_ghg_emissions is None
+
+    with pytest.raises(JsonPatchError):
+        apply_patch(footprint, [{"op": "replace", "path": "/pcf/packagingEmissionsIncluded", "value": True}])
+
+
+def test_reference_period_rules(footprint):
+    apply_patch(footprint, [{"op": "remove", "path": "/pcf/biogenicAccountingMethodology"}])
+
+    with pytest.raises(JsonPatchError, match="2025 or later"):
+        apply_patch(footprint, [{"op": "replace", "path": "/pcf/referencePeriodEnd", "value": "2025-06-30T00:00:00Z"}])
+
+    apply_patch(
+        footprint,
+        [
+            {"op": "replace", "path": "/pcf/referencePeriodEnd", "value": "2025-06-30T00:00:00Z"},
+            {"op": "add", "path": "/pcf/biogenicAccountingMethodology", "value": "PEF"},
+        ],
+    )
+    assert footprint.pcf.reference_period.includes_2025_or_later()
+
+    with pytest.raises(JsonPatchError, match="2025 or later"):
+        apply_patch(footprint, [{"op": "remove", "path": "/pcf/dqi/reliabilityDQR"}])
+
+
+def test_failed_patch_is_rolled_back(footprint):
+    before = encode(footprint)
+    digest = footprint.content_digest
+
+    with pytest.raises(JsonPatchError, match="Operation 1"):
+        apply_patch(
+            footprint,
+            [
+                {"op": "replace", "path": "/pcf/pCfExcludingBiogenic", "value": "0.75"},
+                {"op": "replace", "path": "/pcf/dqi/technologicalDQR", "value": 7},
+            ],
+        )
+
+    assert encode(footprint) == before
+    assert footprint.content_digest == digest
+
+
+@pytest.mark.parametrize(
+    "operation",
+    [
+        {"op": "replace", "path": "/unknownMember", "value": 1},
+        {"op": "replace", "path": "/statusComment", "value": "not defined yet"},
+        {"op": "remove", "path": "/companyName"},
+        {"op": "add", "path": "/productIds/5", "value": "urn:pathfinder:product:customcode:buyer-assigned:x"},
+        {"op": "replace", "path": "/pcf/pCfExcludingBiogenic"},
+        {"op": "frobnicate", "path": "/comment"},
+        {"op": "replace", "path": "", "value": {}},
+        {"op": "move", "from": "/pcf", "path": "/pcf/dqi"},
+    ],
+)
+def test_invalid_operations(footprint, operation):
+    with pytest.raises(JsonPatchError):
+        apply_patch(footprint, [operation])
+
+
+def test_apply_patches(make_product_footprint):
+    first, second = make_product_footprint(), make_product_footprint()
+
+    errors = apply_patches(
+        [
+            (first, [{"op": "replace", "path": "/version", "value": 2}]),
+            (second, [{"op": "replace", "path": "/version", "value": -1}]),
+        ]
+    )
+
+    assert errors[0] is None
+    assert isinstance(errors[1], JsonPatchError)
+    assert first.version.version == 2
+    assert second.version.version == 1
+
+
+def test_parse_pointer():
+    assert parse_pointer("/a~1b/c~0d/0") == ["a/b", "c~d", "0"]
+    assert parse_pointer("") == []
+    for invalid in ("a/b", "/a~2"):
+        with pytest.raises(ValueError):
+            parse_pointer(invalid)
@@ -0,0 +1,222 @@
+import asyncio
+import base64
+import json
+from contextlib import asynccontextmanager
+
+import pytest
+
+from pact_methodology.exceptions import PactApiError
+from pact_methodology.exchange.client import PactClient, parse_link_header
+from pact_methodology.exchange.http import ConnectionPool, split_url
+from pact_methodology.exchange.server import PUBLISHED_EVENT, PactServer
+from pact_methodology.product_footprint.status import Status
+from pact_methodology.repository.repository import FootprintRepository
+
+CREDENTIALS = {"client": "secret"}
+BASIC = "Basic " + base64.b64encode(b"client:secret").decode()
+
+
+@pytest.fixture
+def footprints(make_product_footprint, make_carbon_footprint):
+    return [make_product_footprint(pcf=make_carbon_footprint(p_cf_excluding_biogenic=float(i))) for i in range(5)]
+
+
+@asynccontextmanager
+async def running(server):
+    listener = await server.start()
+    async with listener:
+        yield f"http://127.0.0.1:{listener.sockets[0].getsockname()[1]}"
+
+
+def run(server, scenario):
+    async def main():
+        async with running(server) as origin:
+            return await scenario(origin)
+
+    return asyncio.run(main())
+
+
+async def bearer(pool):
+    response = await pool.request(
+        "POST", "/auth/token", {"Authorization": BASIC}, b"grant_type=client_credentials"
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_client_lists_and_gets_footprints(footprints):
+    server = PactServer(FootprintRepository(footprints), CREDENTIALS, page_size=2)
+
+    async def scenario(origin):
+        async with PactClient(origin, "client", "secret") as client:
+            listed = [footprint async for footprint in client.list_footprints()]
+            fetched = await client.get_footprint(footprints[3].id)
+        return listed, fetched
+
+    listed, fetched = run(server, scenario)
+    assert listed == list(server.repository)
+    assert fetched == footprints[3]
+
+
+def test_list_response(footprints):
+    server = PactServer(FootprintRepository(footprints), CREDENTIALS)
+
+    async def scenario(origin):
+        pool = ConnectionPool(origin)
+        headers = await bearer(pool)
+        first = await pool.request("GET", "/2/footprints?limit=3", headers)
+        link = parse_link_header(first.headers["link"])["next"]
+        last = await pool.request("GET", split_url(link)[1], headers)
+        await pool.close()
+        return origin, first, link, last, pool.connections_opened
+
+    origin, first, link, last, connections = run(server, scenario)
+    assert first.status == 200
+    assert len(first.json()["data"]) == 3
+    assert link.startswith(f"{origin}/2/footprints?limit=3&cursor=")
+    assert len(last.json()["data"]) == 2
+    assert "link" not in last.headers
+    assert connections == 1
+
+
+def test_filtered_list(footprints, make_product_footprint, cpc_code_lookup):
+    others = [make_product_footprint(product_category_cpc=cpc_code_lookup.lookup("2311")) for _ in range(3)]
+    server = PactServer(FootprintRepository(footprints + others), CREDENTIALS, page_size=2)
+
+    async def scenario(origin):
+        async with PactClient(origin, "client", "secret") as client:
+            return [footprint async for footprint in client.list_footprints(filter="productCategoryCpc eq '2311'")]
+
+    listed = run(server, scenario)
+    assert sorted(footprint.id for footprint in listed) == sorted(footprint.id for footprint in others)
+
+
+def test_pages_are_read_from_a_snapshot(footprints, make_product_footprint):
+    server = PactServer(FootprintRepository(footprints), CREDENTIALS, page_size=2)
+    first = server.repository.ordered()[0]
+    added = []
+
+    def on_response(method, url, status, seconds):
+        # Change the repository between pages: add a footprint at the start of the creation order
+        # and replace one that has not been listed yet.
+        if "cursor=" not in url and "/2/footprints" in url:
+            added.append(make_product_footprint(created=first.created))
+            server.repository.add(added[-1])
+            server.repository.set_status(server.repository.ordered()[-1].id, Status.DEPRECATED)
+
+    async def scenario(origin):
+        async with PactClient(origin, "client", "secret", on_response=on_response) as client:
+            return [footprint async for footprint in client.list_footprints()]
+
+    listed = run(server, scenario)
+    assert sorted(footprint.id for footprint in listed) == sorted(footprint.id for footprint in footprints)
+    assert all(footprint.status == Status.ACTIVE for footprint in listed)
+    assert added[0].id in server.repository
+
+
+def test_encodings_are_cached(footprints):
+    server = PactServer(FootprintRepository(footprints), CREDENTIALS)
+    footprint = server.repository.ordered()[0]
+    assert server._encode(footprint) is server._encode(footprint)
+    assert json.loads(server._encode(footprint))["id"] == str(footprint.id)
+
+
+@pytest.mark.parametrize(
+    "target, headers, status, code",
+    [
+        ("/2/footprints", {}, 403, "AccessDenied"),
+        ("/2/footprints", {"Authorization": "Bearer wrong"}, 403, "AccessDenied"),
+        ("/2/footprints/5b1f5e0e-2c2a-4d58-8f59-e4b8e8c0a8b1", None, 404, "NoSuchFootprint"),
+        ("/2/footprints/not-an-id", None, 404, "NoSuchFootprint"),
+        ("/2/footprints?limit=0", None, 400, "BadRequest"),
+        ("/2/footprints?cursor=x", None, 400, "BadRequest"),
+        ("/2/footprints?$filter=x eq 1", None, 400, "BadRequest"),
+        ("/2/unknown", None, 400, "BadRequest"),
+    ],
+)
+def test_errors(footprints, target, headers, status, code):
+    server = PactServer(FootprintRepository(footprints), CREDENTIALS)
+
+    async def scenario(origin):
+        pool = ConnectionPool(origin)
+        response = await pool.request("GET", target, headers if headers is not None else await bearer(pool))
+        await pool.close()
+        return response
+
+    response = run(server, scenario)
+    assert response.status == status
+    assert response.json()["code"] == code
+
+
+def test_expired_token(footprints):
+    server = PactServer(FootprintRepository(footprints), CREDENTIALS, token_lifetime=0.01)
+
+    async def scenario(origin):
+        pool = ConnectionPool(origin)
+        headers = await bearer(pool)
+        await asyncio.sleep(0.02)
+        response = await pool.request("GET", "/2/footprints", headers)
+        await pool.close()
+        return response
+
+    response = run(server, scenario)
+    assert response.status == 401
+    assert response.json()["code"] == "TokenExpired"
+
+
+def test_invalid_credentials(footprints):
+    server = PactServer(FootprintRepository(footprints), CREDENTIALS)
+
+    async def scenario(origin):
+        async with PactClient(origin, "client", "wrong") as client:
+            await client.token()
+
+    with pytest.raises(PactApiError, match="HTTP 401"):
+        run(server, scenario)
+
+
+def test_events(footprints):
+    events = []
+    server = PactServer(FootprintRepository(footprints), CREDENTIALS, on_event=events.append)
+    event = {
+        "type": PUBLISHED_EVENT,
+        "specversion": "1.0",
+        "id": "1",
+        "source": "//supplier.example/events",
+        "data": {"pfIds": [str(footprints[0].id)]},
+    }
+
+    async def scenario(origin):
+        pool = ConnectionPool(origin)
+        headers = {**await bearer(pool), "Content-Type": "application/cloudevents+json; charset=UTF-8"}
+        accepted = await pool.request("POST", "/2/events", headers, json.dumps(event).encode())
+        invalid = await pool.request("POST", "/2/events", headers, b'{"type": "x"}')
+        unknown = await pool.request("POST", "/2/events", headers, json.dumps({**event, "type": "x"}).encode())
+        await pool.close()
+        return accepted, invalid, unknown
+
+    accepted, invalid, unknown = run(server, scenario)
+    assert accepted.status == 200
+    assert events == [event]
+    assert invalid.json()["code"] == "BadRequest"
+    assert unknown.json()["code"] == "NotImplemented"
+
+
+def test_malformed_request(footprints):
+    server = PactServer(FootprintRepository(footprints), CREDENTIALS)
+
+    async def scenario(origin):
+        host, port = origin.removeprefix("http://").split(":")
+        reader, writer = await asyncio.open_connection(host, int(port))
+        writer.write(b"NONSENSE\r\n\r\n")
+        response = await reader.read()
+        writer.close()
+        return response
+
+    assert run(server, scenario).startswith(b"HTTP/1.1 400 Bad Request")
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError, match="page_size"):
+        PactServer(FootprintRepository(), CREDENTIALS, page_size=0)
+    with pytest.raises(ValueError, match="token_lifetime"):
+        PactServer(FootprintRepository(), CREDENTIALS, token_lifetime=0)
@@ -0,0 +1,75 @@
+import copy
+
+import pytest
+
+from pact_methodology.carbon_footprint.cross_sectoral_standard import CrossSectoralStandard
+from pact_methodology.datetime import DateTime
+from pact_methodology.product_footprint.diff import Change, ChangeKind, diff
+from pact_methodology.product_footprint.version import Version
+from pact_methodology.urn import ProductId
+
+
+@pytest.fixture
+def old(make_product_footprint):
+    return make_product_footprint()
+
+
+@pytest.fixture
+def new(old):
+    return copy.deepcopy(old)
+
+
+def test_no_changes(old, new):
+    assert diff(old, new) == []
+    assert diff(old, old) == []
+
+
+def test_changed_values(old, new):
+    new.version = Version(2)
+    new.updated = DateTime("2024-06-01T00:00:00Z")
+    new.pcf.p_cf_excluding_biogenic = 0.75
+    new.pcf.dqi.coverage_percent = 90.0
+
+    assert diff(old, new) == [
+        Change("version", ChangeKind.CHANGED, Version(1), Version(2)),
+        Change("updated", ChangeKind.ADDED, None, new.updated),
+        Change("pcf.p_cf_excluding_biogenic", ChangeKind.CHANGED, 0.5, 0.75),
+        Change("pcf.dqi.coverage_percent", ChangeKind.CHANGED, 80.0, 90.0),
+    ]
+
+
+def test_ignored_paths(old, new):
+    new.version = Version(2)
+    new.pcf.dqi.coverage_percent = 90.0
+    assert diff(old, new, ignore=("version", "pcf.dqi")) == []
+
+
+def test_list_items(old, new):
+    added = ProductId("urn:pathfinder:product:customcode:buyer-assigned:acme-gadget")
+    new.product_ids.append(added)
+    new.extensions = None
+
+    changes = diff(old, new)
+
+    assert changes[0] == Change("product_ids[1]", ChangeKind.ADDED, None, added)
+    assert changes[1].path == "extensions"
+    assert changes[1].kind == ChangeKind.REMOVED
+
+
+def test_set_members(old, new):
+    new.pcf.cross_sectoral_standards_used.add(CrossSectoralStandard.ISO_14067)
+
+    (change,) = diff(old, new)
+
+    assert change.path == "pcf.cross_sectoral_standards_used"
+    assert CrossSectoralStandard.ISO_14067 in change.new
+
+
+def test_integral_floats_are_not_changes(old, new):
+    new.pcf.unitary_product_amount = 1
+    assert diff(old, new) == []
+
+
+def test_invalid_arguments(old):
+    with pytest.raises(ValueError):
+        diff(old, "not a footprint")
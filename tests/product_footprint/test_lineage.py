@@ -0,0 +1,168 @@
+import pytest
+
+from pact_methodology.exceptions import DuplicateIdError, LineageCycleError
+from pact_methodology.product_footprint.id import ProductFootprintId
+from pact_methodology.product_footprint.lineage import VersionLineage
+from pact_methodology.product_footprint.product_id_list import ProductIdList
+from pact_methodology.product_footprint.status import ProductFootprintStatus, Status
+from pact_methodology.product_footprint.version import Version
+from pact_methodology.urn import ProductId
+
+
+PRODUCT_ID = ProductId("urn:pathfinder:product:customcode:buyer-assigned:acme-widget")
+OTHER_PRODUCT_ID = ProductId("urn:pathfinder:product:customcode:buyer-assigned:acme-gadget")
+
+
+@pytest.fixture
+def make_version(make_product_footprint):
+    def _make(version, preceding=None, status=Status.ACTIVE, product_id=PRODUCT_ID):
+        return make_product_footprint(
+            version=Version(version),
+            status_info=ProductFootprintStatus(status=status),
+            product_ids=ProductIdList([product_id]),
+            preceding_pf_ids=[footprint.id for footprint in preceding] if preceding else None,
+        )
+
+    return _make
+
+
+def test_single_footprint_is_head(make_version):
+    lineage = VersionLineage()
+    first = make_version(1)
+    lineage.add(first)
+
+    assert len(lineage) == 1
+    assert first.id in lineage
+    assert lineage.head(PRODUCT_ID) == first.id
+    assert lineage.is_head(first.id)
+    assert lineage.history(first.id) == [first.id]
+
+
+def test_new_version_replaces_head(make_version):
+    lineage = VersionLineage()
+    first = make_version(1)
+    second = make_version(2, preceding=[first])
+    third = make_version(3, preceding=[second])
+    lineage.add_all([first, second, third])
+
+    assert lineage.head(PRODUCT_ID) == third.id
+    assert lineage.heads(PRODUCT_ID) == [third.id]
+    assert lineage.history(third.id) == [third.id, second.id, first.id]
+    assert lineage.successors(first.id) == [second.id]
+    assert lineage.predecessors(third.id) == [second.id]
+    assert not lineage.is_head(first.id)
+
+
+def test_out_of_order_insertion(make_version):
+    lineage = VersionLineage()
+    first = make_version(1)
+    second = make_version(2, preceding=[first])
+    lineage.add(second)
+    lineage.add(first)
+
+    assert lineage.head(PRODUCT_ID) == second.id
+    assert lineage.history(second.id) == [second.id, first.id]
+
+
+def test_history_skips_unknown_predecessors(make_version):
+    lineage = VersionLineage()
+    missing = make_version(1)
+    second = make_version(2, preceding=[missing])
+    lineage.add(second)
+
+    assert lineage.history(second.id) == [second.id]
+
+
+def test_fork_is_detected(make_version):
+    lineage = VersionLineage()
+    first = make_version(1)
+    branch_a = make_version(2, preceding=[first])
+    branch_b = make_version(3, preceding=[first])
+    lineage.add_all([first, branch_a, branch_b])
+
+    assert lineage.forks == {first.id}
+    assert lineage.heads(PRODUCT_ID) == [branch_b.id, branch_a.id]
+    assert lineage.head(PRODUCT_ID) == branch_b.id
+
+
+def test_merge_history_lists_each_ancestor_once(make_version):
+    lineage = VersionLineage()
+    first = make_version(1)
+    branch_a = make_version(2, preceding=[first])
+    branch_b = make_version(2, preceding=[first])
+    merged = make_version(3, preceding=[branch_a, branch_b])
+    lineage.add_all([first, branch_a, branch_b, merged])
+
+    assert lineage.heads(PRODUCT_ID) == [merged.id]
+    assert lineage.history(merged.id) == [merged.id, branch_a.id, branch_b.id, first.id]
+
+
+def test_deprecated_head_is_not_active(make_version):
+    lineage = VersionLineage()
+    first = make_version(1, status=Status.DEPRECATED)
+    lineage.add(first)
+
+    assert lineage.head(PRODUCT_ID) is None
+    assert lineage.heads(PRODUCT_ID) == [first.id]
+
+    lineage.set_status(first.id, Status.ACTIVE)
+    assert lineage.head(PRODUCT_ID) == first.id
+
+
+def test_heads_are_kept_per_product(make_version):
+    lineage = VersionLineage()
+    widget = make_version(1)
+    gadget = make_version(1, product_id=OTHER_PRODUCT_ID)
+    lineage.add_all([widget, gadget])
+
+    assert lineage.head(PRODUCT_ID) == widget.id
+    assert lineage.head(OTHER_PRODUCT_ID) == gadget.id
+
+
+def test_unknown_product_has_no_head():
+    assert VersionLineage().head(PRODUCT_ID) is None
+
+
+def test_self_reference_is_a_cycle(make_version):
+    footprint = make_version(1)
+    footprint.preceding_pf_ids = [footprint.id]
+    with pytest.raises(LineageCycleError):
+        VersionLineage().add(footprint)
+
+
+def test_cycle_is_detected(make_version):
+    lineage = VersionLineage()
+    first = make_version(1)
+    second = make_version(2, preceding=[first])
+    first.preceding_pf_ids = [second.id]
+    lineage.add(second)
+
+    with pytest.raises(LineageCycleError):
+        lineage.add(first)
+    assert first.id not in lineage
+
+
+def test_duplicate_id_is_rejected(make_version):
+    lineage = VersionLineage()
+    first = make_version(1)
+    lineage.add(first)
+    with pytest.raises(DuplicateIdError):
+        lineage.add(first)
+
+
+def test_add_rejects_non_footprint():
+    with pytest.raises(ValueError, match="footprint must be an instance of ProductFootprint"):
+        VersionLineage().add("footprint")
+
+
+def test_set_status_unknown_id():
+    with pytest.raises(KeyError):
+        VersionLineage().set_status(ProductFootprintId(), Status.ACTIVE)
+
+
+def test_set_status_invalid_status(make_version):
+    lineage = VersionLineage()
+    first = make_version(1)
+    lineage.add(first)
+    with pytest.raises(ValueError, match="status must be an instance of Status"):
+        lineage.set_status(first.id, "Active")
@@ -18,6 +18,9 @@ from pact_methodology.product_footprint.product_id_list import ProductIdList
 from pact_methodology.product_footprint.company_id_list import CompanyIdList
 from pact_methodology.product_footprint.cpc import CPCCodeLookup, CPC
 from pact_methodology.product_footprint.version import Version
+from pact_methodology.frozen import freeze, is_frozen, replace, thaw
+from pact_methodology.exchange.json_codec import encode
+from pact_methodology.exchange.patch import apply_patch
 from pact_methodology.datetime import DateTime
 from pact_methodology.carbon_footprint.characterization_factors import (
     CharacterizationFactors,
@@ -658,3 +661,87 @@ def test_product_footprint_ne(valid_product_footprint_data):
     product_footprint1 = ProductFootprint(**valid_product_footprint_data)
     product_footprint2 = ProductFootprint(**{**valid_product_footprint_data, "company_name": "Different Company Name"})
     assert product_footprint1 != product_footprint2
+
+
+def test_product_footprint_hash(valid_product_footprint_data):
+    product_footprint = ProductFootprint(**valid_product_footprint_data)
+    same = ProductFootprint(**valid_product_footprint_data)
+    different = ProductFootprint(**{**valid_product_footprint_data, "comment": "Different comment"})
+
+    assert len({product_footprint, same, different}) == 2
+    assert product_footprint != "not a footprint"
+
+
+def test_product_footprint_new_version(make_product_footprint):
+    first = make_product_footprint()
+    updated = DateTime("2024-06-01T00:00:00Z")
+
+    second = first.new_version(comment="Second version", updated=updated)
+
+    assert second.id != first.id
+    assert second.version == Version(2)
+    assert second.preceding_pf_ids == [first.id]
+    assert second.updated == updated
+    assert second.comment == "Second version"
+    assert second.pcf is first.pcf
+    assert second.product_ids is first.product_ids
+    assert first.version == Version(1)
+    assert first.comment == "Comment"
+    assert first.preceding_pf_ids is None
+
+    third = second.new_version()
+    assert third.preceding_pf_ids == [first.id, second.id]
+    assert third.updated is not None
+
+
+def test_product_footprint_new_version_pcf_changes(make_product_footprint):
+    first = make_product_footprint()
+
+    second = first.new_version(pcf_changes={"p_cf_excluding_biogenic": 0.75})
+
+    assert second.pcf is not first.pcf
+    assert second.pcf.p_cf_excluding_biogenic == 0.75
+    assert first.pcf.p_cf_excluding_biogenic == 0.5
+    assert second.pcf.dqi is first.pcf.dqi
+    assert second.pcf.changed_fields == frozenset()
+
+
+def test_product_footprint_new_version_leaves_old_version_unchanged(make_product_footprint):
+    first = make_product_footprint()
+    before = encode(first)
+    second = first.new_version()
+
+    second.comment = "Second version"
+    second.pcf = replace(second.pcf, fossil_ghg_emissions=0.1)
+    third = thaw(second)
+    apply_patch(
+        third,
+        [
+            {"op": "replace", "path": "/pcf/pCfExcludingBiogenic", "value": "0.9"},
+            {"op": "replace", "path": "/pcf/dqi/coveragePercent", "value": 50},
+        ],
+    )
+    third.product_ids.product_ids.append(ProductId("urn:pathfinder:product:customcode:buyer-assigned:other"))
+
+    assert second.pcf.fossil_ghg_emissions == 0.1 and second.pcf.dqi is first.pcf.dqi
+    assert third.pcf.p_cf_excluding_biogenic == 0.9 and third.pcf.dqi.coverage_percent == 50
+    assert encode(first) == before
+    assert len(second.product_ids) == len(first.product_ids)
+
+
+def test_product_footprint_new_version_frozen(make_product_footprint):
+    first = freeze(make_product_footprint())
+    second = first.new_version(pcf_changes={"primary_data_share": 60.0})
+
+    assert is_frozen(second) and is_frozen(second.pcf)
+    assert second.pcf.dqi is first.pcf.dqi
+
+
+def test_product_footprint_new_version_invalid(make_product_footprint):
+    first = make_product_footprint()
+    with pytest.raises(ValueError):
+        first.new_version(version=Version(5))
+    with pytest.raises(ValueError):
+        first.new_version(pcf_changes={"packaging_emissions_included": False})
+    with pytest.raises(ValueError):
+        first.new_version(company_name="")
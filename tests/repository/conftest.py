@@ -0,0 +1,15 @@
+import pytest
+
+from pact_methodology.datetime import DateTime
+
+
+@pytest.fixture
+def footprints(make_product_footprint, cpc_code_lookup):
+    return [
+        make_product_footprint(created=DateTime("2024-03-01T00:00:00Z")),
+        make_product_footprint(
+            created=DateTime("2024-01-01T00:00:00Z"),
+            product_category_cpc=cpc_code_lookup.lookup("2311"),
+        ),
+        make_product_footprint(created=DateTime("2024-02-01T00:00:00Z")),
+    ]
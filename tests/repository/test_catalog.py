@@ -0,0 +1,112 @@
+import json
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from pact_methodology.aggregation.footprint_table import CATEGORICAL_COLUMNS, NUMERIC_COLUMNS, FootprintTable
+from pact_methodology.exceptions import CatalogFileError, DuplicateIdError
+from pact_methodology.exchange.json_codec import encode
+from pact_methodology.product_footprint.id import ProductFootprintId
+from pact_methodology.product_footprint.status import Status
+from pact_methodology.repository.catalog import CURRENT, CatalogGeneration, SharedCatalog, publish
+
+
+@pytest.fixture
+def footprints(make_product_footprint, cpc_code_lookup):
+    deprecated = make_product_footprint(product_category_cpc=cpc_code_lookup.lookup("2311"))
+    deprecated.status = Status.DEPRECATED
+    return [
+        make_product_footprint(),
+        deprecated,
+        make_product_footprint(id=ProductFootprintId(str(uuid.UUID(bytes=bytes(15) + b"\x01")))),
+        make_product_footprint(id=ProductFootprintId(str(uuid.UUID(bytes=b"\x01" + bytes(15))))),
+    ]
+
+
+def _query(directory: str, id: str) -> tuple[int, int, bytes]:
+    generation = SharedCatalog(directory).current()
+    return generation.number, len(generation), bytes(generation.document(id))
+
+
+def test_publish_and_query(tmp_path, footprints):
+    assert publish(tmp_path, footprints) == 1
+    generation = SharedCatalog(tmp_path).current()
+    expected = FootprintTable.from_footprints(footprints)
+
+    assert len(generation) == 4 and generation.number == 1
+    np.testing.assert_array_equal(generation.table.ids, expected.ids)
+    np.testing.assert_array_equal(generation.table.created, expected.created)
+    np.testing.assert_array_equal(generation.table.dqr, expected.dqr)
+    for name in NUMERIC_COLUMNS:
+        np.testing.assert_array_equal(generation.table.column(name), expected.column(name))
+    for name in CATEGORICAL_COLUMNS:
+        assert list(generation.table.labels(name)) == list(expected.labels(name))
+    assert not generation.table.ids.flags.writeable
+
+    for row, footprint in enumerate(footprints):
+        assert generation.row(footprint.id) == generation.row(str(footprint.id)) == row
+        assert json.loads(bytes(generation.document(footprint.id))) == encode(footprint)
+        assert generation.footprint(footprint.id) == footprint
+    assert generation.row(uuid.UUID(bytes=bytes(16))) is None
+    assert generation.row("not an id") is None and "not an id" not in generation
+    assert generation.document(uuid.uuid4()) is None and generation.footprint(uuid.uuid4()) is None
+    assert list(generation.where("status", "Deprecated")) == [1]
+    assert list(generation.where("product_category_cpc", "2311")) == [1]
+    assert list(generation.where("status", "Unknown")) == []
+    with pytest.raises(IndexError):
+        generation.document_at(4)
+
+
+def test_swaps_generations(tmp_path, footprints):
+    publish(tmp_path, footprints[:1])
+    catalog = SharedCatalog(tmp_path)
+    first = catalog.current()
+    document = first.document(footprints[0].id)
+
+    assert catalog.current() is first
+    assert publish(tmp_path, footprints[1:]) == 2
+    assert publish(tmp_path, footprints, keep=1) == 3
+    assert sorted(os.listdir(tmp_path)) == [f"{3:020d}.catalog", CURRENT]
+
+    current = catalog.current()
+    assert current.number == 3 and len(current) == 4
+    assert len(first) == 1 and json.loads(bytes(document))["id"] == str(footprints[0].id)
+
+
+def test_worker_processes_read_the_same_generation(tmp_path, footprints):
+    publish(tmp_path, footprints)
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        results = list(executor.map(_query, [str(tmp_path)] * 2, [str(footprints[2].id)] * 2))
+
+    assert results == [(1, 4, bytes(SharedCatalog(tmp_path).current().document(footprints[2].id)))] * 2
+
+
+def test_empty_catalog(tmp_path):
+    publish(tmp_path, [])
+
+    assert len(SharedCatalog(tmp_path).current()) == 0
+
+
+def test_rejects_invalid_input(tmp_path, footprints):
+    with pytest.raises(DuplicateIdError):
+        publish(tmp_path, [footprints[0], footprints[0]])
+    with pytest.raises(ValueError, match="keep must be positive"):
+        publish(tmp_path, footprints, keep=0)
+    with pytest.raises(FileNotFoundError):
+        SharedCatalog(tmp_path).current()
+
+    publish(tmp_path, footprints)
+    [path] = tmp_path.glob("*.catalog")
+    data = path.read_bytes()
+    for damaged, message in [
+        (b"", "is empty"),
+        (b"not a catalog", "is not a footprint catalog"),
+        (data[:8] + b"\x02" + data[9:], "unknown format version 2"),
+        (data[: len(data) // 2], "is damaged"),
+    ]:
+        path.write_bytes(damaged)
+        with pytest.raises(CatalogFileError, match=message):
+            CatalogGeneration(path)
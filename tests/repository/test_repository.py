@@ -0,0 +1,248 @@
+import uuid
+
+import pytest
+
+from pact_methodology.datetime import DateTime
+from pact_methodology.exceptions import SnapshotExpiredError
+from pact_methodology.frozen import is_frozen
+from pact_methodology.product_footprint.company_id_list import CompanyIdList
+from pact_methodology.product_footprint.status import Status
+from pact_methodology.repository.repository import Cursor, FootprintRepository, footprint_key
+from pact_methodology.urn import CompanyId
+
+
+def test_add_and_get(footprints):
+    repository = FootprintRepository(footprints)
+
+    assert len(repository) == 3
+    assert repository.revision == 3
+    stored = repository[footprints[0].id]
+    assert stored == footprints[0]
+    assert is_frozen(stored)
+    assert repository.get(str(footprints[1].id)) == footprints[1]
+    assert footprints[2].id in repository
+    assert repository.get("not an id") is None
+    with pytest.raises(KeyError):
+        repository[uuid.uuid4()]
+
+
+def test_creation_order(footprints):
+    repository = FootprintRepository(footprints)
+    assert list(repository) == [footprints[1], footprints[2], footprints[0]]
+    assert repository.ordered(1, 2) == [footprints[2]]
+    assert repository.in_order([footprints[0].id, str(footprints[1].id)]) == [footprints[1], footprints[0]]
+
+
+def test_created_between(footprints):
+    repository = FootprintRepository(footprints)
+    february = DateTime("2024-02-01T00:00:00Z").iso_datetime
+    march = DateTime("2024-03-01T00:00:00Z").iso_datetime
+
+    assert repository.created_between(february) == [footprints[2].id, footprints[0].id]
+    assert repository.created_between(end=february) == [footprints[1].id]
+    assert repository.created_between(february, march) == [footprints[2].id]
+    assert repository.created_between() == [footprint.id for footprint in repository]
+
+
+def test_indexes(footprints):
+    repository = FootprintRepository(footprints)
+
+    assert repository.lookup("product_category_cpc", "2311") == {footprints[1].id}
+    assert repository.lookup("product_category_cpc", "0111") == {footprints[0].id, footprints[2].id}
+    company_id = str(footprints[0].company_ids[0])
+    assert len(repository.lookup("company_ids", company_id)) == 3
+    assert repository.lookup("status", "Deprecated") == frozenset()
+    assert sorted(repository.keys("product_category_cpc")) == ["0111", "2311"]
+    with pytest.raises(KeyError):
+        repository.lookup("unknown", "key")
+
+
+def test_add_replaces_and_reindexes(footprints, make_product_footprint):
+    repository = FootprintRepository(footprints)
+    replacement = make_product_footprint(
+        id=footprints[0].id,
+        created=DateTime("2023-01-01T00:00:00Z"),
+        company_ids=CompanyIdList([CompanyId("urn:pathfinder:company:customcode:buyer-assigned:other")]),
+    )
+
+    replaced = repository.add(replacement)
+
+    assert replaced == footprints[0]
+    assert len(repository) == 3
+    assert list(repository)[0] == replacement
+    assert repository.lookup("company_ids", "urn:pathfinder:company:customcode:buyer-assigned:other") == {
+        footprints[0].id
+    }
+    assert footprints[0].id not in repository.lookup("company_ids", str(footprints[0].company_ids[0]))
+
+
+def test_remove(footprints):
+    repository = FootprintRepository(footprints)
+
+    assert repository.remove(str(footprints[1].id)) == footprints[1]
+
+    assert len(repository) == 2
+    assert repository.lookup("product_category_cpc", "2311") == frozenset()
+    assert "2311" not in repository.keys("product_category_cpc")
+    assert list(repository) == [footprints[2], footprints[0]]
+    with pytest.raises(KeyError):
+        repository.remove(footprints[1].id)
+
+
+def test_set_status(footprints):
+    repository = FootprintRepository(footprints)
+
+    updated = repository.set_status(footprints[0].id, Status.DEPRECATED, "Superseded")
+
+    assert updated.status == Status.DEPRECATED
+    assert updated.status_comment == "Superseded"
+    assert repository[footprints[0].id] is updated
+    assert repository.lookup("status", "Deprecated") == {footprints[0].id}
+    assert footprints[0].status == Status.ACTIVE
+
+
+def test_add_validates(footprints):
+    with pytest.raises(ValueError, match="footprint must be an instance of ProductFootprint"):
+        FootprintRepository().add("footprint")
+
+
+def test_footprint_key(footprints):
+    assert footprint_key(str(footprints[0].id)) == footprints[0].id
+    with pytest.raises(ValueError):
+        footprint_key(42)
+
+
+def test_pages(footprints):
+    repository = FootprintRepository(footprints)
+
+    first, cursor = repository.page(2)
+    rest, end = repository.page(2, cursor)
+
+    assert first + rest == list(repository)
+    assert end is None
+    assert Cursor.decode(cursor.encode()) == cursor
+    assert len(cursor.encode()) == 43
+    with pytest.raises(ValueError, match="limit must be positive"):
+        repository.page(0)
+
+
+def test_pages_read_a_snapshot(footprints, make_product_footprint):
+    repository = FootprintRepository(footprints)
+    expected = list(repository)
+    first, cursor = repository.page(1)
+
+    repository.add(make_product_footprint(created=DateTime("2024-01-15T00:00:00Z")))
+    repository.set_status(footprints[0].id, Status.DEPRECATED)
+    repository.remove(footprints[2].id)
+    rest, _ = repository.page(5, cursor)
+
+    assert first + rest == expected
+    assert rest[-1].status == Status.ACTIVE
+    latest, _ = repository.page(5)
+    assert len(latest) == 3
+    assert latest[-1].status == Status.DEPRECATED
+
+
+def test_pages_with_candidates(footprints):
+    repository = FootprintRepository(footprints)
+    where = lambda footprint: footprint.product_category_cpc.code == "0111"
+    candidates = repository.lookup("product_category_cpc", "0111")
+    first, cursor = repository.page(1, where=where, candidates=candidates)
+
+    repository.set_status(footprints[0].id, Status.DEPRECATED)
+    rest, end = repository.page(1, cursor, where=where, candidates=repository.lookup("status", "Active"))
+
+    assert first + rest == [footprints[2], footprints[0]]
+    assert rest[0].status == Status.ACTIVE
+    assert end is None
+
+
+@pytest.mark.parametrize("code", ["2311", "0111"])
+def test_pages_through_small_and_large_candidate_sets(make_product_footprint, cpc_code_lookup, code):
+    footprints = [
+        make_product_footprint(
+            created=DateTime(f"2024-01-{day:02d}T00:00:00Z"),
+            product_category_cpc=cpc_code_lookup.lookup("2311" if day % 10 == 3 else "0111"),
+        )
+        for day in range(31, 0, -1)
+    ]
+    repository = FootprintRepository(footprints)
+    tested = []
+
+    def where(footprint):
+        tested.append(footprint)
+        return footprint.product_category_cpc.code == code
+
+    expected = [footprint for footprint in repository.ordered() if where(footprint)]
+    pages, cursor = [], None
+    while not pages or cursor is not None:
+        tested.clear()
+        page, cursor = repository.page(1, cursor, where=where, candidates=repository.lookup("product_category_cpc", code))
+        pages += page
+        if page[0] is expected[0]:
+            # Changes after the snapshot are not seen by the following pages.
+            repository.remove(expected[-1].id)
+            repository.add(
+                make_product_footprint(
+                    created=DateTime("2024-01-15T12:00:00Z"), product_category_cpc=cpc_code_lookup.lookup(code)
+                )
+            )
+        else:
+            # Only the next two candidates and the footprint removed since the snapshot are tested.
+            assert len(tested) <= 3
+
+    assert pages == expected
+
+
+def test_pages_within_a_created_range(make_product_footprint):
+    footprints = [make_product_footprint(created=DateTime(f"2024-01-{day:02d}T00:00:00Z")) for day in range(1, 31)]
+    repository = FootprintRepository(footprints)
+    start, end = footprints[9].created.iso_datetime, footprints[12].created.iso_datetime
+    candidates = repository.candidates(start=start, end=end)
+    tested = []
+
+    def where(footprint):
+        tested.append(footprint)
+        return True
+
+    first, cursor = repository.page(2, where=where, candidates=candidates)
+    rest, end_cursor = repository.page(2, cursor, where=where, candidates=candidates)
+
+    # The range is found by bisection, so the footprints outside it are never tested.
+    assert first + rest == footprints[9:12]
+    assert {footprint.id for footprint in tested} == {footprint.id for footprint in footprints[9:12]}
+    assert end_cursor is None
+    repository.remove(footprints[0].id)
+    with pytest.raises(ValueError, match="earlier revision"):
+        repository.page(2, cursor, candidates=candidates)
+
+
+def test_export_and_restore(footprints):
+    repository = FootprintRepository(footprints)
+    repository.set_status(footprints[0].id, Status.DEPRECATED)
+    keys, exported, order, indexes, revision = repository._export()
+
+    restored = FootprintRepository._restore(keys, exported, order, indexes, revision, history=5)
+
+    assert restored.ordered() == repository.ordered() and restored.revision == repository.revision == 4
+    assert restored.lookup("status", "Deprecated") == {footprints[0].id}
+    assert restored.page(2)[0] == repository.page(2)[0]
+    restored.remove(footprints[1].id)
+    assert len(repository) == 3 and footprints[1].id in repository.lookup("product_category_cpc", "2311")
+
+
+def test_expired_snapshots(footprints):
+    repository = FootprintRepository(footprints, history=1)
+    _, cursor = repository.page(1)
+
+    repository.set_status(footprints[0].id, Status.DEPRECATED)
+    assert repository.page(5, cursor)[0][-1].status == Status.ACTIVE
+    repository.set_status(footprints[1].id, Status.DEPRECATED)
+
+    with pytest.raises(SnapshotExpiredError):
+        repository.page(5, cursor)
+    assert len(repository.page(5)[0]) == 3
+    with pytest.raises(ValueError, match="later revision"):
+        repository.page(1, Cursor(repository.revision + 1, cursor.created, cursor.id))
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        Cursor.decode("not a cursor")
@@ -0,0 +1,92 @@
+import pytest
+
+from pact_methodology.datetime import DateTime
+from pact_methodology.exceptions import SnapshotExpiredError, SnapshotFileError
+from pact_methodology.exchange.json_codec import encode
+from pact_methodology.frozen import is_loaded
+from pact_methodology.product_footprint.company_id_list import CompanyIdList
+from pact_methodology.product_footprint.status import Status
+from pact_methodology.repository.repository import INDEXES, FootprintRepository
+from pact_methodology.repository.snapshot_file import dump, load
+from pact_methodology.urn import CompanyId
+
+
+@pytest.fixture
+def repository(footprints, make_product_footprint):
+    other = CompanyIdList([CompanyId("urn:pathfinder:company:customcode:buyer-assigned:other")])
+    repository = FootprintRepository(
+        footprints[:2] + [make_product_footprint(created=footprints[2].created, company_ids=other)]
+    )
+    repository.set_status(repository.ordered()[0].id, Status.DEPRECATED, "Replaced")
+    return repository
+
+
+def test_restores_lazily(tmp_path, repository):
+    dump(repository, tmp_path / "footprints.snapshot")
+    restored = load(tmp_path / "footprints.snapshot")
+
+    assert len(restored) == 3 and restored.revision == repository.revision == 4
+    assert not any(is_loaded(footprint) for footprint in restored.ordered())
+    for name in INDEXES:
+        assert sorted(restored.keys(name)) == sorted(repository.keys(name))
+        for key in repository.keys(name):
+            assert restored.lookup(name, key) == repository.lookup(name, key)
+    assert restored.created_between(repository.ordered()[1].created.iso_datetime) == repository.created_between(
+        repository.ordered()[1].created.iso_datetime
+    )
+    assert restored.ordered() == repository.ordered()
+    assert not any(is_loaded(footprint) for footprint in restored.ordered())
+    assert [encode(footprint) for footprint in restored] == [encode(footprint) for footprint in repository]
+    assert all(is_loaded(footprint) for footprint in restored.ordered())
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_restored_repository_can_change(tmp_path, repository, make_product_footprint):
+    dump(repository, tmp_path / "footprints.snapshot")
+    restored = load(tmp_path / "footprints.snapshot", history=10)
+    first, middle, last = restored.ordered()
+    page, cursor = restored.page(2)
+
+    assert page == [first, middle]
+    restored.remove(first.id)
+    added = make_product_footprint(created=DateTime("2023-01-01T00:00:00Z"))
+    restored.add(added)
+    updated = restored.set_status(last.id, Status.DEPRECATED)
+
+    assert restored.ordered() == [added, middle, updated]
+    assert restored.lookup("status", "Deprecated") == {updated.id}
+    assert restored.page(2, cursor) == ([last], None)
+    with pytest.raises(SnapshotExpiredError):
+        restored.page(1, type(cursor)(cursor.revision - 1, cursor.created, cursor.id))
+
+
+def test_dumps_restored_footprints_without_reading_them(tmp_path, repository):
+    dump(repository, tmp_path / "first.snapshot")
+    restored = load(tmp_path / "first.snapshot")
+    dump(restored, tmp_path / "second.snapshot")
+
+    assert not any(is_loaded(footprint) for footprint in restored.ordered())
+    assert (tmp_path / "second.snapshot").read_bytes() == (tmp_path / "first.snapshot").read_bytes()
+    assert load(tmp_path / "second.snapshot").ordered() == repository.ordered()
+
+
+def test_empty_repository(tmp_path):
+    dump(FootprintRepository(), tmp_path / "empty.snapshot")
+
+    assert len(load(tmp_path / "empty.snapshot")) == 0
+
+
+def test_rejects_damaged_files(tmp_path, repository):
+    path = tmp_path / "footprints.snapshot"
+    dump(repository, path)
+    data = path.read_bytes()
+
+    for damaged, message in [
+        (b"", "is empty"),
+        (b"not a snapshot" * 10, "is not a footprint repository snapshot"),
+        (data[:8] + b"\x02" + data[9:], "unknown format version 2"),
+        (data[: len(data) // 2], "is damaged"),
+    ]:
+        path.write_bytes(damaged)
+        with pytest.raises(SnapshotFileError, match=message):
+            load(path)
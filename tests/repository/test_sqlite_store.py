@@ -0,0 +1,123 @@
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from pact_methodology.datetime import DateTime
+from pact_methodology.exchange.json_codec import encode
+from pact_methodology.frozen import is_frozen, is_loaded
+from pact_methodology.product_footprint.company_id_list import CompanyIdList
+from pact_methodology.product_footprint.status import Status
+from pact_methodology.product_footprint.version import Version
+from pact_methodology.repository.repository import FootprintRepository
+from pact_methodology.repository.sqlite_store import SqliteFootprintStore
+from pact_methodology.urn import CompanyId
+
+ACME = "urn:pathfinder:company:customcode:buyer-assigned:acme-corp"
+OTHER = "urn:pathfinder:company:customcode:buyer-assigned:other"
+
+
+@pytest.fixture
+def footprints(footprints, make_product_footprint):
+    return footprints[:2] + [
+        make_product_footprint(created=footprints[2].created, company_ids=CompanyIdList([CompanyId(OTHER)]))
+    ]
+
+
+@pytest.fixture
+def store(tmp_path, footprints):
+    with SqliteFootprintStore(tmp_path / "footprints.db") as store:
+        store.add_all(footprints)
+        yield store
+
+
+def test_add_and_get(store, footprints):
+    stored = store[footprints[0].id]
+
+    assert len(store) == 3
+    assert is_frozen(stored) and not is_loaded(stored)
+    assert stored == footprints[0] and not is_loaded(stored)
+    assert encode(stored) == encode(footprints[0]) and is_loaded(stored)
+    assert store.get(str(footprints[1].id)) == footprints[1]
+    assert footprints[2].id in store and "not an id" not in store
+    assert store.get("not an id") is None
+    with pytest.raises(KeyError):
+        store[uuid.uuid4()]
+
+
+def test_iterates_in_creation_order(store, footprints):
+    assert list(store) == [footprints[1], footprints[2], footprints[0]]
+
+
+def test_replaces_and_persists(tmp_path, store, footprints, make_product_footprint):
+    updated = make_product_footprint(
+        id=footprints[2].id, version=Version(2), created=DateTime("2024-02-01T00:00:00Z")
+    )
+    store.add(updated)
+    store.close()
+
+    with SqliteFootprintStore(tmp_path / "footprints.db") as reopened:
+        assert len(reopened) == 3
+        assert reopened[footprints[2].id].version == Version(2)
+        assert reopened.lookup("company_ids", OTHER) == frozenset()
+        assert reopened.lookup("company_ids", ACME) == {footprint.id for footprint in footprints}
+
+
+def test_batch_keeps_the_last_footprint_with_an_id(store, footprints, make_product_footprint):
+    updated = make_product_footprint(id=footprints[2].id, version=Version(2))
+
+    assert store.add_all([footprints[2], updated]) == 1
+    assert store[footprints[2].id].version == Version(2)
+    assert store.lookup("company_ids", OTHER) == frozenset()
+    assert store.lookup("company_ids", ACME) == {footprint.id for footprint in footprints}
+
+
+def test_lookup_matches_repository(store, footprints):
+    repository = FootprintRepository(footprints)
+
+    for index, key in [
+        ("company_ids", ACME),
+        ("company_ids", OTHER),
+        ("product_ids", str(footprints[0].product_ids[0])),
+        ("product_category_cpc", "2311"),
+        ("status", "Active"),
+    ]:
+        assert store.lookup(index, key) == repository.lookup(index, key)
+    with pytest.raises(KeyError):
+        store.lookup("unknown", "x")
+
+
+def test_find(store, footprints):
+    assert store.find() == [footprints[1], footprints[2], footprints[0]]
+    assert store.find(company_id=ACME) == [footprints[1], footprints[0]]
+    assert store.find(company_id=OTHER, product_id=str(footprints[2].product_ids[0])) == [footprints[2]]
+    assert store.find(product_category_cpc="2311") == [footprints[1]]
+    assert store.find(status=Status.DEPRECATED) == []
+    assert store.find(created_from=DateTime("2024-02-01T00:00:00Z")) == [footprints[2], footprints[0]]
+    assert store.find(created_before=datetime(2024, 2, 1, tzinfo=timezone.utc)) == [footprints[1]]
+    assert store.find(valid_at=footprints[0].validity_period.start, limit=2) == [footprints[1], footprints[2]]
+    assert store.find(valid_at=DateTime("2000-01-01T00:00:00Z")) == []
+
+
+def test_set_status_and_remove(store, footprints):
+    deprecated = store.set_status(footprints[0].id, Status.DEPRECATED, "Replaced")
+
+    assert store[footprints[0].id] == deprecated
+    assert store.find(status=Status.DEPRECATED) == [deprecated]
+    assert store.remove(footprints[0].id) == deprecated
+    assert footprints[0].id not in store
+    assert store.lookup("company_ids", ACME) == {footprints[1].id}
+    with pytest.raises(KeyError):
+        store.remove(footprints[0].id)
+
+
+def test_invalid_batches_are_not_stored(store, footprints, make_product_footprint):
+    new = make_product_footprint()
+
+    with pytest.raises(ValueError, match="footprint must be an instance of ProductFootprint"):
+        store.add_all([new, "not a footprint"], batch_size=2)
+    assert store.add_all([new, footprints[0], new], batch_size=2) == 3
+
+    assert len(store) == 4
+    with pytest.raises(ValueError, match="batch_size must be positive"):
+        store.add_all([], batch_size=0)
@@ -0,0 +1,152 @@
+import os
+import threading
+
+import pytest
+
+from pact_methodology.exceptions import LogCorruptedError
+from pact_methodology.product_footprint.status import Status
+from pact_methodology.product_footprint.version import Version
+from pact_methodology.repository.wal import FootprintLog
+
+
+def files(directory, suffix):
+    return sorted(name for name in os.listdir(directory) if name.endswith(suffix))
+
+
+def test_replays_changes(tmp_path, footprints, make_product_footprint):
+    updated = make_product_footprint(id=footprints[2].id, version=Version(2), created=footprints[2].created)
+    with FootprintLog(tmp_path) as log:
+        assert log.add_all(footprints) == 3
+        assert log.add(updated) == footprints[2]
+        deprecated = log.set_status(footprints[0].id, Status.DEPRECATED, "Replaced")
+        assert log.remove(footprints[1].id) == footprints[1]
+        assert log.sequence == log.synced == 6
+
+    with FootprintLog(tmp_path) as reopened:
+        assert reopened.replayed == 6
+        assert reopened.repository.ordered() == [updated, deprecated]
+        assert reopened.repository[footprints[0].id].status_comment == "Replaced"
+        assert reopened.repository.lookup("status", "Deprecated") == {footprints[0].id}
+        reopened.add(footprints[1])
+
+    with FootprintLog(tmp_path) as reopened:
+        assert reopened.sequence == 7
+        assert len(reopened.repository) == 3
+
+
+def test_rejected_changes_are_not_logged(tmp_path, footprints):
+    with FootprintLog(tmp_path) as log:
+        with pytest.raises(ValueError, match="footprint must be an instance of ProductFootprint"):
+            log.add_all([footprints[0], "not a footprint"])
+        with pytest.raises(KeyError):
+            log.remove(footprints[0].id)
+        assert log.sequence == 0 and len(log.repository) == 0
+    with pytest.raises(ValueError, match="The log is closed"):
+        log.add(footprints[0])
+
+
+def test_discards_torn_end(tmp_path, footprints):
+    with FootprintLog(tmp_path) as log:
+        log.add_all(footprints)
+    [segment] = files(tmp_path, ".log")
+    path = tmp_path / segment
+    size = path.stat().st_size
+    with open(path, "r+b") as file:
+        file.truncate(size - 10)
+
+    with FootprintLog(tmp_path) as reopened:
+        assert reopened.sequence == 2
+        assert reopened.repository.ordered() == [footprints[1], footprints[0]]
+        reopened.add(footprints[2])
+    with FootprintLog(tmp_path) as reopened:
+        assert reopened.sequence == 3 and len(reopened.repository) == 3
+
+
+def test_rejects_damage_before_end(tmp_path, footprints):
+    with FootprintLog(tmp_path) as log:
+        log.add_all(footprints)
+    [segment] = files(tmp_path, ".log")
+    (tmp_path / f"{int(segment.removesuffix('.log')) + 3:020d}.log").write_bytes(b"")
+    with open(tmp_path / segment, "r+b") as file:
+        file.seek(30)
+        file.write(b"\xff")
+
+    with pytest.raises(LogCorruptedError, match="Damaged record at byte 0"):
+        FootprintLog(tmp_path)
+
+
+def test_rejects_damage_before_the_last_record(tmp_path, footprints):
+    with FootprintLog(tmp_path) as log:
+        log.add_all(footprints)
+    [segment] = files(tmp_path, ".log")
+    path = tmp_path / segment
+    with open(path, "r+b") as file:
+        file.seek(30)
+        file.write(b"\xff")
+
+    with pytest.raises(LogCorruptedError, match="Damaged record at byte 0"):
+        FootprintLog(tmp_path)
+
+
+def test_discards_damaged_last_record(tmp_path, footprints):
+    with FootprintLog(tmp_path) as log:
+        log.add_all(footprints)
+    [segment] = files(tmp_path, ".log")
+    path = tmp_path / segment
+    size = path.stat().st_size
+    with open(path, "r+b") as file:
+        file.seek(size - 1)
+        last = file.read(1)
+        file.seek(size - 1)
+        file.write(bytes([last[0] ^ 0xFF]))
+
+    with FootprintLog(tmp_path) as reopened:
+        assert reopened.sequence == 2
+    assert path.stat().st_size < size
+
+
+def test_snapshots(tmp_path, footprints, make_product_footprint):
+    added = footprints + [make_product_footprint() for _ in range(4)]
+    with FootprintLog(tmp_path, snapshot_interval=3) as log:
+        for footprint in added:
+            log.add(footprint)
+        log.set_status(footprints[0].id, Status.DEPRECATED)
+    assert len(files(tmp_path, ".snapshot")) == 1
+    assert not files(tmp_path, ".tmp")
+
+    with FootprintLog(tmp_path, snapshot_interval=3) as reopened:
+        assert reopened.sequence == 8
+        assert reopened.replayed == 8 - reopened.snapshot_sequence < 8
+        assert len(reopened.repository) == 7
+        assert reopened.repository[footprints[0].id].status == Status.DEPRECATED
+        assert reopened.snapshot() == 8
+        assert files(tmp_path, ".snapshot") == [f"{8:020d}.snapshot"]
+        assert files(tmp_path, ".log") == [f"{9:020d}.log"]
+
+    with FootprintLog(tmp_path) as reopened:
+        assert reopened.replayed == 0
+        assert {footprint.id for footprint in reopened.repository} == {footprint.id for footprint in added}
+
+
+def test_groups_concurrent_commits(tmp_path, make_product_footprint):
+    footprints = [make_product_footprint() for _ in range(80)]
+    with FootprintLog(tmp_path, commit_delay=0.01) as log:
+        log.add_all(footprints[:40])
+        assert log.syncs == 1
+        threads = [threading.Thread(target=log.add, args=(footprint,)) for footprint in footprints[40:]]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert log.synced == 80
+        assert log.syncs < 40
+
+    with FootprintLog(tmp_path) as reopened:
+        assert len(reopened.repository) == 80
+
+
+def test_invalid_arguments(tmp_path):
+    with pytest.raises(ValueError, match="snapshot_interval must be positive"):
+        FootprintLog(tmp_path, snapshot_interval=0)
+    with pytest.raises(ValueError, match="commit_delay must not be negative"):
+        FootprintLog(tmp_path, commit_delay=-1)
@@ -0,0 +1,185 @@
+import copy
+import pickle
+
+import pytest
+
+from pact_methodology.canonical import DIGEST_SIZE, OwnedDict, canonical_bytes, to_primitive
+from pact_methodology.data_quality_indicators.data_quality_rating import DataQualityRating
+from pact_methodology.datetime import DateTime
+from pact_methodology.product_footprint.id import ProductFootprintId
+from pact_methodology.product_footprint.status import Status
+from pact_methodology.product_footprint.version import Version
+from pact_methodology.urn import ProductId
+
+
+@pytest.fixture
+def footprint(make_product_footprint):
+    return make_product_footprint()
+
+
+def test_digest_is_cached(footprint):
+    digest = footprint.content_digest
+    assert len(digest) == DIGEST_SIZE
+    assert footprint.content_digest is digest
+
+
+def test_equal_content_has_equal_digest(footprint):
+    other = copy.deepcopy(footprint)
+    assert other is not footprint
+    assert other.content_digest == footprint.content_digest
+    assert pickle.loads(pickle.dumps(footprint)).content_digest == footprint.content_digest
+
+
+def test_setter_invalidates_digest(footprint):
+    digest = footprint.content_digest
+    footprint.comment = "A different comment"
+    assert footprint.content_digest != digest
+
+
+def test_nested_setter_invalidates_owners(footprint):
+    digest = footprint.content_digest
+    pcf_digest = footprint.pcf.content_digest
+
+    footprint.pcf.dqi.coverage_percent = 95.0
+
+    assert footprint.pcf.content_digest != pcf_digest
+    assert footprint.content_digest != digest
+
+
+def test_shared_objects_invalidate_every_owner(make_product_footprint, make_carbon_footprint):
+    pcf = make_carbon_footprint()
+    first = make_product_footprint(pcf=pcf)
+    second = make_product_footprint(pcf=pcf)
+    digests = first.content_digest, second.content_digest
+
+    pcf.p_cf_excluding_biogenic = 0.75
+
+    assert first.content_digest != digests[0]
+    assert second.content_digest != digests[1]
+
+
+def test_container_mutation_invalidates_digest(footprint):
+    digest = footprint.content_digest
+    footprint.product_ids.append(ProductId("urn:pathfinder:product:customcode:buyer-assigned:acme-gadget"))
+    assert footprint.content_digest != digest
+
+
+def test_in_place_list_changes_invalidate_digest(footprint):
+    other = copy.deepcopy(footprint)
+    assert footprint == other and hash(footprint) == hash(other)
+
+    footprint.preceding_pf_ids = []
+    digest = footprint.content_digest
+    footprint.preceding_pf_ids.append(ProductFootprintId())
+    assert footprint.content_digest != digest and footprint != other
+
+    footprint.preceding_pf_ids.clear()
+    assert footprint.content_digest == digest
+    footprint.extensions[0].data["key"] = "other value"
+    assert footprint.content_digest != digest
+    footprint.extensions.pop()
+    assert footprint.content_digest != digest
+
+    digests = other.content_digest, other.pcf.content_digest
+    other.pcf.ipcc_characterization_factors_sources.append("AR5")
+    assert other.content_digest != digests[0] and other.pcf.content_digest != digests[1]
+
+
+def test_assigned_containers_are_owned(footprint):
+    data = {"nested": {"key": "value"}}
+    extension = footprint.extensions[0]
+    extension.data = data
+    assert isinstance(extension.data, OwnedDict) and extension.data == data
+    digest = footprint.content_digest
+
+    data["nested"]["key"] = "changed after assignment"
+    assert footprint.content_digest is digest
+    extension.data["nested"]["key"] = "other value"
+    assert footprint.content_digest != digest
+    digest = footprint.content_digest
+    extension.data["added"] = {"key": "value"}
+    assert footprint.content_digest != digest
+    digest = footprint.content_digest
+    extension.data["added"]["key"] = "other value"
+    assert footprint.content_digest != digest
+
+    assert type(copy.copy(extension.data)) is dict
+    assert type(pickle.loads(pickle.dumps(footprint)).extensions[0].data) is OwnedDict
+
+
+def test_status_change_invalidates_digest(footprint):
+    digest = footprint.content_digest
+    footprint.status = Status.DEPRECATED
+    assert footprint.content_digest != digest
+
+
+def test_canonical_bytes_are_sorted_and_compact(footprint):
+    encoded = canonical_bytes(footprint.status_info)
+    assert encoded == b'{"$type":"ProductFootprintStatus","comment":null,"status":"Active"}'
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (1.0, 1),
+        (0.25, 0.25),
+        (Status.ACTIVE, "Active"),
+        (Version(3), 3),
+        (DataQualityRating(2), 2),
+        (DateTime("2024-01-01T00:00:00Z"), "2024-01-01T00:00:00Z"),
+        ({"b": [1.5, None]}, {"b": [1.5, None]}),
+        ({"Beta", "Alpha"}, ["Alpha", "Beta"]),
+    ],
+)
+def test_to_primitive(value, expected):
+    assert to_primitive(value) == expected
+
+
+@pytest.mark.parametrize("value", [float("nan"), float("inf"), object()])
+def test_to_primitive_rejects_unsupported_values(value):
+    with pytest.raises(ValueError):
+        to_primitive(value)
+
+
+def test_pickle_round_trip(footprint):
+    restored = pickle.loads(pickle.dumps(footprint))
+
+    assert restored == footprint
+    assert restored.pcf.dqi.reference_period is restored.pcf.reference_period
+    assert restored.product_category_cpc.title == footprint.product_category_cpc.title
+    assert restored.pcf.changed_fields == frozenset()
+    restored.pcf.p_cf_excluding_biogenic = 0.75
+    assert restored != footprint
+
+
+def test_pickle_does_not_validate_again(footprint, monkeypatch):
+    data = pickle.dumps(footprint)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("validated while unpickling")
+
+    monkeypatch.setattr(type(footprint.pcf), "validate_required_attributes", fail)
+    monkeypatch.setattr(ProductId, "__init__", fail)
+    assert pickle.loads(data) == footprint
+
+
+def test_pickle_shares_class_references(make_product_footprint):
+    footprints = [make_product_footprint() for _ in range(10)]
+    single = len(pickle.dumps(footprints[0], protocol=pickle.HIGHEST_PROTOCOL))
+    batch = len(pickle.dumps(footprints, protocol=pickle.HIGHEST_PROTOCOL))
+    assert batch < 10 * single * 0.8
+
+
+def test_pickle_omits_attribute_names(footprint):
+    data = pickle.dumps(footprint, protocol=pickle.HIGHEST_PROTOCOL)
+    assert b"_company_name" not in data and b"_p_cf_excluding_biogenic" not in data
+
+    # Objects without some fields, or with attributes that are not fields, are pickled as well.
+    partial = copy.copy(footprint.pcf)
+    del vars(partial)["_assurance"]
+    vars(partial)["note"] = "extra"
+    restored = pickle.loads(pickle.dumps(partial))
+    assert vars(restored).keys() == vars(partial).keys()
+    assert restored.p_cf_excluding_biogenic == footprint.pcf.p_cf_excluding_biogenic
+    del vars(partial)["note"]
+    assert vars(pickle.loads(pickle.dumps(partial))).keys() == vars(partial).keys()
@@ -0,0 +1,189 @@
+import copy
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import FrozenInstanceError
+
+import pytest
+
+from pact_methodology.carbon_footprint.carbon_footprint import CarbonFootprint
+from pact_methodology.carbon_footprint.cross_sectoral_standard import CrossSectoralStandard
+from pact_methodology.carbon_footprint.reference_period import ReferencePeriod
+from pact_methodology.datetime import DateTime
+from pact_methodology.exchange.json_codec import dumps, encode, loads
+from pact_methodology.frozen import FrozenDict, evolve, freeze, frozen_class, is_frozen, is_loaded, lazy, thaw
+from pact_methodology.product_footprint.product_footprint import ProductFootprint
+from pact_methodology.product_footprint.status import Status
+from pact_methodology.product_footprint.version import Version
+from pact_methodology.urn import ProductId
+
+
+@pytest.fixture
+def footprint(make_product_footprint):
+    return make_product_footprint()
+
+
+@pytest.fixture
+def frozen(footprint):
+    return freeze(footprint)
+
+
+def test_freeze(footprint, frozen):
+    assert is_frozen(frozen) and is_frozen(frozen.pcf) and is_frozen(frozen.pcf.dqi)
+    assert not is_frozen(footprint)
+    assert isinstance(frozen, ProductFootprint)
+    assert isinstance(frozen.pcf, CarbonFootprint)
+    assert type(frozen).__name__ == "FrozenProductFootprint"
+    assert frozen == footprint
+    assert frozen.content_digest == footprint.content_digest
+    assert encode(frozen) == encode(footprint)
+    assert freeze(frozen) is frozen
+
+
+def test_shared_objects_are_frozen_once(frozen):
+    assert frozen.pcf.dqi.reference_period is frozen.pcf.reference_period
+
+
+def test_assignment_raises(frozen):
+    with pytest.raises(FrozenInstanceError):
+        frozen.comment = "Edited"
+    with pytest.raises(FrozenInstanceError):
+        frozen.pcf.p_cf_excluding_biogenic = 1.0
+    with pytest.raises(FrozenInstanceError):
+        frozen.status = Status.DEPRECATED
+    with pytest.raises(FrozenInstanceError):
+        del frozen.pcf.dqi.coverage_percent
+
+
+def test_containers_are_frozen(frozen):
+    with pytest.raises(FrozenInstanceError):
+        frozen.product_ids.append(ProductId("urn:pathfinder:product:customcode:buyer-assigned:other"))
+    with pytest.raises(FrozenInstanceError):
+        frozen.pcf.cross_sectoral_standards_used.add(CrossSectoralStandard.ISO_14067)
+    with pytest.raises(TypeError):
+        frozen.extensions[0].data["key"] = "other"
+    assert isinstance(frozen.extensions, tuple)
+    assert isinstance(frozen.extensions[0].data, FrozenDict)
+
+
+def test_hashable(footprint, frozen):
+    other = freeze(copy.deepcopy(footprint))
+    assert hash(frozen) == hash(other)
+    assert {frozen: 1}[other] == 1
+    assert len({frozen.pcf.dqi, other.pcf.dqi, frozen.pcf.assurance}) == 2
+    assert hash(DateTime("2024-01-01T00:00:00Z")) == hash(DateTime("2024-01-01T00:00:00Z"))
+    assert len({Version(1), Version(1), Version(2)}) == 2
+    assert hash(frozen.product_category_cpc) == hash(footprint.product_category_cpc)
+
+
+def test_evolve(frozen):
+    evolved = frozen.evolve(comment="Edited", version=Version(2))
+
+    assert is_frozen(evolved)
+    assert evolved.comment == "Edited"
+    assert evolved.version == Version(2)
+    assert evolved.pcf is frozen.pcf
+    assert evolved.product_ids is frozen.product_ids
+    assert frozen.comment == "Comment"
+    assert evolved != frozen
+
+
+def test_evolve_nested(frozen):
+    pcf = frozen.pcf.evolve(p_cf_excluding_biogenic=0.75)
+    evolved = frozen.evolve(pcf=pcf, status=Status.DEPRECATED)
+
+    assert evolved.pcf.p_cf_excluding_biogenic == 0.75
+    assert evolved.pcf.dqi is frozen.pcf.dqi
+    assert evolved.status == Status.DEPRECATED
+    assert frozen.status == Status.ACTIVE
+
+
+def test_evolve_validates(frozen):
+    with pytest.raises(ValueError):
+        frozen.evolve(comment=1)
+    with pytest.raises(ValueError):
+        frozen.evolve(unknown=1)
+    with pytest.raises(ValueError, match="must not be defined"):
+        frozen.pcf.evolve(packaging_emissions_included=False)
+    with pytest.raises(ValueError, match="2025 or later"):
+        frozen.pcf.evolve(
+            biogenic_accounting_methodology=None,
+            reference_period=ReferencePeriod(
+                start=DateTime("2025-01-01T00:00:00Z"), end=DateTime("2025-12-31T00:00:00Z")
+            ),
+        )
+
+
+def test_evolve_mutable(footprint):
+    evolved = evolve(footprint, comment="Edited")
+    assert is_frozen(evolved)
+    assert footprint.comment == "Comment"
+
+
+def test_thaw(frozen):
+    thawed = thaw(frozen)
+
+    assert not is_frozen(thawed) and not is_frozen(thawed.pcf)
+    assert thawed == frozen
+    thawed.product_ids.append(ProductId("urn:pathfinder:product:customcode:buyer-assigned:other"))
+    thawed.pcf.p_cf_excluding_biogenic = 1.0
+    assert thawed != frozen
+
+
+def test_copy_and_pickle(frozen):
+    assert copy.copy(frozen) is frozen
+    assert copy.deepcopy(frozen) is frozen
+    restored = pickle.loads(pickle.dumps(frozen))
+    assert is_frozen(restored)
+    assert restored == frozen
+
+
+def test_shared_between_threads(frozen):
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        digests = set(executor.map(lambda _: (hash(frozen), encode(frozen)["pcf"]["pCfExcludingBiogenic"]), range(50)))
+    assert len(digests) == 1
+
+
+def test_frozen_class_rejects_invalid_classes():
+    with pytest.raises(ValueError):
+        frozen_class(int)
+    with pytest.raises(ValueError):
+        frozen_class(frozen_class(CarbonFootprint))
+
+
+def test_lazy(footprint, frozen):
+    loads_called = []
+
+    def load():
+        loads_called.append(True)
+        return loads(dumps(footprint))
+
+    deferred = lazy(ProductFootprint, load, frozen.content_digest)
+
+    assert isinstance(deferred, ProductFootprint) and is_frozen(deferred)
+    assert deferred == frozen and hash(deferred) == hash(frozen) and {frozen: 1}[deferred] == 1
+    assert not is_loaded(deferred) and not loads_called
+    assert deferred.company_name == footprint.company_name
+    assert is_loaded(deferred) and len(loads_called) == 1
+    assert encode(deferred) == encode(frozen)
+    with pytest.raises(FrozenInstanceError):
+        deferred.comment = "Edited"
+
+
+@pytest.mark.parametrize(
+    "use",
+    [vars, encode, thaw, pickle.dumps, lambda obj: evolve(obj, comment="Edited"), lambda obj: obj.content_digest],
+)
+def test_lazy_loads_on_use(footprint, frozen, use):
+    deferred = lazy(ProductFootprint, lambda: footprint)
+
+    use(deferred)
+
+    assert is_loaded(deferred)
+    assert deferred == frozen and vars(deferred) == vars(frozen)
+    assert pickle.loads(pickle.dumps(deferred)) == frozen
+
+
+def test_lazy_rejects_other_classes(frozen):
+    deferred = lazy(CarbonFootprint, lambda: frozen)
+    with pytest.raises(ValueError, match="Loaded FrozenProductFootprint, expected CarbonFootprint"):
+        deferred.pcf
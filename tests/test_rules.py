@@ -0,0 +1,85 @@
+from types import SimpleNamespace
+
+import pytest
+
+from pact_methodology.carbon_footprint.reference_period import ReferencePeriod
+from pact_methodology.datetime import DateTime
+from pact_methodology.rules import DEFAULT_SPEC_VERSION, REGISTRY, Regime, RequiredAttributes, RuleRegistry
+
+
+def test_regime_of():
+    before = ReferencePeriod(start=DateTime("2024-01-01T00:00:00Z"), end=DateTime("2024-12-31T00:00:00Z"))
+    after = ReferencePeriod(start=DateTime("2024-01-01T00:00:00Z"), end=DateTime("2025-01-31T00:00:00Z"))
+    assert Regime.of(before) == Regime.BEFORE_2025
+    assert Regime.of(after) == Regime.FROM_2025
+
+
+def test_required_attributes():
+    check = RequiredAttributes(("a", "b")).compile()
+    check(SimpleNamespace(a=1, b=0))
+    with pytest.raises(ValueError, match="Attribute 'b' must be defined"):
+        check(SimpleNamespace(a=1, b=None))
+
+
+def test_required_attributes_any_of():
+    check = RequiredAttributes(("a", "b"), any_of=True, message="a or b").compile()
+    check(SimpleNamespace(a=None, b=1))
+    with pytest.raises(ValueError, match="a or b"):
+        check(SimpleNamespace(a=None, b=None))
+
+
+def test_single_attribute():
+    check = RequiredAttributes(("a",)).compile()
+    with pytest.raises(ValueError, match="'a'"):
+        check(SimpleNamespace(a=None))
+
+
+def test_invalid_rule():
+    with pytest.raises(ValueError):
+        RequiredAttributes(())
+
+
+def test_registry_compiles_once():
+    registry = RuleRegistry()
+    registry.register("Model", "1.0.0", Regime.FROM_2025, RequiredAttributes(("a",)))
+
+    check = registry.compiled("Model", "1.0.0", Regime.FROM_2025)
+    assert registry.compiled("Model", "1.0.0", Regime.FROM_2025) is check
+    with pytest.raises(ValueError):
+        check(SimpleNamespace(a=None, b=None))
+
+    registry.register("Model", "1.0.0", Regime.FROM_2025, RequiredAttributes(("b",)))
+    check = registry.compiled("Model", "1.0.0", Regime.FROM_2025)
+    with pytest.raises(ValueError, match="'b'"):
+        check(SimpleNamespace(a=1, b=None))
+
+    registry.compiled("Model", "1.0.0", Regime.BEFORE_2025)(SimpleNamespace())
+    with pytest.raises(ValueError, match="No rules are registered for Model in spec version '2.0.0'"):
+        registry.compiled("Model", "2.0.0", Regime.FROM_2025)
+    with pytest.raises(ValueError, match="No rules are registered for Other"):
+        registry.compiled("Other", "1.0.0", Regime.FROM_2025)
+    assert registry.dependencies("Model") == {"a", "b", "reference_period"}
+
+
+def test_registry_rejects_invalid_arguments():
+    registry = RuleRegistry()
+    with pytest.raises(ValueError):
+        registry.register("Model", "1.0.0", "2025 or later", RequiredAttributes(("a",)))
+    with pytest.raises(ValueError):
+        registry.register("Model", "1.0.0", Regime.FROM_2025, ("a",))
+
+
+def test_default_rules():
+    assert REGISTRY.rules("CarbonFootprint", DEFAULT_SPEC_VERSION, Regime.BEFORE_2025)[0].any_of
+    assert "biogenic_accounting_methodology" in REGISTRY.dependencies("CarbonFootprint")
+    assert REGISTRY.rules("DataQualityIndicators", DEFAULT_SPEC_VERSION, Regime.BEFORE_2025) == ()
+
+
+def test_carbon_footprint_uses_spec_version(make_carbon_footprint):
+    pcf = make_carbon_footprint()
+    pcf.dqi = None
+    pcf.primary_data_share = None
+    with pytest.raises(ValueError, match="No rules are registered for CarbonFootprint in spec version '9.9.9'"):
+        pcf.validate_required_attributes(spec_version="9.9.9")
+    with pytest.raises(ValueError, match="At least one of"):
+        pcf.validate_required_attributes()
@@ -0,0 +1,27 @@
+import gc
+
+import pytest
+
+from pact_methodology._support import collection_paused, sync_directory
+
+
+@pytest.mark.parametrize("enabled", [True, False])
+def test_collection_paused_restores_the_collector(enabled):
+    was_enabled = gc.isenabled()
+    (gc.enable if enabled else gc.disable)()
+    try:
+        with collection_paused():
+            assert not gc.isenabled()
+        assert gc.isenabled() is enabled
+        with pytest.raises(RuntimeError), collection_paused():
+            raise RuntimeError
+        assert gc.isenabled() is enabled
+    finally:
+        (gc.enable if was_enabled else gc.disable)()
+
+
+def test_sync_directory(tmp_path):
+    (tmp_path / "file").write_bytes(b"data")
+    sync_directory(tmp_path)
+    with pytest.raises(FileNotFoundError):
+        sync_directory(tmp_path / "missing")